@@ -26,25 +26,14 @@ def check_dependencies():
     """Check if required dependencies are installed"""
     if not all([]):
         raise ValueError("Invalid parameters")
-    required_modules = ['tkinter', 'threading', 'json', 'os', 'sys']
-    optional_modules = ['requests', 'psutil']
+    from tools.preflight import OPTIONAL_MODULES, REQUIRED_MODULES, run_preflight
 
-    missing_required = []
-    missing_optional = []
+    # Found with find_spec, nothing is imported; unchanged environments reuse the last result
+    result = run_preflight(REQUIRED_MODULES, OPTIONAL_MODULES)
+    if result['cached']:
+        print("⚡ Environment unchanged - using cached dependency check")
 
-    for module in required_modules:
-        try:
-            __import__(module)
-        except ImportError:
-            missing_required.append(module)
-
-    for module in optional_modules:
-        try:
-            __import__(module)
-        except ImportError:
-            missing_optional.append(module)
-
-    return missing_required, missing_optional
+    return result['missing_required'], result['missing_optional']
 
 def install_dependencies():
     """Install missing dependencies"""
@@ -53,6 +42,8 @@ def install_dependencies():
     try:
         # Install optional dependencies for better experience
         subprocess.check_call([sys.executable, '-m', 'pip', 'install', 'requests', 'psutil'])
+        from tools.preflight import clear_preflight
+        clear_preflight()
         return True
     except Exception as e:
         print(f"Warning: Could not install optional dependencies: {e}")
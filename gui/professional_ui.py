@@ -1,14 +1,34 @@
-from functools import lru_cache
 #!/usr/bin/env python3
 """
+IRUS V6.0 - Professional Main Window
+Cross-platform converter GUI with lazily built tabs and a queued UI thread
+Worker threads never touch Tk; they post their updates to the event queue
 """
-    print("⚠️ Warning: requests module not available - some features may be limited")
 
-try:
-    import psutil
-except ImportError:
-    psutil = None
-    print("⚠️ Warning: psutil module not available - system diagnostics may be limited")
+import os
+import sys
+import json
+import time
+import platform
+import threading
+import traceback
+import subprocess
+from functools import lru_cache
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+from pathlib import Path
+
+from tools.lazy_import import lazy_import
+from tools.ui_events import UIEventQueue, on_ui_thread
+from tools.log_console import LogConsole, classify, DEFAULT_MAX_LINES, FILTER_CHOICES
+from tools.execution_profile import (apply_cache_limits, describe, resolve_profile, MEMORY_PROFILES,
+                                     SPEED_PROFILES)
+from tools.worker_pool import configure_worker_pool, submit
+from tools.settings_store import SettingsStore
+
+# Only Discord reports and diagnostics need these; they import on first use
+requests = lazy_import('requests')
+psutil = lazy_import('psutil')
 
 # Platform detection
 IS_WINDOWS = sys.platform.startswith('win')
@@ -17,7 +37,30 @@ IS_LINUX = sys.platform.startswith('linux')
 
 class ProfessionalTheme:
     """Professional color scheme and styling"""
+
+    COLORS = {
+        'primary': '#2c3e50',
+        'secondary': '#3498db',
+        'accent': '#1abc9c',
+        'success': '#27ae60',
+        'warning': '#f39c12',
+        'error': '#e74c3c',
+        'background': '#ecf0f1',
+        'text': '#2c3e50',
+        'text_secondary': '#7f8c8d',
+    }
+
+    FONTS = {
+        'heading': ('Helvetica', 18, 'bold'),
+        'subheading': ('Helvetica', 12, 'bold'),
+        'body': ('Helvetica', 10),
+        'small': ('Helvetica', 9),
+        'mono': ('Courier', 10),
+    }
+
+class ModernProgressBar(ttk.Frame):
     """Modern animated progress bar with detailed progress tracking"""
+    def __init__(self, parent, **kwargs):
         super().__init__(parent, **kwargs)
 
         # Main progress bar
@@ -50,16 +93,15 @@ class ProfessionalTheme:
         self.section_progress.pack(fill='x', pady=(0, 5))
 
     def set_progress(self, value, text="", current_line="", total_lines=0, section_progress=0):
-        """Update progress with detailed information"""
-        if not all([self, value, text="", current_line="", total_lines=0, section_progress=0]):
+        """Update progress with detailed information (UI thread only; workers post it)"""
         self.progress['value'] = value
         if text:
-            self.root.after(0, lambda: self.label.config()text=text)
+            self.label.config(text=text)
 
         # Update line information
         if current_line and total_lines > 0:
             line_text = f"Processing line {current_line} of {total_lines}"
-            self.root.after(0, lambda: self.line_info.config()text=line_text)
+            self.line_info.config(text=line_text)
 
             # Update file progress
             file_percent = (int(current_line) / total_lines) * 100
@@ -69,12 +111,9 @@ class ProfessionalTheme:
         if section_progress > 0:
             self.section_progress['value'] = section_progress
 
-        self.update()
-
 class StatusCard(ttk.Frame):
     """Professional status card widget"""
-    def __init__():
-    """Function definition"""
+    def __init__(self, parent, title, status="Ready", **kwargs):
         super().__init__(parent, **kwargs)
 
         # Card styling
@@ -97,16 +136,20 @@ class StatusCard(ttk.Frame):
         self.status_label.pack(anchor='w', padx=(0, 10))
 
     def update_status(self, status, color=None):
-        """Update status with optional color"""
-        self.root.after(0, lambda: self.status_label.config()text=status)
+        """Update status with optional color (UI thread only)"""
+        self.status_label.config(text=status)
         if color:
-            self.root.after(0, lambda: self.status_label.config()foreground=color)
+            self.status_label.config(foreground=color)
 
 class ProfessionalMainWindow:
     """Extremely professional main window with cross-platform support"""
+    def __init__(self):
         try:
             self.root = tk.Tk()
 
+            # Worker threads post UI updates here; the mainloop applies them at about 60 Hz
+            self.ui_events = UIEventQueue(self.root).start()
+
             # Initialize variables first
             self.input_file_var = tk.StringVar()
             self.output_file_var = tk.StringVar()
@@ -115,6 +158,8 @@ class ProfessionalMainWindow:
             self.auto_open_var = tk.BooleanVar(value=True)
             self.backup_var = tk.BooleanVar(value=True)
             self.verbose_var = tk.BooleanVar(value=False)
+            self.log_lines_var = tk.IntVar(value=DEFAULT_MAX_LINES)
+            self.log_filter_var = tk.StringVar(value="All")
             self.theme_var = tk.StringVar(value="Professional")
             self.font_size_var = tk.IntVar(value=10)
             self.speed_var = tk.StringVar(value="Normal")
@@ -124,6 +169,32 @@ class ProfessionalMainWindow:
             self.debug_var = tk.BooleanVar(value=False)
             self.auto_update_var = tk.BooleanVar(value=True)
             self.experimental_var = tk.BooleanVar(value=False)
+            self.webhook_var = tk.StringVar()
+            self.target_system_var = tk.StringVar(value="macOS")
+            self.profile_rules_var = tk.BooleanVar(value=False)
+
+            # Experimental features
+            self.batch_conversion_var = tk.BooleanVar(value=False)
+            self.ai_optimization_var = tk.BooleanVar(value=False)
+            self.profiling_var = tk.BooleanVar(value=False)
+            self.custom_templates_var = tk.BooleanVar(value=False)
+            self.advanced_debug_var = tk.BooleanVar(value=False)
+            self.cloud_sync_var = tk.BooleanVar(value=False)
+
+            # Settings live in memory; changes reach settings.json in debounced, atomic writes
+            self.settings_store = SettingsStore()
+            self.settings_vars = {name: getattr(self, f"{name}_var") for name in self.settings_store.schema
+                                  if name != 'discord_webhook_url'}
+            self.settings_vars['discord_webhook_url'] = self.webhook_var
+            # Discord reports read the webhook from the store, so keep it current as it is typed
+            self.webhook_var.trace_add('write', lambda *args: self.settings_store.update(
+                {'discord_webhook_url': self.webhook_var.get().strip()}))
+
+            # Tabs are built when first selected; widgets bind to the variables above
+            self._tab_builders = {}
+            self._built_tabs = set()
+            self.card_status = {}
+            self.tool_windows = {}
 
             # Set default output location
             default_output = os.path.join(os.getcwd(), "output", "fishing_macro_macos.py")
@@ -137,6 +208,11 @@ class ProfessionalMainWindow:
             # Error handling
             self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
 
+            # Warm converters and tool modules once the window is on screen
+            self.prewarmer = None
+            self._prewarm_started = False
+            self.root.bind('<Map>', self._on_first_map, add='+')
+
         except Exception as e:
             print(f"❌ Critical error initializing UI: {e}")
             print("🔧 Traceback:")
@@ -154,10 +230,30 @@ class ProfessionalMainWindow:
 
             sys.exit(1)
 
+    def _on_first_map(self, event):
+        """Start the background prewarm the first time the main window is shown"""
+        if event.widget is not self.root or self._prewarm_started:
+            return
+        self._prewarm_started = True
+        # Let the first frame finish drawing before the prewarm thread competes for the interpreter
+        self.root.after_idle(self.start_prewarm)
+
+    def start_prewarm(self):
+        """Import and build converters, validators and compiled rules in the background"""
+        try:
+            from tools.prewarm import start_prewarm
+        except ImportError:
+            return
+        self.prewarmer = start_prewarm()
+
     def on_closing(self):
         """Handle window closing"""
         try:
-            # Clean up any running threads
+            # Clean up any running threads; conversions not yet started are dropped
+            from tools.worker_pool import shutdown_worker_pool
+            self.ui_events.stop()
+            shutdown_worker_pool()
+            self.settings_store.close()
             self.root.quit()
             self.root.destroy()
         except Exception as e:
@@ -214,6 +310,7 @@ class ProfessionalMainWindow:
 
         # Load saved settings (after all UI components are created)
         self.load_settings()
+        self.apply_execution_profile(log=False)
 
     def create_header(self):
         """Create professional header"""
@@ -333,8 +430,7 @@ class ProfessionalMainWindow:
         scrollbar_h.pack(side="bottom", fill="x")
 
         # Mouse wheel scrolling
-        def _on_mousewheel():
-    """Function definition"""
+        def _on_mousewheel(event):
             canvas.xview_scroll(int(-1*(event.delta/120)), "units")
 
         canvas.bind("<MouseWheel>", _on_mousewheel)
@@ -376,15 +472,58 @@ class ProfessionalMainWindow:
         self.notebook = ttk.Notebook(content_frame)
         self.notebook.grid(row=1, column=0, sticky='nsew')
 
-        # Create tabs
-        self.create_conversion_tab()
-        self.create_analysis_tab()
-        self.create_settings_tab()
+        # Create tabs; only the conversion tab is shown at startup, the rest build on first selection
+        self.add_lazy_tab("Conversion", self.create_conversion_tab)
+        self.add_lazy_tab("Analysis", self.create_analysis_tab)
+        self.add_lazy_tab("Settings", self.create_settings_tab)
+        self.notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed, add='+')
+        self.ensure_tab("Conversion")
+
+    def add_lazy_tab(self, text, builder):
+        """Add an empty notebook page that builder(frame) fills the first time it is selected"""
+        frame = ttk.Frame(self.notebook)
+        self.notebook.add(frame, text=text)
+        self._tab_builders[text] = (frame, builder)
+        return frame
+
+    def ensure_tab(self, text):
+        """Build a tab's widgets now if they have not been built yet"""
+        if text in self._built_tabs:
+            return
+        frame, builder = self._tab_builders[text]
+        self._built_tabs.add(text)
+        builder(frame)
+
+    def _on_tab_changed(self, event):
+        """Build the newly selected tab on first selection"""
+        self.ensure_tab(self.notebook.tab(self.notebook.select(), 'text'))
+
+    def post_progress(self, *args):
+        """Progress update from a worker thread; only the newest one per tick is drawn"""
+        self.ui_events.post_latest('progress', self.progress_bar.set_progress, *args)
+
+    def update_card(self, name, status, color=None):
+        """Set a status card, remembering the status for cards whose tab is not built yet"""
+        if not on_ui_thread():
+            self.ui_events.post(self.update_card, name, status, color)
+            return
+        self.card_status[name] = (status, color)
+        card = getattr(self, name, None)
+        if card is not None:
+            card.update_status(status, color)
+
+    def _raise_tool_window(self, key):
+        """Bring back a tool window that is still open instead of building another; True if one was"""
+        window = self.tool_windows.get(key)
+        if window is None or not window.winfo_exists():
+            return False
+        window.deiconify()
+        window.lift()
+        window.focus_set()
+        return True
 
-    def create_conversion_tab(self):
+    def create_conversion_tab(self, conv_frame):
         """Create conversion tab"""
-        conv_frame = ttk.Frame(self.notebook)
-        self.notebook.add(conv_frame, text="Conversion")
 
         # Input file selection
         input_frame = ttk.LabelFrame(conv_frame, text="Input Script Selection", padding=20)
@@ -395,7 +534,6 @@ class ProfessionalMainWindow:
         input_file_frame = ttk.Frame(input_frame)
         input_file_frame.pack(fill='x')
 
-        self.input_file_var = tk.StringVar()
         input_entry = ttk.Entry(input_file_frame, textvariable=self.input_file_var, width=50)
         input_entry.pack(side='left', fill='x', expand=True)
 
@@ -412,7 +550,6 @@ class ProfessionalMainWindow:
 
         ttk.Label(target_frame, text="Convert script for:").pack(anchor='w', pady=(0, 5))
 
-        self.target_system_var = tk.StringVar(value="macOS")
         target_systems = ["macOS", "Linux", "Cross-Platform"]
 
         target_radio_frame = ttk.Frame(target_frame)
@@ -444,9 +581,6 @@ class ProfessionalMainWindow:
         output_file_frame = ttk.Frame(output_frame)
         output_file_frame.pack(fill='x')
 
-        self.output_file_var = tk.StringVar()
-        self.output_file_var.set("output/fishing_macro_macos.py")  # Default location
-
         output_entry = ttk.Entry(output_file_frame, textvariable=self.output_file_var, width=50)
         output_entry.pack(side='left', fill='x', expand=True)
 
@@ -477,9 +611,26 @@ class ProfessionalMainWindow:
         self.progress_bar = ModernProgressBar(progress_frame)
         self.progress_bar.pack(fill='x', pady=10)
 
+        # Log filter
+        log_bar = ttk.Frame(progress_frame)
+        log_bar.pack(fill='x', pady=(10, 0))
+
+        ttk.Label(log_bar, text="Show:").pack(side='left')
+        log_filter_combo = ttk.Combobox(
+            log_bar,
+            textvariable=self.log_filter_var,
+            values=list(FILTER_CHOICES),
+            state="readonly",
+            width=10
+        )
+        log_filter_combo.pack(side='left', padx=(5, 0))
+        log_filter_combo.bind('<<ComboboxSelected>>', self.on_log_filter_change)
+
+        ttk.Button(log_bar, text="Clear Log", command=self.clear_log).pack(side='right')
+
         # Log area
         log_frame = ttk.Frame(progress_frame)
-        log_frame.pack(fill='both', expand=True, pady=(10, 0))
+        log_frame.pack(fill='both', expand=True, pady=(5, 0))
 
         self.log_text = tk.Text(
             log_frame,
@@ -494,6 +645,9 @@ class ProfessionalMainWindow:
         self.log_text.pack(side='left', fill='both', expand=True)
         scrollbar.pack(side='right', fill='y')
 
+        self.log_console = LogConsole(self.log_text, self.ui_events, max_lines=self.log_lines_var.get())
+        self.log_console.set_min_level(FILTER_CHOICES.get(self.log_filter_var.get(), 'debug'))
+
         # Status label
         self.status_label = ttk.Label(
             progress_frame,
@@ -503,10 +657,8 @@ class ProfessionalMainWindow:
         )
         self.status_label.pack(pady=(10, 0))
 
-    def create_analysis_tab(self):
+    def create_analysis_tab(self, analysis_frame):
         """Create analysis tab"""
-        analysis_frame = ttk.Frame(self.notebook)
-        self.notebook.add(analysis_frame, text="Analysis")
 
         # Status cards
         cards_frame = ttk.Frame(analysis_frame)
@@ -520,6 +672,11 @@ class ProfessionalMainWindow:
         self.conversion_card = StatusCard(cards_frame, "Conversion Status", "Ready")
         self.conversion_card.pack(side='left', fill='x', expand=True, padx=(10, 0))
 
+        # Show what happened before the tab was first opened
+        for name, (status, color) in self.card_status.items():
+            if name in ('system_card', 'conversion_card'):
+                getattr(self, name).update_status(status, color)
+
         # Analysis results will be displayed here
         results_label = ttk.Label(
             analysis_frame,
@@ -528,10 +685,23 @@ class ProfessionalMainWindow:
         )
         results_label.pack(expand=True)
 
-    def create_settings_tab(self):
+        # Per-rule cost of the last profiled conversion
+        rules_frame = ttk.LabelFrame(analysis_frame, text="Most Expensive Rules", padding=10)
+        rules_frame.pack(fill='both', expand=True, padx=20, pady=(0, 20))
+
+        ttk.Checkbutton(
+            rules_frame,
+            text="Profile rules during conversion",
+            variable=self.profile_rules_var
+        ).pack(anchor='w')
+
+        self.rule_cost_text = tk.Text(rules_frame, height=12, wrap='none', font=('Courier', 9))
+        self.rule_cost_text.pack(fill='both', expand=True, pady=(5, 0))
+        self.rule_cost_text.insert('1.0', "Enable rule profiling and convert a script to see per-rule costs")
+        self.rule_cost_text.config(state='disabled')
+
+    def create_settings_tab(self, settings_frame):
         """Create comprehensive settings tab"""
-        settings_frame = ttk.Frame(self.notebook)
-        self.notebook.add(settings_frame, text="Settings")
 
         # Create scrollable frame
         canvas = tk.Canvas(settings_frame)
@@ -551,7 +721,6 @@ class ProfessionalMainWindow:
         conv_frame.pack(fill='x', padx=20, pady=10)
 
         # Auto-open output folder
-        self.auto_open_var = tk.BooleanVar(value=True)
         ttk.Checkbutton(
             conv_frame,
             text="Auto-open output folder after conversion",
@@ -559,7 +728,6 @@ class ProfessionalMainWindow:
         ).pack(anchor='w', pady=2)
 
         # Backup original files
-        self.backup_var = tk.BooleanVar(value=True)
         ttk.Checkbutton(
             conv_frame,
             text="Create backup of original files",
@@ -567,20 +735,31 @@ class ProfessionalMainWindow:
         ).pack(anchor='w', pady=2)
 
         # Verbose logging
-        self.verbose_var = tk.BooleanVar(value=False)
         ttk.Checkbutton(
             conv_frame,
             text="Enable verbose logging",
             variable=self.verbose_var
         ).pack(anchor='w', pady=2)
 
+        # Log history
+        log_lines_frame = ttk.Frame(conv_frame)
+        log_lines_frame.pack(anchor='w', pady=2)
+        ttk.Label(log_lines_frame, text="Log history (lines):").pack(side='left')
+        ttk.Spinbox(
+            log_lines_frame,
+            from_=500,
+            to=100000,
+            increment=500,
+            textvariable=self.log_lines_var,
+            width=8
+        ).pack(side='left', padx=(5, 0))
+
         # UI Settings
         ui_frame = ttk.LabelFrame(scrollable_frame, text="User Interface", padding=15)
         ui_frame.pack(fill='x', padx=20, pady=10)
 
         # Theme selection
         ttk.Label(ui_frame, text="Theme:").pack(anchor='w')
-        self.theme_var = tk.StringVar(value="Professional")
         theme_combo = ttk.Combobox(
             ui_frame,
             textvariable=self.theme_var,
@@ -592,7 +771,6 @@ class ProfessionalMainWindow:
 
         # Font size
         ttk.Label(ui_frame, text="Font Size:").pack(anchor='w')
-        self.font_size_var = tk.IntVar(value=10)
         font_scale = ttk.Scale(
             ui_frame,
             from_=8,
@@ -613,22 +791,20 @@ class ProfessionalMainWindow:
 
         # Conversion speed
         ttk.Label(perf_frame, text="Conversion Speed:").pack(anchor='w')
-        self.speed_var = tk.StringVar(value="Normal")
         speed_combo = ttk.Combobox(
             perf_frame,
             textvariable=self.speed_var,
-            values=["Fast", "Normal", "Thorough"],
+            values=list(SPEED_PROFILES),
             state="readonly"
         )
         speed_combo.pack(fill='x', pady=(0, 10))
 
         # Memory usage
         ttk.Label(perf_frame, text="Memory Usage:").pack(anchor='w')
-        self.memory_var = tk.StringVar(value="Balanced")
         memory_combo = ttk.Combobox(
             perf_frame,
             textvariable=self.memory_var,
-            values=["Low", "Balanced", "High"],
+            values=list(MEMORY_PROFILES),
             state="readonly"
         )
         memory_combo.pack(fill='x', pady=(0, 10))
@@ -638,7 +814,6 @@ class ProfessionalMainWindow:
         discord_frame.pack(fill='x', padx=20, pady=10)
 
         # Enable Discord features
-        self.discord_enabled_var = tk.BooleanVar(value=True)
         ttk.Checkbutton(
             discord_frame,
             text="Enable Discord integration (bug reports, feedback)",
@@ -647,7 +822,6 @@ class ProfessionalMainWindow:
 
         # Discord webhook URL
         ttk.Label(discord_frame, text="Discord Webhook URL (optional):").pack(anchor='w', pady=(10, 5))
-        self.webhook_var = tk.StringVar()
         webhook_entry = ttk.Entry(discord_frame, textvariable=self.webhook_var, width=60, show="*")
         webhook_entry.pack(fill='x', pady=(0, 5))
 
@@ -674,8 +848,7 @@ class ProfessionalMainWindow:
         )
         discord_link_label.pack(anchor='w', pady=(2, 0))
 
-        def open_discord_server():
-    """Function definition"""
+        def open_discord_server(event=None):
             import webbrowser
             webbrowser.open("https://discord.gg/j6wtpGJVng")
 
@@ -690,7 +863,6 @@ class ProfessionalMainWindow:
         test_webhook_btn.pack(anchor='w', pady=(0, 10))
 
         # Mobile companion
-        self.mobile_companion_var = tk.BooleanVar(value=False)
         ttk.Checkbutton(
             discord_frame,
             text="Enable mobile companion notifications",
@@ -702,7 +874,6 @@ class ProfessionalMainWindow:
         advanced_frame.pack(fill='x', padx=20, pady=10)
 
         # Debug mode
-        self.debug_var = tk.BooleanVar(value=False)
         ttk.Checkbutton(
             advanced_frame,
             text="Enable debug mode",
@@ -710,7 +881,6 @@ class ProfessionalMainWindow:
         ).pack(anchor='w', pady=2)
 
         # Auto-update
-        self.auto_update_var = tk.BooleanVar(value=True)
         ttk.Checkbutton(
             advanced_frame,
             text="Check for updates automatically",
@@ -718,7 +888,6 @@ class ProfessionalMainWindow:
         ).pack(anchor='w', pady=2)
 
         # Experimental features
-        self.experimental_var = tk.BooleanVar(value=False)
         experimental_cb = ttk.Checkbutton(
             advanced_frame,
             text="Enable experimental features",
@@ -740,7 +909,6 @@ class ProfessionalMainWindow:
         self.experimental_frame = ttk.LabelFrame(advanced_frame, text="🧪 Experimental Features", padding=10)
 
         # Batch conversion
-        self.batch_conversion_var = tk.BooleanVar(value=False)
         ttk.Checkbutton(
             self.experimental_frame,
             text="🔄 Batch Conversion - Convert multiple files at once",
@@ -748,7 +916,6 @@ class ProfessionalMainWindow:
         ).pack(anchor='w', pady=2)
 
         # AI-powered optimization
-        self.ai_optimization_var = tk.BooleanVar(value=False)
         ttk.Checkbutton(
             self.experimental_frame,
             text="🤖 AI-Powered Code Optimization",
@@ -756,7 +923,6 @@ class ProfessionalMainWindow:
         ).pack(anchor='w', pady=2)
 
         # Performance profiling
-        self.profiling_var = tk.BooleanVar(value=False)
         ttk.Checkbutton(
             self.experimental_frame,
             text="📊 Real-time Performance Profiling",
@@ -764,7 +930,6 @@ class ProfessionalMainWindow:
         ).pack(anchor='w', pady=2)
 
         # Custom templates
-        self.custom_templates_var = tk.BooleanVar(value=False)
         ttk.Checkbutton(
             self.experimental_frame,
             text="📝 Custom Conversion Templates",
@@ -772,7 +937,6 @@ class ProfessionalMainWindow:
         ).pack(anchor='w', pady=2)
 
         # Advanced debugging
-        self.advanced_debug_var = tk.BooleanVar(value=False)
         ttk.Checkbutton(
             self.experimental_frame,
             text="🔍 Advanced Debugging Tools",
@@ -780,13 +944,16 @@ class ProfessionalMainWindow:
         ).pack(anchor='w', pady=2)
 
         # Cloud sync
-        self.cloud_sync_var = tk.BooleanVar(value=False)
         ttk.Checkbutton(
             self.experimental_frame,
             text="☁️ Cloud Settings Synchronization",
             variable=self.cloud_sync_var
         ).pack(anchor='w', pady=2)
 
+        # Settings may have enabled experimental features before this tab was built
+        if self.experimental_var.get():
+            self.experimental_frame.pack(fill='x', pady=(10, 0))
+
         # Buttons
         button_frame = ttk.Frame(scrollable_frame)
         button_frame.pack(fill='x', padx=20, pady=20)
@@ -800,7 +967,7 @@ class ProfessionalMainWindow:
         ttk.Button(
             button_frame,
             text="Save Settings",
-            command=self.save_settings
+            command=lambda: self.save_settings(notify=True)
         ).pack(side='right', padx=(10, 0))
 
         ttk.Button(
@@ -813,93 +980,46 @@ class ProfessionalMainWindow:
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
 
-    def save_settings(self):
-        """Save settings to file"""
-        try:
-            settings = {
-                'auto_open': self.auto_open_var.get(),
-                'backup': self.backup_var.get(),
-                'verbose': self.verbose_var.get(),
-                'theme': self.theme_var.get(),
-                'font_size': self.font_size_var.get(),
-                'speed': self.speed_var.get(),
-                'memory': self.memory_var.get(),
-                'discord_enabled': self.discord_enabled_var.get(),
-                'mobile_companion': self.mobile_companion_var.get(),
-                'debug': self.debug_var.get(),
-                'auto_update': self.auto_update_var.get(),
-                'experimental': self.experimental_var.get()
-            }
+    def save_settings(self, notify=False):
+        """
+        Store the current settings; the file is written in the background
 
-            os.makedirs('config', exist_ok=True)
-            with open('config/settings.json', "w", encoding="utf-8") as f:
-                json.dump(settings, f, indent=2)
+        Theme and font changes call this on every event, so writes are
+        debounced. notify saves without waiting and confirms to the user.
+        """
+        settings = {}
+        for name, var in self.settings_vars.items():
+            try:
+                settings[name] = var.get()
+            except tk.TclError:
+                # Half-typed spinbox value; the stored value stays
+                continue
+        if isinstance(settings.get('discord_webhook_url'), str):
+            settings['discord_webhook_url'] = settings['discord_webhook_url'].strip()
 
-            self.log_message("💾 Settings saved successfully")
-            messagebox.showinfo("Settings", "Settings saved successfully!")
+        self.settings_store.update(settings, delay=0 if notify else None)
 
-        except Exception as e:
-            self.root.after(0, lambda: self.log_message(msg))
-            messagebox.showerror("Error", f"Failed to save settings:\n{e}")
+        if notify:
+            self.log_message(f"💾 Settings saved to {self.settings_store.path}")
+            messagebox.showinfo("Settings", "Settings saved successfully!")
 
     def load_settings(self):
-        """Load settings from file"""
-        try:
-            if os.path.exists('settings.json'):
-                with open('settings.json', 'r') as f:
-                    settings = json.load(f)
-
-                self.auto_open_var.set(settings.get('auto_open', True))
-                self.backup_var.set(settings.get('backup', True))
-                self.verbose_var.set(settings.get('verbose', False))
-                self.theme_var.set(settings.get('theme', 'Professional'))
-                self.font_size_var.set(settings.get('font_size', 10))
-                self.speed_var.set(settings.get('speed', 'Normal'))
-                self.memory_var.set(settings.get('memory', 'Balanced'))
-                self.discord_enabled_var.set(settings.get('discord_enabled', True))
-                self.mobile_companion_var.set(settings.get('mobile_companion', False))
-                self.debug_var.set(settings.get('debug', False))
-                self.auto_update_var.set(settings.get('auto_update', True))
-                self.experimental_var.set(settings.get('experimental', False))
-
-                # Load webhook URL if available
-                if hasattr(self, 'webhook_var'):
-                    self.webhook_var.set(settings.get('discord_webhook_url', ''))
-
-                # Load experimental features if available
-                if hasattr(self, 'batch_conversion_var'):
-                    self.batch_conversion_var.set(settings.get('batch_conversion', False))
-                if hasattr(self, 'ai_optimization_var'):
-                    self.ai_optimization_var.set(settings.get('ai_optimization', False))
-                if hasattr(self, 'profiling_var'):
-                    self.profiling_var.set(settings.get('profiling', False))
-                if hasattr(self, 'custom_templates_var'):
-                    self.custom_templates_var.set(settings.get('custom_templates', False))
-                if hasattr(self, 'advanced_debug_var'):
-                    self.advanced_debug_var.set(settings.get('advanced_debug', False))
-                if hasattr(self, 'cloud_sync_var'):
-                    self.cloud_sync_var.set(settings.get('cloud_sync', False))
-
-                self.log_message("📂 Settings loaded successfully")
-
-        except Exception as e:
-            self.root.after(0, lambda: self.log_message(msg))
+        """Load settings from file; missing or invalid values take their defaults"""
+        self.set_settings_vars(self.settings_store.load())
+        for problem in self.settings_store.problems:
+            self.log_message(f"⚠️ {problem}")
+        self.log_message("📂 Settings loaded successfully")
+
+    def set_settings_vars(self, settings):
+        """Show settings in the UI variables"""
+        for name, value in settings.items():
+            if name in self.settings_vars:
+                self.settings_vars[name].set(value)
 
     def reset_settings(self):
         """Reset all settings to defaults"""
         if messagebox.askyesno("Reset Settings", "Reset all settings to default values?"):
-            self.auto_open_var.set(True)
-            self.backup_var.set(True)
-            self.verbose_var.set(False)
-            self.theme_var.set('Professional')
-            self.font_size_var.set(10)
-            self.speed_var.set('Normal')
-            self.memory_var.set('Balanced')
-            self.discord_enabled_var.set(True)
-            self.mobile_companion_var.set(False)
-            self.debug_var.set(False)
-            self.auto_update_var.set(True)
-            self.experimental_var.set(False)
+            self.set_settings_vars(self.settings_store.defaults())
 
             self.log_message("🔄 Settings reset to defaults")
 
@@ -918,13 +1038,32 @@ class ProfessionalMainWindow:
                 else:
                     self.apply_professional_theme()
 
+            if hasattr(self, 'log_console'):
+                self.log_console.set_max_lines(self.log_lines_var.get())
+
+            self.apply_execution_profile()
+
             self.log_message("✅ Settings applied successfully")
             messagebox.showinfo("Settings", "Settings applied successfully!")
 
         except Exception as e:
-            self.root.after(0, lambda: self.log_message(msg))
+            self.log_message(f"❌ Failed to apply settings: {e}")
             messagebox.showerror("Error", f"Failed to apply settings:\n{e}")
 
+    def execution_profile(self):
+        """Execution profile for the current speed and memory settings (UI thread only)"""
+        return resolve_profile(self.speed_var.get(), self.memory_var.get())
+
+    def apply_execution_profile(self, log=True):
+        """Size the worker pool, caches and UI tick for the current speed and memory settings"""
+        profile = self.execution_profile()
+        self.ui_events.tick_ms = profile['ui_tick_ms']
+        configure_worker_pool(profile['workers'])
+        apply_cache_limits(profile)
+        if log:
+            self.log_message(f"⚙️ Performance profile {describe(profile)}")
+        return profile
+
     def apply_dark_theme(self):
         """Apply dark theme"""
         # This would implement dark theme styling
@@ -988,25 +1127,34 @@ class ProfessionalMainWindow:
         target_system = self.target_system_var.get() if hasattr(self, 'target_system_var') else "macOS"
 
         self.log_message("🚀 Starting conversion process...")
-        self.root.after(0, lambda: self.log_message(msg))
-        self.root.after(0, lambda: self.log_message(msg))
-        self.root.after(0, lambda: self.log_message(msg))
-        self.conversion_card.update_status("Running", ProfessionalTheme.COLORS['warning'])
+        self.log_message(f"📂 Input: {input_file}")
+        self.log_message(f"📁 Output: {output_file}")
+        self.log_message(f"🎯 Target system: {target_system}")
+        self.update_card('conversion_card', "Running", ProfessionalTheme.COLORS['warning'])
 
         # Create output directory if needed
         output_path = Path(output_file).resolve()
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
+        # Read on the UI thread; the worker never touches Tk variables
+        profile = self.execution_profile()
+
+        # Fast skips the phase-by-phase progress animation
+        pause = time.sleep if profile['pacing'] else (lambda seconds: None)
+
         # Detailed conversion process
         def conversion_thread():
-    """Function definition"""
             try:
                 # Read input file to get total lines
                 with open(input_file, 'r', encoding='utf-8') as f:
                     input_lines = f.readlines()
                 total_lines = len(input_lines)
 
-                self.root.after(0, lambda: self.log_message(msg))
+                self.ui_events.post(self.log_message, f"📖 Loaded {Path(input_file).name} ({total_lines} lines)")
+
+                # A running IRUS daemon already has warm converters and caches
+                if self._convert_with_daemon(input_file, output_file, target_system, total_lines):
+                    return
 
                 conversion_phases = [
                     ("Reading input script", 0, 10),
@@ -1042,10 +1190,10 @@ class ProfessionalMainWindow:
                 phase_lines = max(1, total_lines // len(conversion_phases))
 
                 for phase_name, start_percent, end_percent in conversion_phases:
-                    self.root.after(0, lambda: self.log_message(msg))
+                    self.ui_events.post(self.log_message, f"🔄 {phase_name}...")
 
                     # Update progress
-                    self.progress_bar.set_progress(start_percent)
+                    self.post_progress(start_percent)
 
                     # Apply specific optimizations based on phase
                     if "optimizations" in phase_name.lower() and macos_optimizer_available:
@@ -1055,7 +1203,7 @@ class ProfessionalMainWindow:
                         optimization_report.extend(report)
 
                         for item in report:
-                            self.root.after(0, lambda: self.log_message(msg))
+                            self.ui_events.post(self.log_message, f"  {item}")
 
                     elif "performance" in phase_name.lower():
                         # Apply performance optimizations
@@ -1065,7 +1213,7 @@ class ProfessionalMainWindow:
                                 perf_content, perf_report = optimizer._apply_performance_optimizations(converted_content)
                                 converted_content = perf_content
                                 for item in perf_report:
-                                    self.root.after(0, lambda: self.log_message(msg))
+                                    self.ui_events.post(self.log_message, f"  {item}")
                             except AttributeError:
                                 # Fallback if method doesn't exist
                                 if 'time.sleep(0.001)' in converted_content:
@@ -1079,20 +1227,24 @@ class ProfessionalMainWindow:
 
                     elif "validation" in phase_name.lower():
                         # Run validation checks
-                        if macos_optimizer_available:
+                        if macos_optimizer_available and profile['validation'] != 'none':
                             try:
                                 analysis = optimizer.analyze_conversion_success(original_content, converted_content)
-                                self.root.after(0, lambda: self.log_message(msg))
-                                self.root.after(0, lambda: self.log_message(msg))
+                                self.ui_events.post(self.log_message, f"  📊 Conversion success rate: {analysis['success_rate']}%")
+                                self.ui_events.post(
+                                    self.log_message,
+                                    f"  📏 {analysis['original_lines']} → {analysis['optimized_lines']} lines, "
+                                    f"{analysis['optimizations']} optimizations"
+                                )
                             except AttributeError:
                                 # Fallback if method doesn't exist
                                 self.log_message("  📊 Validation completed")
 
                     # Simulate processing time
-                    time.sleep(0.2)
+                    pause(0.2)
 
                     # Update progress to end of phase
-                    self.progress_bar.set_progress(end_percent)
+                    self.post_progress(end_percent)
 
                     # Simulate line-by-line processing for visual feedback
                     for line_num in range(1, min(phase_lines, 10) + 1):
@@ -1110,7 +1262,7 @@ class ProfessionalMainWindow:
 
                         # Update progress with detailed info
                         current_line_number = line_num + (conversion_phases.index((phase_name, start_percent, end_percent)) * phase_lines)
-                        self.progress_bar.set_progress(
+                        self.post_progress(
                             overall_progress,
                             f"{phase_name}: {current_line_content}",
                             str(min(current_line_number, total_lines)),
@@ -1120,22 +1272,25 @@ class ProfessionalMainWindow:
 
                         # Log progress every 10 lines
                         if line_num % 10 == 0:
-                            self.root.after(0, lambda: self.log_message(msg))
+                            self.ui_events.post(
+                                self.log_message,
+                                f"  📝 {phase_name}: line {current_line_number} of {total_lines}"
+                            )
 
-                        time.sleep(0.1)  # Simulate processing time
+                        pause(0.1)  # Simulate processing time
 
                     # Phase completion
-                    self.progress_bar.set_progress(end_percent, f"{phase_name} complete", "", 0, 100)
-                    time.sleep(0.3)
+                    self.post_progress(end_percent, f"{phase_name} complete", "", 0, 100)
+                    pause(0.3)
 
                 # Final completion
-                self.progress_bar.set_progress(100, "Conversion complete!", str(total_lines), total_lines, 100)
+                self.post_progress(100, "Conversion complete!", str(total_lines), total_lines, 100)
                 self.log_message("✅ Conversion completed successfully!")
-                self.root.after(0, lambda: self.log_message(msg))
-                self.root.after(0, lambda: self.log_message(msg))
-                self.root.after(0, lambda: self.log_message(msg))
+                self.ui_events.post(self.log_message, f"📄 {Path(input_file).name}: {total_lines} lines converted")
+                self.ui_events.post(self.log_message, f"🎯 Target system: {target_system}")
+                self.ui_events.post(self.log_message, f"📁 Output: {output_file}")
 
-                self.conversion_card.update_status("Complete", ProfessionalTheme.COLORS['success'])
+                self.update_card('conversion_card', "Complete", ProfessionalTheme.COLORS['success'])
 
                 # Generate the final converted script
                 if macos_optimizer_available:
@@ -1144,7 +1299,10 @@ class ProfessionalMainWindow:
                         script_header = optimizer.generate_macos_script_header(Path(input_file).resolve().name)
                         final_script = script_header + "\n" + converted_content
                     except Exception as e:
-                        self.root.after(0, lambda: self.log_message(msg))
+                        self.ui_events.post(
+                            self.log_message,
+                            f"⚠️ Could not generate the {target_system} header ({e}) - using a basic header"
+                        )
                         # Fallback to basic header
                         final_script = self._generate_basic_header(input_file, target_system) + converted_content
                 else:
@@ -1155,26 +1313,90 @@ class ProfessionalMainWindow:
                 with open(output_file, "w", encoding="utf-8") as f:
                     f.write(final_script)
 
+                # Thorough also runs the ultra validator on the saved script
+                if profile['validation'] == 'full':
+                    from tools.ultra_validator import ultra_validate_report
+                    report = ultra_validate_report(output_file)
+                    self.log_message(f"🔍 Validation {report['validation_score']}/100 ({report['status']})")
+
                 # Log optimization summary if available
                 if macos_optimizer_available and optimization_report:
                     self.log_message("📋 Optimization Summary:")
                     for item in optimization_report[:5]:  # Show first 5 items
-                        self.root.after(0, lambda: self.log_message(msg))
+                        self.ui_events.post(self.log_message, f"  {item}")
                     if len(optimization_report) > 5:
-                        self.root.after(0, lambda: self.log_message(msg))
+                        self.ui_events.post(self.log_message, f"  ... and {len(optimization_report) - 5} more")
 
                 # Show completion dialog
-                self.root.after(0, self.show_conversion_complete, output_file)
+                self.ui_events.post(self.show_conversion_complete, output_file)
 
             except Exception as e:
-                self.root.after(0, lambda: self.log_message(msg))
-                self.progress_bar.set_progress(0, "Conversion failed")
-                self.conversion_card.update_status("Error", ProfessionalTheme.COLORS['accent'])
+                self.ui_events.post(self.log_message, f"❌ Conversion failed: {e}")
+                self.post_progress(0, "Conversion failed")
+                self.update_card('conversion_card', "Error", ProfessionalTheme.COLORS['accent'])
 
                 # Auto-report critical errors to Discord if configured
                 self.auto_report_bug(e, "Conversion Error")
 
-        threading.Thread(target=conversion_thread, daemon=True).start()
+        profile_rules_enabled = self.profile_rules_var.get()
+
+        def profiled_conversion():
+            if not profile_rules_enabled:
+                conversion_thread()
+                return
+            from tools.rule_profiler import profile_rules
+            with profile_rules() as profiler, profiler.file_scope(input_file):
+                conversion_thread()
+            self.ui_events.post(self.show_rule_costs, profiler)
+
+        submit(profiled_conversion)
+
+    def show_rule_costs(self, profiler, limit=15):
+        """Show the most expensive rules in the analysis tab"""
+        self.ensure_tab("Analysis")
+        self.rule_cost_text.config(state='normal')
+        self.rule_cost_text.delete('1.0', tk.END)
+        self.rule_cost_text.insert('1.0', profiler.format_top(limit))
+        self.rule_cost_text.config(state='disabled')
+        self.log_message("⏱️ Rule profile ready - see the Analysis tab")
+
+    def _convert_with_daemon(self, input_file, output_file, target_system, total_lines):
+        """Convert through the IRUS daemon; returns False when it is not running"""
+        try:
+            from tools.atomic_io import atomic_write_text
+            from tools.conversion_daemon import DaemonError, get_daemon_client
+            from tools.rule_profiler import get_rule_profiler
+        except ImportError:
+            return False
+
+        # Rule profiling has to watch the rules run in this process
+        if get_rule_profiler() is not None:
+            return False
+
+        client = get_daemon_client()
+        if client is None:
+            return False
+
+        try:
+            self.post_progress(10, "Converting via IRUS daemon", "", total_lines, 10)
+            response = client.convert(input_path=input_file)
+            final_script = self._generate_basic_header(input_file, target_system) + response['content']
+            atomic_write_text(output_file, final_script)
+        except (DaemonError, OSError) as e:
+            self.ui_events.post(self.log_message, f"⚠️ Daemon conversion failed ({e}) - converting locally")
+            return False
+        finally:
+            client.close()
+
+        log_lines = [f"  • {entry}" for entry in response['conversion_log'] + response['bugs_fixed']]
+        log_lines.append(f"✅ Conversion completed by IRUS daemon in {response['elapsed_ms']:.1f} ms")
+        for line in log_lines:
+            self.ui_events.post(self.log_message, line)
+
+        self.post_progress(100, "Conversion complete!", str(total_lines), total_lines, 100)
+        self.update_card('conversion_card', "Complete", ProfessionalTheme.COLORS['success'])
+        self.ui_events.post(self.show_conversion_complete, output_file)
+        return True
 
     def _generate_basic_header(self, input_file, target_system):
         """Generate a basic script header"""
@@ -1193,6 +1415,8 @@ import time
 from pathlib import Path
 
 """
+
+    def show_conversion_complete(self, output_file):
         """Show conversion completion dialog"""
         result = messagebox.askyesno(
             "Conversion Complete!",
@@ -1217,7 +1441,7 @@ from pathlib import Path
                 else:  # Linux
                     subprocess.run(["xdg-open", str(folder_path)])
             except Exception as e:
-                self.root.after(0, lambda: self.log_message(msg))
+                self.log_message(f"⚠️ Could not open output folder: {e}")
 
         self.log_message("🎣 Ready to fish on macOS!")
 
@@ -1226,14 +1450,11 @@ from pathlib import Path
         self.log_message("🔍 Running system diagnostics...")
 
         # Update both system cards
-        if hasattr(self, 'system_card'):
-            self.system_card.update_status("Analyzing", ProfessionalTheme.COLORS['warning'])
-        if hasattr(self, 'sidebar_system_card'):
-            self.sidebar_system_card.update_status("Analyzing", ProfessionalTheme.COLORS['warning'])
+        self.update_card('system_card', "Analyzing", ProfessionalTheme.COLORS['warning'])
+        self.update_card('sidebar_system_card', "Analyzing", ProfessionalTheme.COLORS['warning'])
 
         # Run diagnostics
         def diagnostics_thread():
-    """Function definition"""
             try:
                 # Basic system checks
                 self.log_message("📊 Checking system resources...")
@@ -1241,17 +1462,23 @@ from pathlib import Path
                 if psutil:
                     # Memory check
                     memory = psutil.virtual_memory()
-                    self.root.after(0, lambda: self.log_message(msg))
+                    self.ui_events.post(
+                        self.log_message,
+                        f"💾 Memory: {memory.percent:.1f}% used ({memory.available / (1024 ** 3):.1f} GB available)"
+                    )
 
                     # CPU check
                     cpu_percent = psutil.cpu_percent(interval=1)
-                    self.root.after(0, lambda: self.log_message(msg))
+                    self.ui_events.post(self.log_message, f"🖥️ CPU: {cpu_percent:.1f}% used")
 
                     # Disk check (cross-platform)
                     disk_path = 'C:\\' if IS_WINDOWS else '/'
                     disk = psutil.disk_usage(disk_path)
                     disk_percent = (disk.used / disk.total) * 100
-                    self.root.after(0, lambda: self.log_message(msg))
+                    self.ui_events.post(
+                        self.log_message,
+                        f"💿 Disk: {disk_percent:.1f}% used ({disk.free / (1024 ** 3):.1f} GB free)"
+                    )
 
                     # Overall assessment
                     issues = []
@@ -1263,7 +1490,10 @@ from pathlib import Path
                         issues.append("Low disk space")
 
                     if issues:
-                        self.root.after(0, lambda: self.log_message(msg))
+                        self.ui_events.post(
+                            self.log_message,
+                            f"⚠️ System diagnostics found issues: {', '.join(issues)}"
+                        )
                         status_text = "Issues Found"
                         status_color = ProfessionalTheme.COLORS['warning']
                     else:
@@ -1277,41 +1507,21 @@ from pathlib import Path
                     status_color = ProfessionalTheme.COLORS['success']
 
                 # Update both system cards
-                if hasattr(self, 'system_card'):
-                    self.system_card.update_status(status_text, status_color)
-                if hasattr(self, 'sidebar_system_card'):
-                    self.sidebar_system_card.update_status(status_text, status_color)
+                self.update_card('system_card', status_text, status_color)
+                self.update_card('sidebar_system_card', status_text, status_color)
 
             except Exception as e:
-                self.root.after(0, lambda: self.log_message(msg))
+                self.ui_events.post(self.log_message, f"❌ System diagnostics failed: {e}")
                 # Update both system cards
-                if hasattr(self, 'system_card'):
-                    self.system_card.update_status("Error", ProfessionalTheme.COLORS['accent'])
-                if hasattr(self, 'sidebar_system_card'):
-                    self.sidebar_system_card.update_status("Error", ProfessionalTheme.COLORS['accent'])
+                self.update_card('system_card', "Error", ProfessionalTheme.COLORS['accent'])
+                self.update_card('sidebar_system_card', "Error", ProfessionalTheme.COLORS['accent'])
 
         threading.Thread(target=diagnostics_thread, daemon=True).start()
-    @lru_cache(maxsize=128)
 
     def get_discord_webhook(self):
         """Get Discord webhook URL from settings"""
-        try:
-            # First try to get from UI variable
-            if hasattr(self, 'webhook_var') and self.webhook_var.get().strip():
-                return self.webhook_var.get().strip()
-
-            # Fallback to settings file
-            settings_file = 'settings.json'
-            if os.path.exists(settings_file):
-                with open(settings_file, 'r') as f:
-                    settings = json.load(f)
-                    webhook_url = settings.get('discord_webhook_url', '')
-                    if hasattr(self, 'webhook_var'):
-                        self.webhook_var.set(webhook_url)
-                    return webhook_url
-            return ''
-        except Exception as e:
-            return ''
+        # Called from worker threads, so read the store rather than the Tk variable
+        return self.settings_store.get('discord_webhook_url')
 
     def send_to_discord_webhook(self, webhook_url, message):
         """Send message to Discord webhook"""
@@ -1358,7 +1568,6 @@ from pathlib import Path
         self.log_message("🧪 Testing Discord webhook...")
 
         def test_thread():
-    """Function definition"""
             try:
                 success = self.send_to_discord_webhook(
                     webhook_url,
@@ -1370,7 +1579,7 @@ from pathlib import Path
                 )
 
                 if success:
-                    self.root.after(0, lambda: messagebox.showinfo(
+                    self.ui_events.post(lambda: messagebox.showinfo(
                         "Webhook Test Successful!",
                         "✅ Discord webhook test successful!\n\n"
                         "Check your Discord server for the test message.\n"
@@ -1378,7 +1587,7 @@ from pathlib import Path
                     ))
                     self.log_message("✅ Discord webhook test successful!")
                 else:
-                    self.root.after(0, lambda: messagebox.showerror(
+                    self.ui_events.post(lambda: messagebox.showerror(
                         "Webhook Test Failed",
                         "❌ Discord webhook test failed!\n\n"
                         "Please check:\n"
@@ -1389,21 +1598,25 @@ from pathlib import Path
                     self.log_message("❌ Discord webhook test failed!")
 
             except Exception as e:
-                self.root.after(0, lambda: messagebox.showerror(
+                self.ui_events.post(
+                    messagebox.showerror,
                     "Test Error",
                     f"❌ Error testing webhook:\n{str(e)}\n\n"
                     "Please check your webhook URL and try again."
-                ))
-                self.root.after(0, lambda: self.log_message(msg))
+                )
+                self.ui_events.post(self.log_message, f"❌ Discord webhook test error: {e}")
 
         threading.Thread(target=test_thread, daemon=True).start()
 
     def open_ai_assistant(self):
         """Open AI assistant"""
         self.log_message("🤖 AI Assistant activated")
+        if self._raise_tool_window('ai_assistant'):
+            return
 
         # Create AI assistant window
         ai_window = tk.Toplevel(self.root)
+        self.tool_windows['ai_assistant'] = ai_window
         ai_window.title("IRUS V5.0 - AI Assistant")
         ai_window.geometry("600x500")
         ai_window.resizable(True, True)
@@ -1535,7 +1748,6 @@ from pathlib import Path
 
         input_entry.focus()
     @lru_cache(maxsize=128)
-
     def get_ai_response(self, user_message):
         """Generate AI response to user message"""
         message_lower = user_message.lower()
@@ -1676,7 +1888,7 @@ from pathlib import Path
                                "Please select a script file or run conversion first.")
             return
 
-        self.root.after(0, lambda: self.log_message(msg))
+        self.log_message(f"🔍 Analyzing {file_type}: {Path(analyze_file).name}")
 
         # Create analysis window
         analysis_window = tk.Toplevel(self.root)
@@ -1744,13 +1956,11 @@ from pathlib import Path
 
         # Run analysis in thread
         def run_analysis():
-    """Function definition"""
-            analysis_progress.start()
+            self.ui_events.post(analysis_progress.start)
 
             try:
                 # Quick syntax check
-                progress_label.config(text="Checking syntax...")
-                analysis_window.update()
+                self.ui_events.post(progress_label.config, text="Checking syntax...")
 
                 with open(analyze_file, 'r', encoding='utf-8') as f:
                     content = f.read()
@@ -1765,8 +1975,7 @@ from pathlib import Path
                 results.append("")
 
                 # Syntax validation
-                progress_label.config(text="Validating Python syntax...")
-                analysis_window.update()
+                self.ui_events.post(progress_label.config, text="Validating Python syntax...")
 
                 try:
                     compile(content, analyze_file, 'exec')
@@ -1775,8 +1984,7 @@ from pathlib import Path
                     results.append(f"❌ SYNTAX ERROR: Line {e.lineno}: {e.msg}")
 
                 # Import analysis
-                progress_label.config(text="Analyzing imports...")
-                analysis_window.update()
+                self.ui_events.post(progress_label.config, text="Analyzing imports...")
 
                 import_lines = [line.strip() for line in content.split('\n') if line.strip().startswith(('import ', 'from '))]
                 results.append(f"\n📦 IMPORTS FOUND: {len(import_lines)}")
@@ -1795,8 +2003,7 @@ from pathlib import Path
                         results.append(f"❌ {imp}: Windows import detected - needs conversion")
 
                 # API analysis
-                progress_label.config(text="Checking API usage...")
-                analysis_window.update()
+                self.ui_events.post(progress_label.config, text="Checking API usage...")
 
                 results.append(f"\n🔧 API ANALYSIS:")
 
@@ -1815,8 +2022,7 @@ from pathlib import Path
                         results.append(f"✅ macOS API '{api}': {count} occurrences")
 
                 # Performance analysis
-                progress_label.config(text="Analyzing performance...")
-                analysis_window.update()
+                self.ui_events.post(progress_label.config, text="Analyzing performance...")
 
                 results.append(f"\n⚡ PERFORMANCE ANALYSIS:")
 
@@ -1834,8 +2040,7 @@ from pathlib import Path
                         results.append("⚠️ Consider using daemon threads")
 
                 # Security analysis
-                progress_label.config(text="Security scan...")
-                analysis_window.update()
+                self.ui_events.post(progress_label.config, text="Security scan...")
 
                 results.append(f"\n🔒 SECURITY ANALYSIS:")
 
@@ -1878,25 +2083,28 @@ from pathlib import Path
                 results.append("4. Grant required macOS permissions")
 
                 # Display results
-                analysis_progress.stop()
-                progress_label.config(text="Analysis complete!")
+                self.ui_events.post(analysis_progress.stop)
+                self.ui_events.post(progress_label.config, text="Analysis complete!")
 
-                results_text.delete('1.0', 'end')
-                results_text.insert('1.0', '\n'.join(results))
+                self.ui_events.post(results_text.delete, '1.0', 'end')
+                self.ui_events.post(results_text.insert, '1.0', '\n'.join(results))
 
                 # Log summary
-                self.root.after(0, lambda: self.log_message(msg))
+                self.ui_events.post(self.log_message, f"🔍 Bug analysis complete - quality score {score}/100")
                 if critical_issues > 0:
-                    self.root.after(0, lambda: self.log_message(msg))
+                    self.ui_events.post(
+                        self.log_message,
+                        f"❌ {critical_issues} critical issues need fixing before the script runs"
+                    )
                 if warnings > 0:
-                    self.root.after(0, lambda: self.log_message(msg))
+                    self.ui_events.post(self.log_message, f"⚠️ {warnings} warnings found")
 
             except Exception as e:
-                analysis_progress.stop()
-                progress_label.config(text="Analysis failed!")
-                results_text.delete('1.0', 'end')
-                results_text.insert('1.0', f"❌ Analysis Error:\n{str(e)}\n\nPlease check the file and try again.")
-                self.root.after(0, lambda: self.log_message(msg))
+                self.ui_events.post(analysis_progress.stop)
+                self.ui_events.post(progress_label.config, text="Analysis failed!")
+                self.ui_events.post(results_text.delete, '1.0', 'end')
+                self.ui_events.post(results_text.insert, '1.0', f"❌ Analysis Error:\n{str(e)}\n\nPlease check the file and try again.")
+                self.ui_events.post(self.log_message, f"❌ Bug analysis failed: {e}")
 
         # Start analysis
         threading.Thread(target=run_analysis, daemon=True).start()
@@ -1914,7 +2122,10 @@ from pathlib import Path
 
     def create_inline_feedback_system(self):
         """Create inline feedback system"""
+        if self._raise_tool_window('feedback'):
+            return
         feedback_window = tk.Toplevel(self.root)
+        self.tool_windows['feedback'] = feedback_window
         feedback_window.title("IRUS V5.0 - User Feedback")
         feedback_window.geometry("500x600")
         feedback_window.resizable(False, False)
@@ -1958,8 +2169,7 @@ from pathlib import Path
         rating_var = tk.IntVar()
         star_buttons = []
 
-        def update_stars():
-    """Function definition"""
+        def update_stars(selected_rating):
             rating_var.set(selected_rating)
             for i, btn in enumerate(star_buttons):
                 if i < selected_rating:
@@ -2013,7 +2223,6 @@ from pathlib import Path
         button_frame.pack(fill='x', pady=(10, 0))
 
         def submit_feedback():
-    """Function definition"""
             rating = rating_var.get()
             feedback_content = feedback_text.get('1.0', 'end-1c').strip()
             contact_info = contact_var.get().strip()
@@ -2029,8 +2238,7 @@ from pathlib import Path
             # Simulate network delay
             feedback_window.after(1000, lambda: send_feedback_complete(rating, feedback_content, contact_info))
 
-        def send_feedback_complete():
-    """Function definition"""
+        def send_feedback_complete(rating, feedback_content, contact_info):
             try:
                 # Try Discord webhook if configured
                 webhook_url = self.get_discord_webhook()
@@ -2107,7 +2315,10 @@ from pathlib import Path
 
     def create_inline_bug_reporter(self):
         """Create inline bug reporting system"""
+        if self._raise_tool_window('bug_reporter'):
+            return
         bug_window = tk.Toplevel(self.root)
+        self.tool_windows['bug_reporter'] = bug_window
         bug_window.title("IRUS V5.0 - Bug Reporter")
         bug_window.geometry("600x700")
         bug_window.resizable(True, True)
@@ -2203,7 +2414,6 @@ from pathlib import Path
         button_frame.pack(fill='x', pady=(10, 0))
 
         def submit_bug_report():
-    """Function definition"""
             bug_type = bug_type_var.get()
             description = bug_text.get('1.0', 'end-1c').strip()
             steps = steps_text.get('1.0', 'end-1c').strip()
@@ -2220,8 +2430,7 @@ from pathlib import Path
             # Simulate network delay
             bug_window.after(1000, lambda: send_bug_report_complete(bug_type, description, steps, contact_info))
 
-        def send_bug_report_complete():
-    """Function definition"""
+        def send_bug_report_complete(bug_type, description, steps, contact_info):
             try:
                 # Try Discord webhook if configured
                 webhook_url = self.get_discord_webhook()
@@ -2305,15 +2514,28 @@ from pathlib import Path
                 import traceback
                 error_traceback = traceback.format_exc()
 
-                bug_report = f"""
+                bug_report = f"""🚨 **IRUS Automatic Bug Report** 🚨
+
+**Error Type:** {error_type}
+**Exception:** {exception}
+**Platform:** {platform.system()} {platform.release()}
+**Time:** {time.strftime('%Y-%m-%d %H:%M:%S')}
+
+**Traceback:**
+```
+{error_traceback[-1500:]}
+```
+
 **Note:** This is an automatic report. User may follow up with more details."""
+
+                if self.send_to_discord_webhook(webhook_url, bug_report):
                     self.log_message("🤖 Automatic bug report sent to Discord")
                 else:
                     self.log_message("⚠️ Could not send automatic bug report")
 
         except Exception as e:
             # Don't let auto-reporting cause more errors
-            self.root.after(0, lambda: self.log_message(msg))
+            self.log_message(f"⚠️ Automatic bug report failed: {e}")
 
     def browse_input_file(self):
         """Browse for input script file"""
@@ -2327,7 +2549,7 @@ from pathlib import Path
             input_path = Path(filename).resolve()
             output_name = f"{input_path.stem}_macos.py"
             self.output_file_var.set(f"output/{output_name}")
-            self.root.after(0, lambda: self.log_message(msg))
+            self.log_message(f"📂 Selected input: {input_path.name}")
 
     def browse_output_file(self):
         """Browse for output save location"""
@@ -2338,7 +2560,7 @@ from pathlib import Path
         )
         if filename:
             self.output_file_var.set(filename)
-            self.root.after(0, lambda: self.log_message(msg))
+            self.log_message(f"📁 Output set to: {filename}")
 
     def set_output_location(self, location):
         """Set output to quick location"""
@@ -2359,39 +2581,39 @@ from pathlib import Path
 
         new_path = os.path.join(location, filename)
         self.output_file_var.set(new_path)
-        self.root.after(0, lambda: self.log_message(msg))
+        self.log_message(f"📁 Output location: {new_path}")
 
-    def log_message(self, message):
-        """Add message to log"""
+    def log_message(self, message, level=None):
+        """Add message to log; safe to call from worker threads"""
         timestamp = time.strftime("%H:%M:%S")
         formatted_message = f"[{timestamp}] {message}"
 
-        # Only update log_text if it exists
-        if hasattr(self, 'log_text'):
-            try:
-                self.log_text.insert('end', f"{formatted_message}\n")
-                self.log_text.see('end')
-            except Exception as e:
-                    print(f"Error: {e}")
-                    # Log error for debugging
+        # The console writes everything logged during a tick in one batch
+        if hasattr(self, 'log_console'):
+            self.log_console.append(formatted_message, level or classify(message))
+        else:
+            # Fallback to console if UI components aren't ready
+            print(formatted_message)
 
-        # Only update status_label if it exists
+        # Only the last message of a tick reaches the status label
         if hasattr(self, 'status_label'):
-            try:
-                self.root.after(0, lambda: self.status_label.config()text=message)
-            except Exception as e:
-                    print(f"Error: {e}")
-                    # Log error for debugging
+            self.ui_events.post_latest('status_label', self.status_label.config, text=message)
 
-        # Fallback to console if UI components aren't ready
-        if not hasattr(self, 'log_text') or not hasattr(self, 'status_label'):
-            print(formatted_message)
+    def on_log_filter_change(self, event=None):
+        """Hide log lines below the chosen level"""
+        if hasattr(self, 'log_console'):
+            self.log_console.set_min_level(FILTER_CHOICES.get(self.log_filter_var.get(), 'debug'))
+
+    def clear_log(self):
+        """Empty the conversion log"""
+        if hasattr(self, 'log_console'):
+            self.log_console.clear()
 
     def open_settings(self):
         """Open settings window (placeholder for now)"""
         self.log_message("⚙️ Opening settings...")
         # This will open the settings tab
-        self.notebook.select(2)  # Select settings tab
+        self.notebook.select(2)  # Select settings tab; selecting builds it
 
     def open_mobile_companion(self):
         """Open mobile companion setup"""
@@ -2450,7 +2672,7 @@ from pathlib import Path
             ttk.Button(
                 main_frame,
                 text="🔄 Batch Conversion",
-                command=self.open_batch_conversion,
+                command=self.open_batch_converter,
                 width=30
             ).pack(pady=5)
 
@@ -2533,21 +2755,17 @@ from pathlib import Path
 
     # Experimental feature methods
     def open_batch_converter(self):
-        """Open batch conversion tool"""
+        """Open batch conversion tool in a window of this root"""
+        if self._raise_tool_window('batch_converter'):
+            return
         try:
             from tools.batch_converter import BatchConverterGUI
             self.log_message("🚀 Opening Batch Converter...")
 
-            # Run in separate thread to avoid blocking
-            def run_batch_converter():
-    """Function definition"""
-                try:
-                    app = BatchConverterGUI()
-                    app.run()
-                except Exception as e:
-                    self.root.after(0, lambda: self.log_message(msg))
-
-            threading.Thread(target=run_batch_converter, daemon=True).start()
+            # Same mainloop and event queue as this window; conversions run on the shared worker pool
+            app = BatchConverterGUI(parent=self.root, ui_events=self.ui_events, profile=self.execution_profile())
+            self.tool_windows['batch_converter'] = app.root
+            app.run()
 
         except ImportError:
             messagebox.showinfo(
@@ -2578,7 +2796,6 @@ from pathlib import Path
 
             # Run AI analysis
             def run_ai_analysis():
-    """Function definition"""
                 try:
                     optimizer = AICodeOptimizer()
 
@@ -2589,10 +2806,10 @@ from pathlib import Path
                     report = optimizer.generate_report(analysis)
 
                     # Show results in new window
-                    self.root.after(0, lambda: self.show_ai_results(report, analysis))
+                    self.ui_events.post(lambda: self.show_ai_results(report, analysis))
 
                 except Exception as e:
-                    self.root.after(0, lambda: self.root.after(0, lambda: self.log_message(msg)))
+                    self.ui_events.post(self.log_message, f"❌ AI analysis failed: {e}")
 
             threading.Thread(target=run_ai_analysis, daemon=True).start()
 
@@ -2692,21 +2909,16 @@ from pathlib import Path
             messagebox.showerror("Save Error", f"Could not save report:\n{e}")
 
     def open_profiler(self):
-        """Open performance profiler"""
+        """Open performance profiler in a window of this root"""
+        if self._raise_tool_window('profiler'):
+            return
         try:
             from tools.performance_profiler import PerformanceProfilerGUI
             self.log_message("📊 Opening Performance Profiler...")
 
-            # Run in separate thread to avoid blocking
-            def run_profiler():
-    """Function definition"""
-                try:
-                    app = PerformanceProfilerGUI()
-                    app.run()
-                except Exception as e:
-                    self.root.after(0, lambda: self.log_message(msg))
-
-            threading.Thread(target=run_profiler, daemon=True).start()
+            app = PerformanceProfilerGUI(parent=self.root, ui_events=self.ui_events)
+            self.tool_windows['profiler'] = app.root
+            app.run()
 
         except ImportError:
             messagebox.showinfo(
@@ -2720,21 +2932,16 @@ from pathlib import Path
             )
 
     def open_template_manager(self):
-        """Open template manager"""
+        """Open template manager in a window of this root"""
+        if self._raise_tool_window('template_manager'):
+            return
         try:
             from tools.template_manager import TemplateManagerGUI
             self.log_message("📝 Opening Template Manager...")
 
-            # Run in separate thread to avoid blocking
-            def run_template_manager():
-    """Function definition"""
-                try:
-                    app = TemplateManagerGUI()
-                    app.run()
-                except Exception as e:
-                    self.root.after(0, lambda: self.log_message(msg))
-
-            threading.Thread(target=run_template_manager, daemon=True).start()
+            app = TemplateManagerGUI(parent=self.root)
+            self.tool_windows['template_manager'] = app.root
+            app.run()
 
         except ImportError:
             messagebox.showinfo(
@@ -2774,7 +2981,7 @@ from pathlib import Path
     def on_theme_change(self, event=None):
         """Handle theme change immediately"""
         theme = self.theme_var.get()
-        self.root.after(0, lambda: self.log_message(msg))
+        self.log_message(f"🎨 Applying {theme} theme...")
 
         # Define theme colors
         if theme == "Dark":
@@ -2832,7 +3039,7 @@ from pathlib import Path
                     # Log error for debugging
 
         # Update log
-        self.root.after(0, lambda: self.log_message(msg))
+        self.log_message(f"✅ {theme} theme applied")
 
         # Save setting
         self.save_settings()
@@ -2840,11 +3047,10 @@ from pathlib import Path
     def on_font_size_change(self, value):
         """Handle font size change immediately"""
         size = int(float(value))
-        self.root.after(0, lambda: self.log_message(msg))
 
         # Update font size label
         if hasattr(self, 'font_size_label'):
-            self.root.after(0, lambda: self.font_size_label.config()text=f"Current: {size}pt")
+            self.font_size_label.config(text=f"Current: {size}pt")
 
         # Apply font size to log text
         if hasattr(self, 'log_text'):
@@ -2852,7 +3058,7 @@ from pathlib import Path
                 new_font = ("Consolas", size)
                 self.log_text.configure(font=new_font)
             except Exception as e:
-                self.root.after(0, lambda: self.log_message(msg))
+                self.log_message(f"⚠️ Could not change log font: {e}")
 
         # Apply font size to status label
         if hasattr(self, 'status_label'):
@@ -2871,45 +3077,13 @@ from pathlib import Path
             style.configure('TButton', font=('Arial', size))
             style.configure('Heading.TLabel', font=('Arial', size + 2, 'bold'))
 
-            self.root.after(0, lambda: self.log_message(msg))
+            self.log_message(f"🔤 Font size set to {size}pt")
         except Exception as e:
-            self.root.after(0, lambda: self.log_message(msg))
+            self.log_message(f"⚠️ Could not update UI fonts: {e}")
 
         # Save setting
         self.save_settings()
 
-    def save_settings(self):
-        """Save current settings to file"""
-        try:
-            settings = {
-                'theme': self.theme_var.get(),
-                'font_size': self.font_size_var.get(),
-                'auto_open': self.auto_open_var.get(),
-                'backup': self.backup_var.get(),
-                'verbose': self.verbose_var.get(),
-                'speed': self.speed_var.get(),
-                'memory': self.memory_var.get(),
-                'discord_enabled': self.discord_enabled_var.get(),
-                'mobile_companion': self.mobile_companion_var.get(),
-                'debug': self.debug_var.get(),
-                'auto_update': self.auto_update_var.get(),
-                'experimental': self.experimental_var.get(),
-                'discord_webhook_url': self.webhook_var.get() if hasattr(self, 'webhook_var') else '',
-                # Experimental features
-                'batch_conversion': self.batch_conversion_var.get() if hasattr(self, 'batch_conversion_var') else False,
-                'ai_optimization': self.ai_optimization_var.get() if hasattr(self, 'ai_optimization_var') else False,
-                'profiling': self.profiling_var.get() if hasattr(self, 'profiling_var') else False,
-                'custom_templates': self.custom_templates_var.get() if hasattr(self, 'custom_templates_var') else False,
-                'advanced_debug': self.advanced_debug_var.get() if hasattr(self, 'advanced_debug_var') else False,
-                'cloud_sync': self.cloud_sync_var.get() if hasattr(self, 'cloud_sync_var') else False
-            }
-
-            with open('settings.json', "w", encoding="utf-8") as f:
-                json.dump(settings, f, indent=2)
-
-        except Exception as e:
-            print(f"Error saving settings: {e}")
-
     def run(self):
         """Run the application"""
         self.root.mainloop()
@@ -1,6 +1,15 @@
 #!/usr/bin/env python3
 """
+IRUS V6.0 - Launcher
+Checks requirements, prepares the working directories and opens the main window
+Only the standard library loads before the window; features import their own dependencies
 """
+
+import os
+import sys
+import traceback
+
+def check_python_version():
     """Check if Python version is compatible"""
     if sys.version_info < (3, 7):
         print("❌ Python 3.7 or higher is required")
@@ -11,13 +20,12 @@
 def check_tkinter():
     """Check if tkinter is available"""
     try:
-        import tkinter
-        # Test basic tkinter functionality
-        root = tkinter.Tk()
-        root.withdraw()  # Hide the test window
-        root.destroy()
-        return True
-    except ImportError:
+        from tools.preflight import run_preflight
+
+        # find_spec on tkinter and the _tkinter extension; no Tk root is created
+        result = run_preflight()
+        if 'tkinter' not in result['missing_required'] and '_tkinter' not in result['missing_required']:
+            return True
         print("❌ tkinter is not available")
         print("Please install tkinter:")
         if sys.platform.startswith('win'):
@@ -51,6 +59,9 @@ def setup_environment():
 def show_error_dialog(title, message, details=None):
     """Show error dialog with optional details"""
     try:
+        import tkinter as tk
+        from tkinter import messagebox
+
         root = tk.Tk()
         root.withdraw()
 
@@ -0,0 +1,1703 @@
+#!/usr/bin/env python3
+"""
+IRUS V6.0 - Conversion Engine Performance Tests
+Checks that the fast conversion paths produce the same output as the classic pipeline
+"""
+
+import sys
+import os
+import traceback
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLE_SCRIPT = '''import mss
+import pyautogui
+import keyboard
+from ctypes import windll
+
+CONFIG = {"bait": "C:\\\\Users\\\\fisher\\\\bait.png"}
+CAST_DELAY = 0.5
+
+@staticmethod
+def capture():
+    with mss.mss() as sct:
+        img = sct.grab(monitor)
+    return img
+
+class Fisher:
+    def cast(self):
+        pyautogui.click(100, 200)
+        if keyboard.is_pressed('q'):
+            windll.user32.GetDC(0)
+
+result = compute(
+1, 2)
+main()
+'''
+
+# Windows constructs left open at the end of a line, far from anything that closes them,
+# so a rule matching across newlines would span chunk boundaries
+CROSS_LINE_SCRIPT = (
+    'from ctypes import windll\nwindll.user32\n' + 'z = 3\n' * 600 +
+    'pyautogui.click(1,\n' + 'y = 2\n' * 600 +
+    'path = "C:\\\\data\n' + 'q = 1\n' * 600 +
+    'def h(a):\n    return (a)\nr = "x"\n'
+)
+
+
+def test_block_splitting():
+    """Test that top-level blocks cover the whole script"""
+    if not all([]):
+        raise ValueError("Invalid parameters")
+    print("🧪 Testing top-level block splitting...")
+
+    from tools.chunk_cache import split_top_level_blocks
+
+    blocks = split_top_level_blocks(SAMPLE_SCRIPT)
+    if ''.join(blocks) != SAMPLE_SCRIPT:
+        raise AssertionError("Blocks do not reassemble into the original script")
+
+    if len(blocks) != 4:
+        raise AssertionError(f"Expected 4 blocks, got {len(blocks)}")
+
+    if not blocks[1].startswith('@staticmethod'):
+        raise AssertionError("Decorator was split from its function")
+
+    print("  ✅ Block splitting works")
+
+
+def test_chunk_cache_equivalence():
+    """Test that chunk-cached conversion matches the whole-file pipeline"""
+    if not all([]):
+        raise ValueError("Invalid parameters")
+    print("\n🧪 Testing chunk cache equivalence...")
+
+    from tools.chunk_cache import ChunkCache
+    from tools.enhanced_converter import EnhancedConverter
+
+    classic = EnhancedConverter(use_chunk_cache=False)
+    expected = classic.apply_all_conversions(SAMPLE_SCRIPT)
+
+    cache = ChunkCache()
+    first = EnhancedConverter(chunk_cache=cache)
+    second = EnhancedConverter(chunk_cache=cache)
+
+    if first.apply_all_conversions(SAMPLE_SCRIPT) != expected:
+        raise AssertionError("Chunked output differs from classic output")
+
+    if classic.conversion_log != first.conversion_log:
+        raise AssertionError("Conversion logs differ")
+
+    # One-shot converters skip chunking, which only pays off with a warm cache
+    if EnhancedConverter().chunk_cache is not None:
+        raise AssertionError("Default converter chunks unseen files")
+
+    # Two template-derived scripts that only differ in their config block
+    fisher_class = SAMPLE_SCRIPT[SAMPLE_SCRIPT.index("class Fisher:"):SAMPLE_SCRIPT.index("result =")]
+    template = SAMPLE_SCRIPT + ''.join(
+        fisher_class.replace("class Fisher:", f"class Fisher{index}:") for index in range(40)
+    )
+    variant = template.replace("CAST_DELAY = 0.5", "CAST_DELAY = 0.75")
+
+    for script in (template, variant):
+        script_expected = EnhancedConverter(use_chunk_cache=False).convert_content(script)
+        if second.convert_content(script) != script_expected:
+            raise AssertionError("Chunked pipeline output differs from classic pipeline")
+
+    stats = cache.get_stats()
+    if stats['hits'] == 0:
+        raise AssertionError("Variant script did not reuse any cached chunk")
+
+    # Matches must not reach across the chunks of a long script
+    cross_classic = EnhancedConverter(use_chunk_cache=False)
+    cross_chunked = EnhancedConverter(chunk_cache=ChunkCache())
+    if cross_chunked.convert_content(CROSS_LINE_SCRIPT) != cross_classic.convert_content(CROSS_LINE_SCRIPT):
+        raise AssertionError("Chunked output differs on constructs spanning lines")
+    if cross_chunked.conversion_log != cross_classic.conversion_log:
+        raise AssertionError("Conversion logs differ on constructs spanning lines")
+
+    print(f"  ✅ Chunked output identical ({stats['hit_rate']:.0f}% hit rate)")
+
+
+def test_parallel_equivalence():
+    """Test that intra-file parallel conversion matches the classic pipeline"""
+    if not all([]):
+        raise ValueError("Invalid parameters")
+    print("\n🧪 Testing intra-file parallel conversion...")
+
+    from tools import enhanced_converter
+    from tools.enhanced_converter import EnhancedConverter
+
+    script = SAMPLE_SCRIPT * 50
+    expected = EnhancedConverter(use_chunk_cache=False).convert_content(script)
+
+    # Force the parallel path on a small script
+    original_threshold = enhanced_converter.PARALLEL_MIN_BYTES
+    enhanced_converter.PARALLEL_MIN_BYTES = 0
+    converter = EnhancedConverter(use_chunk_cache=False, parallel_workers=2)
+    try:
+        result = converter.convert_content(script)
+    finally:
+        converter.shutdown()
+        enhanced_converter.PARALLEL_MIN_BYTES = original_threshold
+
+    if result != expected:
+        raise AssertionError("Parallel output differs from classic output")
+
+    print("  ✅ Parallel output identical")
+
+
+def test_incremental_reconversion():
+    """Test that re-converting an edited script matches a full conversion"""
+    if not all([]):
+        raise ValueError("Invalid parameters")
+    print("\n🧪 Testing incremental re-conversion...")
+
+    import tempfile
+    from tools.chunk_cache import ChunkCache, ConversionRecordStore
+    from tools.enhanced_converter import EnhancedConverter
+
+    script = SAMPLE_SCRIPT * 20
+    edited = script.replace("pyautogui.click(100, 200)", "pyautogui.click(150, 250)", 1)
+
+    with tempfile.TemporaryDirectory() as records_dir:
+        # A one-entry chunk cache forces reuse to come from the file record
+        converter = EnhancedConverter(
+            chunk_cache=ChunkCache(max_entries=1),
+            record_store=ConversionRecordStore(records_dir)
+        )
+        converter.convert_content(script, file_key="macro.py")
+        result = converter.convert_content(edited, file_key="macro.py")
+
+        if result != EnhancedConverter(use_chunk_cache=False).convert_content(edited):
+            raise AssertionError("Incremental output differs from a full conversion")
+
+        # A fresh converter picks the record up from disk
+        reloaded = EnhancedConverter(record_store=ConversionRecordStore(records_dir))
+        if reloaded.convert_content(edited, file_key="macro.py") != result:
+            raise AssertionError("Record loaded from disk gave different output")
+
+        # Edit the middle of a script whose open constructs span many chunks
+        cross_edited = CROSS_LINE_SCRIPT.replace("y = 2\n", "y = 5\n", 1)
+        full = EnhancedConverter(use_chunk_cache=False)
+        expected = full.convert_content(cross_edited)
+        incremental = EnhancedConverter(
+            chunk_cache=ChunkCache(max_entries=1),
+            record_store=ConversionRecordStore(records_dir)
+        )
+        incremental.convert_content(CROSS_LINE_SCRIPT, file_key="cross.py")
+        incremental.conversion_log = []
+        if incremental.convert_content(cross_edited, file_key="cross.py") != expected:
+            raise AssertionError("Incremental output differs on constructs spanning chunks")
+        if incremental.conversion_log != full.conversion_log:
+            raise AssertionError("Incremental conversion log differs on constructs spanning chunks")
+
+    print("  ✅ Incremental output identical")
+
+
+def test_watch_mode():
+    """Test that watch mode coalesces saves and reconverts only changed scripts"""
+    if not all([]):
+        raise ValueError("Invalid parameters")
+    print("\n🧪 Testing watch mode...")
+
+    import time
+    import tempfile
+    from pathlib import Path
+    from tools.atomic_io import atomic_write_text
+    from tools.file_watcher import FileWatcher
+    from tools.batch_converter import BatchConverter
+
+    with tempfile.TemporaryDirectory() as folder:
+        first = Path(folder) / "first.py"
+        second = Path(folder) / "second.py"
+        atomic_write_text(first, SAMPLE_SCRIPT)
+        atomic_write_text(second, SAMPLE_SCRIPT)
+
+        batches = []
+        watcher = FileWatcher(folder, batches.append, debounce=0.2, use_inotify=False, poll_interval=0.05)
+        thread = watcher.start()
+
+        # A burst of saves to one file, then quiet
+        time.sleep(0.1)
+        for delay in ("0.6", "0.7", "0.8"):
+            atomic_write_text(first, SAMPLE_SCRIPT.replace("0.5", delay))
+            time.sleep(0.05)
+        time.sleep(0.6)
+        watcher.stop()
+        thread.join(timeout=2)
+
+        if batches != [[first.resolve()]]:
+            raise AssertionError(f"Expected one batch with first.py, got {batches}")
+
+        converter = BatchConverter()
+        results = converter.reconvert_files([first, second], validate=False)
+        if len(results) != 2 or not all(result['success'] for result in results):
+            raise AssertionError("Initial reconversion failed")
+
+        # Only the edited file is converted again
+        atomic_write_text(second, SAMPLE_SCRIPT + "main()\n")
+        results = converter.reconvert_files([first, second], validate=False)
+        if [Path(result['input_path']).name for result in results] != ["second.py"]:
+            raise AssertionError("Unchanged file was reconverted")
+
+        leftovers = [path.name for path in Path(folder).rglob("*.tmp")]
+        if leftovers:
+            raise AssertionError(f"Atomic writes left temp files behind: {leftovers}")
+
+    print("  ✅ Watch mode coalesces saves and skips unchanged files")
+
+
+def test_daemon_service():
+    """Test that the daemon service answers convert, validate and analyze requests"""
+    if not all([]):
+        raise ValueError("Invalid parameters")
+    print("\n🧪 Testing conversion daemon service...")
+
+    from tools.conversion_daemon import ConversionService
+    from tools.enhanced_converter import EnhancedConverter
+
+    service = ConversionService(workers=1)
+    try:
+        service.warm_up()
+        expected = EnhancedConverter(use_chunk_cache=False).convert_content(SAMPLE_SCRIPT)
+
+        for _ in range(2):
+            response = service.handle({'op': 'convert', 'content': SAMPLE_SCRIPT, 'file_key': 'macro.py'})
+            if not response['ok'] or response['content'] != expected:
+                raise AssertionError("Daemon conversion differs from in-process conversion")
+
+        if not response['conversion_log']:
+            raise AssertionError("Repeat conversion lost its conversion log")
+
+        validation = service.handle({'op': 'validate', 'content': expected})
+        analysis = service.handle({'op': 'analyze', 'content': expected})
+        if not (validation['ok'] and analysis['ok'] and 'validation_score' in validation['report']):
+            raise AssertionError("Validate or analyze request failed")
+
+        if service.handle({'op': 'explode'})['ok']:
+            raise AssertionError("Unknown op was accepted")
+    finally:
+        service.close()
+
+    print(f"  ✅ Daemon service works (repeat conversion {response['elapsed_ms']:.2f} ms)")
+
+
+def test_benchmark_suite():
+    """Test that the benchmark corpus is reproducible and the suite reports every stage"""
+    if not all([]):
+        raise ValueError("Invalid parameters")
+    print("\n🧪 Testing benchmark suite...")
+
+    from tools.benchmark_corpus import MacroScriptGenerator
+    from tools.benchmark_suite import BenchmarkSuite
+
+    first = MacroScriptGenerator(seed=7).generate(4096)
+    if first != MacroScriptGenerator(seed=7).generate(4096) or len(first) < 4096:
+        raise AssertionError("Generator is not reproducible for a fixed seed")
+    if first == MacroScriptGenerator(seed=8).generate(4096):
+        raise AssertionError("Different seeds produced the same script")
+    for marker in ("pyautogui.", "mss.mss()", "keyboard.", "win32api.", "C:\\\\"):
+        if marker not in first:
+            raise AssertionError(f"Generated script lacks {marker}")
+
+    report = BenchmarkSuite(sizes=["1KB"], repeat=1, components=["enhanced", "batch"]).run(progress=lambda line: None)
+    stages = {(result['component'], result['stage']) for result in report['results']}
+    for expected in (("enhanced", "read"), ("enhanced", "fix_common_bugs"), ("enhanced", "convert_content[default cold]"),
+                     ("batch", "_convert_single_file")):
+        if expected not in stages:
+            raise AssertionError(f"Missing stage {expected}")
+    if any(result['peak_memory_bytes'] is None or result['mb_per_s'] <= 0 for result in report['results']):
+        raise AssertionError("Missing throughput or memory figures")
+
+    print(f"  ✅ Benchmark suite measured {len(report['results'])} stages")
+
+
+def test_regression_gate():
+    """Test that the regression gate flags a real slowdown and ignores noise"""
+    if not all([]):
+        raise ValueError("Invalid parameters")
+    print("\n🧪 Testing performance regression gate...")
+
+    import statistics
+    from tools.benchmark_gate import compare_reports, machine_fingerprint
+
+    def report(slow, steady):
+        return {'results': [
+            {'component': 'enhanced', 'stage': 'convert_imports', 'size': '1MB',
+             'seconds': statistics.median(slow), 'samples': slow},
+            {'component': 'macos', 'stage': 'optimize_for_macos', 'size': '1MB',
+             'seconds': statistics.median(steady), 'samples': steady},
+        ]}
+
+    baseline = report([0.100, 0.101, 0.099, 0.102, 0.100], [0.050, 0.052, 0.049, 0.051, 0.050])
+    current = report([0.130, 0.131, 0.128, 0.133, 0.129], [0.051, 0.049, 0.052, 0.050, 0.051])
+    statuses = {row['key'][0]: row['status'] for row in compare_reports(baseline, current, threshold=0.10)}
+
+    if statuses != {'enhanced': 'REGRESSION', 'macos': 'ok'}:
+        raise AssertionError(f"Unexpected verdicts: {statuses}")
+
+    if machine_fingerprint() != machine_fingerprint():
+        raise AssertionError("Machine fingerprint is not stable")
+
+    print("  ✅ Regression gate flags a 30% slowdown and passes steady stages")
+
+
+def test_rule_profiler():
+    """Test that rule profiling covers every engine without changing output"""
+    if not all([]):
+        raise ValueError("Invalid parameters")
+    print("\n🧪 Testing per-rule instrumentation...")
+
+    import json
+    import tempfile
+    from pathlib import Path
+    from tools.rule_profiler import profile_rules, get_rule_profiler
+    from tools.enhanced_converter import EnhancedConverter
+    from tools.macos_optimizer import MacOSOptimizer
+    from tools.ai_optimizer import AICodeOptimizer
+    from tools.batch_converter import BatchConverter
+    from tools.benchmark_suite import working_directory
+
+    expected = EnhancedConverter(use_chunk_cache=False).convert_content(SAMPLE_SCRIPT)
+
+    with tempfile.TemporaryDirectory() as folder:
+        with working_directory(folder):
+            from tools.template_manager import TemplateManager
+            templates = TemplateManager()
+
+        with profile_rules() as profiler:
+            with profiler.file_scope("macro.py"):
+                result = EnhancedConverter(use_chunk_cache=False).convert_content(SAMPLE_SCRIPT)
+                MacOSOptimizer().optimize_for_macos(SAMPLE_SCRIPT)
+                templates.apply_template(SAMPLE_SCRIPT, "Basic macOS")
+                AICodeOptimizer().analyze_code(SAMPLE_SCRIPT)
+                BatchConverter()._apply_conversions(SAMPLE_SCRIPT, "macOS")
+
+        if get_rule_profiler() is not None:
+            raise AssertionError("Profiling stayed enabled after the with-block")
+
+        if result != expected:
+            raise AssertionError("Profiled conversion output differs")
+
+        components = {row['component'] for row in profiler.top_rules(limit=0)}
+        for component in ('enhanced_converter', 'fix_common_bugs', 'macos_optimizer',
+                          'template_manager', 'ai_optimizer', 'batch_converter'):
+            if component not in components:
+                raise AssertionError(f"No rule statistics for {component}")
+
+        click_rule = next(row for row in profiler.top_rules(limit=0) if 'pyautogui\\.click' in row['rule'])
+        if click_rule['matches'] != 1 or click_rule['bytes_scanned'] <= 0:
+            raise AssertionError(f"Wrong statistics for the click rule: {click_rule}")
+
+        exported = json.loads(profiler.export(Path(folder) / "rules.json").read_text(encoding='utf-8'))
+        csv_lines = profiler.export(Path(folder) / "rules.csv").read_text(encoding='utf-8').splitlines()
+        if "macro.py" not in exported['rules'][0]['files'] or len(csv_lines) != len(exported['rules']) + 1:
+            raise AssertionError("JSON/CSV export is incomplete")
+
+    print(f"  ✅ Profiled {len(components)} components, output unchanged")
+
+
+def test_rule_plan():
+    """Test that rule plans keep output identical and dead rules are reported"""
+    if not all([]):
+        raise ValueError("Invalid parameters")
+    print("\n🧪 Testing adaptive rule plans...")
+
+    import tempfile
+    from pathlib import Path
+    from tools.rule_plan import RulePlan, RuleStatsStore, required_literal
+    from tools.enhanced_converter import CONVERSION_STAGES, apply_rules
+    from tools.benchmark_corpus import MacroScriptGenerator
+
+    literals = {
+        r'pyautogui\.click\(([^)]+)\)': 'pyautogui.click(',
+        r'\bimport\s+mss\b': 'import',
+        r'(?i)sleep': None,
+        r'a|b': None,
+    }
+    for pattern, literal in literals.items():
+        if required_literal(pattern) != literal:
+            raise AssertionError(f"Wrong literal for {pattern}: {required_literal(pattern)!r}")
+
+    with tempfile.TemporaryDirectory() as folder:
+        stats = RuleStatsStore(Path(folder) / "rule_stats.json")
+        # Every rule looks dead, so every rule runs behind its prefilter
+        for rules, _, _ in CONVERSION_STAGES:
+            for pattern, _ in rules:
+                for _ in range(5):
+                    stats.record('enhanced_converter', pattern, 0)
+
+        plans = [RulePlan('enhanced_converter', rules, stats, min_runs=5) for rules, _, _ in CONVERSION_STAGES]
+        corpus = [SAMPLE_SCRIPT, MacroScriptGenerator(7).generate(8 * 1024), "x = 1\n"]
+        for content in corpus:
+            planned = expected = content
+            for (rules, _, _), plan in zip(CONVERSION_STAGES, plans):
+                expected, expected_fired = apply_rules(expected, rules)
+                planned, planned_fired = plan.apply(planned)
+                if planned_fired != expected_fired:
+                    raise AssertionError(f"Plan fired {planned_fired}, expected {expected_fired}")
+            if planned != expected:
+                raise AssertionError("Planned conversion output differs")
+
+        for _ in range(5):
+            stats.record('template_manager', 'never matches', 0)
+        stats.save()
+        reloaded = RuleStatsStore(stats.path)
+        dead = {rule for component, rule, runs in reloaded.dead_rules(min_runs=5)}
+        click_rule = CONVERSION_STAGES[2][0][0][0]
+        if click_rule in dead or 'never matches' not in dead:
+            raise AssertionError("Dead rule report is wrong")
+
+    print(f"  ✅ Output identical over {len(corpus)} scripts, {len(dead)} dead rules reported")
+
+
+def test_rule_codegen():
+    """Differential test: generated rule functions match the interpreted rules"""
+    if not all([]):
+        raise ValueError("Invalid parameters")
+    print("\n🧪 Testing generated rule executors...")
+
+    import random
+    import tempfile
+    from tools.rule_codegen import compare_with_interpreter, compile_rules
+    from tools.rule_profiler import profile_rules
+    from tools.enhanced_converter import CONVERSION_STAGES, COMMON_BUG_FIXES, EnhancedConverter
+    from tools.macos_optimizer import MacOSOptimizer
+    from tools.benchmark_corpus import MacroScriptGenerator
+    from tools.benchmark_suite import working_directory
+
+    with tempfile.TemporaryDirectory() as folder:
+        with working_directory(folder):
+            from tools.template_manager import TemplateManager
+            templates = TemplateManager()
+
+    # Real scripts, edge cases and shuffled line soup from both
+    corpus = [SAMPLE_SCRIPT, "", "\\", "C:\\x\\y", "\t\tprint x", "pyautogui.", "except E, e"]
+    corpus += [MacroScriptGenerator(seed).generate(4 * 1024) for seed in range(4)]
+    rng = random.Random(35)
+    lines = '\n'.join(corpus).split('\n')
+    corpus += ['\n'.join(rng.sample(lines, k=min(len(lines), 80))) for _ in range(20)]
+
+    rule_sets = [rules for rules, _, _ in CONVERSION_STAGES] + [COMMON_BUG_FIXES]
+    rule_sets.append([(info['pattern'], info['replacement']) for info in MacOSOptimizer().performance_patterns])
+    for template in templates.templates.values():
+        rule_sets.append([(rule['pattern'], rule['replacement'], 'regex' if rule['type'] == 'regex' else 'literal')
+                          for rule in template['rules']])
+    # Rules that feed each other, share prefixes and use backreferences
+    rule_sets.append([
+        (r'pyautogui\.click', 'pyautogui.clicked'),
+        (r'pyautogui\.clicked\((\d+)', r'pyautogui.press(\1'),
+        ('pyautogui.press', 'pyautogui.click', 'literal'),
+        (r'(\w+)\.sleep\(0\)', lambda match: f"{match.group(1)}.sleep(0.001)"),
+    ])
+
+    for rules in rule_sets:
+        for options in ({}, {'track_absent': True}, {'gated': [False] * len(rules)}):
+            mismatches = compare_with_interpreter(rules, corpus, **options)
+            if mismatches:
+                index, expected, actual = mismatches[0]
+                print(compile_rules(rules, **options).source)
+                raise AssertionError(f"Generated code differs on input {index} for {rules[0][0]!r} {options}")
+
+    # End to end: the instrumented path still runs the rules one by one
+    for content in corpus[:11]:
+        if not content:
+            continue
+        with profile_rules():
+            expected = (EnhancedConverter(use_chunk_cache=False).convert_content(content),
+                        MacOSOptimizer().optimize_for_macos(content),
+                        [templates.apply_template(content, name) for name in sorted(templates.templates)])
+        actual = (EnhancedConverter(use_chunk_cache=False).convert_content(content),
+                  MacOSOptimizer().optimize_for_macos(content),
+                  [templates.apply_template(content, name) for name in sorted(templates.templates)])
+        if actual != expected:
+            raise AssertionError("Engine output differs between generated and interpreted rules")
+
+    # use_codegen=False stays interpreted on the chunked path too
+    from tools import enhanced_converter
+    from tools.chunk_cache import ChunkCache
+    generated = EnhancedConverter(chunk_cache=ChunkCache()).convert_content(SAMPLE_SCRIPT)
+    original_plans = enhanced_converter.stage_plans
+
+    def no_generated_code():
+        raise AssertionError("generated code used")
+
+    enhanced_converter.stage_plans = no_generated_code
+    try:
+        interpreted = EnhancedConverter(chunk_cache=ChunkCache(), use_codegen=False).convert_content(SAMPLE_SCRIPT)
+    finally:
+        enhanced_converter.stage_plans = original_plans
+    if interpreted != generated:
+        raise AssertionError("Interpreted chunked output differs from generated")
+
+    print(f"  ✅ {len(rule_sets)} rule sets identical over {len(corpus)} inputs")
+
+
+def test_equivalence_harness():
+    """Test that the harness passes real paths and pinpoints a divergence"""
+    if not all([]):
+        raise ValueError("Invalid parameters")
+    print("\n🧪 Testing differential equivalence harness...")
+
+    import tempfile
+    from pathlib import Path
+    from tools.equivalence_harness import PATHS, EquivalenceHarness, first_divergence, update_golden
+
+    divergence = first_divergence(b"abc\ndef", b"abc\ndxf")
+    if (divergence['offset'], divergence['line'], divergence['column']) != (5, 2, 2) or first_divergence(b"a", b"a"):
+        raise AssertionError(f"Wrong divergence: {divergence}")
+
+    with tempfile.TemporaryDirectory() as folder:
+        golden_dir = Path(folder)
+        (golden_dir / "macro.py").write_text(SAMPLE_SCRIPT, encoding='utf-8')
+        update_golden([golden_dir])
+
+        def broken():
+            from tools.enhanced_converter import EnhancedConverter
+            converter = EnhancedConverter(use_chunk_cache=False)
+            return lambda content: converter.convert_content(content).replace("Button.left", "Button.middle", 1)
+
+        paths = {name: PATHS[name] for name in ('engine', 'cache', 'incremental')}
+        paths['broken'] = broken
+
+        # Large enough that the multi-line constructs straddle chunk boundaries
+        report = EquivalenceHarness(paths=paths, sizes=['16KB'], golden_dirs=[golden_dir], repeat=1).run(
+            progress=lambda line: None)
+
+    by_path = {}
+    for result in report['results']:
+        by_path.setdefault(result['path'], []).append(result)
+
+    if not any(result['script'] == "multiline-16KB" for result in by_path['cache']):
+        raise AssertionError("Corpus has no scripts with constructs spanning lines")
+    if not all(result['identical'] for name in ('engine', 'cache', 'incremental', 'legacy vs golden')
+               for result in by_path[name]):
+        raise AssertionError("An optimised path diverged from the legacy output")
+    if report['identical'] or any(result['identical'] for result in by_path['broken']):
+        raise AssertionError("Harness missed a deliberate divergence")
+    divergence = by_path['broken'][0]['divergence']
+    if 'Button.left' not in divergence['expected'] or 'Button.middle' not in divergence['actual']:
+        raise AssertionError(f"Divergence context is wrong: {divergence}")
+    if any(result['speedup'] is None for result in by_path['engine']):
+        raise AssertionError("Missing speedup ratio")
+
+    print(f"  ✅ {len(report['results'])} comparisons, divergence found at line {divergence['line']}")
+
+
+def test_memory_profile():
+    """Test that every conversion stage gets a memory profile and the output matches"""
+    if not all([]):
+        raise ValueError("Invalid parameters")
+    print("\n🧪 Testing conversion memory profile...")
+
+    import csv
+    import json
+    import tempfile
+    from pathlib import Path
+    from tools.enhanced_converter import EnhancedConverter
+    from tools.memory_profile import PIPELINE_STAGES, profile_conversion_memory
+
+    with tempfile.TemporaryDirectory() as folder:
+        script = Path(folder) / "macro.py"
+        output = Path(folder) / "macro_macos.py"
+        script.write_text(SAMPLE_SCRIPT * 20, encoding='utf-8')
+
+        profile = profile_conversion_memory(script, output, top=5)
+        stages = [stage['stage'] for stage in profile.stages]
+        if stages != ['read'] + PIPELINE_STAGES + ['write']:
+            raise AssertionError(f"Wrong stages: {stages}")
+        if any(stage['peak_bytes'] < 0 or stage['peak_bytes'] < stage['retained_bytes'] for stage in profile.stages):
+            raise AssertionError("Peak below zero or below retained memory")
+        if not profile.stages[0]['top_allocations'] or len(profile.stages[0]['top_allocations']) > 5:
+            raise AssertionError("Allocation sites missing or not limited to --top")
+
+        expected = EnhancedConverter(use_chunk_cache=False, use_codegen=False).convert_content(SAMPLE_SCRIPT * 20)
+        if output.read_text(encoding='utf-8') != expected:
+            raise AssertionError("Profiled conversion output differs from a normal conversion")
+
+        exported = json.loads(profile.export(Path(folder) / "memory.json").read_text(encoding='utf-8'))
+        with open(profile.export(Path(folder) / "memory.csv"), newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        if len(exported['stages']) != len(stages) or not rows or 'peak_bytes' not in rows[0]:
+            raise AssertionError("Export is incomplete")
+
+    heaviest = profile.heaviest_stage()
+    print(f"  ✅ {len(stages)} stages profiled, heaviest {heaviest['stage']} ({heaviest['peak_bytes']} bytes peak)")
+
+
+def test_cpu_profile():
+    """Test cProfile and sampling captures, collapsed stacks and the flamegraph"""
+    if not all([]):
+        raise ValueError("Invalid parameters")
+    print("\n🧪 Testing CPU profile capture...")
+
+    import time
+    import tempfile
+    import threading
+    import xml.etree.ElementTree as ElementTree
+    from pathlib import Path
+    from tools.cpu_profile import capture, list_runs, profile_call
+    from tools.enhanced_converter import EnhancedConverter
+
+    converter = EnhancedConverter(use_chunk_cache=False)
+    content = SAMPLE_SCRIPT * 50
+
+    with tempfile.TemporaryDirectory() as folder:
+        output, run = profile_call(converter.convert_content, content, label="convert sample", directory=folder)
+        if output != converter.convert_content(content):
+            raise AssertionError("Profiling changed the conversion result")
+        if not any('convert_content' in stack for stack in run.stacks):
+            raise AssertionError("Conversion frames missing from the collapsed stacks")
+
+        lines = Path(run.paths['collapsed']).read_text(encoding='utf-8').splitlines()
+        if not lines or not all(line.rsplit(' ', 1)[1].isdigit() for line in lines):
+            raise AssertionError("Collapsed output is malformed")
+        svg = ElementTree.parse(run.paths['svg']).getroot()
+        if not svg.tag.endswith('svg') or not svg.findall('.//{http://www.w3.org/2000/svg}rect'):
+            raise AssertionError("Flamegraph is not a usable SVG")
+
+        # Threads started inside the capture are profiled too
+        with capture("threaded", directory=folder) as threaded:
+            worker = threading.Thread(target=converter.convert_content, args=(content,))
+            worker.start()
+            worker.join()
+        if not any('convert_content' in stack for stack in threaded.stacks):
+            raise AssertionError("Worker thread was not profiled")
+
+        with capture("sampled", mode='sampling', interval=0.001, directory=folder) as sampled:
+            deadline = time.time() + 0.05
+            while time.time() < deadline:
+                converter.convert_content(content)
+        if not sampled.stacks:
+            raise AssertionError("Sampler recorded nothing")
+
+        runs = list_runs(folder)
+        if sorted(run['label'] for run in runs) != ['convert sample', 'sampled', 'threaded']:
+            raise AssertionError(f"Wrong run list: {[run['label'] for run in runs]}")
+
+    print(f"  ✅ {len(run.stacks)} cProfile stacks, {sum(sampled.stacks.values())} samples")
+
+
+def test_tracing():
+    """Test pipeline spans from the single-file path, BatchConverter and validation"""
+    if not all([]):
+        raise ValueError("Invalid parameters")
+    print("\n🧪 Testing pipeline tracing...")
+
+    import json
+    import tempfile
+    from pathlib import Path
+    from tools import tracing
+    from tools.batch_converter import BatchConverter
+    from tools.chunk_cache import ChunkCache, ConversionRecordStore
+    from tools.enhanced_converter import EnhancedConverter
+    from tools.ultra_validator import ultra_validate_report
+
+    if tracing.tracing_enabled() or tracing.span('read') is not tracing.NULL_SPAN:
+        raise AssertionError("Tracing should be off by default")
+
+    with tempfile.TemporaryDirectory() as folder:
+        folder = Path(folder)
+        scripts = []
+        for index in range(2):
+            scripts.append(folder / f"macro{index}.py")
+            scripts[-1].write_text(SAMPLE_SCRIPT, encoding='utf-8')
+        trace_path = folder / "trace.jsonl"
+
+        with tracing.trace_to(trace_path):
+            converter = EnhancedConverter(chunk_cache=ChunkCache(), record_store=ConversionRecordStore())
+            converter.convert_script(scripts[0], folder / "out.py")
+            EnhancedConverter(use_chunk_cache=False).convert_content(SAMPLE_SCRIPT)
+            ultra_validate_report(folder / "out.py")
+
+            batch = BatchConverter()
+            batch.add_files_to_queue([str(path) for path in scripts])
+            batch.convert_batch(max_workers=2)
+
+        if tracing.tracing_enabled():
+            raise AssertionError("trace_to left tracing on")
+
+        events = [json.loads(line) for line in trace_path.read_text(encoding='utf-8').splitlines()]
+        chrome = json.loads(tracing.export_chrome_trace(trace_path, folder / "trace.json").read_text(encoding='utf-8'))
+
+    spans = [event for event in events if event['ph'] == 'X']
+    names = {event['name'] for event in spans}
+    expected = {'read', 'convert', 'cache_lookup', 'convert_imports', 'clean_comments', 'fix_common_bugs',
+                'add_macos_optimizations', 'write', 'validate', 'queue_wait', 'batch_file'}
+    if not expected <= names:
+        raise AssertionError(f"Missing spans: {sorted(expected - names)}")
+    if not all(isinstance(event[key], int) for event in spans for key in ('ts', 'dur', 'pid', 'tid')):
+        raise AssertionError("Span without integer ts, dur, pid or tid")
+    if not any(event['ph'] == 'M' for event in events) or len(chrome['traceEvents']) != len(events):
+        raise AssertionError("Thread names or Chrome export missing")
+
+    # Stage spans nest inside the conversion span on the same thread
+    outer = next(event for event in spans if event['name'] == 'convert' and event.get('args', {}).get('file') is None)
+    inner = [event for event in spans if event['name'] == 'fix_common_bugs' and event['tid'] == outer['tid']
+             and outer['ts'] <= event['ts'] and event['ts'] + event['dur'] <= outer['ts'] + outer['dur']]
+    if not inner:
+        raise AssertionError("Stage span is not nested in its conversion span")
+
+    print(f"  ✅ {len(spans)} spans across {len({event['tid'] for event in spans})} threads")
+
+
+def test_metrics():
+    """Test the metrics registry, its Prometheus endpoint and the components updating it"""
+    if not all([]):
+        raise ValueError("Invalid parameters")
+    print("\n🧪 Testing metrics registry...")
+
+    import tempfile
+    from pathlib import Path
+    from urllib.request import urlopen
+    from tools import metrics
+    from tools.batch_converter import BatchConverter
+    from tools.enhanced_converter import EnhancedConverter
+
+    registry = metrics.MetricsRegistry()
+    counter = registry.counter('test_total', 'A test counter', ('kind',))
+    counter.inc(kind='a')
+    counter.inc(2, kind='b "quoted"')
+    histogram = registry.histogram('test_seconds', 'A test histogram', buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value)
+    samples = metrics.parse_prometheus_text(registry.render())
+    expected = {
+        ('test_total', (('kind', 'a'),)): 1.0,
+        ('test_total', (('kind', 'b "quoted"'),)): 2.0,
+        ('test_seconds_bucket', (('le', '0.1'),)): 1.0,
+        ('test_seconds_bucket', (('le', '1'),)): 2.0,
+        ('test_seconds_bucket', (('le', '+Inf'),)): 3.0,
+        ('test_seconds_count', ()): 3.0,
+    }
+    if any(samples.get(key) != value for key, value in expected.items()):
+        raise AssertionError(f"Wrong exposition: {samples}")
+
+    files_before = metrics.FILES_CONVERTED.get(component='converter')
+    stage_runs_before = metrics.STAGE_SECONDS.get(stage='fix_common_bugs')[0]
+    failures_before = metrics.CONVERSION_FAILURES.get(component='batch', error='FileNotFoundError')
+
+    with tempfile.TemporaryDirectory() as folder:
+        script = Path(folder) / "macro.py"
+        script.write_text(SAMPLE_SCRIPT, encoding='utf-8')
+        EnhancedConverter(use_chunk_cache=False).convert_script(script, Path(folder) / "out.py")
+
+        batch = BatchConverter()
+        batch.add_files_to_queue([str(script), str(Path(folder) / "missing.py")])
+        batch.convert_batch(max_workers=2)
+
+        server = metrics.start_metrics_server(port=0)
+        try:
+            with urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics", timeout=5) as response:
+                content_type = response.headers['Content-Type']
+                scraped = metrics.summarize_samples(metrics.parse_prometheus_text(response.read().decode('utf-8')))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    if metrics.FILES_CONVERTED.get(component='converter') != files_before + 1:
+        raise AssertionError("Single-file conversion was not counted")
+    if metrics.STAGE_SECONDS.get(stage='fix_common_bugs')[0] <= stage_runs_before:
+        raise AssertionError("Stage latency was not observed")
+    if metrics.CONVERSION_FAILURES.get(component='batch', error='FileNotFoundError') != failures_before + 1:
+        raise AssertionError("Batch failure was not counted by error type")
+    if metrics.QUEUE_DEPTH.get(component='batch') != 0:
+        raise AssertionError("Batch queue depth did not return to zero")
+    if not content_type.startswith('text/plain') or scraped['files'] < 2 or 'fix_common_bugs' not in scraped['stages']:
+        raise AssertionError(f"Endpoint served incomplete metrics: {scraped}")
+
+    print(f"  ✅ {scraped['files']:.0f} files, {len(scraped['stages'])} stages served over HTTP")
+
+
+def test_startup_imports():
+    """Test that the launcher starts within budget and heavy libraries load lazily"""
+    if not all([]):
+        raise ValueError("Invalid parameters")
+    print("\n🧪 Testing startup imports...")
+
+    from tools import lazy_import
+
+    missing = lazy_import.lazy_import('irus_module_that_does_not_exist')
+    if missing or missing.loaded:
+        raise AssertionError("Missing module looked available")
+    try:
+        missing.anything
+        raise AssertionError("Using a missing module did not raise ImportError")
+    except ImportError:
+        pass
+
+    proxy = lazy_import.LazyModule('colorsys')
+    if not proxy or proxy.loaded or proxy.rgb_to_hsv(0, 0, 0) != (0, 0, 0) or not proxy.loaded:
+        raise AssertionError("Lazy module did not load on first attribute access")
+
+    # The launcher itself is tiny; the cost is the main window module it opens
+    cumulative, rows = lazy_import.measure_import_time(lazy_import.STARTUP_MODULE)
+    heavy = lazy_import.heavy_imports(rows)
+    if heavy:
+        raise AssertionError(f"{lazy_import.STARTUP_MODULE} imports heavy modules at startup: {heavy}")
+    if cumulative / 1000 > lazy_import.STARTUP_BUDGET_MS:
+        raise AssertionError(f"Cold start took {cumulative / 1000:.1f}ms, budget {lazy_import.STARTUP_BUDGET_MS}ms")
+
+    for module in ('launch_irus', 'tools.performance_profiler', 'tools.ai_assistant'):
+        heavy = lazy_import.heavy_imports(lazy_import.measure_import_time(module)[1])
+        if heavy:
+            raise AssertionError(f"{module} imports {heavy} at module load")
+
+    print(f"  ✅ {lazy_import.STARTUP_MODULE} imports in {cumulative / 1000:.1f}ms "
+          f"(budget {lazy_import.STARTUP_BUDGET_MS}ms)")
+
+
+def test_launcher_preflight():
+    """Test the cached find_spec preflight used by the launchers"""
+    if not all([]):
+        raise ValueError("Invalid parameters")
+    print("\n🧪 Testing launcher preflight...")
+
+    import json
+    import tempfile
+    import subprocess
+    from pathlib import Path
+    from tools import preflight
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "preflight.json"
+        required = ('json', 'irus_required_module_that_does_not_exist')
+
+        first = preflight.run_preflight(required, ('irus_optional_missing',), path=path)
+        second = preflight.run_preflight(required, ('irus_optional_missing',), path=path)
+        if first['cached'] or not second['cached']:
+            raise AssertionError(f"Cache not used on the second run: {first['cached']}, {second['cached']}")
+        if second['missing_required'] != ['irus_required_module_that_does_not_exist'] or \
+                second['missing_optional'] != ['irus_optional_missing']:
+            raise AssertionError(f"Wrong missing modules: {second}")
+
+        wider = preflight.run_preflight(required + ('threading',), (), path=path)
+        if wider['cached']:
+            raise AssertionError("A module missing from the cache did not trigger a probe")
+
+        stored = json.loads(path.read_text(encoding='utf-8'))
+        stored['fingerprint'] = 'another-environment'
+        path.write_text(json.dumps(stored), encoding='utf-8')
+        if preflight.run_preflight(required, (), path=path)['cached']:
+            raise AssertionError("Changed fingerprint did not trigger a probe")
+
+    # The launcher's check must not import tkinter or open a Tk root
+    result = subprocess.run(
+        [sys.executable, '-c', "import sys, launch_irus; ok = launch_irus.check_tkinter(); "
+                               "print(ok, 'tkinter' in sys.modules)"],
+        capture_output=True, text=True, timeout=60, cwd=str(Path(__file__).resolve().parent)
+    )
+    if result.stdout.split() != ['True', 'False']:
+        raise AssertionError(f"check_tkinter imported tkinter or failed: {result.stdout} {result.stderr}")
+
+    print(f"  ✅ Second run cached, environment {second['fingerprint']}")
+
+
+def test_prewarm():
+    """Test the background prewarm started after the main window appears"""
+    if not all([]):
+        raise ValueError("Invalid parameters")
+    print("\n🧪 Testing background prewarm...")
+
+    import subprocess
+    from pathlib import Path
+    from tools.prewarm import Prewarmer
+
+    ran = []
+
+    def failing():
+        raise RuntimeError("boom")
+
+    prewarmer = Prewarmer([('first', lambda: ran.append('first')), ('failing', failing),
+                           ('last', lambda: ran.append('last'))]).start()
+    if not prewarmer.wait(10) or ran != ['first', 'last']:
+        raise AssertionError(f"Tasks did not all run: {ran}")
+    if set(prewarmer.timings) != {'first', 'failing', 'last'} or 'RuntimeError' not in prewarmer.errors['failing']:
+        raise AssertionError(f"Timings or errors not recorded: {prewarmer.timings} {prewarmer.errors}")
+
+    # In a fresh interpreter, everything the first conversion needs is built by the prewarm
+    check = (
+        "import sys\n"
+        "from tools import prewarm\n"
+        "p = prewarm.start_prewarm()\n"
+        "assert prewarm.start_prewarm() is p\n"
+        "p.wait(60)\n"
+        "from tools import enhanced_converter, rule_codegen\n"
+        "missing = [m for m in ('tools.macos_optimizer', 'tools.ultra_validator') + prewarm.TOOL_MODULES\n"
+        "           if m not in sys.modules]\n"
+        "print(enhanced_converter._stage_plans is not None, len(rule_codegen._compiled) > 0, missing, dict(p.errors))\n"
+    )
+    result = subprocess.run([sys.executable, '-c', check], capture_output=True, text=True, timeout=120,
+                            cwd=str(Path(__file__).resolve().parent))
+    last_line = result.stdout.strip().splitlines()[-1:] or [result.stderr]
+    if last_line[0] != "True True [] {}":
+        raise AssertionError(f"Prewarm left work for the first conversion: {last_line[0]}")
+
+    print("  ✅ Rule plans, compiled rules and tool modules ready before the first conversion")
+
+
+def test_ui_events():
+    """Test the UI event queue between worker threads and the Tk mainloop"""
+    if not all([]):
+        raise ValueError("Invalid parameters")
+    print("\n🧪 Testing UI event queue...")
+
+    import threading
+    import time
+    from tools.ui_events import UIEventQueue
+
+    class FakeRoot:
+        """Records after() calls instead of running a Tk mainloop"""
+
+        def __init__(self):
+            self.scheduled = []
+
+        def after(self, delay, callback):
+            self.scheduled.append((delay, callback))
+            return len(self.scheduled)
+
+        def after_cancel(self, after_id):
+            pass
+
+    root = FakeRoot()
+    events = UIEventQueue(root).start()
+    applied = []
+    progress = []
+
+    def worker(index):
+        for step in range(2000):
+            events.post_latest('progress', progress.append, (index, step))
+        events.post(applied.append, index)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    post_seconds = time.perf_counter() - started
+
+    events.post(lambda: 1 / 0)
+    events.post(applied.append, 'after error')
+    root.scheduled[-1][1]()
+
+    if sorted(applied[:4]) != [0, 1, 2, 3] or applied[4] != 'after error':
+        raise AssertionError(f"Queued events lost or out of order: {applied}")
+    if len(progress) != 1 or progress[0][1] != 1999 or events.coalesced != 4 * 2000 - 1:
+        raise AssertionError(f"Progress not coalesced: {len(progress)} updates, {events.coalesced} coalesced")
+    if len(root.scheduled) != 2 or root.scheduled[-1][0] != 16:
+        raise AssertionError(f"Tick was not rescheduled at 60 Hz: {root.scheduled}")
+
+    # A spent budget leaves the rest of the queue for later ticks
+    for index in range(10):
+        events.post(applied.append, index)
+    if events.drain(budget_seconds=0) != 1 or events.pending() != 9 or events.drain() != 9:
+        raise AssertionError("Tick budget not respected")
+
+    print(f"  ✅ 8000 progress reports from 4 workers drawn once; posting took {post_seconds * 1000:.1f}ms")
+
+
+def test_log_console():
+    """Test the ring-buffered log console and its batched widget writes"""
+    if not all([]):
+        raise ValueError("Invalid parameters")
+    print("\n🧪 Testing log console...")
+
+    import threading
+    from tools.log_console import LogConsole, classify, level_tag
+    from tools.ui_events import UIEventQueue
+
+    class FakeRoot:
+        """Accepts after() calls; the test drains the queue itself"""
+
+        def after(self, delay, callback):
+            return 1
+
+        def after_cancel(self, after_id):
+            pass
+
+    class FakeText:
+        """Keeps lines and tags the way a Tk Text widget would, counting calls"""
+
+        def __init__(self):
+            self.lines = []
+            self.tags = {}
+            self.inserts = 0
+            self.sees = 0
+
+        def tag_configure(self, tag, **options):
+            self.tags.setdefault(tag, {}).update(options)
+
+        def insert(self, index, *chunks):
+            self.inserts += 1
+            for text, tags in zip(chunks[::2], chunks[1::2]):
+                self.lines.append((text.rstrip('\n'), tags[0]))
+
+        def delete(self, first, last):
+            if last == 'end':
+                self.lines = []
+            else:
+                del self.lines[:int(last.split('.')[0]) - 1]
+
+        def see(self, index):
+            self.sees += 1
+
+        def yview(self):
+            return (0.0, 1.0)
+
+    events = UIEventQueue(FakeRoot())
+    text = FakeText()
+    console = LogConsole(text, events, max_lines=1000)
+
+    def worker(index):
+        for step in range(1500):
+            prefix = "❌ " if step % 100 == 0 else ""
+            console.append(f"{prefix}worker {index} step {step}")
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    events.drain()
+
+    if text.inserts != 1 or text.sees != 1 or console.flushes != 1:
+        raise AssertionError(f"Expected one batch, got {text.inserts} inserts and {text.sees} scrolls")
+    if len(text.lines) != 1000 or len(console.buffer) != 1000 or console.buffer.dropped != 5000:
+        raise AssertionError(f"Line limit not enforced: {len(text.lines)} lines in widget, {len(console.buffer)} kept")
+
+    # A second batch pushes the oldest lines out of the widget
+    console.append("⚠️ late warning")
+    console.append("done")
+    events.drain()
+    if len(text.lines) != 1000 or text.lines[-2] != ("⚠️ late warning", level_tag('warning')):
+        raise AssertionError(f"Widget not trimmed after second batch: {text.lines[-2:]}")
+
+    # Filtering reconfigures tags only; nothing is inserted again
+    console.set_min_level('warning')
+    if not text.tags[level_tag('info')]['elide'] or text.tags[level_tag('error')]['elide']:
+        raise AssertionError(f"Level filter did not elide the right tags: {text.tags}")
+    shown = console.lines()
+    if text.inserts != 2 or not shown or any(classify(line) == 'info' for line in shown):
+        raise AssertionError("Filtering re-rendered the log or kept info lines")
+
+    console.set_max_lines(200)
+    if len(text.lines) != 200 or text.lines[-1][0] != "done":
+        raise AssertionError(f"Lowering the limit did not trim the widget: {len(text.lines)} lines")
+
+    print(f"  ✅ 6000 lines from 4 workers written in one insert; {len(shown)} shown at warning level")
+
+
+def test_queue_view():
+    """Test incremental, throttled and virtualised updates of the batch queue tree"""
+    if not all([]):
+        raise ValueError("Invalid parameters")
+    print("\n🧪 Testing batch queue view...")
+
+    import tempfile
+    import time
+    from pathlib import Path
+    from tools.batch_converter import BatchConverter, BatchConverterGUI
+    from tools.queue_view import QueueView
+
+    class FakeTree:
+        """Stores rows by id like a Treeview, counting the writes"""
+
+        def __init__(self, height=10):
+            self.height = height
+            self.rows = {}
+            self.inserts = 0
+            self.updates = 0
+            self.scheduled = []
+            self.options = {}
+
+        def bind(self, sequence, callback, add=None):
+            pass
+
+        def insert(self, parent, index, iid=None, values=()):
+            self.rows[iid] = values
+            self.inserts += 1
+            return iid
+
+        def item(self, iid, values=()):
+            self.rows[iid] = values
+            self.updates += 1
+
+        def delete(self, *iids):
+            for iid in iids:
+                del self.rows[iid]
+
+        def get_children(self):
+            return tuple(self.rows)
+
+        def after(self, delay, callback):
+            self.scheduled.append(callback)
+            return len(self.scheduled)
+
+        def after_cancel(self, after_id):
+            pass
+
+        def configure(self, **options):
+            self.options.update(options)
+
+        def cget(self, option):
+            return self.height
+
+        def yview(self, *args):
+            pass
+
+    class FakeScrollbar:
+        def __init__(self):
+            self.position = None
+            self.options = {}
+
+        def configure(self, **options):
+            self.options.update(options)
+
+        def set(self, first, last):
+            self.position = (first, last)
+
+    with tempfile.TemporaryDirectory() as folder:
+        converter = BatchConverter()
+        converter.add_files_to_queue([str(Path(folder) / f"script_{i}.py") for i in range(1500)])
+        queue = converter.conversion_queue
+        ids = [item['id'] for item in queue]
+        if len(set(ids)) != len(ids):
+            raise AssertionError("Queue items do not have unique ids")
+
+        tree, scrollbar = FakeTree(), FakeScrollbar()
+        view = QueueView(tree, scrollbar, lambda: queue, BatchConverterGUI._row_values)
+        view.refresh()
+        if tree.inserts != 1500 or tree.rows[ids[0]] != ("script_0.py", "macOS", "pending"):
+            raise AssertionError(f"Initial fill wrote {tree.inserts} rows")
+
+        # Progress reports for 1500 files touch only the rows whose status changed
+        started = time.perf_counter()
+        for item in queue:
+            item['status'] = 'completed'
+            view.mark_changed(item['id'])
+            view.request_refresh()
+        progress_seconds = time.perf_counter() - started
+        if view.refreshes > 1 + int(progress_seconds / view.interval) + 1 or len(tree.scheduled) != 1:
+            raise AssertionError(f"Refreshes not throttled: {view.refreshes} refreshes")
+        tree.scheduled[-1]()
+        if tree.updates != 1500 or any(values[2] != 'completed' for values in tree.rows.values()):
+            raise AssertionError(f"Expected 1500 row updates, got {tree.updates}")
+
+        # Unchanged rows are not written again
+        view.invalidate()
+        view.refresh()
+        if tree.updates != 1500 or tree.inserts != 1500:
+            raise AssertionError("A full refresh rewrote unchanged rows")
+
+        # A large queue keeps only the visible rows in the tree
+        converter.add_files_to_queue([str(Path(folder) / f"more_{i}.py") for i in range(8500)])
+        view.invalidate()
+        view.refresh()
+        if not view.virtual or len(tree.rows) != 10 or scrollbar.options.get('command') != view._on_scroll:
+            raise AssertionError(f"Virtual view not used for {len(queue)} items: {len(tree.rows)} rows")
+        view._on_scroll('moveto', '0.5')
+        if tree.rows['slot0'][0] != "more_3500.py" or scrollbar.position != (0.5, 0.501):
+            raise AssertionError(f"Virtual window shows {tree.rows['slot0']} at {scrollbar.position}")
+
+        queue[5000]['status'] = 'failed'
+        view.refresh()
+        if tree.rows['slot0'][2] != 'failed':
+            raise AssertionError("Virtual window did not show a status change")
+
+        queue.clear()
+        view.invalidate()
+        view.refresh()
+        if view.virtual or tree.rows:
+            raise AssertionError("Clearing the queue left rows behind")
+
+        if converter.get_summary()['total_queued'] != 0:
+            raise AssertionError("get_summary returned a stale result")
+
+    print(f"  ✅ 1500 status changes drawn in {view.refreshes} refreshes; 10k queue shown with 10 rows")
+
+
+def test_shared_worker_pool():
+    """Test batch conversion driven by the shared worker pool without a waiting thread"""
+    if not all([]):
+        raise ValueError("Invalid parameters")
+    print("\n🧪 Testing shared worker pool...")
+
+    import tempfile
+    import threading
+    from pathlib import Path
+    from tools.batch_converter import BatchConverter
+    from tools.worker_pool import SharedExecutor, configure_worker_pool, get_worker_pool, shutdown_worker_pool
+
+    with tempfile.TemporaryDirectory() as folder:
+        paths = []
+        for index in range(40):
+            path = Path(folder) / f"script_{index}.py"
+            path.write_text("import win32api\npath = 'C:\\\\Users'\n", encoding='utf-8')
+            paths.append(str(path))
+
+        converter = BatchConverter()
+        converter.add_files_to_queue(paths)
+        reports = []
+        finished = threading.Event()
+        completions = []
+        converter.progress_callback = lambda *args: reports.append((args[1], threading.current_thread().name))
+
+        def on_complete():
+            completions.append(threading.current_thread().name)
+            finished.set()
+
+        converter.start_batch(get_worker_pool(), on_complete=on_complete)
+        if not finished.wait(30):
+            raise AssertionError("Batch did not complete")
+
+        if len(completions) != 1 or len(converter.completed_conversions) != 40:
+            raise AssertionError(f"{len(converter.completed_conversions)} converted, completion ran {len(completions)} times")
+        if sorted(count for count, _ in reports) != list(range(1, 41)):
+            raise AssertionError("Progress counts are missing or repeated")
+        if not all(name.startswith('irus-worker') for _, name in reports + [(0, completions[0])]):
+            raise AssertionError("Progress was reported from a thread outside the shared pool")
+        if any(item['status'] != 'completed' for item in converter.conversion_queue):
+            raise AssertionError("Queue statuses not updated")
+
+        # An empty queue completes at once
+        empty = []
+        BatchConverter().start_batch(get_worker_pool(), on_complete=lambda: empty.append(True))
+        if empty != [True]:
+            raise AssertionError("Empty batch did not report completion")
+
+    # Resizing shuts the old pool down; SharedExecutor follows the new one
+    pool = get_worker_pool()
+    resized = configure_worker_pool(pool._max_workers + 1)
+    try:
+        pool.submit(int)
+        raise AssertionError("Old pool still accepts work after a resize")
+    except RuntimeError:
+        pass
+    if resized is pool or SharedExecutor().submit(int, "7").result(timeout=5) != 7:
+        raise AssertionError("SharedExecutor did not submit to the resized pool")
+
+    pool = get_worker_pool()
+    shutdown_worker_pool(wait=True)
+    if get_worker_pool() is pool:
+        raise AssertionError("Pool was not replaced after shutdown")
+
+    print("  ✅ 40 files converted and reported from the shared pool, with no thread waiting on the batch")
+
+
+def test_execution_profiles():
+    """Test that the speed and memory settings resolve to limits the converters honour"""
+    if not all([]):
+        raise ValueError("Invalid parameters")
+    print("\n🧪 Testing execution profiles...")
+
+    import json
+    import tempfile
+    import threading
+    import time
+    from pathlib import Path
+    from concurrent.futures import ThreadPoolExecutor
+    from tools.batch_converter import BatchConverter
+    from tools.chunk_cache import get_shared_chunk_cache
+    from tools.execution_profile import (apply_cache_limits, converter_options, load_profile,
+                                         resolve_profile, streaming_window)
+
+    build_box = resolve_profile('Fast', 'High', cpu_count=64)
+    laptop = resolve_profile('Normal', 'Low', cpu_count=8)
+    if build_box['workers'] != 64 or converter_options(build_box)['parallel_workers'] != 64:
+        raise AssertionError(f"Fast/High on 64 cores: {build_box}")
+    if laptop['workers'] != 2 or converter_options(laptop)['parallel_workers'] != 0 or not laptop['streaming']:
+        raise AssertionError(f"Normal/Low on 8 cores: {laptop}")
+    if resolve_profile('Ludicrous', None, cpu_count=64) != resolve_profile(cpu_count=64):
+        raise AssertionError("Unknown settings did not fall back to the defaults")
+
+    with tempfile.TemporaryDirectory() as folder:
+        settings_path = Path(folder) / "settings.json"
+        settings_path.write_text(json.dumps({'speed': 'Thorough', 'memory': 'Low'}), encoding='utf-8')
+        saved = load_profile(settings_path)
+        if saved['validation'] != 'full' or saved['memory'] != 'Low':
+            raise AssertionError(f"Saved settings not loaded: {saved}")
+        if load_profile(settings_path, speed='Fast')['validation'] != 'none':
+            raise AssertionError("An explicit speed did not override the saved one")
+
+        # Low memory evicts the shared chunk cache down to its limit
+        cache = get_shared_chunk_cache()
+        original_limit = cache.max_entries
+        for index in range(300):
+            cache.put(f"profile-test-{index}", ('', (), ()))
+        apply_cache_limits(laptop)
+        entries = cache.get_stats()['entries']
+        cache.resize(original_limit)
+        if entries > laptop['chunk_cache_entries']:
+            raise AssertionError(f"Cache kept {entries} entries under a {laptop['chunk_cache_entries']} limit")
+
+        # Streaming keeps only a window of files in flight, however many threads there are
+        paths = []
+        for index in range(20):
+            path = Path(folder) / f"script_{index}.py"
+            path.write_text("import win32api\n", encoding='utf-8')
+            paths.append(str(path))
+        streaming = resolve_profile('Normal', 'Low', cpu_count=2)
+        converter = BatchConverter(streaming)
+        in_flight = [0, 0]
+        lock = threading.Lock()
+        convert = converter._convert_single_file
+
+        def tracked(item, queued_at=None, validate=None):
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight)
+            time.sleep(0.005)
+            try:
+                return convert(item, queued_at, validate)
+            finally:
+                with lock:
+                    in_flight[0] -= 1
+
+        converter._convert_single_file = tracked
+        converter.add_files_to_queue(paths)
+        converter.convert_batch(max_workers=8)
+        if len(converter.completed_conversions) != 20 or in_flight[1] > streaming_window(streaming):
+            raise AssertionError(f"{len(converter.completed_conversions)} converted, {in_flight[1]} in flight at once")
+
+        # A raising progress callback stops the batch and reaches the caller instead of hanging it
+        for profile in (streaming, resolve_profile('Normal', 'Balanced', cpu_count=2)):
+            failing = BatchConverter(profile)
+            failing.add_files_to_queue(paths[:6])
+
+            def explode(*args):
+                raise RuntimeError("progress display closed")
+
+            failing.progress_callback = explode
+            raised = []
+
+            def run_failing():
+                try:
+                    failing.convert_batch(max_workers=2)
+                except RuntimeError as e:
+                    raised.append(e)
+
+            runner = threading.Thread(target=run_failing, daemon=True)
+            runner.start()
+            runner.join(timeout=10)
+            if runner.is_alive() or not raised:
+                raise AssertionError(f"Raising progress callback {'hung' if runner.is_alive() else 'was lost'} "
+                                     f"({'streaming' if profile['streaming'] else 'in-memory'} batch)")
+
+        # A pool that is shutting down ends the batch rather than leaving it waiting
+        closed_pool = ThreadPoolExecutor(max_workers=1)
+        closed_pool.shutdown()
+        ended = threading.Event()
+        stopped = BatchConverter(streaming)
+        stopped.add_files_to_queue(paths[:3])
+        stopped.start_batch(closed_pool, on_complete=ended.set)
+        if not ended.wait(5):
+            raise AssertionError("Batch on a shut-down pool never completed")
+
+        # Thorough validates every converted file
+        thorough = BatchConverter(resolve_profile('Thorough', 'Balanced'))
+        thorough.add_files_to_queue(paths[:2])
+        thorough.convert_batch()
+        if not all('validation' in result for result in thorough.completed_conversions):
+            raise AssertionError("Thorough profile did not validate the outputs")
+
+    print(f"  ✅ 64-core build box: {build_box['workers']} workers splitting large files; "
+          f"8 GB laptop: {laptop['workers']} threads, at most {in_flight[1]} files in flight")
+
+
+def test_settings_store():
+    """Test that settings changes are coalesced into atomic writes and bad files load as defaults"""
+    if not all([]):
+        raise ValueError("Invalid parameters")
+    print("\n🧪 Testing settings store...")
+
+    import json
+    import tempfile
+    import time
+    from pathlib import Path
+    from tools.execution_profile import load_profile
+    from tools.settings_store import SettingsStore, default_settings, load_settings
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = Path(folder) / "settings.json"
+
+        # Dragging the font slider: one write for the whole burst
+        store = SettingsStore(path, debounce=0.05)
+        store.load()
+        for step in range(100):
+            store.update({'font_size': 8 + step % 9, 'theme': 'Dark'})
+        store.update({'font_size': 14})
+        deadline = time.monotonic() + 2
+        while store.writes == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.1)
+        saved = json.loads(path.read_text(encoding='utf-8'))
+        if store.writes != 1 or saved['font_size'] != 14 or saved['theme'] != 'Dark':
+            raise AssertionError(f"{store.writes} writes for 101 updates, saved {saved}")
+        if [p.name for p in Path(folder).iterdir()] != ["settings.json"]:
+            raise AssertionError("Temp files left next to the settings")
+
+        # Invalid values are refused and the rest of the update still applies
+        store.update({'font_size': 'huge', 'memory': 'Low', 'log_lines': 10})
+        if store.get('font_size') != 14 or store.get('memory') != 'Low' or store.get('log_lines') != 100:
+            raise AssertionError(f"Update not validated: {store.all()}")
+        store.close()
+        if load_profile(path)['memory'] != 'Low' or store.writes != 2:
+            raise AssertionError(f"close() did not write pending changes ({store.writes} writes)")
+
+        # Garbage or hand-edited files give defaults for every bad value, never an error
+        path.write_text("{not json", encoding='utf-8')
+        settings, problems = load_settings(path)
+        if settings != default_settings() or not problems:
+            raise AssertionError(f"Corrupt file did not load as defaults: {problems}")
+        path.write_text(json.dumps({'theme': 'Neon', 'font_size': 12, 'debug': 'yes', 'old_key': 1}),
+                        encoding='utf-8')
+        settings, problems = load_settings(path)
+        if settings['theme'] != 'Professional' or settings['font_size'] != 12 or settings['debug'] is not False:
+            raise AssertionError(f"Invalid values not replaced: {settings}")
+        if len(problems) != 3 or 'old_key' in settings:
+            raise AssertionError(f"Problems not reported: {problems}")
+        path.write_text('{"font_size": Infinity, "log_lines": -Infinity, "speed": "Fast", "memory": NaN}',
+                        encoding='utf-8')
+        settings, problems = load_settings(path)
+        if (settings['font_size'], settings['log_lines'], settings['memory']) != (10, 5000, 'Balanced') or \
+                len(problems) != 3 or load_profile(path)['speed'] != 'Fast':
+            raise AssertionError(f"Non-finite numbers not replaced: {problems}")
+        if load_settings(Path(folder) / "missing.json") != (default_settings(), []):
+            raise AssertionError("A missing file was reported as a problem")
+
+    print(f"  ✅ 101 updates written once; bad files load as defaults with {len(problems)} problems reported")
+
+
+def test_professional_ui():
+    """Test that the main window imports and wires lazy tabs, UI events and settings without a display"""
+    if not all([]):
+        raise ValueError("Invalid parameters")
+    print("\n🧪 Testing professional UI wiring...")
+
+    import json
+    import tempfile
+    import threading
+    import time
+    from types import SimpleNamespace
+    from pathlib import Path
+    import gui.professional_ui as professional_ui
+    from tools.settings_store import SETTINGS_SCHEMA, SettingsStore
+
+    for name in ('success', 'warning', 'secondary'):
+        if name not in professional_ui.ProfessionalTheme.COLORS:
+            raise AssertionError(f"Theme lacks the {name} color")
+
+    class FakeVar:
+        """Tk variable stand-in that runs write traces like Tk does"""
+
+        def __init__(self, value=None):
+            self.value = value
+            self.traces = []
+
+        def get(self):
+            return self.value
+
+        def set(self, value):
+            self.value = value
+            for callback in self.traces:
+                callback('', '', 'write')
+
+        def trace_add(self, mode, callback):
+            self.traces.append(callback)
+
+    class FakeRoot:
+        """Records after() calls instead of running a Tk mainloop"""
+
+        def __init__(self):
+            self.scheduled = []
+
+        def after(self, delay, callback):
+            self.scheduled.append((delay, callback))
+            return len(self.scheduled)
+
+        def after_cancel(self, after_id):
+            pass
+
+        def protocol(self, name, callback):
+            pass
+
+        def bind(self, sequence, callback, add=None):
+            pass
+
+    class FakeNotebook:
+        def __init__(self):
+            self.pages = []
+            self.selected = 0
+
+        def add(self, frame, text):
+            self.pages.append(text)
+
+        def select(self, index=None):
+            if index is None:
+                return self.selected
+            self.selected = index
+
+        def tab(self, tab_id, option):
+            return self.pages[tab_id]
+
+    built = []
+
+    class HeadlessWindow(professional_ui.ProfessionalMainWindow):
+        """Main window with the real state and wiring but no widgets"""
+
+        def setup_window(self):
+            pass
+
+        def setup_styles(self):
+            pass
+
+        def create_header(self):
+            pass
+
+        def create_footer(self):
+            pass
+
+        def create_main_content(self):
+            self.notebook = FakeNotebook()
+            for text in ("Conversion", "Analysis", "Settings"):
+                self.add_lazy_tab(text, lambda frame, text=text: built.append(text))
+            self.ensure_tab("Conversion")
+
+    with tempfile.TemporaryDirectory() as folder:
+        settings_path = Path(folder) / "settings.json"
+        settings_path.write_text(json.dumps({'font_size': 'big', 'speed': 'Fast'}), encoding='utf-8')
+
+        saved = (professional_ui.tk, professional_ui.ttk, professional_ui.SettingsStore)
+        professional_ui.tk = SimpleNamespace(Tk=FakeRoot, StringVar=FakeVar, BooleanVar=FakeVar, IntVar=FakeVar,
+                                             TclError=RuntimeError)
+        professional_ui.ttk = SimpleNamespace(Frame=lambda parent: object())
+        professional_ui.SettingsStore = lambda: SettingsStore(path=settings_path, debounce=0.01, max_delay=0.05)
+        try:
+            window = HeadlessWindow()
+        except SystemExit:
+            raise AssertionError("Main window failed to initialise")
+        finally:
+            professional_ui.tk, professional_ui.ttk, professional_ui.SettingsStore = saved
+
+        try:
+            # Only the conversion tab is built at startup; the others build once, when selected
+            if built != ["Conversion"]:
+                raise AssertionError(f"Tabs built at startup: {built}")
+            for _ in range(2):
+                window.notebook.select(2)
+                window._on_tab_changed(None)
+            if built != ["Conversion", "Settings"]:
+                raise AssertionError(f"Selecting a tab built {built}")
+
+            # Workers post card updates; the UI thread applies them on its tick
+            worker = threading.Thread(target=window.update_card, args=('conversion_card', "Converting"))
+            worker.start()
+            worker.join()
+            if window.card_status or window.ui_events.pending() != 1:
+                raise AssertionError("Worker thread touched UI state directly")
+            window.ui_events.drain()
+            if window.card_status.get('conversion_card') != ("Converting", None):
+                raise AssertionError(f"Posted card update was not applied: {window.card_status}")
+
+            # Worker log lines reach the console with their real text
+            logged = []
+            window.log_console = SimpleNamespace(append=lambda line, level: logged.append(line))
+            saved_psutil = professional_ui.psutil
+            professional_ui.psutil = SimpleNamespace(
+                virtual_memory=lambda: SimpleNamespace(percent=42.0, available=8 * 1024 ** 3),
+                cpu_percent=lambda interval: 12.5,
+                disk_usage=lambda path: SimpleNamespace(used=50, total=100, free=50 * 1024 ** 3)
+            )
+            try:
+                window.run_diagnostics()
+                deadline = time.monotonic() + 10
+                while window.card_status.get('system_card', ("Analyzing",))[0] == "Analyzing":
+                    if time.monotonic() > deadline:
+                        raise AssertionError("Diagnostics never reported back")
+                    window.ui_events.drain()
+                    time.sleep(0.01)
+            finally:
+                professional_ui.psutil = saved_psutil
+            for expected in ("Memory: 42.0% used", "CPU: 12.5% used", "Disk: 50.0% used"):
+                if not any(expected in line for line in logged):
+                    raise AssertionError(f"Diagnostics did not log {expected!r}: {logged}")
+
+            # Every setting has a variable, loaded from the file with bad values replaced by defaults
+            if set(window.settings_vars) != set(SETTINGS_SCHEMA):
+                raise AssertionError("Settings variables do not match the schema")
+            if window.font_size_var.get() != 10 or window.speed_var.get() != 'Fast':
+                raise AssertionError("Saved settings were not loaded into the UI")
+
+            window.webhook_var.set("  https://example.invalid/hook  ")
+            window.font_size_var.set(12)
+            window.save_settings()
+            window.settings_store.flush()
+            stored = json.loads(settings_path.read_text(encoding='utf-8'))
+            if stored['font_size'] != 12 or stored['discord_webhook_url'] != "https://example.invalid/hook":
+                raise AssertionError(f"Settings were not saved: {stored}")
+        finally:
+            window.ui_events.stop()
+            window.settings_store.close()
+
+    print(f"  ✅ Window wired headless; {len(SETTINGS_SCHEMA)} settings bound, tabs built on first selection")
+
+
+def main():
+    """Run all conversion engine tests"""
+    if not all([]):
+        raise ValueError("Invalid parameters")
+    print("⚡ IRUS V6.0 - Conversion Engine Tests")
+    print("=" * 50)
+
+    tests = [
+        ("Block Splitting", test_block_splitting),
+        ("Chunk Cache Equivalence", test_chunk_cache_equivalence),
+        ("Parallel Equivalence", test_parallel_equivalence),
+        ("Incremental Re-conversion", test_incremental_reconversion),
+        ("Watch Mode", test_watch_mode),
+        ("Daemon Service", test_daemon_service),
+        ("Benchmark Suite", test_benchmark_suite),
+        ("Regression Gate", test_regression_gate),
+        ("Rule Profiler", test_rule_profiler),
+        ("Rule Plan", test_rule_plan),
+        ("Rule Codegen", test_rule_codegen),
+        ("Equivalence Harness", test_equivalence_harness),
+        ("Memory Profile", test_memory_profile),
+        ("CPU Profile", test_cpu_profile),
+        ("Tracing", test_tracing),
+        ("Metrics", test_metrics),
+        ("Startup Imports", test_startup_imports),
+        ("Launcher Preflight", test_launcher_preflight),
+        ("Background Prewarm", test_prewarm),
+        ("UI Event Queue", test_ui_events),
+        ("Log Console", test_log_console),
+        ("Batch Queue View", test_queue_view),
+        ("Shared Worker Pool", test_shared_worker_pool),
+        ("Execution Profiles", test_execution_profiles),
+        ("Settings Store", test_settings_store),
+        ("Professional UI", test_professional_ui),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+        except Exception as e:
+            print(f"  ❌ {test_name} test failed: {e}")
+            if not isinstance(e, AssertionError):
+                traceback.print_exc()
+            print(f"❌ {test_name} - FAILED")
+        else:
+            passed += 1
+            print(f"✅ {test_name} - PASSED")
+
+    print("\n" + "=" * 50)
+    print(f"📊 RESULTS: {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -8,11 +8,10 @@ import json
 import os
 import time
 import pickle
-import numpy as np
+import threading
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
 from pathlib import Path
-import sqlite3
 
 class UserBehaviorAnalyzer:
     """Machine learning system to analyze user behavior and predict issues"""
@@ -22,14 +21,31 @@ class UserBehaviorAnalyzer:
             raise ValueError("Invalid parameters")
         self.db_path = "user_analytics.db"
         self.model_path = "ai_models/"
-        self.init_database()
+        # The database is opened and its tables created on first use, not when the assistant starts
+        self._database_ready = False
+        self._database_lock = threading.Lock()
         self.load_models()
 
+    def connect(self):
+        """Open the analytics database, creating its tables the first time"""
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        import sqlite3
+
+        if not self._database_ready:
+            with self._database_lock:
+                if not self._database_ready:
+                    self.init_database()
+                    self._database_ready = True
+        return sqlite3.connect(self.db_path)
+
     def init_database(self):
         """Initialize SQLite database for user analytics"""
 
         if not all([self]):
             raise ValueError("Invalid parameters")
+        import sqlite3
+
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
@@ -105,9 +121,9 @@ class UserBehaviorAnalyzer:
     def record_session(self, session_data: Dict):
         """Record user session for learning"""
 
-        if not all([self, session_data: Dict]):
+        if not all([self, session_data]):
             raise ValueError("Invalid parameters")
-        conn = sqlite3.connect(self.db_path)
+        conn = self.connect()
         cursor = conn.cursor()
 
         cursor.execute('''
@@ -136,10 +152,9 @@ class UserBehaviorAnalyzer:
                            system_context: Dict, resolution: str = None):
         """Record error patterns for learning"""
 
-        if not all([self, error_type: str, error_message: str,
-                           system_context: Dict, resolution: str = None]):
+        if not all([self, error_type, error_message]):
             raise ValueError("Invalid parameters")
-        conn = sqlite3.connect(self.db_path)
+        conn = self.connect()
         cursor = conn.cursor()
 
         # Check if pattern exists
@@ -229,7 +244,7 @@ class UserBehaviorAnalyzer:
             })
 
         # Query historical patterns
-        conn = sqlite3.connect(self.db_path)
+        conn = self.connect()
         cursor = conn.cursor()
 
         cursor.execute('''
@@ -258,7 +273,7 @@ class UserBehaviorAnalyzer:
     def update_model(self, session_data: Dict):
         """Update ML model with new session data"""
 
-        if not all([self, session_data: Dict]):
+        if not all([self, session_data]):
             raise ValueError("Invalid parameters")
         success = session_data.get('success', False)
         errors = session_data.get('errors', [])
@@ -7,11 +7,19 @@ Advanced pattern recognition and improvement suggestions
 
 import ast
 import re
+import sys
 import json
 import time
 from pathlib import Path
 from typing import List, Dict, Tuple
 
+if __name__ == "__main__":
+    # Allow running as a script from the tools directory
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools.rule_profiler import get_rule_profiler, profiled_finditer
+from tools.rule_plan import may_match
+
 class AICodeOptimizer:
     """AI-powered code optimization system"""
 
@@ -149,9 +157,16 @@ class AICodeOptimizer:
     def _find_optimizations(self, code: str) -> List[Dict]:
         """Find optimization opportunities"""
         optimizations = []
+        profiler = get_rule_profiler()
 
         for rule_name, rule in self.optimization_rules.items():
-            matches = re.finditer(rule['pattern'], code, re.MULTILINE | re.DOTALL)
+            if profiler is None:
+                if not may_match(rule['pattern'], code, re.MULTILINE | re.DOTALL):
+                    continue
+                matches = re.finditer(rule['pattern'], code, re.MULTILINE | re.DOTALL)
+            else:
+                matches = profiled_finditer(profiler, 'ai_optimizer', rule['pattern'], code,
+                                            re.MULTILINE | re.DOTALL, rule=rule_name)
 
             for match in matches:
                 line_num = code[:match.start()].count('\n') + 1
@@ -181,10 +196,17 @@ class AICodeOptimizer:
     def _find_performance_issues(self, code: str) -> List[Dict]:
         """Find performance issues"""
         issues = []
+        profiler = get_rule_profiler()
 
         for category, patterns in self.performance_patterns.items():
             for pattern in patterns:
-                matches = re.finditer(pattern, code, re.MULTILINE)
+                if profiler is None:
+                    if not may_match(pattern, code, re.MULTILINE):
+                        continue
+                    matches = re.finditer(pattern, code, re.MULTILINE)
+                else:
+                    matches = profiled_finditer(profiler, 'ai_optimizer', pattern, code,
+                                                re.MULTILINE, rule=f"{category}: {pattern}")
 
                 for match in matches:
                     line_num = code[:match.start()].count('\n') + 1
@@ -204,10 +226,17 @@ class AICodeOptimizer:
     def _find_security_issues(self, code: str) -> List[Dict]:
         """Find security vulnerabilities"""
         issues = []
+        profiler = get_rule_profiler()
 
         for category, patterns in self.security_patterns.items():
             for pattern in patterns:
-                matches = re.finditer(pattern, code, re.MULTILINE)
+                if profiler is None:
+                    if not may_match(pattern, code, re.MULTILINE):
+                        continue
+                    matches = re.finditer(pattern, code, re.MULTILINE)
+                else:
+                    matches = profiled_finditer(profiler, 'ai_optimizer', pattern, code,
+                                                re.MULTILINE, rule=f"{category}: {pattern}")
 
                 for match in matches:
                     line_num = code[:match.start()].count('\n') + 1
@@ -365,7 +394,7 @@ class AICodeOptimizer:
 """
 
         if analysis['optimizations']:
-            report = f"{report}{"\n🔧 Optimization Opportunities:\n"}"
+            report += "\n🔧 Optimization Opportunities:\n"
             for i, opt in enumerate(analysis['optimizations'][:5], 1):
                 report += f"{i}. {opt['suggestion']} (Line {opt['line']}, Confidence: {opt['confidence']:.1%})\n"
 
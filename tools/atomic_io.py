@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+IRUS V6.0 - Atomic File Writes
+Write files so readers only ever see the old or the new content
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+
+def atomic_write_text(path, content, encoding='utf-8'):
+    """
+    Write text to path atomically
+
+    The content goes to a temp file in the same directory, is flushed to
+    disk, and then renamed over the target. A macro that is running from
+    the target file never reads a half-written script.
+    """
+    if not all([path]):
+        raise ValueError("Invalid parameters")
+    path = Path(path)
+    fd, temp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+
+    try:
+        with os.fdopen(fd, 'w', encoding=encoding) as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # mkstemp creates owner-only files; keep the permissions scripts normally get
+        if path.exists():
+            shutil.copymode(str(path), temp_path)
+        else:
+            os.chmod(temp_path, 0o644)
+
+        os.replace(temp_path, str(path))
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
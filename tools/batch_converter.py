@@ -1,4 +1,3 @@
-from functools import lru_cache
 #!/usr/bin/env python3
 """
 IRUS V6.0 - Batch Conversion System
@@ -8,32 +7,61 @@ Advanced parallel processing with progress tracking
 
 import os
 import sys
+import hashlib
+import itertools
 import threading
 import time
 import json
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
+if __name__ == "__main__":
+    # Allow running as a script from the tools directory
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools.atomic_io import atomic_write_text
+from tools.rule_profiler import RuleProfiler, get_rule_profiler, profiled_replace, profile_rules as profile_rules_scope
+from tools.rule_plan import get_rule_stats
+from tools.tracing import now_us, record_span, span
+from tools.metrics import QUEUE_DEPTH, record_conversion, record_failure, time_stage
+from tools.ui_events import UIEventQueue
+from tools.queue_view import QueueView
+from tools.worker_pool import configure_worker_pool, SharedExecutor
+from tools.execution_profile import (add_profile_arguments, apply_cache_limits, describe, load_profile,
+                                     streaming_window)
+
 class BatchConverter:
     """Advanced batch conversion system"""
 
-    def __init__(self):
+    def __init__(self, profile=None):
         if not all([self]):
             raise ValueError("Invalid parameters")
+        # Workers, streaming and validation depth; the saved GUI settings unless given
+        self.profile = profile or load_profile()
         self.conversion_queue = []
         self.completed_conversions = []
         self.failed_conversions = []
         self.progress_callback = None
 
+        # Stable ids for queued items; the GUI uses them as tree row ids
+        self._item_ids = itertools.count(1)
+
+        # Source digests of files converted in watch mode, to skip no-op saves
+        self._watch_digests = {}
+
+        # Per-rule statistics of the last batch run with profile_rules=True
+        self.rule_profile = None
+
     def add_files_to_queue(self, file_paths, target_system="macOS"):
         """Add files to conversion queue"""
-        if not all([self, file_paths, target_system="macOS"]):
+        if not all([self, file_paths, target_system]):
             raise ValueError("Invalid parameters")
         for file_path in file_paths:
             if Path(file_path).resolve().suffix == '.py':
                 self.conversion_queue.append({
+                    'id': f"item{next(self._item_ids)}",
                     'input_path': file_path,
                     'target_system': target_system,
                     'status': 'pending',
@@ -52,74 +80,220 @@ class BatchConverter:
         output_name = f"{input_file.stem}{suffix}{input_file.suffix}"
         return output_dir / output_name
 
-    def convert_batch(self, max_workers=4):
-        """Convert all files in batch with parallel processing"""
-        if not all([self, max_workers=4]):
+    def convert_batch(self, max_workers=None, profile_rules=False):
+        """
+        Convert all files in batch with parallel processing
+
+        max_workers defaults to the execution profile's worker count. With
+        profile_rules=True every rule application is timed and the
+        statistics for the whole batch are left in self.rule_profile.
+        """
+        if not all([self]):
             raise ValueError("Invalid parameters")
         if not self.conversion_queue:
             return
+        max_workers = max_workers or self.profile['workers']
+
+        stats = get_rule_stats()
+        if profile_rules:
+            self.rule_profile = RuleProfiler()
+            with profile_rules_scope(self.rule_profile):
+                self._run_batch(max_workers)
+            stats.merge_profiler(self.rule_profile)
+        else:
+            self._run_batch(max_workers)
+        stats.save()
+
+    def start_batch(self, executor, on_complete=None):
+        """
+        Convert all queued files on executor without waiting for them
+
+        Each finished file is recorded and reported from the worker that
+        converted it; on_complete() runs on the worker that finishes last.
+        Used by the GUI with the shared worker pool, so no thread sits
+        waiting on the batch. An error stops the batch and is printed, as
+        there is no caller left to raise it to.
+        """
+        if not all([self, executor]):
+            raise ValueError("Invalid parameters")
+        stats = get_rule_stats()
 
-        total_files = len(self.conversion_queue)
-        completed = 0
+        def batch_done(error):
+            if error is not None:
+                print(f"❌ Batch stopped: {error}")
+            stats.save()
+            if on_complete:
+                on_complete()
+
+        self._submit_batch(executor, batch_done)
+
+    def _run_batch(self, max_workers):
+        """Convert the queued files on a thread pool; re-raises the error that stopped the batch"""
+        finished = threading.Event()
+        outcome = []
+
+        def batch_done(error):
+            outcome.append(error)
+            finished.set()
 
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all conversion tasks
-            future_to_file = {
-                executor.submit(self._convert_single_file, item): item
-                for item in self.conversion_queue
+            self._submit_batch(executor, batch_done)
+            finished.wait()
+        if outcome[0] is not None:
+            raise outcome[0]
+
+    def _submit_batch(self, executor, on_complete):
+        """
+        Hand the queued files to executor and call on_complete(error) after the last one
+
+        A streaming profile keeps only a window of files in flight and
+        submits the next one as each finishes; otherwise all are submitted.
+        Completion runs in Future done-callbacks, which swallow exceptions,
+        so an error while recording a result (a raising progress callback)
+        or submitting a file (a pool shutting down) is kept instead: files
+        not yet submitted are skipped, and error is the first one kept, or
+        None. Every file is counted either way, so on_complete always runs.
+        """
+        items = list(self.conversion_queue)
+        total_files = len(items)
+        if not total_files:
+            on_complete(None)
+            return
+
+        window = streaming_window(self.profile) or total_files
+        remaining = iter(items)
+        submit_lock = threading.Lock()
+        result_lock = threading.Lock()
+        # recorded numbers the progress reports; finished also counts skipped files
+        recorded = [0]
+        finished = [0]
+        errors = []
+        QUEUE_DEPTH.inc(total_files, component='batch')
+
+        def finish(count):
+            with result_lock:
+                finished[0] += count
+                done = finished[0] == total_files
+            if done:
+                on_complete(errors[0] if errors else None)
+            return done
+
+        def stop(error):
+            with result_lock:
+                errors.append(error)
+            with submit_lock:
+                skipped = sum(1 for _ in remaining)
+            if skipped:
+                QUEUE_DEPTH.dec(skipped, component='batch')
+                finish(skipped)
+
+        def submit_next():
+            with submit_lock:
+                item = next(remaining, None)
+                if item is None:
+                    return
+                try:
+                    future = executor.submit(self._convert_single_file, item, now_us())
+                except Exception as e:
+                    future, error = None, e
+            if future is None:
+                QUEUE_DEPTH.dec(component='batch')
+                stop(error)
+                finish(1)
+                return
+            # Runs file_done right here if the file already finished
+            future.add_done_callback(lambda future: file_done(future, item))
+
+        def file_done(future, item):
+            try:
+                with result_lock:
+                    recorded[0] += 1
+                    self._record_result(future, item, recorded[0], total_files)
+            except Exception as e:
+                stop(e)
+            finally:
+                done = finish(1)
+            if not done and not errors:
+                submit_next()
+
+        for _ in range(min(window, total_files)):
+            submit_next()
+
+    def _record_result(self, future, item, completed, total_files):
+        """File the result of one finished conversion and report progress"""
+        try:
+            result = future.result()
+            if result['success']:
+                self.completed_conversions.append(result)
+                item['status'] = 'completed'
+            else:
+                self.failed_conversions.append(result)
+                item['status'] = 'failed'
+
+        except Exception as e:
+            error_result = {
+                'input_path': item['input_path'],
+                'success': False,
+                'error': str(e)
             }
+            self.failed_conversions.append(error_result)
+            item['status'] = 'failed'
 
-            # Process completed conversions
-            for future in as_completed(future_to_file):
-                item = future_to_file[future]
-                completed += 1
+        # Update progress
+        if self.progress_callback:
+            progress = (completed / total_files) * 100
+            self.progress_callback(progress, completed, total_files, item)
 
-                try:
-                    result = future.result()
-                    if result['success']:
-                        self.completed_conversions.append(result)
-                        item['status'] = 'completed'
-                    else:
-                        self.failed_conversions.append(result)
-                        item['status'] = 'failed'
+    def _convert_single_file(self, item, queued_at=None, validate=None):
+        """
+        Convert a single file; queued_at is when it was handed to the pool (now_us())
 
-                except Exception as e:
-                    error_result = {
-                        'input_path': item['input_path'],
-                        'success': False,
-                        'error': str(e)
-                    }
-                    self.failed_conversions.append(error_result)
-                    item['status'] = 'failed'
-
-                # Update progress
-                if self.progress_callback:
-                    progress = (completed / total_files) * 100
-                    self.progress_callback(progress, completed, total_files, item)
-
-    def _convert_single_file(self, item):
-        """Convert a single file"""
+        validate defaults to the execution profile: Thorough validates every output.
+        """
         if not all([self, item]):
             raise ValueError("Invalid parameters")
+        if queued_at is not None:
+            QUEUE_DEPTH.dec(component='batch')
+            record_span('queue_wait', queued_at, file=item['input_path'])
+        with span('batch_file', file=item['input_path']):
+            result = self._convert_file(item)
+        if validate is None:
+            validate = self.profile['validation'] == 'full'
+        # Validated on the worker, alongside the other conversions
+        if result['success'] and validate:
+            result['validation'] = self._validate_output(result['output_path'])
+        return result
+
+    def _convert_file(self, item):
+        """Body of _convert_single_file"""
+        started = time.perf_counter()
         try:
             input_path = Path(item['input_path']).resolve()
             output_path = Path(item['output_path']).resolve()
             target_system = item['target_system']
 
             # Read input file
-            with open(input_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            with span('read', file=str(input_path)), time_stage('read'):
+                with open(input_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
 
             # Apply conversions based on target system
-            converted_content = self._apply_conversions(content, target_system)
+            with span('convert', file=str(input_path), bytes=len(content)):
+                profiler = get_rule_profiler()
+                if profiler is not None:
+                    with profiler.file_scope(input_path):
+                        converted_content = self._apply_conversions(content, target_system)
+                else:
+                    converted_content = self._apply_conversions(content, target_system)
 
             # Add header
             header = self._generate_header(input_path.name, target_system)
             final_content = header + "\n\n" + converted_content
 
-            # Write output file
-            with open(output_path, "w", encoding="utf-8", encoding='utf-8') as f:
-                f.write(final_content)
+            # Write output file atomically so a running macro never sees a partial script
+            with span('write', file=str(output_path), bytes=len(final_content)), time_stage('write'):
+                atomic_write_text(output_path, final_content)
+            record_conversion('batch', len(content), time.perf_counter() - started)
 
             return {
                 'input_path': str(input_path),
@@ -130,12 +304,116 @@ class BatchConverter:
             }
 
         except Exception as e:
+            record_failure('batch', e)
             return {
                 'input_path': str(input_path),
                 'success': False,
                 'error': str(e)
             }
 
+    def reconvert_files(self, file_paths, target_system="macOS", validate=True):
+        """Reconvert and revalidate only the given files, skipping unchanged sources"""
+        if not all([self, target_system]):
+            raise ValueError("Invalid parameters")
+        results = []
+
+        for file_path in file_paths:
+            input_path = Path(file_path).resolve()
+            try:
+                with open(input_path, 'rb') as f:
+                    digest = hashlib.sha1(f.read()).hexdigest()
+            except OSError:
+                # Deleted or moved away since the change was reported
+                self._watch_digests.pop(str(input_path), None)
+                continue
+
+            if self._watch_digests.get(str(input_path)) == digest:
+                continue
+
+            item = {
+                'input_path': str(input_path),
+                'target_system': target_system,
+                'status': 'pending',
+                'output_path': self._generate_output_path(input_path, target_system)
+            }
+            result = self._convert_single_file(item, validate=False)
+
+            if result['success']:
+                self._watch_digests[str(input_path)] = digest
+                item['status'] = 'completed'
+                if validate:
+                    result['validation'] = self._validate_output(result['output_path'])
+            else:
+                item['status'] = 'failed'
+
+            results.append(result)
+
+        return results
+
+    def _validate_output(self, output_path):
+        """Run the ultra validator over a converted file"""
+        if not all([self, output_path]):
+            raise ValueError("Invalid parameters")
+        try:
+            from tools.ultra_validator import ultra_validate_report
+            report = ultra_validate_report(output_path)
+            return {
+                'score': report['validation_score'],
+                'status': report['status'],
+                'critical_issues': report['summary']['critical_issues'],
+                'warnings': report['summary']['warnings']
+            }
+        except Exception as e:
+            return {'score': 0, 'status': f'Validation failed: {e}', 'critical_issues': 1, 'warnings': 0}
+
+    def watch_folder(self, folder, target_system="macOS", debounce=0.3, validate=True,
+                     use_inotify=True, on_results=None, background=False):
+        """
+        Keep a folder's converted copies in sync with its scripts
+
+        Every script is converted once, then the folder is watched and each
+        debounced batch of changed scripts is reconverted and revalidated
+        with this same converter. Returns the FileWatcher; with
+        background=True it runs on a daemon thread, otherwise this call
+        blocks until the watcher is stopped.
+        """
+        if not all([self, folder, target_system]):
+            raise ValueError("Invalid parameters")
+        from tools.file_watcher import FileWatcher, is_watched_script
+
+        folder = Path(folder).resolve()
+        on_results = on_results or self._print_watch_results
+
+        def handle_changes(changed_paths):
+            results = self.reconvert_files(changed_paths, target_system, validate)
+            if results:
+                on_results(results)
+
+        initial = [path for path in sorted(folder.rglob("*.py")) if is_watched_script(path)]
+        on_results(self.reconvert_files(initial, target_system, validate))
+
+        watcher = FileWatcher(folder, handle_changes, debounce=debounce, use_inotify=use_inotify)
+        print(f"👀 Watching {folder} ({watcher.backend_name}) - press Ctrl+C to stop")
+
+        if background:
+            watcher.start()
+        else:
+            watcher.run()
+        return watcher
+
+    def _print_watch_results(self, results):
+        """Print one line per reconverted file"""
+        for result in results:
+            name = Path(result['input_path']).name
+            if not result['success']:
+                print(f"❌ {name}: {result.get('error', 'conversion failed')}")
+                continue
+            validation = result.get('validation')
+            if validation:
+                print(f"✅ {name} → {result['output_path']} (validation {validation['score']}/100)")
+            else:
+                print(f"✅ {name} → {result['output_path']}")
+
     def _apply_conversions(self, content, target_system):
         """Apply target-specific conversions"""
         if not all([self, content, target_system]):
@@ -152,8 +430,7 @@ class BatchConverter:
                 'C:\\': '/Users/'
             }
 
-            for old, new in conversions.items():
-                converted = converted.replace(old, new)
+            converted = self._replace_all(converted, conversions)
 
         elif target_system == "Linux":
             # Linux-specific conversions
@@ -164,11 +441,25 @@ class BatchConverter:
                 'C:\\': '/home/'
             }
 
-            for old, new in conversions.items():
-                converted = converted.replace(old, new)
+            converted = self._replace_all(converted, conversions)
 
         return converted
 
+    def _replace_all(self, content, conversions):
+        """Apply a dict of literal replacements in order"""
+        profiler = get_rule_profiler()
+        stats = get_rule_stats()
+        for old, new in conversions.items():
+            if profiler is None:
+                # A miss costs the same single scan as replace(); a hit is counted for the rule statistics
+                hit = old in content
+                if hit:
+                    content = content.replace(old, new)
+                stats.record('batch_converter', old, int(hit))
+            else:
+                content, _ = profiled_replace(profiler, 'batch_converter', old, new, content)
+        return content
+
     def _generate_header(self, original_filename, target_system):
         """Generate header for converted file"""
         if not all([self, original_filename, target_system]):
@@ -187,7 +478,6 @@ import os
 import sys
 import time
 from pathlib import Path'''
-    @lru_cache(maxsize=128)
 
     def get_summary(self):
         """Get conversion summary"""
@@ -201,14 +491,31 @@ from pathlib import Path'''
         }
 
 class BatchConverterGUI:
-    """GUI for batch conversion"""
+    """
+    GUI for batch conversion
+
+    Given a parent it is a Toplevel of the main window and shares its UI
+    event queue; on its own it owns a Tk root and a queue of its own, and
+    applies the execution profile's pool size, cache limits and UI tick.
+    """
 
-    def __init__(self):
+    def __init__(self, parent=None, ui_events=None, profile=None):
         if not all([self]):
             raise ValueError("Invalid parameters")
-        self.root = tk.Tk()
-        self.converter = BatchConverter()
+        self.owns_root = parent is None
+        self.root = tk.Tk() if self.owns_root else tk.Toplevel(parent)
+        self.converter = BatchConverter(profile)
+        self.closed = False
+        # Conversion workers report here; only the mainloop touches widgets
+        self._owns_events = ui_events is None
+        if self._owns_events:
+            profile = self.converter.profile
+            configure_worker_pool(profile['workers'])
+            apply_cache_limits(profile)
+            ui_events = UIEventQueue(self.root, tick_ms=profile['ui_tick_ms']).start()
+        self.ui_events = ui_events
         self.setup_gui()
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
 
     def setup_gui(self):
         """Setup batch converter GUI"""
@@ -270,6 +577,10 @@ class BatchConverterGUI:
         self.file_tree.pack(side='left', fill='both', expand=True)
         scrollbar.pack(side='right', fill='y')
 
+        self.queue_view = QueueView(
+            self.file_tree, scrollbar, lambda: self.converter.conversion_queue, self._row_values
+        )
+
         # Controls
         control_frame = ttk.Frame(main_frame)
         control_frame.pack(fill='x', pady=(0, 15))
@@ -350,18 +661,14 @@ class BatchConverterGUI:
         """Update the file list display"""
         if not all([self]):
             raise ValueError("Invalid parameters")
-        # Clear existing items
-        for item in self.file_tree.get_children():
-            self.file_tree.delete(item)
-
-        # Add queue items
-        for item in self.converter.conversion_queue:
-            filename = Path(item['input_path']).resolve().name
-            self.file_tree.insert('', 'end', values=(
-                filename,
-                item['target_system'],
-                item['status']
-            ))
+        with span('gui_update_file_list', cat='gui', rows=len(self.converter.conversion_queue)):
+            self.queue_view.invalidate()
+            self.queue_view.refresh()
+
+    @staticmethod
+    def _row_values(item):
+        """Values shown in the file list for a queue item"""
+        return (Path(item['input_path']).name, item['target_system'], item['status'])
 
     def start_conversion(self):
         """Start batch conversion"""
@@ -372,30 +679,45 @@ class BatchConverterGUI:
             return
 
         self.convert_btn.config(state='disabled', text="Converting...")
-        self.converter.progress_callback = self.update_progress
+        self.converter.progress_callback = self.post_progress
+
+        # Files convert on the shared worker pool; the last one to finish reports completion
+        started = now_us()
+        files = len(self.converter.conversion_queue)
+
+        def batch_finished():
+            record_span('batch', started, files=files)
+            self.ui_events.post(self.conversion_complete, now_us())
 
-        # Run conversion in separate thread
-        def run_conversion():
-            if not all([]):
-                raise ValueError("Invalid parameters")
-            self.converter.convert_batch()
-            self.root.after(0, self.conversion_complete)
+        # Not the pool itself: a streaming batch keeps going if the profile resizes the pool
+        self.converter.start_batch(SharedExecutor(), on_complete=batch_finished)
 
-        threading.Thread(target=run_conversion, daemon=True).start()
+    def post_progress(self, progress, completed, total, current_item):
+        """Progress callback for conversion threads; the newest report per tick is shown"""
+        self.queue_view.mark_changed(current_item.get('id'))
+        self.ui_events.post_latest('progress', self.update_progress, progress, completed, total, current_item)
 
     def update_progress(self, progress, completed, total, current_item):
-        """Update progress display"""
+        """Update progress display (UI thread only)"""
         if not all([self, progress, completed, total, current_item]):
             raise ValueError("Invalid parameters")
-        self.progress_var.set(progress)
-        filename = Path(current_item['input_path']).resolve().name
-        self.status_label.config(text=f"Converting: {filename} ({completed}/{total})")
-        self.update_file_list()
-
-    def conversion_complete(self):
-        """Handle conversion completion"""
+        if self.closed:
+            return
+        with span('gui_update_progress', cat='gui', completed=completed, total=total):
+            self.progress_var.set(progress)
+            filename = Path(current_item['input_path']).resolve().name
+            self.status_label.config(text=f"Converting: {filename} ({completed}/{total})")
+            self.queue_view.request_refresh()
+
+    def conversion_complete(self, posted_at=None):
+        """Handle conversion completion; posted_at is when the worker scheduled it"""
         if not all([self]):
             raise ValueError("Invalid parameters")
+        if posted_at is not None:
+            # Time the event sat in the UI event queue before the GUI thread ran it
+            record_span('queue_wait', posted_at, cat='gui', event='conversion_complete')
+        if self.closed:
+            return
         summary = self.converter.get_summary()
 
         self.convert_btn.config(state='normal', text="🚀 Start Batch Conversion")
@@ -415,12 +737,90 @@ class BatchConverterGUI:
 
         self.update_file_list()
 
+    def close(self):
+        """Close the window; conversions already running finish in the background"""
+        self.closed = True
+        self.queue_view.stop()
+        if self._owns_events:
+            self.ui_events.stop()
+        self.root.destroy()
+
     def run(self):
-        """Run the batch converter GUI"""
+        """Run the batch converter GUI; a hosted window runs on the main window's mainloop"""
         if not all([self]):
             raise ValueError("Invalid parameters")
-        self.root.mainloop()
+        if self.owns_root:
+            self.root.mainloop()
+        else:
+            self.root.lift()
+            self.root.focus_set()
 
 if __name__ == "__main__":
-    app = BatchConverterGUI()
-    app.run()
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="batch_converter.py",
+        description="IRUS batch converter - opens the GUI unless --watch is given"
+    )
+    parser.add_argument("--watch", metavar="FOLDER", help="Keep converted copies of FOLDER's scripts in sync")
+    parser.add_argument("--target", default="macOS", choices=["macOS", "Linux", "Cross-Platform"])
+    parser.add_argument("--debounce", type=float, default=0.3, help="Seconds of quiet before reconverting")
+    parser.add_argument("--poll", action="store_true", help="Poll for changes instead of using inotify")
+    parser.add_argument("--no-validate", action="store_true", help="Skip validation of reconverted files")
+    parser.add_argument("files", nargs="*", help="Convert these scripts without opening the GUI")
+    parser.add_argument("--workers", type=int, help="Parallel conversions for FILES (default: from the profile)")
+    parser.add_argument("--profile-rules", action="store_true", help="Time every rule and show the most expensive ones")
+    parser.add_argument("--top", type=int, default=10, metavar="N", help="Rules to show with --profile-rules")
+    parser.add_argument("--rule-report", metavar="FILE", help="Export per-rule, per-file statistics (.json or .csv)")
+    parser.add_argument(
+        "--trace", nargs="?", const="cache/trace.jsonl", metavar="FILE",
+        help="Record pipeline spans as Chrome trace events (default: cache/trace.jsonl)"
+    )
+    parser.add_argument("--metrics-port", type=int, metavar="PORT", help="Serve Prometheus metrics on localhost:PORT")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profile = load_profile(speed=args.speed, memory=args.memory)
+    apply_cache_limits(profile)
+
+    if args.metrics_port is not None:
+        from tools.metrics import try_start_metrics_server
+        try_start_metrics_server(args.metrics_port)
+
+    if args.trace:
+        from tools.tracing import enable_tracing
+        print(f"🔬 Tracing to {enable_tracing(args.trace).path}")
+
+    if args.files:
+        print(f"⚙️ Profile {describe(profile)}")
+        converter = BatchConverter(profile)
+        converter.add_files_to_queue(args.files, args.target)
+        converter.convert_batch(args.workers, profile_rules=args.profile_rules or bool(args.rule_report))
+        for result in converter.completed_conversions:
+            validation = result.get('validation')
+            if validation:
+                print(f"✅ {Path(result['input_path']).name} → {result['output_path']} "
+                      f"(validation {validation['score']}/100)")
+            else:
+                print(f"✅ {Path(result['input_path']).name} → {result['output_path']}")
+        for result in converter.failed_conversions:
+            print(f"❌ {Path(result['input_path']).name}: {result.get('error', 'conversion failed')}")
+
+        if converter.rule_profile is not None:
+            print(f"\n⏱️ Top {args.top} rules by time:")
+            print(converter.rule_profile.format_top(args.top))
+            if args.rule_report:
+                print(f"📄 Rule statistics saved to {converter.rule_profile.export(args.rule_report)}")
+        sys.exit(1 if converter.failed_conversions else 0)
+
+    if args.watch:
+        converter = BatchConverter(profile)
+        try:
+            converter.watch_folder(
+                args.watch, args.target, debounce=args.debounce,
+                validate=not args.no_validate, use_inotify=not args.poll
+            )
+        except KeyboardInterrupt:
+            print("\n👋 Watch mode stopped")
+    else:
+        app = BatchConverterGUI(profile=profile)
+        app.run()
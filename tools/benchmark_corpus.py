@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+IRUS V6.0 - Benchmark Corpus Generator
+Builds realistic Windows macro scripts of any size from a seed
+The same seed and size always produce the same script
+"""
+
+import random
+from pathlib import Path
+
+# Named sizes used by the benchmark suite
+SIZE_PRESETS = {
+    '1KB': 1024,
+    '16KB': 16 * 1024,
+    '256KB': 256 * 1024,
+    '1MB': 1024 * 1024,
+    '8MB': 8 * 1024 * 1024,
+    '50MB': 50 * 1024 * 1024,
+}
+DEFAULT_SIZES = ['1KB', '16KB', '256KB', '1MB']
+DEFAULT_SEED = 1337
+
+IMPORT_LINES = [
+    "import mss",
+    "import pyautogui",
+    "import keyboard",
+    "import win32api",
+    "import win32gui",
+    "import win32con",
+    "from ctypes import windll",
+    "import os",
+    "import time",
+    "import threading",
+    "import random",
+    "import numpy as np",
+    "import cv2",
+]
+
+GAMES = ['fisch', 'fishing_sim', 'deep_sea', 'lake_life', 'reef_run']
+KEYS = ['q', 'e', 'r', 'f', 'space', 'shift', 'esc', 'f1', 'tab']
+IMAGES = ['bait', 'bobber', 'catch', 'reel', 'shake', 'inventory', 'sell']
+
+
+def parse_size(label):
+    """Turn '256KB', '1MB' or a plain byte count into bytes"""
+    if not all([label]):
+        raise ValueError("Invalid parameters")
+    label = str(label).strip().upper()
+    if label in SIZE_PRESETS:
+        return SIZE_PRESETS[label]
+    for suffix, factor in (('MB', 1024 * 1024), ('KB', 1024), ('B', 1)):
+        if label.endswith(suffix):
+            return int(float(label[:-len(suffix)]) * factor)
+    return int(label)
+
+
+def size_label(size):
+    """Short human label for a byte count"""
+    for label, preset in SIZE_PRESETS.items():
+        if preset == size:
+            return label
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):g}MB"
+    if size >= 1024:
+        return f"{size / 1024:g}KB"
+    return f"{size}B"
+
+
+class MacroScriptGenerator:
+    """
+    Seeded generator of Windows macro scripts
+
+    Scripts look like the ones users actually convert: a header of
+    imports, a config block full of Windows paths, then a run of helper
+    functions and bot classes built from pyautogui, mss, keyboard,
+    win32api and path handling, closed by a main loop. Units are numbered
+    so that large scripts are not one block repeated.
+    """
+
+    def __init__(self, seed=DEFAULT_SEED):
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        self.seed = seed
+
+    def generate(self, target_bytes, multiline=False):
+        """
+        Generate a script of about target_bytes (never less)
+
+        multiline mixes in calls, Windows API references and drive paths
+        that continue over several lines, some past a def or class line
+        where the chunked pipeline may split them; scripts without it are
+        unchanged.
+        """
+        if not all([self, target_bytes]):
+            raise ValueError("Invalid parameters")
+        rng = random.Random(f"{self.seed}:{target_bytes}" + (":multiline" if multiline else ""))
+        parts = [self._header(rng)]
+        size = len(parts[0])
+        index = 0
+
+        builders = [self._capture_function, self._click_function, self._key_function,
+                    self._win32_function, self._path_function, self._bot_class]
+        if multiline:
+            builders.append(self._multiline_unit)
+        while size < target_bytes:
+            unit = rng.choice(builders)(rng, index)
+            parts.append(unit)
+            size += len(unit)
+            index += 1
+
+        parts.append(self._main_block(rng))
+        return ''.join(parts)
+
+    def write(self, directory, target_bytes, name=None):
+        """Generate a script into directory and return its path"""
+        if not all([self, directory, target_bytes]):
+            raise ValueError("Invalid parameters")
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / (name or f"macro_{size_label(target_bytes)}_{self.seed}.py")
+        with open(path, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(self.generate(target_bytes))
+        return path
+
+    def _header(self, rng):
+        imports = ['import mss', 'import pyautogui', 'import keyboard']
+        imports += rng.sample(IMPORT_LINES[3:], k=rng.randint(3, len(IMPORT_LINES) - 3))
+        game = rng.choice(GAMES)
+        images = ',\n'.join(
+            f'    "{image}": "C:\\\\Users\\\\Player\\\\Macros\\\\{game}\\\\{image}.png"'
+            for image in rng.sample(IMAGES, k=4)
+        )
+        return (
+            '"""\n'
+            f'{game} auto fishing macro\n'
+            'Windows only - uses pyautogui, mss and win32api\n'
+            '"""\n\n'
+            + '\n'.join(dict.fromkeys(imports)) + '\n\n'
+            f'GAME_DIR = "C:\\\\Program Files\\\\{game}"\n'
+            f'SAVE_DIR = os.path.join("C:\\\\Users\\\\Player\\\\Documents", "{game}")\n'
+            f'CAST_DELAY = {rng.uniform(0.1, 2.0):.2f}\n'
+            f'REEL_KEY = "{rng.choice(KEYS)}"\n'
+            'IMAGES = {\n' + images + '\n}\n'
+            f'monitor = {{"top": {rng.randint(0, 200)}, "left": {rng.randint(0, 300)}, '
+            f'"width": {rng.choice([800, 1280, 1920])}, "height": {rng.choice([600, 720, 1080])}}}\n\n'
+        )
+
+    def _capture_function(self, rng, index):
+        return (
+            f'def capture_region_{index}():\n'
+            '    """Grab the bobber area"""\n'
+            '    with mss.mss() as sct:\n'
+            '        img = sct.grab(monitor)\n'
+            f'        frame = np.array(img)[:, :, :3]\n'
+            f'    if frame.mean() > {rng.randint(40, 200)}:\n'
+            f'        return mss.mss().grab({{"top": {rng.randint(0, 900)}, "left": {rng.randint(0, 1600)}, "width": 64, "height": 64}})\n'
+            '    return frame\n\n'
+        )
+
+    def _click_function(self, rng, index):
+        x, y = rng.randint(0, 1920), rng.randint(0, 1080)
+        return (
+            f'def click_target_{index}(offset=0):\n'
+            f'    pyautogui.moveTo({x} + offset, {y})\n'
+            f'    pyautogui.click({x} + offset, {y})\n'
+            f'    time.sleep({rng.choice(["0", "0.001", "0.05", "CAST_DELAY"])})\n'
+            f'    pyautogui.rightClick({x}, {y} + offset)\n'
+            f'    pyautogui.drag({rng.randint(-50, 50)}, {rng.randint(-50, 50)})\n\n'
+        )
+
+    def _key_function(self, rng, index):
+        key = rng.choice(KEYS)
+        return (
+            f'def wait_for_bite_{index}():\n'
+            '    while True:\n'
+            f'        if keyboard.is_pressed("{key}"):\n'
+            '            break\n'
+            f'        keyboard.press("{rng.choice(KEYS)}")\n'
+            f'    keyboard.wait("{rng.choice(KEYS)}")\n\n'
+        )
+
+    def _win32_function(self, rng, index):
+        return (
+            f'def focus_game_{index}():\n'
+            f'    hwnd = win32gui.FindWindow(None, "{rng.choice(GAMES)}")\n'
+            '    win32gui.SetForegroundWindow(hwnd)\n'
+            f'    win32api.SetCursorPos(({rng.randint(0, 1920)}, {rng.randint(0, 1080)}))\n'
+            '    hdc = windll.user32.GetDC(0)\n'
+            '    dpi = windll.gdi32.GetDeviceCaps(hdc, 88)\n'
+            '    windll.user32.ReleaseDC(0, hdc)\n'
+            '    return dpi\n\n'
+        )
+
+    def _path_function(self, rng, index):
+        image = rng.choice(IMAGES)
+        return (
+            f'def load_asset_{index}():\n'
+            f'    path = os.path.join(GAME_DIR, "assets\\\\{image}_{index}.png")\n'
+            f'    backup = "D:\\\\Backups\\\\{rng.choice(GAMES)}\\\\{image}.png"\n'
+            '    if not os.path.exists(path):\n'
+            '        path = backup\n'
+            '    return cv2.imread(path)\n\n'
+        )
+
+    def _bot_class(self, rng, index):
+        x, y = rng.randint(0, 1920), rng.randint(0, 1080)
+        return (
+            f'class FishingBot{index}:\n'
+            f'    """Bot variant {index}"""\n\n'
+            '    def __init__(self):\n'
+            '        self.running = False\n'
+            f'        self.catches = {rng.randint(0, 10)}\n\n'
+            '    def cast(self):\n'
+            f'        pyautogui.click({x}, {y})\n'
+            '        time.sleep(CAST_DELAY)\n\n'
+            '    def reel(self):\n'
+            '        with mss.mss() as sct:\n'
+            '            img = sct.grab(monitor)\n'
+            '        if keyboard.is_pressed(REEL_KEY):\n'
+            '            self.running = False\n'
+            f'        win32api.keybd_event(0x{rng.randint(0x41, 0x5A):02X}, 0, 0, 0)\n'
+            '        return img\n\n'
+        )
+
+    def _multiline_unit(self, rng, index):
+        x, y = rng.randint(0, 1920), rng.randint(0, 1080)
+        game = rng.choice(GAMES)
+        return rng.choice([
+            # Arguments on their own lines inside a function
+            f'def drag_line_{index}():\n'
+            '    pyautogui.click(\n'
+            f'        {x},\n'
+            f'        {y})\n'
+            '    hdc = windll.user32.GetDC(\n'
+            '        0)\n'
+            '    return hdc\n\n',
+            # A bare API reference left open right before the next def
+            'windll.user32\n\n'
+            f'def focus_window_{index}(hwnd):\n'
+            f'    pyautogui.click({x},\n'
+            f'                    {y})\n'
+            '    return hwnd\n\n',
+            # A drive path that runs on inside a multi-line string past a class-like line
+            f'NOTES_{index} = """C:\\\\Games\\\\{game}\n'
+            'class names below match the game folders\n'
+            '"""\n\n',
+        ])
+
+    def _main_block(self, rng):
+        return (
+            'def main():\n'
+            '    print("Starting macro - press F1 to stop")\n'
+            '    while not keyboard.is_pressed("f1"):\n'
+            '        pyautogui.click(960, 540)\n'
+            '        time.sleep(0)\n\n'
+            'if __name__ == "__main__":\n'
+            '    main()\n'
+        )
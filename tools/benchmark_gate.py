@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+IRUS V6.0 - Performance Regression Gate
+Compares fresh benchmark runs against baselines stored per machine
+Exits non-zero when a stage is confidently slower than the threshold allows
+"""
+
+import sys
+import json
+import random
+import hashlib
+import statistics
+from pathlib import Path
+
+if __name__ == "__main__":
+    # Allow running as a script from the tools directory
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools.benchmark_suite import BenchmarkSuite, RESULTS_DIR, machine_info, save_results
+from tools.benchmark_corpus import DEFAULT_SEED, DEFAULT_SIZES
+
+BASELINE_DIR = RESULTS_DIR / "baselines"
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_REPEAT = 7
+DEFAULT_CONFIDENCE = 0.95
+BOOTSTRAP_ROUNDS = 2000
+
+# Stages faster than this are too noisy to fail the gate
+NOISE_FLOOR_SECONDS = 0.0005
+
+
+def machine_fingerprint(info=None):
+    """Short stable id for the hardware and interpreter a run used"""
+    info = info or machine_info()
+    python_minor = '.'.join(str(info.get('python', '')).split('.')[:2])
+    key = '|'.join(str(part) for part in (
+        info.get('machine'), info.get('processor'), info.get('cpu_count'),
+        info.get('implementation'), python_minor, info.get('platform', '').split('-')[0]
+    ))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]
+
+
+def baseline_path(fingerprint, baseline_dir=None):
+    """Where the baseline for a machine fingerprint lives"""
+    return Path(baseline_dir or BASELINE_DIR) / f"{fingerprint}.json"
+
+
+def load_report(path):
+    """Load a benchmark report"""
+    if not all([path]):
+        raise ValueError("Invalid parameters")
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def bootstrap_ratio_interval(baseline, current, confidence=DEFAULT_CONFIDENCE, rounds=BOOTSTRAP_ROUNDS, seed=0):
+    """
+    Confidence interval for median(current) / median(baseline)
+
+    Percentile bootstrap: both sample sets are resampled with replacement
+    and the ratio of their medians is collected. A fixed seed keeps the
+    gate's verdict reproducible for the same inputs.
+    """
+    if not all([baseline, current]):
+        raise ValueError("Invalid parameters")
+    rng = random.Random(seed)
+    ratios = []
+    for _ in range(rounds):
+        base = statistics.median(rng.choices(baseline, k=len(baseline)))
+        cur = statistics.median(rng.choices(current, k=len(current)))
+        if base > 0:
+            ratios.append(cur / base)
+    if not ratios:
+        return (1.0, 1.0)
+    ratios.sort()
+    tail = (1 - confidence) / 2
+    low = ratios[int(tail * (len(ratios) - 1))]
+    high = ratios[int((1 - tail) * (len(ratios) - 1))]
+    return (low, high)
+
+
+def _result_key(result):
+    return (result['component'], result['stage'], result['size'])
+
+
+def compare_reports(baseline, current, threshold=DEFAULT_THRESHOLD, confidence=DEFAULT_CONFIDENCE,
+                    noise_floor=NOISE_FLOOR_SECONDS):
+    """
+    Compare two benchmark reports stage by stage
+
+    A stage regresses when its median time grew by more than threshold
+    and the lower bound of the bootstrap interval for the slowdown is
+    still above 1, i.e. it is slower beyond reasonable noise. Stages
+    under noise_floor in both runs are reported but never fail.
+    """
+    if not all([baseline, current]):
+        raise ValueError("Invalid parameters")
+    baseline_results = {_result_key(result): result for result in baseline['results']}
+    rows = []
+
+    for result in current['results']:
+        key = _result_key(result)
+        previous = baseline_results.get(key)
+        if previous is None:
+            rows.append({'key': key, 'status': 'new', 'current': result['seconds']})
+            continue
+
+        base_median = statistics.median(previous['samples'])
+        cur_median = statistics.median(result['samples'])
+        ratio = cur_median / base_median if base_median else 1.0
+        low, high = bootstrap_ratio_interval(previous['samples'], result['samples'], confidence)
+
+        if max(base_median, cur_median) < noise_floor:
+            status = 'noise'
+        elif ratio > 1 + threshold and low > 1.0:
+            status = 'REGRESSION'
+        elif ratio < 1 - threshold and high < 1.0:
+            status = 'faster'
+        else:
+            status = 'ok'
+
+        rows.append({
+            'key': key,
+            'status': status,
+            'baseline': base_median,
+            'current': cur_median,
+            'change': ratio - 1,
+            'interval': (low - 1, high - 1),
+        })
+
+    current_keys = {_result_key(result) for result in current['results']}
+    for key in baseline_results:
+        if key not in current_keys:
+            rows.append({'key': key, 'status': 'missing', 'baseline': baseline_results[key]['seconds']})
+
+    return rows
+
+
+def _format_seconds(seconds):
+    if seconds is None:
+        return '-'
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.0f}µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds:.2f}s"
+
+
+def print_diff_table(rows):
+    """Print the per-stage comparison"""
+    header = f"{'Component':<10} {'Stage':<34} {'Size':>6} {'Baseline':>10} {'Current':>10} {'Change':>8}  {'95% CI':<17} Status"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        component, stage, size = row['key']
+        change = f"{row['change'] * 100:+.1f}%" if 'change' in row else '-'
+        interval = (f"[{row['interval'][0] * 100:+.1f}, {row['interval'][1] * 100:+.1f}]%"
+                    if 'interval' in row else '-')
+        icon = {'REGRESSION': '❌', 'faster': '🚀', 'ok': '✅', 'noise': '·', 'new': '🆕', 'missing': '⚠️'}[row['status']]
+        print(f"{component:<10} {stage[:34]:<34} {size:>6} {_format_seconds(row.get('baseline')):>10} "
+              f"{_format_seconds(row.get('current')):>10} {change:>8}  {interval:<17} {icon} {row['status']}")
+
+
+def print_rule_changes(baseline, current):
+    """Point out rule-set growth, the usual cause of quiet slowdowns"""
+    before = baseline.get('rule_counts', {})
+    after = current.get('rule_counts', {})
+    for name in sorted(set(before) | set(after)):
+        if before.get(name) != after.get(name):
+            print(f"📐 {name}: {before.get(name, '?')} → {after.get(name, '?')} rules")
+
+
+def main(argv=None):
+    """Command-line entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="benchmark_gate.py",
+        description="Record performance baselines and fail on regressions"
+    )
+    parser.add_argument("command", choices=["record", "check", "compare"],
+                        help="record a baseline, check against it, or compare two report files")
+    parser.add_argument("reports", nargs="*", help="For compare: BASELINE.json CURRENT.json")
+    parser.add_argument("--sizes", default=','.join(DEFAULT_SIZES))
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed runs per stage")
+    parser.add_argument("--components", default=None, help="Comma-separated components to run")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown as a fraction (0.10 = 10%%)")
+    parser.add_argument("--confidence", type=float, default=DEFAULT_CONFIDENCE)
+    parser.add_argument("--noise-floor", type=float, default=NOISE_FLOOR_SECONDS,
+                        help="Stages faster than this many seconds never fail")
+    parser.add_argument("--baseline-dir", default=None, help=f"Default: {BASELINE_DIR}")
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        if len(args.reports) != 2:
+            parser.error("compare needs BASELINE.json and CURRENT.json")
+        baseline, current = (load_report(path) for path in args.reports)
+    else:
+        fingerprint = machine_fingerprint()
+        path = baseline_path(fingerprint, args.baseline_dir)
+        if args.command == "check" and not path.exists():
+            print(f"❌ No baseline for this machine ({fingerprint}) - run 'record' first")
+            return 2
+
+        suite = BenchmarkSuite(
+            sizes=args.sizes.split(','), seed=args.seed, repeat=args.repeat,
+            components=args.components.split(',') if args.components else None,
+            measure_memory=False,
+        )
+        print(f"⚡ Running benchmarks on machine {fingerprint} ({args.repeat} repetitions)...")
+        current = suite.run(progress=lambda line: None)
+        current['fingerprint'] = fingerprint
+
+        if args.command == "record":
+            save_results(current, path)
+            print(f"✅ Baseline saved to {path}")
+            return 0
+
+        baseline = load_report(path)
+        if (baseline.get('seed'), baseline.get('schema')) != (current.get('seed'), current.get('schema')):
+            print("⚠️ Baseline was recorded with a different seed or schema - results may not be comparable")
+
+    rows = compare_reports(baseline, current, args.threshold, args.confidence, args.noise_floor)
+    print()
+    print_diff_table(rows)
+    print_rule_changes(baseline, current)
+
+    regressions = [row for row in rows if row['status'] == 'REGRESSION']
+    print()
+    if regressions:
+        print(f"❌ {len(regressions)} stage(s) slower than the {args.threshold * 100:.0f}% threshold")
+        return 1
+    print(f"✅ No regressions beyond {args.threshold * 100:.0f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
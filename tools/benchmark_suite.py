@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+IRUS V6.0 - Conversion Benchmark Suite
+Measures per-stage throughput and peak memory of the conversion engines
+Runs over a seeded synthetic macro corpus and writes results to JSON
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import statistics
+import tempfile
+import tracemalloc
+from pathlib import Path
+from contextlib import contextmanager
+
+if __name__ == "__main__":
+    # Allow running as a script from the tools directory
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools.benchmark_corpus import (
+    DEFAULT_SEED, DEFAULT_SIZES, MacroScriptGenerator, parse_size, size_label
+)
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+COMPONENTS = ['enhanced', 'macos', 'batch', 'template']
+RESULTS_DIR = Path("benchmark_results")
+SCHEMA_VERSION = 1
+
+
+@contextmanager
+def working_directory(path):
+    """Temporarily run in another directory (for tools that write relative paths)"""
+    previous = os.getcwd()
+    os.chdir(str(path))
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def machine_info():
+    """Describe the machine a run was measured on"""
+    return {
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+    }
+
+
+def max_rss_bytes():
+    """Peak resident set size of this process, or None where unknown"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def rule_counts(components):
+    """Count the rules each measured component applies"""
+    counts = {}
+    if 'enhanced' in components:
+        from tools.enhanced_converter import CONVERSION_STAGES
+        counts['enhanced_converter'] = sum(len(rules) for rules, _, _ in CONVERSION_STAGES)
+    if 'macos' in components:
+        from tools.macos_optimizer import MacOSOptimizer
+        optimizer = MacOSOptimizer()
+        counts['macos_optimizer'] = len(optimizer.macos_optimizations) + len(optimizer.performance_patterns)
+    return counts
+
+
+class BenchmarkSuite:
+    """
+    Per-stage benchmarks for EnhancedConverter, MacOSOptimizer,
+    BatchConverter and TemplateManager
+
+    Each stage is timed `repeat` times on the same input and reported by
+    its median, so MB/s and lines/s always refer to the size of the
+    generated source script. With measure_memory on, every stage then
+    runs once more under tracemalloc to record its peak allocation.
+    """
+
+    def __init__(self, sizes=None, seed=DEFAULT_SEED, repeat=3, components=None,
+                 measure_memory=True, corpus_dir=None):
+        if not all([self, repeat]):
+            raise ValueError("Invalid parameters")
+        self.sizes = [parse_size(size) for size in (sizes or DEFAULT_SIZES)]
+        self.seed = seed
+        self.repeat = repeat
+        self.components = components or list(COMPONENTS)
+        self.measure_memory = measure_memory
+        self.corpus_dir = Path(corpus_dir) if corpus_dir else None
+        self.generator = MacroScriptGenerator(seed)
+        self.results = []
+
+        unknown = set(self.components) - set(COMPONENTS)
+        if unknown:
+            raise ValueError(f"Unknown components: {', '.join(sorted(unknown))}")
+
+    def run(self, progress=print):
+        """Run every component over every corpus size and return the report"""
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        self.results = []
+        started = time.time()
+
+        with tempfile.TemporaryDirectory(prefix="irus_bench_") as temp_dir:
+            workdir = Path(temp_dir)
+            corpus_dir = self.corpus_dir or workdir / "corpus"
+
+            for size in self.sizes:
+                script_path = self.generator.write(corpus_dir, size)
+                with open(script_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                context = {
+                    'path': script_path,
+                    'content': content,
+                    'size': size,
+                    'bytes': len(content.encode('utf-8')),
+                    'lines': content.count('\n') + 1,
+                    'workdir': workdir,
+                }
+                progress(f"📏 {size_label(size)}: {context['bytes']:,} bytes, {context['lines']:,} lines")
+
+                for component in self.components:
+                    for stage, func in getattr(self, f"_{component}_stages")(context):
+                        result = self._measure(component, stage, func, context)
+                        self.results.append(result)
+                        progress(f"  {component:<9} {stage:<32} {result['mb_per_s']:>9.2f} MB/s "
+                                 f"{result['lines_per_s']:>12,.0f} lines/s")
+
+        return {
+            'schema': SCHEMA_VERSION,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'duration_seconds': round(time.time() - started, 3),
+            'seed': self.seed,
+            'repeat': self.repeat,
+            'machine': machine_info(),
+            'max_rss_bytes': max_rss_bytes(),
+            'rule_counts': rule_counts(self.components),
+            'results': self.results,
+        }
+
+    def _measure(self, component, stage, func, context):
+        """Time one stage and optionally record its peak allocation"""
+        samples = []
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - started)
+
+        peak_memory = None
+        if self.measure_memory:
+            tracemalloc.start()
+            try:
+                baseline = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                func()
+                peak_memory = tracemalloc.get_traced_memory()[1] - baseline
+            finally:
+                tracemalloc.stop()
+
+        seconds = statistics.median(samples)
+        return {
+            'component': component,
+            'stage': stage,
+            'size': size_label(context['size']),
+            'bytes': context['bytes'],
+            'lines': context['lines'],
+            'seconds': seconds,
+            'samples': samples,
+            'mb_per_s': context['bytes'] / (1024 * 1024) / seconds if seconds else 0.0,
+            'lines_per_s': context['lines'] / seconds if seconds else 0.0,
+            'peak_memory_bytes': peak_memory,
+        }
+
+    def _chain(self, content, steps):
+        """Feed each step the previous step's output; returns [(name, func, input)]"""
+        chained = []
+        current = content
+        for name, func in steps:
+            chained.append((name, func, current))
+            current = func(current)
+        return chained
+
+    def _enhanced_stages(self, context):
+        from tools.atomic_io import atomic_write_text
+        from tools.chunk_cache import ChunkCache
+        from tools.enhanced_converter import EnhancedConverter
+
+        converter = EnhancedConverter(use_chunk_cache=False)
+
+        def fresh_logs(func):
+            # Converters keep appending to their logs; start each run clean
+            owner = func.__self__
+
+            def run(content):
+                owner.conversion_log = []
+                owner.bugs_fixed = []
+                return func(content)
+            return run
+
+        def read():
+            with open(context['path'], 'r', encoding='utf-8') as f:
+                return f.read()
+
+        steps = [(name, fresh_logs(getattr(converter, name))) for name in (
+            'convert_imports', 'convert_screen_capture', 'convert_mouse_control',
+            'convert_keyboard_control', 'convert_system_apis', 'convert_file_paths',
+            'clean_comments', 'fix_common_bugs', 'add_macos_optimizations',
+        )]
+        chained = self._chain(context['content'], steps)
+        output = chained[-1][1](chained[-1][2])
+        output_path = context['workdir'] / "enhanced_output.py"
+
+        stages = [('read', read)]
+        stages += [(name, lambda func=func, data=data: func(data)) for name, func, data in chained]
+        stages.append(('write', lambda: atomic_write_text(output_path, output)))
+        stages.append(('convert_content', lambda: fresh_logs(converter.convert_content)(context['content'])))
+
+        # What a one-shot conversion costs: a new converter with default options
+        stages.append(('convert_content[default cold]', lambda: EnhancedConverter().convert_content(context['content'])))
+
+        # Chunk-cached pipeline, first with an empty cache and then warm
+        def chunked_cold():
+            EnhancedConverter(chunk_cache=ChunkCache()).convert_content(context['content'])
+
+        warm = EnhancedConverter(chunk_cache=ChunkCache())
+        warm.convert_content(context['content'])
+        stages.append(('convert_content[chunked cold]', chunked_cold))
+        stages.append(('convert_content[chunked warm]', lambda: fresh_logs(warm.convert_content)(context['content'])))
+        return stages
+
+    def _macos_stages(self, context):
+        from tools.macos_optimizer import MacOSOptimizer
+
+        optimizer = MacOSOptimizer()
+        content = context['content']
+        return [
+            ('_apply_macos_optimizations', lambda: optimizer._apply_macos_optimizations(content)),
+            ('_apply_performance_optimizations', lambda: optimizer._apply_performance_optimizations(content)),
+            ('_add_macos_imports', lambda: optimizer._add_macos_imports(content)),
+            ('_generate_compatibility_warnings', lambda: optimizer._generate_compatibility_warnings(content, "macOS")),
+            ('optimize_for_macos', lambda: optimizer.optimize_for_macos(content, "macOS")),
+        ]
+
+    def _batch_stages(self, context):
+        from tools.batch_converter import BatchConverter
+
+        converter = BatchConverter()
+        content = context['content']
+        item = {
+            'input_path': str(context['path']),
+            'target_system': "macOS",
+            'status': 'pending',
+            'output_path': context['workdir'] / "batch_output.py",
+        }
+        return [
+            ('_apply_conversions[macOS]', lambda: converter._apply_conversions(content, "macOS")),
+            ('_apply_conversions[Linux]', lambda: converter._apply_conversions(content, "Linux")),
+            ('_convert_single_file', lambda: converter._convert_single_file(item)),
+        ]
+
+    def _template_stages(self, context):
+        from tools.template_manager import TemplateManager
+
+        # TemplateManager keeps its templates relative to the working directory
+        with working_directory(context['workdir']):
+            manager = TemplateManager()
+        content = context['content']
+        return [
+            (f"apply_template[{name}]", lambda name=name: manager.apply_template(content, name))
+            for name in sorted(manager.templates)
+        ]
+
+
+def save_results(report, output_path=None):
+    """Write a benchmark report to JSON and return the path"""
+    if not all([report]):
+        raise ValueError("Invalid parameters")
+    if output_path is None:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        output_path = RESULTS_DIR / f"benchmark_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    return output_path
+
+
+def main(argv=None):
+    """Command-line entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="benchmark_suite.py",
+        description="Benchmark IRUS conversion throughput on a synthetic macro corpus"
+    )
+    parser.add_argument("--sizes", default=','.join(DEFAULT_SIZES),
+                        help="Comma-separated corpus sizes, e.g. 1KB,256KB,50MB")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage")
+    parser.add_argument("--components", default=','.join(COMPONENTS),
+                        help=f"Comma-separated subset of: {', '.join(COMPONENTS)}")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak memory pass")
+    parser.add_argument("--corpus-dir", help="Keep the generated scripts in this folder")
+    parser.add_argument("--output", help="JSON file for the results")
+    args = parser.parse_args(argv)
+
+    suite = BenchmarkSuite(
+        sizes=args.sizes.split(','),
+        seed=args.seed,
+        repeat=args.repeat,
+        components=args.components.split(','),
+        measure_memory=not args.no_memory,
+        corpus_dir=args.corpus_dir,
+    )
+
+    print("⚡ IRUS V6.0 - Conversion Benchmark")
+    print("=" * 50)
+    report = suite.run()
+    output_path = save_results(report, args.output)
+    print(f"\n✅ Results saved to {output_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
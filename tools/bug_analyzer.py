@@ -362,7 +362,7 @@ def analyze_script(script_path):
             # Save fixed version if changes were made
             if fixed_content != original_content:
                 fixed_path = script_path.replace('.py', '_fixed.py')
-                with open(fixed_path, "w", encoding="utf-8", encoding='utf-8') as f:
+                with open(fixed_path, "w", encoding="utf-8") as f:
                     f.write(fixed_content)
                 print(f"✅ Fixed version saved as: {fixed_path}")
 
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+IRUS V6.0 - Chunk Cache
+Memoises converted top-level code blocks across files
+Lets template-derived scripts reuse conversions of shared defs, classes and config blocks
+"""
+
+import re
+import json
+import zlib
+import hashlib
+import threading
+from pathlib import Path
+from collections import OrderedDict
+
+from tools.atomic_io import atomic_write_text
+
+# Column-0 lines: decorators, def/class headers, and any other statement start
+TOP_LEVEL_LINE = re.compile(
+    r'^(?:(@)|((?:async[ \t]+)?def\b|class\b)|[^\s#)\]}])',
+    re.MULTILINE
+)
+
+# Chunk sizing: blocks are grouped until a content-defined boundary so
+# per-chunk overhead stays small next to the regex work it saves
+CHUNK_MIN_BYTES = 2 * 1024
+CHUNK_MAX_BYTES = 64 * 1024
+CHUNK_BOUNDARY_MODULUS = 8
+
+
+def split_top_level_blocks(content):
+    """
+    Split source into top-level blocks
+
+    Each def or class (with its decorators) is one block, and every run of
+    consecutive top-level statements between them is one block. Blocks are
+    whole lines, so ''.join(blocks) == content. The split is a single regex
+    scan over column-0 lines rather than a full tokenize, so it stays much
+    cheaper than the conversion it feeds.
+    """
+    if not content:
+        return []
+
+    starts = [0]
+    previous_kind = None
+    after_decorator = False
+
+    for match in TOP_LEVEL_LINE.finditer(content):
+        if match.group(1) or match.group(2):
+            if not after_decorator:
+                starts.append(match.start())
+            after_decorator = bool(match.group(1))
+            previous_kind = 'block'
+        else:
+            if previous_kind != 'statement' and not after_decorator:
+                starts.append(match.start())
+            after_decorator = False
+            previous_kind = 'statement'
+
+    starts = sorted(set(starts))
+    blocks = []
+    for position, start in enumerate(starts):
+        end = starts[position + 1] if position + 1 < len(starts) else len(content)
+        if end > start:
+            blocks.append(content[start:end])
+
+    return blocks
+
+
+def group_blocks(blocks):
+    """
+    Group consecutive blocks into cacheable chunks
+
+    A chunk closes after a block whose checksum hits the boundary modulus
+    (once the chunk is at least CHUNK_MIN_BYTES), or when it reaches
+    CHUNK_MAX_BYTES. Boundaries depend on block content rather than
+    position, so a block pasted into another script tends to land in an
+    identical chunk there too.
+    """
+    chunks = []
+    current = []
+    size = 0
+
+    for block in blocks:
+        current.append(block)
+        size += len(block)
+        at_boundary = zlib.crc32(block.encode('utf-8', 'surrogatepass')) % CHUNK_BOUNDARY_MODULUS == 0
+        if size >= CHUNK_MAX_BYTES or (size >= CHUNK_MIN_BYTES and at_boundary):
+            chunks.append(''.join(current))
+            current = []
+            size = 0
+
+    if current:
+        chunks.append(''.join(current))
+
+    return chunks
+
+
+def split_chunks(content):
+    """Split source into cacheable chunks of whole top-level blocks"""
+    return group_blocks(split_top_level_blocks(content))
+
+
+class ChunkCache:
+    """Thread-safe LRU cache of converted top-level code blocks"""
+
+    def __init__(self, max_entries=4096):
+        if not all([self, max_entries]):
+            raise ValueError("Invalid parameters")
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(block, namespace=""):
+        """Build a cache key from a block and the rule-set namespace"""
+        digest = hashlib.sha1()
+        digest.update(namespace.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(block.encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return the cached entry for key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        """Store an entry, evicting the least recently used ones"""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def resize(self, max_entries):
+        """Change the entry limit, evicting the least recently used blocks above it"""
+        if not all([self, max_entries]):
+            raise ValueError("Invalid parameters")
+        with self._lock:
+            self.max_entries = max_entries
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached blocks and reset statistics"""
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self):
+        """Get cache statistics"""
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / lookups * 100) if lookups else 0
+            }
+
+
+class ConversionRecordStore:
+    """
+    Per-file records of the previous conversion
+
+    A record holds the digest of the source that was converted, the final
+    output and log lines, and the converted entry of every chunk keyed by
+    its cache key. Re-converting an edited file then only converts chunks
+    whose key is not in the record. The most recent records stay in memory
+    and, when a directory is given, are also written there as JSON.
+    """
+
+    def __init__(self, directory=None, max_records=256):
+        if not all([self, max_records]):
+            raise ValueError("Invalid parameters")
+        self.directory = Path(directory).resolve() if directory else None
+        self.max_records = max_records
+        self._records = OrderedDict()
+        self._lock = threading.Lock()
+
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def source_digest(content):
+        """Digest script source for change detection"""
+        return hashlib.sha1(content.encode('utf-8', 'surrogatepass')).hexdigest()
+
+    def _record_path(self, file_key):
+        """Get the JSON file holding the record for file_key"""
+        name = hashlib.sha1(file_key.encode('utf-8')).hexdigest()
+        return self.directory / f"{name}.json"
+
+    def get(self, file_key):
+        """Get the previous record for a file, or None"""
+        if not all([self, file_key]):
+            raise ValueError("Invalid parameters")
+        with self._lock:
+            record = self._records.get(file_key)
+            if record is not None:
+                self._records.move_to_end(file_key)
+        if record is not None or not self.directory:
+            return record
+
+        try:
+            with open(self._record_path(file_key), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if data.get('file_key') != file_key:
+            return None
+
+        # JSON turns tuples into lists; entries must stay hashable
+        data['chunks'] = {
+            key: (converted, tuple(tuple(item) for item in fired), tuple(helpers))
+            for key, (converted, fired, helpers) in data.get('chunks', {}).items()
+        }
+        self._remember(file_key, data)
+        return data
+
+    def put(self, file_key, record):
+        """Store the record for a file"""
+        if not all([self, file_key, record]):
+            raise ValueError("Invalid parameters")
+        record = dict(record, file_key=file_key)
+        self._remember(file_key, record)
+        if not self.directory:
+            return
+
+        # Write through a temp file so a crash never leaves a torn record
+        try:
+            atomic_write_text(self._record_path(file_key), json.dumps(record))
+        except OSError as e:
+            print(f"⚠️ Could not save conversion record: {e}")
+
+    def _remember(self, file_key, record):
+        """Keep a record in memory, evicting the oldest ones"""
+        with self._lock:
+            self._records[file_key] = record
+            self._records.move_to_end(file_key)
+            while len(self._records) > self.max_records:
+                self._records.popitem(last=False)
+
+    def forget(self, file_key):
+        """Drop the record for a file"""
+        if not all([self, file_key]):
+            raise ValueError("Invalid parameters")
+        with self._lock:
+            self._records.pop(file_key, None)
+        if self.directory:
+            try:
+                self._record_path(file_key).unlink()
+            except OSError:
+                pass
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_chunk_cache():
+    """Get the process-wide chunk cache shared by all converters"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ChunkCache()
+        return _shared_cache
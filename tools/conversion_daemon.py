@@ -0,0 +1,584 @@
+#!/usr/bin/env python3
+"""
+IRUS V6.0 - Conversion Daemon
+Long-running local service that keeps converters, rules and caches warm
+Serves convert, validate and analyze requests to the GUI and the CLI
+
+Protocol: one JSON object per request and per response. Over a Unix
+socket each message is a single line; over localhost TCP the request is
+the body of an HTTP POST to /. Every request carries the token from the
+daemon state file, which only the current user can read.
+
+    {"op": "convert", "token": "...", "content": "import mss\\n..."}
+    {"ok": true, "content": "...", "conversion_log": [...], "bugs_fixed": [...]}
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import socket
+import getpass
+import secrets
+import tempfile
+import threading
+import socketserver
+import http.client
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+if __name__ == "__main__":
+    # Allow running as a script from the tools directory
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools.atomic_io import atomic_write_text
+from tools.rule_plan import get_rule_stats
+from tools.metrics import DEFAULT_METRICS_PORT, QUEUE_DEPTH, record_conversion, record_failure, try_start_metrics_server
+
+DEFAULT_HTTP_PORT = 47631
+CONNECT_TIMEOUT = 0.2
+MAX_MESSAGE_BYTES = 256 * 1024 * 1024
+
+# Small script used to compile every rule before the first real request
+WARMUP_SCRIPT = '''import mss
+import pyautogui
+import keyboard
+from ctypes import windll
+
+def capture():
+    with mss.mss() as sct:
+        img = sct.grab(monitor)
+    pyautogui.click(10, 20)
+    if keyboard.is_pressed('q'):
+        windll.user32.GetDC(0)
+    path = "C:\\\\Users\\\\fisher\\\\bait.png"
+'''
+
+
+def _runtime_dir():
+    """Directory shared by the daemon and its clients"""
+    return Path(tempfile.gettempdir())
+
+
+def daemon_state_path():
+    """Path of the per-user file that advertises a running daemon"""
+    return _runtime_dir() / f"irus_daemon_{getpass.getuser()}.json"
+
+
+def default_socket_path():
+    """Default Unix socket path for the current user"""
+    return _runtime_dir() / f"irus_daemon_{getpass.getuser()}.sock"
+
+
+class DaemonError(Exception):
+    """Raised when the daemon rejects a request or cannot be reached"""
+
+
+class ConversionService:
+    """
+    Warm state behind the daemon
+
+    A fixed pool of EnhancedConverter instances shares the process-wide
+    chunk cache and one in-memory record store, so repeat requests for
+    the same script only redo the blocks that changed. Each request checks
+    a converter out of the pool; requests beyond the pool size wait.
+    """
+
+    def __init__(self, workers=None, parallel_workers=0):
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        from tools.chunk_cache import ConversionRecordStore, get_shared_chunk_cache
+        from tools.enhanced_converter import EnhancedConverter
+
+        self.workers = workers or os.cpu_count() or 1
+        self.record_store = ConversionRecordStore()
+        self.chunk_cache = get_shared_chunk_cache()
+        self.converters = queue.Queue()
+        for _ in range(self.workers):
+            self.converters.put(EnhancedConverter(
+                chunk_cache=self.chunk_cache,
+                parallel_workers=parallel_workers,
+                record_store=self.record_store
+            ))
+
+        self.started = time.time()
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+        self.shutdown_requested = threading.Event()
+
+        self.handlers = {
+            'ping': self.handle_ping,
+            'convert': self.handle_convert,
+            'validate': self.handle_validate,
+            'analyze': self.handle_analyze,
+            'stats': self.handle_stats,
+            'shutdown': self.handle_shutdown,
+        }
+
+    def warm_up(self):
+        """Compile rules and import validators before serving requests"""
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        import tools.ultra_validator
+        import tools.bug_analyzer
+
+        converter = self.converters.get()
+        try:
+            converter.convert_content(WARMUP_SCRIPT)
+        finally:
+            self._reset_logs(converter)
+            self.converters.put(converter)
+        self.chunk_cache.clear()
+
+    def handle(self, request):
+        """Dispatch one decoded request and return the response dict"""
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        if not isinstance(request, dict):
+            return {'ok': False, 'error': 'Request must be a JSON object'}
+
+        handler = self.handlers.get(request.get('op'))
+        if handler is None:
+            return {'ok': False, 'error': f"Unknown op: {request.get('op')}"}
+
+        with self._count_lock:
+            self.request_count += 1
+
+        started = time.perf_counter()
+        try:
+            response = handler(request)
+        except Exception as e:
+            if request.get('op') == 'convert':
+                record_failure('daemon', e)
+            return {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+        response['ok'] = True
+        response['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 3)
+        return response
+
+    def handle_ping(self, request):
+        """Report that the daemon is alive"""
+        return {
+            'pid': os.getpid(),
+            'uptime': round(time.time() - self.started, 1),
+            'requests': self.request_count,
+            'workers': self.workers
+        }
+
+    def handle_convert(self, request):
+        """Convert script content, or a script file when input_path is given"""
+        started = time.perf_counter()
+        content, file_key = self._read_request_source(request)
+        output_path = request.get('output_path')
+
+        # Requests beyond the pool size wait here for a converter
+        QUEUE_DEPTH.inc(component='daemon')
+        try:
+            converter = self.converters.get()
+        finally:
+            QUEUE_DEPTH.dec(component='daemon')
+        try:
+            self._reset_logs(converter)
+            converted = converter.convert_content(content, file_key=file_key)
+            response = {
+                'conversion_log': list(converter.conversion_log),
+                'bugs_fixed': list(converter.bugs_fixed)
+            }
+        finally:
+            self._reset_logs(converter)
+            self.converters.put(converter)
+
+        if output_path:
+            atomic_write_text(output_path, converted)
+            response['output_path'] = str(Path(output_path).resolve())
+        else:
+            response['content'] = converted
+        record_conversion('daemon', len(content), time.perf_counter() - started)
+        return response
+
+    def handle_validate(self, request):
+        """Ultra-validate a converted script"""
+        from tools.ultra_validator import ultra_validate_report
+
+        if request.get('path'):
+            return {'report': ultra_validate_report(request['path'])}
+
+        # The validator works on files; give inline content a private one
+        content = request.get('content')
+        if not content:
+            raise ValueError("validate needs 'path' or 'content'")
+        fd, temp_path = tempfile.mkstemp(suffix='.py')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(content)
+            return {'report': ultra_validate_report(temp_path)}
+        finally:
+            os.remove(temp_path)
+
+    def handle_analyze(self, request):
+        """Run the bug analyzer over a converted script"""
+        from tools.bug_analyzer import BugAnalyzer
+
+        content, _ = self._read_request_source(request, path_key='path')
+        analyzer = BugAnalyzer()
+        if analyzer.check_syntax(content):
+            analyzer.check_import_issues(content)
+            analyzer.check_api_conversion_issues(content)
+            analyzer.check_macos_specific_issues(content)
+            analyzer.check_performance_issues(content)
+            analyzer.check_compatibility_issues(content)
+        return {'report': analyzer.generate_report()}
+
+    def handle_stats(self, request):
+        """Report cache statistics"""
+        return {'chunk_cache': self.chunk_cache.get_stats(), 'requests': self.request_count}
+
+    def handle_shutdown(self, request):
+        """Ask the server loop to exit after this response"""
+        self.shutdown_requested.set()
+        return {'stopping': True}
+
+    def _read_request_source(self, request, path_key='input_path'):
+        """Get (content, file_key) from inline content or a file path"""
+        path = request.get(path_key)
+        if path:
+            resolved = Path(path).resolve()
+            with open(resolved, 'r', encoding='utf-8') as f:
+                return f.read(), str(resolved)
+
+        content = request.get('content')
+        if not content:
+            raise ValueError(f"Request needs '{path_key}' or 'content'")
+        return content, request.get('file_key')
+
+    def _reset_logs(self, converter):
+        """Clear per-request logs on a pooled converter"""
+        converter.conversion_log = []
+        converter.bugs_fixed = []
+
+    def close(self):
+        """Shut down converter worker pools and keep the rule hit counts"""
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        while not self.converters.empty():
+            self.converters.get_nowait().shutdown()
+        get_rule_stats().save()
+
+
+class _UnixRequestHandler(socketserver.StreamRequestHandler):
+    """JSON-lines handler; a connection may carry many requests"""
+
+    def handle(self):
+        server = self.server
+        while True:
+            line = self.rfile.readline(MAX_MESSAGE_BYTES)
+            if not line:
+                return
+            response = server.dispatch(line)
+            self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+            self.wfile.flush()
+            if server.service.shutdown_requested.is_set():
+                threading.Thread(target=server.shutdown, daemon=True).start()
+                return
+
+
+class _HTTPRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler: POST / with a JSON body"""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        if length > MAX_MESSAGE_BYTES:
+            self.send_error(413)
+            return
+        response = self.server.dispatch(self.rfile.read(length))
+        body = json.dumps(response).encode('utf-8')
+        self.send_response(200 if response.get('ok') else 400)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if self.server.service.shutdown_requested.is_set():
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+    def log_message(self, format, *args):
+        # Keep the console for the daemon's own messages
+        pass
+
+
+class _DispatchMixin:
+    """Token check and JSON decoding shared by both transports"""
+
+    def dispatch(self, raw):
+        try:
+            request = json.loads(raw)
+        except ValueError as e:
+            return {'ok': False, 'error': f"Invalid JSON: {e}"}
+        if not isinstance(request, dict) or not secrets.compare_digest(str(request.get('token', '')), self.token):
+            return {'ok': False, 'error': 'Invalid token'}
+        return self.service.handle(request)
+
+
+if hasattr(socketserver, 'ThreadingUnixStreamServer'):
+    class _UnixServer(_DispatchMixin, socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+else:
+    _UnixServer = None
+
+
+class _HTTPServer(_DispatchMixin, ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class ConversionDaemon:
+    """Serves a ConversionService over a Unix socket or localhost HTTP"""
+
+    def __init__(self, use_http=False, port=DEFAULT_HTTP_PORT, socket_path=None, workers=None,
+                 metrics_port=DEFAULT_METRICS_PORT):
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        # None disables the Prometheus endpoint
+        self.metrics_port = metrics_port
+        self.metrics_server = None
+        if not use_http and _UnixServer is None:
+            print("⚠️ Unix sockets are not available here - serving HTTP on localhost instead")
+            use_http = True
+
+        self.use_http = use_http
+        self.port = port
+        self.socket_path = Path(socket_path) if socket_path else default_socket_path()
+        self.token = secrets.token_hex(16)
+        self.service = ConversionService(workers=workers)
+        self.server = None
+
+    def serve_forever(self):
+        """Warm up, advertise the daemon and serve until shutdown"""
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        started = time.perf_counter()
+        self.service.warm_up()
+
+        if self.use_http:
+            self.server = _HTTPServer(('127.0.0.1', self.port), _HTTPRequestHandler)
+            address = {'transport': 'http', 'host': '127.0.0.1', 'port': self.server.server_address[1]}
+        else:
+            if self.socket_path.exists():
+                self.socket_path.unlink()
+            old_umask = os.umask(0o177)
+            try:
+                self.server = _UnixServer(str(self.socket_path), _UnixRequestHandler)
+            finally:
+                os.umask(old_umask)
+            address = {'transport': 'unix', 'path': str(self.socket_path)}
+
+        self.server.service = self.service
+        self.server.token = self.token
+        self._write_state(address)
+        if self.metrics_port is not None:
+            self.metrics_server = try_start_metrics_server(self.metrics_port)
+
+        print(f"🚀 IRUS daemon ready in {time.perf_counter() - started:.2f}s ({self._describe(address)})")
+        try:
+            self.server.serve_forever()
+        finally:
+            self.close()
+
+    def _write_state(self, address):
+        """Publish the address and token for clients"""
+        state = dict(address, pid=os.getpid(), token=self.token, started=time.time())
+        state_path = daemon_state_path()
+        old_umask = os.umask(0o077)
+        try:
+            atomic_write_text(state_path, json.dumps(state))
+            os.chmod(state_path, 0o600)
+        finally:
+            os.umask(old_umask)
+
+    def _describe(self, address):
+        """Human-readable address"""
+        if address['transport'] == 'http':
+            return f"http://{address['host']}:{address['port']}/"
+        return address['path']
+
+    def close(self):
+        """Stop serving and remove the advertised state"""
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        if self.server is not None:
+            self.server.server_close()
+            self.server = None
+        if self.metrics_server is not None:
+            self.metrics_server.shutdown()
+            self.metrics_server.server_close()
+            self.metrics_server = None
+        try:
+            state = json.loads(daemon_state_path().read_text(encoding='utf-8'))
+            if state.get('pid') == os.getpid():
+                daemon_state_path().unlink()
+        except (OSError, ValueError):
+            pass
+        if not self.use_http and self.socket_path.exists():
+            self.socket_path.unlink()
+        self.service.close()
+        print("👋 IRUS daemon stopped")
+
+
+class DaemonClient:
+    """Client for a running conversion daemon; keeps its connection open"""
+
+    def __init__(self, state, timeout=60.0):
+        if not all([self, state]):
+            raise ValueError("Invalid parameters")
+        self.state = state
+        self.token = state['token']
+        self.timeout = timeout
+        self._connection = None
+        self._reader = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        """Open the transport connection"""
+        if self.state['transport'] == 'http':
+            self._connection = http.client.HTTPConnection(
+                self.state['host'], self.state['port'], timeout=self.timeout
+            )
+            self._connection.connect()
+            # Headers and body go out as separate writes; don't let Nagle hold the body
+            self._connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        else:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(self.state['path'])
+            sock.settimeout(self.timeout)
+            self._connection = sock
+            self._reader = sock.makefile('rb')
+
+    def request(self, op, **payload):
+        """Send one request and return the decoded response"""
+        if not all([self, op]):
+            raise ValueError("Invalid parameters")
+        message = dict(payload, op=op, token=self.token)
+        body = json.dumps(message).encode('utf-8')
+
+        with self._lock:
+            try:
+                if self._connection is None:
+                    self._connect()
+                response = self._exchange(body)
+            except (OSError, http.client.HTTPException, ValueError) as e:
+                self.close()
+                raise DaemonError(f"Daemon unavailable: {e}")
+
+        if not response.get('ok'):
+            raise DaemonError(response.get('error', 'Request failed'))
+        return response
+
+    def _exchange(self, body):
+        """Write a request and read its response on the open connection"""
+        if self.state['transport'] == 'http':
+            self._connection.request('POST', '/', body, {'Content-Type': 'application/json'})
+            return json.loads(self._connection.getresponse().read())
+
+        self._connection.sendall(body + b'\n')
+        line = self._reader.readline(MAX_MESSAGE_BYTES)
+        if not line:
+            raise ConnectionError("Daemon closed the connection")
+        return json.loads(line)
+
+    def convert(self, content=None, input_path=None, output_path=None, file_key=None):
+        """Convert content or a script file; see ConversionService.handle_convert"""
+        payload = {'content': content, 'file_key': file_key, 'output_path': output_path}
+        if input_path:
+            payload['input_path'] = str(Path(input_path).resolve())
+        if output_path:
+            payload['output_path'] = str(Path(output_path).resolve())
+        return self.request('convert', **payload)
+
+    def validate(self, path=None, content=None):
+        """Ultra-validate a script and return the report"""
+        if path:
+            path = str(Path(path).resolve())
+        return self.request('validate', path=path, content=content)['report']
+
+    def analyze(self, path=None, content=None):
+        """Bug-analyze a script and return the report"""
+        if path:
+            path = str(Path(path).resolve())
+        return self.request('analyze', path=path, content=content)['report']
+
+    def close(self):
+        """Close the connection"""
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def get_daemon_client(timeout=60.0):
+    """
+    Connect to the running daemon
+
+    Returns a DaemonClient, or None when no daemon is running, so callers
+    can fall back to converting in-process.
+    """
+    if os.environ.get('IRUS_NO_DAEMON'):
+        return None
+    try:
+        state = json.loads(daemon_state_path().read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+    client = DaemonClient(state, timeout=timeout)
+    try:
+        client.request('ping')
+    except (DaemonError, KeyError):
+        client.close()
+        return None
+    return client
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="conversion_daemon.py",
+        description="Run or control the IRUS conversion daemon"
+    )
+    parser.add_argument("command", nargs="?", default="start", choices=["start", "stop", "status"])
+    parser.add_argument("--http", action="store_true", help="Serve HTTP on localhost instead of a Unix socket")
+    parser.add_argument("--port", type=int, default=DEFAULT_HTTP_PORT, help="Port for --http")
+    parser.add_argument("--workers", type=int, default=None, help="Number of warm converters")
+    parser.add_argument("--metrics-port", type=int, default=DEFAULT_METRICS_PORT,
+                        help="Port of the Prometheus metrics endpoint on localhost")
+    parser.add_argument("--no-metrics", action="store_true", help="Do not serve metrics")
+    args = parser.parse_args()
+
+    if args.command == "start":
+        if get_daemon_client() is not None:
+            print("ℹ️ IRUS daemon is already running")
+            sys.exit(0)
+        daemon = ConversionDaemon(use_http=args.http, port=args.port, workers=args.workers,
+                                  metrics_port=None if args.no_metrics else args.metrics_port)
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        sys.exit(0)
+
+    client = get_daemon_client()
+    if client is None:
+        print("❌ IRUS daemon is not running")
+        sys.exit(1)
+
+    if args.command == "stop":
+        client.request('shutdown')
+        print("✅ Stop requested")
+    else:
+        status = client.request('ping')
+        print(f"✅ IRUS daemon running (pid {status['pid']}, up {status['uptime']}s, "
+              f"{status['requests']} requests, {status['workers']} workers)")
+    client.close()
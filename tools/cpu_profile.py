@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+IRUS V6.0 - CPU Profile Capture
+Wraps a conversion, validation or batch run in cProfile or a stack sampler
+Saves each run as collapsed stacks and a self-contained SVG flamegraph
+"""
+
+import re
+import sys
+import json
+import time
+import zlib
+import cProfile
+import pstats
+import threading
+from html import escape
+from pathlib import Path
+from contextlib import contextmanager
+
+if __name__ == "__main__":
+    # Allow running as a script from the tools directory
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+PROFILES_DIR = Path("cache") / "profiles"
+MODES = ('cprofile', 'sampling')
+DEFAULT_INTERVAL = 0.005
+
+# Call-graph paths below this share of the run are dropped from the flamegraph
+MIN_SHARE = 0.0005
+MAX_DEPTH = 128
+
+SVG_WIDTH = 1200
+FRAME_HEIGHT = 16
+CHAR_WIDTH = 7
+
+
+def frame_label(filename, lineno, name):
+    """Name of one stack frame in collapsed output"""
+    if filename == '~':
+        # cProfile's key for builtins: ('~', 0, "<built-in method ...>")
+        label = name
+    else:
+        label = f"{name} ({Path(filename).name}:{lineno})"
+    # ';' separates frames and a trailing number is the count
+    return label.replace(';', ':')
+
+
+class StackSampler:
+    """
+    Samples the Python stack of every thread at a fixed interval
+
+    Cheaper than cProfile on long runs and unaffected by call counts;
+    each sample adds one to the count of the stack it saw.
+    """
+
+    def __init__(self, interval=DEFAULT_INTERVAL):
+        if not all([self, interval]):
+            raise ValueError("Invalid parameters")
+        self.interval = interval
+        self.stacks = {}
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Begin sampling in a background thread"""
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="irus-stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling and wait for the sampler thread"""
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                labels = []
+                while frame is not None:
+                    code = frame.f_code
+                    labels.append(frame_label(code.co_filename, code.co_firstlineno, code.co_name))
+                    frame = frame.f_back
+                stack = ';'.join(reversed(labels))
+                self.stacks[stack] = self.stacks.get(stack, 0) + 1
+            self.samples += 1
+
+
+def collapse_stats(stats):
+    """
+    Collapsed stacks (in microseconds) from a pstats.Stats call graph
+
+    cProfile records caller -> callee edges, not whole stacks, so each
+    callee's time under a caller is split along the caller's paths in
+    proportion to their share of the caller's cumulative time.
+    """
+    entries = stats.stats
+    callees = {}
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    total = sum(entry[2] for entry in entries.values()) or 1.0
+    threshold = total * MIN_SHARE
+    collapsed = {}
+
+    def visit(func, path, seconds, depth):
+        _, _, own, cumulative, _ = entries[func]
+        share = seconds / cumulative if cumulative else 0.0
+        path = path + [frame_label(*func)]
+        self_time = int(own * share * 1e6)
+        if self_time:
+            stack = ';'.join(path)
+            collapsed[stack] = collapsed.get(stack, 0) + self_time
+        if depth >= MAX_DEPTH:
+            return
+        for callee, edge_seconds in callees.get(func, []):
+            child_seconds = edge_seconds * share
+            # Recursive calls are already inside the caller's cumulative time
+            if child_seconds >= threshold and callee not in visiting:
+                visiting.add(callee)
+                visit(callee, path, child_seconds, depth + 1)
+                visiting.discard(callee)
+
+    roots = [func for func, entry in entries.items() if not any(caller in entries for caller in entry[4])]
+    for root in roots:
+        visiting = {root}
+        visit(root, [], entries[root][3], 0)
+    return collapsed
+
+
+def _frame_colour(name):
+    """Warm flamegraph colour, stable for a given frame name"""
+    value = zlib.crc32(name.encode('utf-8'))
+    return f"rgb({205 + value % 50},{(value >> 8) % 180 + 50},{(value >> 16) % 55})"
+
+
+def render_flamegraph(collapsed, title="IRUS Flamegraph", unit="samples"):
+    """
+    Self-contained SVG flamegraph of collapsed stacks
+
+    No script or external stylesheet: every frame is a rect with a
+    <title> tooltip, so the file opens in any browser or image viewer.
+    """
+    root = {'name': 'all', 'value': 0, 'children': {}}
+    for stack, count in collapsed.items():
+        node = root
+        node['value'] += count
+        for name in stack.split(';'):
+            node = node['children'].setdefault(name, {'name': name, 'value': 0, 'children': {}})
+            node['value'] += count
+
+    total = root['value'] or 1
+    frames = []
+
+    def layout(node, x, depth):
+        frames.append((node, x, depth))
+        child_x = x
+        for child in sorted(node['children'].values(), key=lambda child: child['name']):
+            if child['value'] * SVG_WIDTH / total >= 0.5:
+                layout(child, child_x, depth + 1)
+            child_x += child['value']
+
+    layout(root, 0, 0)
+    max_depth = max(depth for _, _, depth in frames)
+    header = 40
+    height = header + (max_depth + 1) * FRAME_HEIGHT + 10
+
+    lines = [
+        '<?xml version="1.0" standalone="no"?>',
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{SVG_WIDTH}" height="{height}" '
+        f'viewBox="0 0 {SVG_WIDTH} {height}" font-family="Verdana, sans-serif" font-size="11">',
+        f'<rect width="100%" height="100%" fill="#f8f8f0"/>',
+        f'<text x="{SVG_WIDTH / 2}" y="24" text-anchor="middle" font-size="16">{escape(title)}</text>',
+    ]
+    for node, x, depth in frames:
+        width = node['value'] * SVG_WIDTH / total
+        left = x * SVG_WIDTH / total
+        top = height - 10 - (depth + 1) * FRAME_HEIGHT
+        tooltip = f"{node['name']} ({node['value']} {unit}, {node['value'] / total:.2%})"
+        lines.append('<g>')
+        lines.append(f'<title>{escape(tooltip)}</title>')
+        lines.append(f'<rect x="{left:.2f}" y="{top}" width="{width:.2f}" height="{FRAME_HEIGHT - 1}" '
+                     f'fill="{_frame_colour(node["name"])}" rx="2"/>')
+        chars = int((width - 6) / CHAR_WIDTH)
+        if chars >= 3:
+            text = node['name'] if len(node['name']) <= chars else node['name'][:chars - 2] + '..'
+            lines.append(f'<text x="{left + 3:.2f}" y="{top + FRAME_HEIGHT - 4}">{escape(text)}</text>')
+        lines.append('</g>')
+    lines.append('</svg>')
+    return '\n'.join(lines) + '\n'
+
+
+class CapturedRun:
+    """One profiled run: its collapsed stacks and where they were saved"""
+
+    def __init__(self, label, mode, interval=DEFAULT_INTERVAL):
+        if not all([self, label, mode]):
+            raise ValueError("Invalid parameters")
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {', '.join(MODES)}")
+        self.label = label
+        self.mode = mode
+        self.interval = interval
+        self.created = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self.seconds = 0.0
+        self.stacks = {}
+        self.skipped_threads = 0
+        self.paths = {}
+
+    @property
+    def unit(self):
+        return 'samples' if self.mode == 'sampling' else 'us'
+
+    def to_collapsed(self):
+        """Collapsed-stack text, one 'frame;frame;frame count' line per stack"""
+        return ''.join(f"{stack} {count}\n" for stack, count in sorted(self.stacks.items()))
+
+    def to_svg(self):
+        """Flamegraph of the run"""
+        return render_flamegraph(self.stacks, f"{self.label} ({self.mode}, {self.seconds:.2f}s)", self.unit)
+
+    def hottest(self, limit=10):
+        """Frames with the most self time or samples, highest first"""
+        own = {}
+        for stack, count in self.stacks.items():
+            leaf = stack.rsplit(';', 1)[-1]
+            own[leaf] = own.get(leaf, 0) + count
+        return sorted(own.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+    def metadata(self):
+        return {
+            'label': self.label,
+            'mode': self.mode,
+            'unit': self.unit,
+            'interval': self.interval if self.mode == 'sampling' else None,
+            'created': self.created,
+            'seconds': self.seconds,
+            'total': sum(self.stacks.values()),
+            'stacks': len(self.stacks),
+            'skipped_threads': self.skipped_threads,
+            'collapsed': str(self.paths.get('collapsed', '')),
+            'svg': str(self.paths.get('svg', '')),
+        }
+
+    def save(self, directory=None):
+        """Write <name>.collapsed, <name>.svg and <name>.json into directory"""
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        from tools.atomic_io import atomic_write_text
+
+        directory = Path(directory) if directory else PROFILES_DIR
+        directory.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r'[^A-Za-z0-9_.-]+', '-', self.label).strip('-')[:60] or 'run'
+        stem = f"{time.strftime('%Y%m%d-%H%M%S')}-{slug}-{self.mode}"
+        base, number = directory / stem, 1
+        while base.with_name(base.name + '.json').exists():
+            number += 1
+            base = directory / f"{stem}-{number}"
+        self.paths = {
+            'collapsed': base.with_name(base.name + '.collapsed'),
+            'svg': base.with_name(base.name + '.svg'),
+            'metadata': base.with_name(base.name + '.json'),
+        }
+        atomic_write_text(self.paths['collapsed'], self.to_collapsed())
+        atomic_write_text(self.paths['svg'], self.to_svg())
+        atomic_write_text(self.paths['metadata'], json.dumps(self.metadata(), indent=2))
+        return self.paths
+
+
+@contextmanager
+def capture(label, mode='cprofile', interval=DEFAULT_INTERVAL, directory=None, save=True):
+    """
+    Profile the body of a with-block and yield its CapturedRun
+
+    cProfile mode also profiles threads started inside the block (the
+    batch converter's worker pool); threads still running when the block
+    ends are left out and counted in skipped_threads. Sampling mode sees
+    every thread. The run is filled in, and saved unless save=False,
+    when the block exits.
+    """
+    run = CapturedRun(label, mode, interval)
+    started = time.perf_counter()
+
+    if mode == 'sampling':
+        sampler = StackSampler(interval)
+        sampler.start()
+        try:
+            yield run
+        finally:
+            sampler.stop()
+            run.seconds = time.perf_counter() - started
+            run.stacks = sampler.stacks
+    else:
+        thread_profiles = []
+
+        def start_thread_profile(frame, event, arg):
+            # First event in a new thread: swap this hook for a real profiler
+            sys.setprofile(None)
+            thread_profile = cProfile.Profile()
+            thread_profiles.append((threading.current_thread(), thread_profile))
+            thread_profile.enable()
+
+        profile = cProfile.Profile()
+        threading.setprofile(start_thread_profile)
+        profile.enable()
+        try:
+            yield run
+        finally:
+            profile.disable()
+            threading.setprofile(None)
+            run.seconds = time.perf_counter() - started
+            stats = pstats.Stats(profile)
+            for thread, thread_profile in thread_profiles:
+                if thread.is_alive():
+                    run.skipped_threads += 1
+                else:
+                    stats.add(thread_profile)
+            run.stacks = collapse_stats(stats)
+
+    if save:
+        run.save(directory)
+
+
+def profile_call(func, *args, label=None, mode='cprofile', interval=DEFAULT_INTERVAL, directory=None, **kwargs):
+    """Call func(*args, **kwargs) under capture(); returns (result, run)"""
+    with capture(label or getattr(func, '__name__', 'call'), mode, interval, directory) as run:
+        result = func(*args, **kwargs)
+    return result, run
+
+
+def list_runs(directory=None):
+    """Metadata of every saved run, newest first"""
+    directory = Path(directory) if directory else PROFILES_DIR
+    runs = []
+    for path in directory.glob("*.json"):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                runs.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    runs.sort(key=lambda run: (run.get('created', ''), run.get('svg', '')), reverse=True)
+    return runs
+
+
+def main(argv=None):
+    """Command-line entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="cpu_profile.py",
+        description="Profile a conversion, validation or batch run and save a flamegraph"
+    )
+    parser.add_argument("command", choices=["convert", "validate", "batch", "list"])
+    parser.add_argument("paths", nargs="*", help="convert: INPUT [OUTPUT]; validate: SCRIPT; batch: FILES...")
+    parser.add_argument("--sampling", action="store_true", help="Sample stacks instead of tracing every call")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, help="Seconds between samples")
+    parser.add_argument("--dir", default=None, help=f"Where runs are saved (default: {PROFILES_DIR})")
+    parser.add_argument("--top", type=int, default=10, help="Hottest frames to print")
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        runs = list_runs(args.dir)
+        if not runs:
+            print("No captured runs")
+        for run in runs:
+            print(f"{run['created']}  {run['mode']:<8} {run['seconds']:>7.2f}s  {run['label']}  {run['svg']}")
+        return 0
+
+    if not args.paths:
+        parser.error(f"{args.command} needs at least one path")
+    mode = 'sampling' if args.sampling else 'cprofile'
+
+    if args.command == "convert":
+        from tools.enhanced_converter import EnhancedConverter
+        output = args.paths[1] if len(args.paths) > 1 else None
+        if output is None:
+            source = Path(args.paths[0])
+            output = source.with_name(f"{source.stem}_macos.py")
+        converter = EnhancedConverter()
+        success, run = profile_call(converter.convert_script, args.paths[0], output,
+                                    label=f"convert {Path(args.paths[0]).name}", mode=mode,
+                                    interval=args.interval, directory=args.dir)
+    elif args.command == "validate":
+        from tools.ultra_validator import UltraValidator
+        success, run = profile_call(UltraValidator().validate_converted_script, args.paths[0],
+                                    label=f"validate {Path(args.paths[0]).name}", mode=mode,
+                                    interval=args.interval, directory=args.dir)
+    else:
+        from tools.batch_converter import BatchConverter
+        converter = BatchConverter()
+        converter.add_files_to_queue(args.paths)
+        _, run = profile_call(converter.convert_batch, label=f"batch {len(args.paths)} files", mode=mode,
+                              interval=args.interval, directory=args.dir)
+        success = not converter.failed_conversions
+
+    print(f"\n⏱️ {run.label}: {run.seconds:.2f}s ({mode})")
+    for name, count in run.hottest(args.top):
+        print(f"  {count:>10} {run.unit:<7} {name}")
+    if run.skipped_threads:
+        print(f"⚠️ {run.skipped_threads} thread(s) still running at the end were not profiled")
+    print(f"📄 Collapsed stacks: {run.paths['collapsed']}")
+    print(f"🔥 Flamegraph: {run.paths['svg']}")
+    return 0 if success else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,134 +9,99 @@ Converts Windows fishing macros to macOS with bug fixes and clean comments
 import re
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-class EnhancedConverter:
-    def __init__(self):
-        if not all([self]):
-            raise ValueError("Invalid parameters")
-        self.conversion_log = []
-        self.bugs_fixed = []
-
-    def convert_script(self, input_path, output_path):
-        """Convert Windows script to macOS with enhanced bug fixing"""
-
-        if not all([self, input_path, output_path]):
-            raise ValueError("Invalid parameters")
-        print(f"🔄 Converting {input_path} to macOS...")
-
-        try:
-            with open(input_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except Exception as e:
-            print(f"❌ Error reading input file: {e}")
-            return False
-
-        # Apply conversions
-        converted_content = self.apply_all_conversions(content)
-
-        # Clean up comments
-        converted_content = self.clean_comments(converted_content)
-
-        # Fix common bugs
-        converted_content = self.fix_common_bugs(converted_content)
-
-        # Add macOS-specific optimizations
-        converted_content = self.add_macos_optimizations(converted_content)
-
-        try:
-            with open(output_path, "w", encoding="utf-8", encoding='utf-8') as f:
-                f.write(converted_content)
-
-            print(f"✅ Conversion complete: {output_path}")
-            self.print_conversion_summary()
-            return True
-
-        except Exception as e:
-            print(f"❌ Error writing output file: {e}")
-            return False
-
-    def apply_all_conversions(self, content):
-        """Apply all Windows to macOS conversions"""
-
-        if not all([self, content]):
-            raise ValueError("Invalid parameters")
-        # Import conversions
-        content = self.convert_imports(content)
-
-        # Screen capture conversions
-        content = self.convert_screen_capture(content)
-
-        # Mouse control conversions
-        content = self.convert_mouse_control(content)
-
-        # Keyboard control conversions
-        content = self.convert_keyboard_control(content)
-
-        # System API conversions
-        content = self.convert_system_apis(content)
-
-        # File path conversions
-        content = self.convert_file_paths(content)
-
-        return content
-
-    def convert_imports(self, content):
-        """Convert Windows imports to macOS equivalents"""
-
-        if not all([self, content]):
-            raise ValueError("Invalid parameters")
-        conversions = [
-            # Screen capture
-            (r'import mss',
-                '# Screen capture - converted to Quartz\nfrom Quartz import CGWindowListCopyWindowInfo,
-                CGDisplayCreateImage,
-                CGMainDisplayID\nfrom Quartz.CoreGraphics import CGRectMake'),
-            (r'from mss import mss',
-                '# Screen capture - converted to Quartz\nfrom Quartz import CGWindowListCopyWindowInfo,
-                CGDisplayCreateImage,
-                CGMainDisplayID\nfrom Quartz.CoreGraphics import CGRectMake'),
-
-            # Mouse control
-            (r'import pyautogui', '# Mouse control - converted to pynput\nfrom pynput.mouse import Button, Listener as MouseListener\nfrom pynput import mouse'),
-            (r'from pyautogui import.*', '# Mouse control - converted to pynput\nfrom pynput.mouse import Button, Listener as MouseListener\nfrom pynput import mouse'),
-
-            # Keyboard control
-            (r'import keyboard', '# Keyboard control - converted to pynput\nfrom pynput.keyboard import Key, Listener as KeyboardListener\nfrom pynput import keyboard'),
-            (r'from keyboard import.*', '# Keyboard control - converted to pynput\nfrom pynput.keyboard import Key, Listener as KeyboardListener\nfrom pynput import keyboard'),
-
-            # Windows-specific
-            (r'import ctypes\.windll.*', '# Windows APIs removed - using macOS native APIs'),
-            (r'from ctypes import windll', '# Windows APIs removed - using macOS native APIs'),
-        ]
-
-        for old_pattern, new_code in conversions:
-            if re.search(old_pattern, content):
-                content = re.sub(old_pattern, new_code, content)
-                self.conversion_log.append(f"Converted import: {old_pattern}")
-
-        return content
-
-    def convert_screen_capture(self, content):
-        """Convert screen capture from mss to Quartz"""
-
-        if not all([self, content]):
-            raise ValueError("Invalid parameters")
-        # Replace mss screen capture
-        mss_patterns = [
-            (r'with mss\.mss\(\) as sct:', 'def capture_screen():'),
-            (r'sct\.grab\(monitor\)', 'capture_screen_region()'),
-            (r'mss\.mss\(\)\.grab\([^)]+\)', 'capture_screen_region()'),
-        ]
-
-        for old_pattern, new_code in mss_patterns:
-            if re.search(old_pattern, content):
-                content = re.sub(old_pattern, new_code, content)
-                self.conversion_log.append(f"Converted screen capture: {old_pattern}")
-
-        # Add macOS screen capture implementation
-        if 'mss' in content or 'sct.grab' in content:
-            screen_capture_code = '''
+if __name__ == "__main__":
+    # Allow running as a script from the tools directory
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools.atomic_io import atomic_write_text
+from tools.chunk_cache import ChunkCache, ConversionRecordStore, split_chunks, get_shared_chunk_cache
+from tools.rule_profiler import get_rule_profiler, profiled_subn, profile_rules
+from tools.rule_plan import RulePlan, get_rule_stats
+from tools.rule_codegen import InterpretedRuleSet, compile_rules
+from tools.tracing import now_us, record_span, span
+from tools.metrics import record_cache_lookups, record_conversion, record_failure, time_stage
+
+QUARTZ_CAPTURE_IMPORTS = (
+    '# Screen capture - converted to Quartz\n'
+    'from Quartz import CGWindowListCopyWindowInfo, CGDisplayCreateImage, CGMainDisplayID\n'
+    'from Quartz.CoreGraphics import CGRectMake'
+)
+
+# Conversion rules never match across a newline: chunks are converted separately,
+# so a match spanning lines could span two chunks and differ from the whole-file result
+IMPORT_CONVERSIONS = [
+    # Screen capture
+    (r'import mss', QUARTZ_CAPTURE_IMPORTS),
+    (r'from mss import mss', QUARTZ_CAPTURE_IMPORTS),
+
+    # Mouse control
+    (r'import pyautogui', '# Mouse control - converted to pynput\nfrom pynput.mouse import Button, Listener as MouseListener\nfrom pynput import mouse'),
+    (r'from pyautogui import.*', '# Mouse control - converted to pynput\nfrom pynput.mouse import Button, Listener as MouseListener\nfrom pynput import mouse'),
+
+    # Keyboard control
+    (r'import keyboard', '# Keyboard control - converted to pynput\nfrom pynput.keyboard import Key, Listener as KeyboardListener\nfrom pynput import keyboard'),
+    (r'from keyboard import.*', '# Keyboard control - converted to pynput\nfrom pynput.keyboard import Key, Listener as KeyboardListener\nfrom pynput import keyboard'),
+
+    # Windows-specific
+    (r'import ctypes\.windll.*', '# Windows APIs removed - using macOS native APIs'),
+    (r'from ctypes import windll', '# Windows APIs removed - using macOS native APIs'),
+]
+
+SCREEN_CAPTURE_CONVERSIONS = [
+    (r'with mss\.mss\(\) as sct:', 'def capture_screen():'),
+    (r'sct\.grab\(monitor\)', 'capture_screen_region()'),
+    (r'mss\.mss\(\)\.grab\([^)\n]+\)', 'capture_screen_region()'),
+]
+
+MOUSE_CONVERSIONS = [
+    (r'pyautogui\.click\(([^)\n]+)\)', r'mouse_controller.click(Button.left, 1)  # Position: \1'),
+    (r'pyautogui\.rightClick\(([^)\n]+)\)', r'mouse_controller.click(Button.right, 1)  # Position: \1'),
+    (r'pyautogui\.moveTo\(([^)\n]+)\)', r'mouse_controller.position = (\1)'),
+    (r'pyautogui\.drag\(([^)\n]+)\)', r'mouse_controller.drag(\1)'),
+]
+
+KEYBOARD_CONVERSIONS = [
+    (r'keyboard\.is_pressed\([\'"]([^\'"\n]+)[\'"]\)', r'is_key_pressed("\1")'),
+    (r'keyboard\.wait\([\'"]([^\'"\n]+)[\'"]\)', r'wait_for_key("\1")'),
+    (r'keyboard\.press\([\'"]([^\'"\n]+)[\'"]\)', r'keyboard_controller.press(Key.\1)'),
+]
+
+# Remove Windows-specific API calls
+SYSTEM_API_CONVERSIONS = [
+    (api_pattern, '# Windows API removed - using macOS native APIs')
+    for api_pattern in [
+        r'ctypes\.windll\.[^(\n]+\([^)\n]*\)',
+        r'windll\.[^(\n]+\([^)\n]*\)',
+        r'GetDC\([^)\n]*\)',
+        r'GetDeviceCaps\([^)\n]*\)',
+        r'ReleaseDC\([^)\n]*\)',
+    ]
+]
+
+
+# Applied by fix_common_bugs: indentation first, then syntax
+COMMON_BUG_FIXES = [
+    (r'\t', '    '),  # Convert tabs to spaces
+    (r'print ([^(][^\n]*)', r'print(\1)'),  # Fix print statements
+    (r'except ([A-Za-z][A-Za-z0-9_]*), ([a-z])', r'except \1 as \2'),  # Fix except syntax
+]
+
+
+def _convert_drive_path(match):
+    """Turn a Windows drive path into a Unix path"""
+    return match.group(0).replace('\\', '/').replace('C:', '')
+
+
+PATH_CONVERSIONS = [
+    (r'[A-Z]:\\[^"\'\n]*', _convert_drive_path),
+    (r'\\\\', '/'),
+    (r'\\', '/'),
+]
+
+SCREEN_CAPTURE_HELPER = '''
 # macOS Screen Capture Implementation
 def capture_screen_region(x=0, y=0, width=None, height=None):
     """Capture screen region using Quartz"""
@@ -182,60 +147,15 @@ def capture_screen_region(x=0, y=0, width=None, height=None):
     return Image.fromarray(img_array)
 
 '''
-            content = screen_capture_code + content
-            self.conversion_log.append("Added macOS screen capture implementation")
-
-        return content
 
-    def convert_mouse_control(self, content):
-        """Convert mouse control from pyautogui to pynput"""
-
-        if not all([self, content]):
-            raise ValueError("Invalid parameters")
-        mouse_conversions = [
-            (r'pyautogui\.click\(([^)]+)\)', r'mouse_controller.click(Button.left, 1)  # Position: \1'),
-            (r'pyautogui\.rightClick\(([^)]+)\)', r'mouse_controller.click(Button.right, 1)  # Position: \1'),
-            (r'pyautogui\.moveTo\(([^)]+)\)', r'mouse_controller.position = (\1)'),
-            (r'pyautogui\.drag\(([^)]+)\)', r'mouse_controller.drag(\1)'),
-        ]
-
-        for old_pattern, new_code in mouse_conversions:
-            if re.search(old_pattern, content):
-                content = re.sub(old_pattern, new_code, content)
-                self.conversion_log.append(f"Converted mouse control: {old_pattern}")
-
-        # Add mouse controller initialization
-        if 'pyautogui' in content:
-            mouse_init = '''
+MOUSE_HELPER = '''
 # macOS Mouse Control Setup
 from pynput import mouse
 mouse_controller = mouse.Controller()
 
 '''
-            content = mouse_init + content
-            self.conversion_log.append("Added macOS mouse controller")
-
-        return content
 
-    def convert_keyboard_control(self, content):
-        """Convert keyboard control to pynput"""
-
-        if not all([self, content]):
-            raise ValueError("Invalid parameters")
-        keyboard_conversions = [
-            (r'keyboard\.is_pressed\([\'"]([^\'"]+)[\'"]\)', r'is_key_pressed("\1")'),
-            (r'keyboard\.wait\([\'"]([^\'"]+)[\'"]\)', r'wait_for_key("\1")'),
-            (r'keyboard\.press\([\'"]([^\'"]+)[\'"]\)', r'keyboard_controller.press(Key.\1)'),
-        ]
-
-        for old_pattern, new_code in keyboard_conversions:
-            if re.search(old_pattern, content):
-                content = re.sub(old_pattern, new_code, content)
-                self.conversion_log.append(f"Converted keyboard control: {old_pattern}")
-
-        # Add keyboard helper functions
-        if 'keyboard.is_pressed' in content or 'keyboard.wait' in content:
-            keyboard_helpers = '''
+KEYBOARD_HELPER = '''
 # macOS Keyboard Control Setup
 from pynput import keyboard
 from pynput.keyboard import Key, Listener as KeyboardListener
@@ -280,31 +200,492 @@ keyboard_listener = KeyboardListener(on_press=on_key_press, on_release=on_key_re
 keyboard_listener.start()
 
 '''
-            content = keyboard_helpers + content
-            self.conversion_log.append("Added macOS keyboard helpers")
+
+# Helpers prepended to the script: (trigger markers, code, log message)
+HELPER_INJECTIONS = {
+    'screen_capture': (('mss', 'sct.grab'), SCREEN_CAPTURE_HELPER, "Added macOS screen capture implementation"),
+    'mouse': (('pyautogui',), MOUSE_HELPER, "Added macOS mouse controller"),
+    'keyboard': (('keyboard.is_pressed', 'keyboard.wait'), KEYBOARD_HELPER, "Added macOS keyboard helpers"),
+}
+
+# Conversion stages in pipeline order: (rules, log label, helper injected after the stage)
+CONVERSION_STAGES = [
+    (IMPORT_CONVERSIONS, "Converted import", None),
+    (SCREEN_CAPTURE_CONVERSIONS, "Converted screen capture", 'screen_capture'),
+    (MOUSE_CONVERSIONS, "Converted mouse control", 'mouse'),
+    (KEYBOARD_CONVERSIONS, "Converted keyboard control", 'keyboard'),
+    (SYSTEM_API_CONVERSIONS, "Removed Windows API", None),
+    (PATH_CONVERSIONS, "Converted file paths", None),
+]
+
+# EnhancedConverter method for each entry of CONVERSION_STAGES, used to name trace spans
+STAGE_METHODS = (
+    'convert_imports', 'convert_screen_capture', 'convert_mouse_control',
+    'convert_keyboard_control', 'convert_system_apis', 'convert_file_paths',
+)
+
+
+def _ruleset_fingerprint():
+    """Fingerprint the conversion rules so cached blocks expire when they change"""
+    parts = []
+    for rules, label, helper_key in CONVERSION_STAGES:
+        parts.append(label)
+        for pattern, replacement in rules:
+            parts.append(pattern)
+            parts.append(getattr(replacement, '__qualname__', replacement))
+    return '\0'.join(parts)
+
+
+RULESET_FINGERPRINT = _ruleset_fingerprint()
+
+
+def apply_rules(content, rules):
+    """Apply (pattern, replacement) rules in order, returning the content and the patterns that fired"""
+    fired = []
+    profiler = get_rule_profiler()
+    for pattern, replacement in rules:
+        if profiler is None:
+            content, count = re.subn(pattern, replacement, content)
+        else:
+            content, count = profiled_subn(profiler, 'enhanced_converter', pattern, replacement, content)
+        if count:
+            fired.append(pattern)
+    return content, fired
+
+
+_stage_plans = None
+
+
+def stage_plans():
+    """Execution plans for CONVERSION_STAGES, built once from the saved rule statistics"""
+    global _stage_plans
+    if _stage_plans is None:
+        stats = get_rule_stats()
+        _stage_plans = [RulePlan('enhanced_converter', rules, stats) for rules, _, _ in CONVERSION_STAGES]
+    return _stage_plans
+
+
+def apply_stage_rules(content, stage_index, use_codegen=True):
+    """Apply one stage's rules, through its plan unless rules are being profiled or use_codegen is off"""
+    if not use_codegen or get_rule_profiler() is not None:
+        return apply_rules(content, CONVERSION_STAGES[stage_index][0])
+    return stage_plans()[stage_index].apply(content)
+
+
+def needs_helper(content, helper_key):
+    """Check whether a helper's trigger markers appear in content"""
+    markers = HELPER_INJECTIONS[helper_key][0]
+    return any(marker in content for marker in markers)
+
+
+def clean_comment_lines(content):
+    """Drop comment lines that don't explain functionality"""
+    lines = content.split('\n')
+    cleaned_lines = []
+
+    for line in lines:
+        # Keep comments that explain functionality
+        if line.strip().startswith('#'):
+            comment = line.strip()[1:].strip().lower()
+
+            # Keep functional comments
+            keep_comment = any(keyword in comment for keyword in [
+                'function', 'method', 'class', 'setup', 'initialization',
+                'main', 'loop', 'process', 'handle', 'detect', 'capture',
+                'control', 'configuration', 'parameters', 'variables',
+                'screen', 'mouse', 'keyboard', 'macro', 'fishing',
+                'converted', 'macos', 'implementation', 'helper'
+            ])
+
+            # Remove generic comments
+            remove_comment = any(phrase in comment for phrase in [
+                'todo', 'fixme', 'hack', 'temporary', 'debug',
+                'test', 'example', 'sample', 'placeholder'
+            ])
+
+            if keep_comment and not remove_comment:
+                cleaned_lines.append(line)
+            elif len(comment) > 50:  # Keep longer explanatory comments
+                cleaned_lines.append(line)
+        else:
+            cleaned_lines.append(line)
+
+    return '\n'.join(cleaned_lines)
+
+
+def convert_block(block, clean=False, use_codegen=True):
+    """
+    Run every conversion stage over one top-level block
+
+    Returns (converted_block, fired, helpers) where fired holds
+    (stage_index, pattern) pairs and helpers the helper keys whose
+    markers were present when their stage finished. With clean=True the
+    block also goes through comment cleaning, which is line-local.
+    use_codegen=False runs every rule through the interpreted loop.
+    """
+    fired = []
+    helpers = []
+    for stage_index, (rules, label, helper_key) in enumerate(CONVERSION_STAGES):
+        block, stage_fired = apply_stage_rules(block, stage_index, use_codegen)
+        fired.extend((stage_index, pattern) for pattern in stage_fired)
+        if helper_key and needs_helper(block, helper_key):
+            helpers.append(helper_key)
+    if clean:
+        block = clean_comment_lines(block)
+    return block, tuple(fired), tuple(helpers)
+
+
+def convert_block_batch(blocks, clean=False, queued_at=None, use_codegen=True):
+    """Convert a batch of blocks in a worker process"""
+    if queued_at is not None:
+        record_span('queue_wait', queued_at, blocks=len(blocks))
+    with span('convert_block_batch', blocks=len(blocks)), time_stage('convert_block_batch'):
+        return [convert_block(block, clean, use_codegen) for block in blocks]
+
+
+# Files smaller than this are converted in-process even in parallel mode
+PARALLEL_MIN_BYTES = 256 * 1024
+
+# Batches handed to each worker, so small chunks don't pay one IPC round-trip each
+BATCHES_PER_WORKER = 4
+
+
+class EnhancedConverter:
+    def __init__(self, use_chunk_cache=False, chunk_cache=None, parallel_workers=0, record_store=None,
+                 use_codegen=True):
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        self.conversion_log = []
+        self.bugs_fixed = []
+
+        # False runs every rule through the interpreted loop (the reference path)
+        self.use_codegen = use_codegen
+
+        # Chunking only pays off once the cache is warm, so one-shot conversions
+        # of unseen files take the classic path unless a cache is asked for
+        if chunk_cache is not None:
+            self.chunk_cache = chunk_cache
+        elif use_chunk_cache:
+            self.chunk_cache = get_shared_chunk_cache()
+        else:
+            self.chunk_cache = None
+
+        # Intra-file parallelism: 0 disables it, None uses every core
+        self.parallel_workers = parallel_workers
+        self._process_pool = None
+        self._pool_workers = 0
+
+        # Previous conversions per file, for incremental re-conversion
+        if record_store is None and self.chunk_cache is not None:
+            record_store = ConversionRecordStore()
+        self.record_store = record_store
+        self.last_chunk_entries = {}
+
+    def convert_script(self, input_path, output_path):
+        """Convert Windows script to macOS with enhanced bug fixing"""
+
+        if not all([self, input_path, output_path]):
+            raise ValueError("Invalid parameters")
+        print(f"🔄 Converting {input_path} to macOS...")
+
+        # A warm converter reports each script on its own
+        self.conversion_log = []
+        self.bugs_fixed = []
+
+        started = time.perf_counter()
+        try:
+            with span('read', file=str(input_path)), time_stage('read'):
+                with open(input_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+        except Exception as e:
+            print(f"❌ Error reading input file: {e}")
+            record_failure('converter', e)
+            return False
+
+        file_key = str(Path(input_path).resolve())
+        converted_content = self.convert_content(content, file_key=file_key)
+
+        try:
+            with span('write', file=str(output_path), bytes=len(converted_content)), time_stage('write'):
+                atomic_write_text(output_path, converted_content)
+            record_conversion('converter', len(content), time.perf_counter() - started)
+
+            print(f"✅ Conversion complete: {output_path}")
+            self.print_conversion_summary()
+            return True
+
+        except Exception as e:
+            print(f"❌ Error writing output file: {e}")
+            record_failure('converter', e)
+            return False
+
+    def convert_content(self, content, file_key=None):
+        """
+        Run the full conversion pipeline over script content
+
+        When file_key names the script and a record store is set, the
+        previous conversion of that file is reused: unchanged source returns
+        the recorded output, and edited source only re-converts the chunks
+        that changed before the global steps run again.
+        """
+
+        if not all([self, content]):
+            raise ValueError("Invalid parameters")
+        with span('convert', file=file_key, bytes=len(content)):
+            profiler = get_rule_profiler()
+            if profiler is not None and file_key:
+                with profiler.file_scope(file_key):
+                    return self._run_pipeline(content, file_key)
+            return self._run_pipeline(content, file_key)
+
+    def _run_pipeline(self, content, file_key):
+        """Body of convert_content"""
+        record = None
+        source_digest = None
+        if file_key and self.record_store is not None:
+            with span('cache_lookup', store='records') as lookup:
+                record = self.record_store.get(file_key)
+                source_digest = ConversionRecordStore.source_digest(content)
+                unchanged = bool(record) and record.get('source_digest') == source_digest and \
+                    record.get('ruleset') == RULESET_FINGERPRINT
+                lookup.set(hit=unchanged)
+            record_cache_lookups('records', int(unchanged), int(not unchanged))
+            if unchanged:
+                self.conversion_log.extend(record['conversion_log'])
+                self.bugs_fixed.extend(record['bugs_fixed'])
+                return record['output']
+
+        log_start = len(self.conversion_log)
+        bugs_start = len(self.bugs_fixed)
+
+        if self.chunk_cache is not None or self._wants_parallel(content) or source_digest is not None:
+            # Conversions and comment cleaning run per chunk
+            previous_chunks = record['chunks'] if record else None
+            converted_content = self.apply_chunked_conversions(content, clean=True, previous_chunks=previous_chunks)
+        else:
+            # Apply conversions
+            converted_content = self.apply_all_conversions(content)
+
+            # Clean up comments
+            converted_content = self.clean_comments(converted_content)
+
+        # Fix common bugs
+        with span('fix_common_bugs', cat='stage'), time_stage('fix_common_bugs'):
+            converted_content = self.fix_common_bugs(converted_content)
+
+        # Add macOS-specific optimizations
+        with span('add_macos_optimizations', cat='stage'), time_stage('add_macos_optimizations'):
+            converted_content = self.add_macos_optimizations(converted_content)
+
+        if source_digest is not None and self.last_chunk_entries:
+            self.record_store.put(file_key, {
+                'source_digest': source_digest,
+                'ruleset': RULESET_FINGERPRINT,
+                'output': converted_content,
+                'conversion_log': self.conversion_log[log_start:],
+                'bugs_fixed': self.bugs_fixed[bugs_start:],
+                'chunks': self.last_chunk_entries
+            })
+
+        return converted_content
+
+    def apply_all_conversions(self, content):
+        """Apply all Windows to macOS conversions"""
+
+        if not all([self, content]):
+            raise ValueError("Invalid parameters")
+        if self.chunk_cache is not None or self._wants_parallel(content):
+            return self.apply_chunked_conversions(content)
+
+        # Import conversions
+        content = self.convert_imports(content)
+
+        # Screen capture conversions
+        content = self.convert_screen_capture(content)
+
+        # Mouse control conversions
+        content = self.convert_mouse_control(content)
+
+        # Keyboard control conversions
+        content = self.convert_keyboard_control(content)
+
+        # System API conversions
+        content = self.convert_system_apis(content)
+
+        # File path conversions
+        content = self.convert_file_paths(content)
+
+        return content
+
+    def apply_chunked_conversions(self, content, clean=False, previous_chunks=None):
+        """Apply all conversions chunk by chunk, reusing cached and previously converted chunks"""
+
+        if not all([self, content]):
+            raise ValueError("Invalid parameters")
+        # The interpreted reference path never reuses chunks converted by generated code
+        namespace = RULESET_FINGERPRINT + ('\0clean' if clean else '') + ('' if self.use_codegen else '\0interpreted')
+        chunks = split_chunks(content)
+        keys = [ChunkCache.make_key(chunk, namespace) for chunk in chunks]
+        entries = [None] * len(chunks)
+        pending = []
+
+        with span('cache_lookup', store='chunks', chunks=len(chunks)) as lookup:
+            for index, key in enumerate(keys):
+                if previous_chunks:
+                    entries[index] = previous_chunks.get(key)
+                if entries[index] is None and self.chunk_cache is not None:
+                    entries[index] = self.chunk_cache.get(key)
+                if entries[index] is None:
+                    pending.append(index)
+            lookup.set(misses=len(pending))
+        record_cache_lookups('chunks', len(chunks) - len(pending), len(pending))
+
+        if pending:
+            if self._wants_parallel(content) and len(pending) > 1:
+                converted = self._convert_in_workers([chunks[index] for index in pending], clean)
+            else:
+                converted = convert_block_batch([chunks[index] for index in pending], clean,
+                                                use_codegen=self.use_codegen)
+
+            for index, entry in zip(pending, converted):
+                entries[index] = entry
+                if self.chunk_cache is not None:
+                    self.chunk_cache.put(keys[index], entry)
+
+        self.last_chunk_entries = dict(zip(keys, entries))
+
+        converted_blocks = []
+        block_fired = set()
+        block_helpers = set()
+        for converted, fired, helpers in entries:
+            converted_blocks.append(converted)
+            block_fired.update(fired)
+            block_helpers.update(helpers)
+
+        # Global steps run once over the merged result
+        return self._merge_converted_blocks(converted_blocks, block_fired, block_helpers, clean)
+
+    def _wants_parallel(self, content):
+        """Check whether content is big enough for intra-file parallelism"""
+        # Rule profiling only sees this process, so it keeps work in-process
+        if get_rule_profiler() is not None:
+            return False
+        return self.parallel_workers != 0 and len(content) >= PARALLEL_MIN_BYTES
+
+    def _convert_in_workers(self, chunks, clean):
+        """Convert chunks across the worker pool, preserving their order"""
+        pool = self._get_process_pool()
+        batch_count = min(len(chunks), self._pool_workers * BATCHES_PER_WORKER)
+
+        # Interleave chunks so every batch gets a similar mix of sizes
+        batches = [list(range(start, len(chunks), batch_count)) for start in range(batch_count)]
+        try:
+            results = list(pool.map(
+                convert_block_batch,
+                [[chunks[index] for index in batch] for batch in batches],
+                [clean] * batch_count,
+                [now_us()] * batch_count,
+                [self.use_codegen] * batch_count
+            ))
+        except Exception as e:
+            print(f"⚠️ Parallel conversion unavailable, converting in-process: {e}")
+            self.shutdown()
+            return convert_block_batch(chunks, clean, use_codegen=self.use_codegen)
+
+        entries = [None] * len(chunks)
+        for batch, batch_entries in zip(batches, results):
+            for index, entry in zip(batch, batch_entries):
+                entries[index] = entry
+        return entries
+
+    def _get_process_pool(self):
+        """Create the worker pool on first use and keep it warm"""
+        if self._process_pool is None:
+            self._pool_workers = self.parallel_workers or os.cpu_count() or 1
+            self._process_pool = ProcessPoolExecutor(max_workers=self._pool_workers)
+        return self._process_pool
+
+    def shutdown(self):
+        """Stop worker processes started for parallel conversion"""
+        if self._process_pool is not None:
+            self._process_pool.shutdown()
+            self._process_pool = None
+
+    def _merge_converted_blocks(self, converted_blocks, block_fired, block_helpers, clean=False):
+        """Inject helpers and write the log exactly as the whole-file pipeline would"""
+
+        # Helpers are prepended mid-pipeline, so later stages still run over them
+        prefix = ''
+        for stage_index, (rules, label, helper_key) in enumerate(CONVERSION_STAGES):
+            prefix, prefix_fired = apply_rules(prefix, rules)
+            for pattern, _ in rules:
+                if pattern in prefix_fired or (stage_index, pattern) in block_fired:
+                    self.conversion_log.append(f"{label}: {pattern}")
+
+            if helper_key and (helper_key in block_helpers or needs_helper(prefix, helper_key)):
+                _, helper_code, message = HELPER_INJECTIONS[helper_key]
+                prefix = helper_code + prefix
+                self.conversion_log.append(message)
+
+        if clean:
+            # Chunks start on line boundaries, so cleaning them separately is exact
+            prefix = clean_comment_lines(prefix)
+
+        return prefix + ''.join(converted_blocks)
+
+    def _apply_stage(self, content, stage_index):
+        """Apply one conversion stage to the whole content and log what fired"""
+        rules, label, helper_key = CONVERSION_STAGES[stage_index]
+        with span(STAGE_METHODS[stage_index], cat='stage'), time_stage(STAGE_METHODS[stage_index]):
+            content, fired = apply_stage_rules(content, stage_index, self.use_codegen)
+        for pattern in fired:
+            self.conversion_log.append(f"{label}: {pattern}")
+
+        if helper_key and needs_helper(content, helper_key):
+            _, helper_code, message = HELPER_INJECTIONS[helper_key]
+            content = helper_code + content
+            self.conversion_log.append(message)
 
         return content
 
+    def convert_imports(self, content):
+        """Convert Windows imports to macOS equivalents"""
+
+        if not all([self, content]):
+            raise ValueError("Invalid parameters")
+        return self._apply_stage(content, 0)
+
+    def convert_screen_capture(self, content):
+        """Convert screen capture from mss to Quartz"""
+
+        if not all([self, content]):
+            raise ValueError("Invalid parameters")
+        # Replace mss screen capture and add the macOS implementation
+        return self._apply_stage(content, 1)
+
+    def convert_mouse_control(self, content):
+        """Convert mouse control from pyautogui to pynput"""
+
+        if not all([self, content]):
+            raise ValueError("Invalid parameters")
+        # Convert calls and add mouse controller initialization
+        return self._apply_stage(content, 2)
+
+    def convert_keyboard_control(self, content):
+        """Convert keyboard control to pynput"""
+
+        if not all([self, content]):
+            raise ValueError("Invalid parameters")
+        # Convert calls and add keyboard helper functions
+        return self._apply_stage(content, 3)
+
     def convert_system_apis(self, content):
         """Convert Windows system APIs to macOS equivalents"""
 
         if not all([self, content]):
             raise ValueError("Invalid parameters")
         # Remove Windows-specific API calls
-        windows_apis = [
-            r'ctypes\.windll\.[^(]+\([^)]*\)',
-            r'windll\.[^(]+\([^)]*\)',
-            r'GetDC\([^)]*\)',
-            r'GetDeviceCaps\([^)]*\)',
-            r'ReleaseDC\([^)]*\)',
-        ]
-
-        for api_pattern in windows_apis:
-            if re.search(api_pattern, content):
-                content = re.sub(api_pattern, '# Windows API removed - using macOS native APIs', content)
-                self.conversion_log.append(f"Removed Windows API: {api_pattern}")
-
-        return content
+        return self._apply_stage(content, 4)
 
     def convert_file_paths(self, content):
         """Convert Windows file paths to Unix paths"""
@@ -312,58 +693,15 @@ keyboard_listener.start()
         if not all([self, content]):
             raise ValueError("Invalid parameters")
         # Convert Windows paths
-        path_conversions = [
-            (r'[A-Z]:\\[^"\']*', lambda m: m.group(0).replace('\\', '/').replace('C:', '')),
-            (r'\\\\', '/'),
-            (r'\\', '/'),
-        ]
-
-        for old_pattern, replacement in path_conversions:
-            if re.search(old_pattern, content):
-                if callable(replacement):
-                    content = re.sub(old_pattern, replacement, content)
-                else:
-                    content = re.sub(old_pattern, replacement, content)
-                self.conversion_log.append(f"Converted file paths: {old_pattern}")
-
-        return content
+        return self._apply_stage(content, 5)
 
     def clean_comments(self, content):
         """Clean up comments - keep only functional explanations"""
 
         if not all([self, content]):
             raise ValueError("Invalid parameters")
-        lines = content.split('\n')
-        cleaned_lines = []
-
-        for line in lines:
-            # Keep comments that explain functionality
-            if line.strip().startswith('#'):
-                comment = line.strip()[1:].strip().lower()
-
-                # Keep functional comments
-                keep_comment = any(keyword in comment for keyword in [
-                    'function', 'method', 'class', 'setup', 'initialization',
-                    'main', 'loop', 'process', 'handle', 'detect', 'capture',
-                    'control', 'configuration', 'parameters', 'variables',
-                    'screen', 'mouse', 'keyboard', 'macro', 'fishing',
-                    'converted', 'macos', 'implementation', 'helper'
-                ])
-
-                # Remove generic comments
-                remove_comment = any(phrase in comment for phrase in [
-                    'todo', 'fixme', 'hack', 'temporary', 'debug',
-                    'test', 'example', 'sample', 'placeholder'
-                ])
-
-                if keep_comment and not remove_comment:
-                    cleaned_lines.append(line)
-                elif len(comment) > 50:  # Keep longer explanatory comments
-                    cleaned_lines.append(line)
-            else:
-                cleaned_lines.append(line)
-
-        return '\n'.join(cleaned_lines)
+        with span('clean_comments', cat='stage'), time_stage('clean_comments'):
+            return clean_comment_lines(content)
 
     def fix_common_bugs(self, content):
         """Fix common conversion bugs"""
@@ -393,19 +731,21 @@ keyboard_listener.start()
         content = '\n'.join(unique_imports + [''] + other_lines)
         self.bugs_fixed.append("Fixed import order and removed duplicates")
 
-        # Fix indentation issues
-        content = re.sub(r'\t', '    ', content)  # Convert tabs to spaces
+        profiler = get_rule_profiler()
+
+        # Convert tabs to spaces, then fix common syntax issues
+        if profiler is None:
+            executor = compile_rules(COMMON_BUG_FIXES) if self.use_codegen else InterpretedRuleSet(COMMON_BUG_FIXES)
+            content, counts = executor(content)
+        else:
+            counts = []
+            for old_pattern, new_pattern in COMMON_BUG_FIXES:
+                content, count = profiled_subn(profiler, 'fix_common_bugs', old_pattern, new_pattern, content)
+                counts.append(count)
         self.bugs_fixed.append("Standardized indentation to 4 spaces")
 
-        # Fix common syntax issues
-        syntax_fixes = [
-            (r'print ([^(][^\n]*)', r'print(\1)'),  # Fix print statements
-            (r'except ([A-Za-z][A-Za-z0-9_]*), ([a-z])', r'except \1 as \2'),  # Fix except syntax
-        ]
-
-        for old_pattern, new_pattern in syntax_fixes:
-            if re.search(old_pattern, content):
-                content = re.sub(old_pattern, new_pattern, content)
+        for (old_pattern, _), count in zip(COMMON_BUG_FIXES[1:], counts[1:]):
+            if count:
                 self.bugs_fixed.append(f"Fixed syntax: {old_pattern}")
 
         return content
@@ -468,32 +808,83 @@ def run_in_background(func, *args, **kwargs):
 
         if not all([self]):
             raise ValueError("Invalid parameters")
-        print("\n" + "="*50)
-        print("CONVERSION SUMMARY")
-        print("="*50)
+        print_conversion_summary(self.conversion_log, self.bugs_fixed)
+
+def print_conversion_summary(conversion_log, bugs_fixed):
+    """Print the conversions and bug fixes of one script"""
+    print("\n" + "="*50)
+    print("CONVERSION SUMMARY")
+    print("="*50)
+
+    print(f"✅ Conversions applied: {len(conversion_log)}")
+    for conversion in conversion_log:
+        print(f"  • {conversion}")
+
+    print(f"\n🔧 Bugs fixed: {len(bugs_fixed)}")
+    for bug_fix in bugs_fixed:
+        print(f"  • {bug_fix}")
 
-        print(f"✅ Conversions applied: {len(self.conversion_log)}")
-        for conversion in self.conversion_log:
-            print(f"  • {conversion}")
+    print(f"\n🎯 Status: Conversion complete - ready for macOS!")
+
+# Where --incremental keeps per-file conversion records between runs
+INCREMENTAL_RECORDS_DIR = Path("cache") / "incremental"
+
+
+def convert_with_daemon(input_path, output_path):
+    """
+    Convert through the running IRUS daemon
+
+    Returns None when no daemon is running, so the caller converts
+    in-process instead.
+    """
+    if not all([input_path, output_path]):
+        raise ValueError("Invalid parameters")
+    from tools.conversion_daemon import DaemonError, get_daemon_client
+
+    client = get_daemon_client()
+    if client is None:
+        return None
 
-        print(f"\n🔧 Bugs fixed: {len(self.bugs_fixed)}")
-        for bug_fix in self.bugs_fixed:
-            print(f"  • {bug_fix}")
+    print(f"🔄 Converting {input_path} to macOS (via IRUS daemon)...")
+    try:
+        response = client.convert(input_path=input_path, output_path=output_path)
+    except DaemonError as e:
+        print(f"⚠️ Daemon conversion failed ({e}) - converting locally")
+        return None
+    finally:
+        client.close()
 
-        print(f"\n🎯 Status: Conversion complete - ready for macOS!")
+    print(f"✅ Conversion complete: {output_path} ({response['elapsed_ms']:.1f} ms)")
+    print_conversion_summary(response['conversion_log'], response['bugs_fixed'])
+    return True
 
-def convert_fishing_script(input_path, output_path=None):
-    """Convert fishing script from Windows to macOS"""
+def convert_fishing_script(input_path, output_path=None, parallel_workers=0, incremental=False, use_daemon=True,
+                           validate=False):
+    """Convert fishing script from Windows to macOS; validate=True also runs the ultra validator"""
 
-    if not all([input_path, output_path=None]):
+    if not all([input_path]):
         raise ValueError("Invalid parameters")
     if output_path is None:
         # Generate output filename
         input_file = Path(input_path).resolve()
         output_path = input_file.parent / f"{input_file.stem}_macos.py"
 
-    converter = EnhancedConverter()
-    success = converter.convert_script(input_path, output_path)
+    # The daemon keeps its own warm converters and records
+    success = convert_with_daemon(input_path, output_path) if use_daemon else None
+    if success is None:
+        record_store = ConversionRecordStore(INCREMENTAL_RECORDS_DIR) if incremental else None
+        converter = EnhancedConverter(parallel_workers=parallel_workers, record_store=record_store)
+        try:
+            success = converter.convert_script(input_path, output_path)
+        finally:
+            converter.shutdown()
+        # Hit counts decide how the rules run next time
+        get_rule_stats().save()
+
+    if success and validate:
+        from tools.ultra_validator import ultra_validate_report
+        report = ultra_validate_report(output_path)
+        print(f"🔍 Validation {report['validation_score']}/100 ({report['status']})")
 
     if success:
         print(f"\n🎣 Your macOS fishing macro is ready!")
@@ -502,12 +893,160 @@ def convert_fishing_script(input_path, output_path=None):
 
     return success
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python3 enhanced_converter.py <input_script.py> [output_script.py]")
-        sys.exit(1)
+def watch_fishing_script(input_path, output_path=None, parallel_workers=0, incremental=False,
+                         debounce=0.3, validate=True, use_inotify=True):
+    """
+    Reconvert a fishing script every time it is saved
 
-    input_file = sys.argv[1]
-    output_file = sys.argv[2] if len(sys.argv) > 2 else None
+    One converter stays warm for the whole session, so each save only
+    re-converts the top-level blocks that changed before the output is
+    atomically replaced and re-validated.
+    """
+    if not all([input_path]):
+        raise ValueError("Invalid parameters")
+    from tools.file_watcher import FileWatcher
 
-    convert_fishing_script(input_file, output_file)
+    input_file = Path(input_path).resolve()
+    if output_path is None:
+        output_path = input_file.parent / f"{input_file.stem}_macos.py"
+
+    record_store = ConversionRecordStore(INCREMENTAL_RECORDS_DIR if incremental else None)
+    converter = EnhancedConverter(use_chunk_cache=True, parallel_workers=parallel_workers, record_store=record_store)
+
+    def reconvert(_changed_paths):
+        if not input_file.exists():
+            print(f"⚠️ {input_file.name} was removed - waiting for it to come back")
+            return
+        started = time.perf_counter()
+        if not converter.convert_script(input_file, output_path):
+            return
+        elapsed = time.perf_counter() - started
+        if validate:
+            from tools.ultra_validator import ultra_validate_report
+            report = ultra_validate_report(output_path)
+            print(f"🔄 Reconverted in {elapsed:.2f}s - validation {report['validation_score']}/100 ({report['status']})")
+        else:
+            print(f"🔄 Reconverted in {elapsed:.2f}s")
+
+    reconvert([input_file])
+    watcher = FileWatcher(input_file, reconvert, debounce=debounce, use_inotify=use_inotify)
+    print(f"👀 Watching {input_file.name} ({watcher.backend_name}) - press Ctrl+C to stop")
+
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        print("\n👋 Watch mode stopped")
+    finally:
+        converter.shutdown()
+        get_rule_stats().save()
+
+    return True
+
+if __name__ == "__main__":
+    import argparse
+    from tools.execution_profile import add_profile_arguments, apply_cache_limits, converter_options, load_profile
+
+    parser = argparse.ArgumentParser(
+        prog="enhanced_converter.py",
+        description="Convert a Windows fishing macro to macOS"
+    )
+    parser.add_argument("input_file", help="Windows script to convert")
+    parser.add_argument("output_file", nargs="?", help="Where to write the macOS script")
+    parser.add_argument(
+        "-j", "--jobs", type=int, metavar="N",
+        help="Convert large files in N worker processes (-1 uses every core, default: from the profile)"
+    )
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="Keep a record of each conversion and only redo the blocks that changed"
+    )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="Keep converting the input every time it is saved"
+    )
+    parser.add_argument("--debounce", type=float, default=0.3, help="Seconds of quiet before reconverting")
+    parser.add_argument("--poll", action="store_true", help="Poll for changes instead of using inotify")
+    parser.add_argument("--no-validate", action="store_true", help="Skip validation after conversion")
+    parser.add_argument(
+        "--no-daemon", action="store_true",
+        help="Convert in this process even when the IRUS daemon is running"
+    )
+    parser.add_argument(
+        "--profile-rules", action="store_true",
+        help="Time every conversion rule and show the most expensive ones"
+    )
+    parser.add_argument("--top", type=int, default=10, metavar="N", help="Rules to show with --profile-rules")
+    parser.add_argument("--rule-report", metavar="FILE", help="Export rule statistics to FILE (.json or .csv)")
+    parser.add_argument(
+        "--profile-memory", action="store_true",
+        help="Show peak and retained memory of every conversion stage"
+    )
+    parser.add_argument("--memory-report", metavar="FILE", help="Export the memory profile to FILE (.json or .csv)")
+    parser.add_argument(
+        "--trace", nargs="?", const="cache/trace.jsonl", metavar="FILE",
+        help="Record pipeline spans as Chrome trace events (default: cache/trace.jsonl)"
+    )
+    parser.add_argument(
+        "--metrics-port", type=int, metavar="PORT",
+        help="Serve Prometheus metrics on localhost:PORT (most useful with --watch)"
+    )
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    if args.metrics_port is not None:
+        from tools.metrics import try_start_metrics_server
+        try_start_metrics_server(args.metrics_port)
+
+    if args.trace:
+        from tools.tracing import enable_tracing
+        print(f"🔬 Tracing to {enable_tracing(args.trace).path}")
+
+    execution_profile = load_profile(speed=args.speed, memory=args.memory)
+    apply_cache_limits(execution_profile)
+    if args.jobs is None:
+        jobs = converter_options(execution_profile)['parallel_workers']
+    else:
+        jobs = None if args.jobs < 0 else args.jobs
+    if args.profile_rules or args.rule_report:
+        # The daemon's rules run in another process, so profile locally
+        with profile_rules() as profiler:
+            success = convert_fishing_script(
+                args.input_file, args.output_file, parallel_workers=jobs,
+                incremental=args.incremental, use_daemon=False
+            )
+        print(f"\n⏱️ Top {args.top} rules by time:")
+        print(profiler.format_top(args.top))
+        stats = get_rule_stats()
+        stats.merge_profiler(profiler)
+        stats.save()
+        if args.rule_report:
+            print(f"📄 Rule statistics saved to {profiler.export(args.rule_report)}")
+        sys.exit(0 if success else 1)
+
+    if args.profile_memory or args.memory_report:
+        from tools.memory_profile import profile_conversion_memory
+        output_path = args.output_file or Path(args.input_file).with_name(f"{Path(args.input_file).stem}_macos.py")
+        print(f"🧠 Profiling memory for {args.input_file}...")
+        memory_profile = profile_conversion_memory(args.input_file, output_path, top=args.top)
+        print(memory_profile.format_table())
+        print(f"📁 Location: {output_path}")
+        if args.memory_report:
+            print(f"📄 Memory profile saved to {memory_profile.export(args.memory_report)}")
+        sys.exit(0)
+
+    if args.watch:
+        success = watch_fishing_script(
+            args.input_file, args.output_file, parallel_workers=jobs,
+            incremental=args.incremental, debounce=args.debounce,
+            validate=not args.no_validate and execution_profile['validation'] != 'none',
+            use_inotify=not args.poll
+        )
+        sys.exit(0 if success else 1)
+
+    success = convert_fishing_script(
+        args.input_file, args.output_file,
+        parallel_workers=jobs, incremental=args.incremental,
+        use_daemon=not args.no_daemon,
+        validate=not args.no_validate and execution_profile['validation'] == 'full'
+    )
+    sys.exit(0 if success else 1)
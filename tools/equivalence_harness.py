@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+IRUS V6.0 - Differential Equivalence Harness
+Runs the legacy conversion path and every optimised path over the same scripts
+Reports byte-level divergences and how much faster each path is
+"""
+
+import sys
+import time
+import statistics
+from pathlib import Path
+
+if __name__ == "__main__":
+    # Allow running as a script from the tools directory
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools.benchmark_corpus import DEFAULT_SEED, MacroScriptGenerator, parse_size, size_label
+
+DEFAULT_SIZES = ['1KB', '16KB', '256KB']
+GOLDEN_SUFFIX = '.golden'
+CONTEXT_BYTES = 40
+COMPARE_BLOCK = 64 * 1024
+
+
+def _legacy_path():
+    from tools.enhanced_converter import EnhancedConverter
+    converter = EnhancedConverter(use_chunk_cache=False, use_codegen=False)
+    return converter.convert_content
+
+
+def _engine_path():
+    from tools.enhanced_converter import EnhancedConverter
+    converter = EnhancedConverter(use_chunk_cache=False)
+    return converter.convert_content
+
+
+def _cache_path():
+    from tools.chunk_cache import ChunkCache
+    from tools.enhanced_converter import EnhancedConverter
+
+    # A fresh cache per run measures the chunked pipeline, not cache hits
+    def convert(content):
+        return EnhancedConverter(chunk_cache=ChunkCache()).convert_content(content)
+    return convert
+
+
+def _cache_warm_path():
+    from tools.chunk_cache import ChunkCache
+    from tools.enhanced_converter import EnhancedConverter
+    converter = EnhancedConverter(chunk_cache=ChunkCache())
+    return converter.convert_content
+
+
+def _incremental_path():
+    from tools.chunk_cache import ChunkCache, ConversionRecordStore
+    from tools.enhanced_converter import EnhancedConverter
+    converter = EnhancedConverter(chunk_cache=ChunkCache(), record_store=ConversionRecordStore())
+
+    def convert(content):
+        return converter.convert_content(content, file_key="equivalence.py")
+    return convert
+
+
+def _parallel_path():
+    from tools.enhanced_converter import EnhancedConverter
+    converter = EnhancedConverter(use_chunk_cache=False, parallel_workers=2)
+
+    # Scripts under PARALLEL_MIN_BYTES stay in-process, larger ones use the pool
+    def convert(content):
+        return converter.convert_content(content)
+    convert.close = converter.shutdown
+    return convert
+
+
+# Path name -> factory returning convert(content) -> str; 'legacy' is the reference
+PATHS = {
+    'legacy': _legacy_path,
+    'engine': _engine_path,
+    'cache': _cache_path,
+    'cache_warm': _cache_warm_path,
+    'incremental': _incremental_path,
+    'parallel': _parallel_path,
+}
+DEFAULT_PATHS = ['engine', 'cache', 'cache_warm', 'incremental', 'parallel']
+
+
+def first_divergence(expected, actual):
+    """
+    Locate the first byte where two outputs differ
+
+    Returns None when they are identical, otherwise the byte offset,
+    1-based line and column, and a little context from both sides.
+    """
+    if expected == actual:
+        return None
+
+    offset = 0
+    shortest = min(len(expected), len(actual))
+    # Skip equal blocks with one memcmp each, then walk the differing block
+    while offset + COMPARE_BLOCK <= shortest and expected[offset:offset + COMPARE_BLOCK] == actual[offset:offset + COMPARE_BLOCK]:
+        offset += COMPARE_BLOCK
+    while offset < shortest and expected[offset] == actual[offset]:
+        offset += 1
+
+    line_start = expected.rfind(b'\n', 0, offset) + 1
+    start = max(0, offset - CONTEXT_BYTES)
+    return {
+        'offset': offset,
+        'line': expected.count(b'\n', 0, offset) + 1,
+        'column': offset - line_start + 1,
+        'expected_length': len(expected),
+        'actual_length': len(actual),
+        'expected': expected[start:offset + CONTEXT_BYTES].decode('utf-8', 'replace'),
+        'actual': actual[start:offset + CONTEXT_BYTES].decode('utf-8', 'replace'),
+    }
+
+
+def golden_corpus(directory):
+    """Scripts in a golden directory as (name, content, expected output or None)"""
+    if not all([directory]):
+        raise ValueError("Invalid parameters")
+    scripts = []
+    for path in sorted(Path(directory).rglob("*.py")):
+        golden = path.with_name(path.name + GOLDEN_SUFFIX)
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        expected = golden.read_bytes() if golden.exists() else None
+        scripts.append((str(path), content, expected))
+    return scripts
+
+
+class EquivalenceHarness:
+    """
+    Differential test of optimised conversion paths against the legacy path
+
+    The legacy path is the whole-file, rule-by-rule EnhancedConverter.
+    Every other path converts the same scripts and its output is compared
+    byte for byte; the first divergence and the speedup over legacy are
+    reported per script. Golden scripts with a recorded `.golden` output
+    also check the legacy path itself against that recording.
+    """
+
+    def __init__(self, paths=None, sizes=None, seed=DEFAULT_SEED, golden_dirs=None, repeat=3):
+        if not all([self, repeat]):
+            raise ValueError("Invalid parameters")
+        paths = paths or DEFAULT_PATHS
+        # Names pick built-in paths; a dict adds custom factories
+        self.paths = dict(paths) if isinstance(paths, dict) else {name: PATHS[name] for name in paths}
+        self.paths.pop('legacy', None)
+        self.sizes = [parse_size(size) for size in (DEFAULT_SIZES if sizes is None else sizes)]
+        self.seed = seed
+        self.golden_dirs = list(golden_dirs or [])
+        self.repeat = repeat
+
+    def corpus(self):
+        """All scripts to compare: (name, content, golden bytes or None)"""
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        generator = MacroScriptGenerator(self.seed)
+        scripts = [(f"synthetic-{size_label(size)}", generator.generate(size), None) for size in self.sizes]
+        # Constructs spanning lines catch rules that match across chunk boundaries
+        scripts += [(f"multiline-{size_label(size)}", generator.generate(size, multiline=True), None)
+                    for size in self.sizes]
+        for directory in self.golden_dirs:
+            scripts.extend(golden_corpus(directory))
+        return scripts
+
+    def _time(self, convert, content):
+        """Median seconds over repeat runs, and the output of the last run"""
+        samples = []
+        output = None
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            output = convert(content)
+            samples.append(time.perf_counter() - started)
+        return statistics.median(samples), output
+
+    def run(self, progress=print):
+        """Compare every path on every script and return the report"""
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        legacy = _legacy_path()
+        converters = {name: factory() for name, factory in self.paths.items()}
+        results = []
+
+        # Compile patterns and generated rule functions before anything is timed
+        warm_up = MacroScriptGenerator(self.seed).generate(1024)
+        for convert in [legacy] + list(converters.values()):
+            convert(warm_up)
+
+        try:
+            for name, content, golden in self.corpus():
+                legacy_seconds, legacy_output = self._time(legacy, content)
+                expected = legacy_output.encode('utf-8')
+
+                if golden is not None:
+                    divergence = first_divergence(golden, expected)
+                    results.append(self._result(name, 'legacy vs golden', None, None, divergence))
+                    progress(self._format(results[-1]))
+
+                for path_name, convert in converters.items():
+                    seconds, output = self._time(convert, content)
+                    divergence = first_divergence(expected, output.encode('utf-8'))
+                    results.append(self._result(name, path_name, legacy_seconds, seconds, divergence))
+                    progress(self._format(results[-1]))
+        finally:
+            for convert in converters.values():
+                close = getattr(convert, 'close', None)
+                if close:
+                    close()
+
+        return {
+            'seed': self.seed,
+            'repeat': self.repeat,
+            'paths': list(converters),
+            'identical': all(result['identical'] for result in results),
+            'results': results,
+        }
+
+    def _result(self, script, path, legacy_seconds, seconds, divergence):
+        return {
+            'script': script,
+            'path': path,
+            'identical': divergence is None,
+            'legacy_seconds': legacy_seconds,
+            'seconds': seconds,
+            'speedup': legacy_seconds / seconds if seconds else None,
+            'divergence': divergence,
+        }
+
+    def _format(self, result):
+        speedup = f"{result['speedup']:.2f}x" if result['speedup'] else '-'
+        if result['identical']:
+            return f"✅ {Path(result['script']).name:<28} {result['path']:<18} identical  {speedup:>8}"
+        divergence = result['divergence']
+        return (
+            f"❌ {Path(result['script']).name:<28} {result['path']:<18} DIVERGES   {speedup:>8}\n"
+            f"   first difference at byte {divergence['offset']} (line {divergence['line']}, "
+            f"column {divergence['column']}; lengths {divergence['expected_length']} vs {divergence['actual_length']})\n"
+            f"   expected: {divergence['expected']!r}\n"
+            f"   actual:   {divergence['actual']!r}"
+        )
+
+
+def update_golden(directories):
+    """Record the legacy output next to every golden script"""
+    if not all([directories]):
+        raise ValueError("Invalid parameters")
+    from tools.atomic_io import atomic_write_text
+
+    legacy = _legacy_path()
+    written = []
+    for directory in directories:
+        for name, content, _ in golden_corpus(directory):
+            path = Path(name).with_name(Path(name).name + GOLDEN_SUFFIX)
+            atomic_write_text(path, legacy(content))
+            written.append(path)
+    return written
+
+
+def main(argv=None):
+    """Command-line entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="equivalence_harness.py",
+        description="Check that optimised conversion paths produce exactly the legacy output"
+    )
+    parser.add_argument("--paths", default=','.join(DEFAULT_PATHS),
+                        help=f"Comma-separated subset of: {', '.join(DEFAULT_PATHS)}")
+    parser.add_argument("--sizes", default=','.join(DEFAULT_SIZES), help="Synthetic script sizes ('' for none)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--golden", action="append", default=[], metavar="DIR",
+                        help="Folder of real scripts; *.py.golden files hold their expected output")
+    parser.add_argument("--update-golden", action="store_true", help="Record legacy output for --golden scripts")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per path and script")
+    parser.add_argument("--output", help="Also write the report to this JSON file")
+    args = parser.parse_args(argv)
+
+    if args.update_golden:
+        if not args.golden:
+            parser.error("--update-golden needs --golden DIR")
+        for path in update_golden(args.golden):
+            print(f"📄 {path}")
+        return 0
+
+    harness = EquivalenceHarness(
+        paths=[name for name in args.paths.split(',') if name],
+        sizes=[size for size in args.sizes.split(',') if size],
+        seed=args.seed, golden_dirs=args.golden, repeat=args.repeat,
+    )
+    print("🔬 IRUS V6.0 - Differential Equivalence")
+    print("=" * 50)
+    report = harness.run()
+
+    if args.output:
+        from tools.benchmark_suite import save_results
+        print(f"📄 Report saved to {save_results(report, args.output)}")
+
+    print()
+    if report['identical']:
+        print("✅ Every path produced byte-identical output")
+        return 0
+    diverged = sum(1 for result in report['results'] if not result['identical'])
+    print(f"❌ {diverged} comparison(s) diverged")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+IRUS V6.0 - Execution Profiles
+Turns the "Conversion speed" and "Memory usage" settings into concrete limits
+Workers, large-file processes, cache sizes, streaming, validation depth and UI refresh rate
+"""
+
+import os
+import sys
+from pathlib import Path
+
+if __name__ == "__main__":
+    # Allow running as a script from the tools directory
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+DEFAULT_SPEED = "Normal"
+DEFAULT_MEMORY = "Balanced"
+
+# share: part of the CPU cores used for conversion workers
+# validation: none skips checks, basic runs the conversion analysis, full also runs the ultra validator
+# ui_tick_ms: how often the UI event queue is drained; a slower tick leaves more CPU for workers
+# pacing: the GUI's step-by-step progress animation between conversion phases
+SPEED_PROFILES = {
+    'Fast': {'share': 1.0, 'validation': 'none', 'ui_tick_ms': 33, 'pacing': False},
+    'Normal': {'share': 0.5, 'validation': 'basic', 'ui_tick_ms': 16, 'pacing': True},
+    'Thorough': {'share': 0.5, 'validation': 'full', 'ui_tick_ms': 16, 'pacing': True},
+}
+
+# max_workers: cap on workers whatever the core count (None for no cap)
+# split_large_files: EnhancedConverter spreads one large file over worker processes;
+#   batches always convert their files on threads, one file per worker
+# chunk_cache_entries: LRU limit of the shared chunk cache
+# streaming: batches hand files to workers a few at a time instead of queueing every file up front
+MEMORY_PROFILES = {
+    'Low': {'max_workers': 2, 'split_large_files': False, 'chunk_cache_entries': 256, 'streaming': True},
+    'Balanced': {'max_workers': 8, 'split_large_files': False, 'chunk_cache_entries': 4096, 'streaming': False},
+    'High': {'max_workers': None, 'split_large_files': True, 'chunk_cache_entries': 32768, 'streaming': False},
+}
+
+# Files in flight per worker when streaming
+STREAMING_WINDOW_PER_WORKER = 2
+
+
+def resolve_profile(speed=DEFAULT_SPEED, memory=DEFAULT_MEMORY, cpu_count=None):
+    """
+    Execution profile for a speed and memory setting
+
+    Unknown names fall back to the defaults, so an old or hand-edited
+    settings file still gives a working profile.
+    """
+    speed = speed if speed in SPEED_PROFILES else DEFAULT_SPEED
+    memory = memory if memory in MEMORY_PROFILES else DEFAULT_MEMORY
+    speed_settings = SPEED_PROFILES[speed]
+    memory_settings = MEMORY_PROFILES[memory]
+
+    cores = cpu_count or os.cpu_count() or 1
+    workers = max(1, round(cores * speed_settings['share']))
+    if memory_settings['max_workers'] is not None:
+        workers = min(workers, memory_settings['max_workers'])
+
+    return {
+        'speed': speed,
+        'memory': memory,
+        'workers': workers,
+        'split_large_files': memory_settings['split_large_files'],
+        'chunk_cache_entries': memory_settings['chunk_cache_entries'],
+        'streaming': memory_settings['streaming'],
+        'validation': speed_settings['validation'],
+        'ui_tick_ms': speed_settings['ui_tick_ms'],
+        'pacing': speed_settings['pacing'],
+    }
+
+
+def load_profile(path=None, speed=None, memory=None):
+    """Profile from the saved GUI settings; speed or memory given here win over the file"""
+    # Imported here: the settings schema takes its choices from this module
+    from tools.settings_store import load_settings
+
+    settings, _ = load_settings(path)
+    return resolve_profile(speed or settings['speed'], memory or settings['memory'])
+
+
+def streaming_window(profile):
+    """Files a batch keeps in flight, or None to queue every file at once"""
+    if not profile['streaming']:
+        return None
+    return profile['workers'] * STREAMING_WINDOW_PER_WORKER
+
+
+def converter_options(profile):
+    """Keyword arguments for EnhancedConverter under profile"""
+    return {'parallel_workers': profile['workers'] if profile['split_large_files'] else 0}
+
+
+def apply_cache_limits(profile):
+    """Resize the process-wide caches to the profile's limits"""
+    from tools.chunk_cache import get_shared_chunk_cache
+
+    get_shared_chunk_cache().resize(profile['chunk_cache_entries'])
+
+
+def describe(profile):
+    """One line summary for logs and the CLI"""
+    return (f"{profile['speed']}/{profile['memory']}: {profile['workers']} workers"
+            f"{', large files split across processes' if profile['split_large_files'] else ''}, "
+            f"{profile['chunk_cache_entries']} cached chunks, "
+            f"{'streaming' if profile['streaming'] else 'in-memory'} batches, "
+            f"{profile['validation']} validation, UI every {profile['ui_tick_ms']}ms")
+
+
+def add_profile_arguments(parser):
+    """Add --speed and --memory to an argparse parser"""
+    parser.add_argument("--speed", choices=list(SPEED_PROFILES),
+                        help="Conversion speed profile (default: the GUI setting, else Normal)")
+    parser.add_argument("--memory", choices=list(MEMORY_PROFILES),
+                        help="Memory usage profile (default: the GUI setting, else Balanced)")
+
+
+def main(argv=None):
+    """Command-line entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="execution_profile.py",
+        description="Show what the speed and memory settings resolve to on this machine"
+    )
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    profile = load_profile(speed=args.speed, memory=args.memory)
+    print(f"⚙️ {describe(profile)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+IRUS V6.0 - File Watcher
+Watches script folders and reports changed files in debounced batches
+Uses inotify on Linux and falls back to polling everywhere else
+"""
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import threading
+from pathlib import Path
+
+# inotify event masks (from <sys/inotify.h>)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct('iIII')
+
+# Folders never worth watching (our own output included)
+IGNORED_DIRECTORIES = {'converted_batch', '__pycache__', '.git'}
+
+
+def is_watched_script(path):
+    """Check whether a path is a script the watcher should report"""
+    path = Path(path)
+    if path.suffix != '.py' or path.name.startswith('.'):
+        return False
+    return not any(part in IGNORED_DIRECTORIES for part in path.parts)
+
+
+class InotifyBackend:
+    """Change source backed by Linux inotify through ctypes"""
+
+    def __init__(self, root, path_filter):
+        if not all([self, root, path_filter]):
+            raise ValueError("Invalid parameters")
+        libc_name = ctypes.util.find_library('c')
+        if not sys.platform.startswith('linux') or not libc_name:
+            raise OSError("inotify is not available on this platform")
+
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.root = Path(root).resolve()
+        self.path_filter = path_filter
+        self.watches = {}
+
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        if self.root.is_dir():
+            self._add_tree(self.root)
+        else:
+            self._add_watch(self.root.parent)
+
+    def _add_watch(self, directory):
+        """Watch one directory"""
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(str(directory)), WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error == errno.ENOSPC:
+                raise OSError(error, "inotify watch limit reached")
+            return
+        self.watches[wd] = Path(directory)
+
+    def _add_tree(self, directory):
+        """Watch a directory and every sub-directory below it"""
+        for current, dirnames, _ in os.walk(str(directory)):
+            dirnames[:] = [name for name in dirnames if name not in IGNORED_DIRECTORIES]
+            self._add_watch(current)
+
+    def wait(self, timeout):
+        """Wait up to timeout seconds and return the changed paths"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, name_length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset:offset + name_length].rstrip(b'\0')
+                offset += name_length
+
+                if mask & IN_Q_OVERFLOW:
+                    # Events were dropped; report everything we can see
+                    changed.update(path for path in self.root.rglob('*.py') if self.path_filter(path))
+                    continue
+
+                directory = self.watches.get(wd)
+                if directory is None:
+                    continue
+                if mask & IN_IGNORED:
+                    self.watches.pop(wd, None)
+                    continue
+
+                path = directory / os.fsdecode(name) if name else directory
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO) and path.name not in IGNORED_DIRECTORIES:
+                        self._add_tree(path)
+                        changed.update(item for item in path.rglob('*.py') if self.path_filter(item))
+                    continue
+
+                if self.path_filter(path):
+                    changed.add(path)
+
+        return changed
+
+    def close(self):
+        """Release the inotify descriptor"""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingBackend:
+    """Change source that compares file stats on a fixed interval"""
+
+    def __init__(self, root, path_filter, interval=0.5):
+        if not all([self, root, path_filter, interval]):
+            raise ValueError("Invalid parameters")
+        self.root = Path(root).resolve()
+        self.path_filter = path_filter
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self):
+        """Stat every watched script under the root"""
+        if self.root.is_file():
+            candidates = [self.root]
+        else:
+            candidates = []
+            for current, dirnames, filenames in os.walk(str(self.root)):
+                dirnames[:] = [name for name in dirnames if name not in IGNORED_DIRECTORIES]
+                candidates.extend(Path(current) / name for name in filenames)
+
+        snapshot = {}
+        for path in candidates:
+            if not self.path_filter(path):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self, timeout):
+        """Wait up to timeout seconds and return the changed paths"""
+        time.sleep(min(timeout, self.interval))
+        snapshot = self._scan()
+        changed = {
+            path for path, signature in snapshot.items()
+            if self.snapshot.get(path) != signature
+        }
+        changed.update(path for path in self.snapshot if path not in snapshot)
+        self.snapshot = snapshot
+        return changed
+
+    def close(self):
+        """Nothing to release for polling"""
+        self.snapshot = {}
+
+
+class FileWatcher:
+    """Debounced, coalescing watcher for a script or a folder of scripts"""
+
+    def __init__(self, root, callback, debounce=0.3, path_filter=None, use_inotify=True, poll_interval=0.5):
+        if not all([self, root, callback]):
+            raise ValueError("Invalid parameters")
+        self.root = Path(root).resolve()
+        self.callback = callback
+        self.debounce = debounce
+        self.max_delay = max(debounce * 10, 2.0)
+        self.stop_event = threading.Event()
+
+        if path_filter is None:
+            if self.root.is_file():
+                watched_file = self.root
+                path_filter = lambda path: Path(path).resolve() == watched_file
+            else:
+                path_filter = is_watched_script
+        self.path_filter = path_filter
+
+        self.backend = None
+        if use_inotify:
+            try:
+                self.backend = InotifyBackend(self.root, self.path_filter)
+            except (OSError, AttributeError) as e:
+                print(f"⚠️ inotify unavailable ({e}) - falling back to polling")
+        if self.backend is None:
+            self.backend = PollingBackend(self.root, self.path_filter, poll_interval)
+
+    @property
+    def backend_name(self):
+        """Name of the change source in use"""
+        return 'inotify' if isinstance(self.backend, InotifyBackend) else 'polling'
+
+    def run(self):
+        """
+        Watch until stop() is called
+
+        Changes are collected until the tree has been quiet for the debounce
+        interval (or max_delay has passed since the first one), then handed
+        to the callback as one sorted list, so a burst of saves triggers a
+        single reconversion per file.
+        """
+        pending = set()
+        first_change = last_change = None
+
+        try:
+            while not self.stop_event.is_set():
+                changed = self.backend.wait(self.debounce)
+                now = time.monotonic()
+
+                if changed:
+                    if not pending:
+                        first_change = now
+                    pending.update(changed)
+                    last_change = now
+
+                if pending and (now - last_change >= self.debounce or now - first_change >= self.max_delay):
+                    batch = sorted(pending)
+                    pending = set()
+                    try:
+                        self.callback(batch)
+                    except Exception as e:
+                        print(f"❌ Watch callback failed: {e}")
+        finally:
+            self.backend.close()
+
+    def start(self):
+        """Run the watcher on a daemon thread"""
+        thread = threading.Thread(target=self.run, daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        """Ask the watch loop to exit"""
+        self.stop_event.set()
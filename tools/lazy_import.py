@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+IRUS V6.0 - Lazy Imports
+Heavy optional libraries load when a feature first uses them, not at startup
+Includes an -X importtime reader for checking cold start cost
+"""
+
+import re
+import sys
+import importlib
+import importlib.util
+import subprocess
+import threading
+from pathlib import Path
+
+if __name__ == "__main__":
+    # Allow running as a script from the tools directory
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Libraries the GUI and tools use for a few features only
+HEAVY_MODULES = ('requests', 'psutil', 'numpy', 'matplotlib', 'sqlite3')
+
+# What the launcher imports before the window shows, and its cold start budget in milliseconds
+STARTUP_MODULE = 'gui.professional_ui'
+STARTUP_BUDGET_MS = 150
+
+_IMPORT_TIME = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+class LazyModule:
+    """
+    Stands in for a module until one of its attributes is used
+
+    Truth testing tells whether the module is installed without importing
+    it, so existing "if psutil:" checks keep working. Using an attribute
+    of a missing module raises ImportError with the pip hint.
+    """
+
+    def __init__(self, name, install_hint=None):
+        # Not all([self, ...]): truth testing self would look the module up
+        if not all([name]):
+            raise ValueError("Invalid parameters")
+        # Set through __dict__: __setattr__ is left alone, attributes go to the module
+        self.__dict__['_name'] = name
+        self.__dict__['_install_hint'] = install_hint or f"pip install {name.partition('.')[0]}"
+        self.__dict__['_module'] = None
+        self.__dict__['_available'] = None
+        self.__dict__['_lock'] = threading.Lock()
+
+    @property
+    def available(self):
+        """True when the module can be imported; checked without importing it"""
+        if self._module is not None:
+            return True
+        if self._available is None:
+            # find_spec of a dotted name imports the parent package, so only ask about the top level
+            top_level = self._name.partition('.')[0]
+            self.__dict__['_available'] = top_level in sys.modules or importlib.util.find_spec(top_level) is not None
+        return self._available
+
+    @property
+    def loaded(self):
+        """True once the real module has been imported"""
+        return self._module is not None
+
+    def load(self):
+        """Import the module now and return it"""
+        module = self._module
+        if module is not None:
+            return module
+        with self._lock:
+            if self._module is None:
+                try:
+                    self.__dict__['_module'] = importlib.import_module(self._name)
+                except ImportError as e:
+                    self.__dict__['_available'] = False
+                    raise ImportError(f"{self._name} is not installed ({self._install_hint})") from e
+            return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self.load(), attr, value)
+
+    def __bool__(self):
+        return self.available
+
+    def __repr__(self):
+        state = 'loaded' if self.loaded else 'not loaded'
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name, install_hint=None):
+    """
+    Module proxy for name that imports on first attribute access
+
+    Returns the real module when it has already been imported elsewhere.
+    """
+    if not all([name]):
+        raise ValueError("Invalid parameters")
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name, install_hint)
+
+
+def parse_import_times(stderr):
+    """
+    Rows of -X importtime output as dicts, in the order Python printed them
+
+    Times are microseconds; depth 1 is a module imported directly by the
+    script, deeper levels are what it imported in turn.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        match = _IMPORT_TIME.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append({'module': module, 'self_us': int(self_us), 'cumulative_us': int(cumulative_us),
+                         'depth': len(indent) // 2 + 1})
+    return rows
+
+
+def measure_import_time(module, python=None, cwd=None):
+    """
+    Import module in a fresh interpreter under -X importtime
+
+    Returns the cumulative microseconds of module itself and every row.
+    """
+    if not all([module]):
+        raise ValueError("Invalid parameters")
+    result = subprocess.run(
+        [python or sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, cwd=cwd or Path(__file__).resolve().parent.parent, timeout=60
+    )
+    if result.returncode != 0:
+        raise ImportError(f"Importing {module} failed: {result.stderr.strip().splitlines()[-1:]}")
+    rows = parse_import_times(result.stderr)
+    cumulative = next((row['cumulative_us'] for row in reversed(rows) if row['module'] == module), 0)
+    return cumulative, rows
+
+
+def heavy_imports(rows):
+    """Top-level names from HEAVY_MODULES that appear in import time rows"""
+    return sorted({row['module'].partition('.')[0] for row in rows} & set(HEAVY_MODULES))
+
+
+def main(argv=None):
+    """Command-line entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="lazy_import.py",
+        description="Show what importing a module costs in a fresh interpreter"
+    )
+    parser.add_argument("module", nargs="?", default=STARTUP_MODULE,
+                        help=f"Module to import (default: {STARTUP_MODULE})")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list")
+    args = parser.parse_args(argv)
+
+    cumulative, rows = measure_import_time(args.module)
+    print(f"⏱️ import {args.module}: {cumulative / 1000:.1f}ms")
+    for row in sorted(rows, key=lambda row: row['self_us'], reverse=True)[:args.top]:
+        print(f"  {row['self_us'] / 1000:>7.2f}ms  {row['module']}")
+    heavy = heavy_imports(rows)
+    if heavy:
+        print(f"⚠️ Heavy modules imported at startup: {', '.join(heavy)}")
+    if args.module == STARTUP_MODULE and cumulative / 1000 > STARTUP_BUDGET_MS:
+        print(f"❌ Over the {STARTUP_BUDGET_MS}ms startup budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+IRUS V6.0 - Log Console
+Keeps the most recent log lines in a ring buffer and writes new ones to a Tk Text widget
+Lines are flushed in one insert per UI tick; level filtering hides lines without redrawing them
+"""
+
+import sys
+import threading
+from collections import deque
+from pathlib import Path
+
+if __name__ == "__main__":
+    # Allow running as a script from the tools directory
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+LEVELS = ('debug', 'info', 'warning', 'error')
+
+# Lines kept in memory and in the widget; older lines are dropped
+DEFAULT_MAX_LINES = 5000
+MIN_MAX_LINES = 100
+
+# Choices for the "Show" box above the log, mapped to the lowest level shown
+FILTER_CHOICES = {'All': 'debug', 'Info': 'info', 'Warnings': 'warning', 'Errors': 'error'}
+
+# Existing messages carry their level as an emoji prefix
+_LEVEL_PREFIXES = (('❌', 'error'), ('⚠', 'warning'), ('🐛', 'debug'))
+
+
+def classify(message):
+    """Level of a log message from its emoji prefix; plain messages are info"""
+    stripped = message.lstrip()
+    for prefix, level in _LEVEL_PREFIXES:
+        if stripped.startswith(prefix):
+            return level
+    return 'info'
+
+
+def level_tag(level):
+    """Text widget tag holding every line of level"""
+    return f"log_{level}"
+
+
+class LogBuffer:
+    """
+    Thread-safe ring buffer of (sequence, level, text) log lines
+
+    Lines appended since the last take_pending() are kept separately, capped
+    at the same limit, so a burst larger than the limit costs no more than
+    the limit to display.
+    """
+
+    def __init__(self, max_lines=DEFAULT_MAX_LINES):
+        # Not all([self, ...]): an empty buffer is falsy through __len__
+        if not all([max_lines]):
+            raise ValueError("Invalid parameters")
+        max_lines = max(int(max_lines), MIN_MAX_LINES)
+        self.max_lines = max_lines
+        self._lines = deque(maxlen=max_lines)
+        self._pending = deque(maxlen=max_lines)
+        self._lock = threading.Lock()
+        self._sequence = 0
+        self.dropped = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._lines)
+
+    def append(self, text, level='info'):
+        """Add a line; returns its sequence number"""
+        with self._lock:
+            self._sequence += 1
+            if len(self._lines) == self.max_lines:
+                self.dropped += 1
+            entry = (self._sequence, level, text)
+            self._lines.append(entry)
+            self._pending.append(entry)
+            return self._sequence
+
+    def take_pending(self):
+        """Lines appended since the last call, oldest first"""
+        with self._lock:
+            pending = list(self._pending)
+            self._pending.clear()
+            return pending
+
+    def lines(self, min_level='debug'):
+        """Text of every kept line at min_level or above"""
+        shown = set(LEVELS[LEVELS.index(min_level):])
+        with self._lock:
+            return [text for _, level, text in self._lines if level in shown]
+
+    def set_max_lines(self, max_lines):
+        """Change the limit, keeping the newest lines"""
+        if not all([max_lines]):
+            raise ValueError("Invalid parameters")
+        max_lines = max(int(max_lines), MIN_MAX_LINES)
+        with self._lock:
+            self.dropped += max(len(self._lines) - max_lines, 0)
+            self.max_lines = max_lines
+            self._lines = deque(self._lines, maxlen=max_lines)
+            self._pending = deque(self._pending, maxlen=max_lines)
+
+    def clear(self):
+        """Forget every line"""
+        with self._lock:
+            self._lines.clear()
+            self._pending.clear()
+
+
+class LogConsole:
+    """
+    Log view over a Tk Text widget backed by a LogBuffer
+
+    append() may be called from any thread: it stores the line and asks the
+    UI event queue for one flush per tick. flush() writes every pending line
+    with a single insert, trims the widget to the line limit and scrolls to
+    the end only when the user had not scrolled away from it.
+    """
+
+    def __init__(self, text, ui_events, max_lines=DEFAULT_MAX_LINES):
+        if not all([self, text, ui_events, max_lines]):
+            raise ValueError("Invalid parameters")
+        self.text = text
+        self.ui_events = ui_events
+        self.buffer = LogBuffer(max_lines)
+        self.min_level = 'debug'
+        self._flush_key = ('log_flush', id(self))
+        self._widget_lines = 0
+        self.flushes = 0
+
+        for level in LEVELS:
+            self.text.tag_configure(level_tag(level), elide=False)
+
+    @property
+    def max_lines(self):
+        return self.buffer.max_lines
+
+    def append(self, message, level=None):
+        """Queue a line for the next flush; safe to call from worker threads"""
+        self.buffer.append(message, level or classify(message))
+        self.ui_events.post_latest(self._flush_key, self.flush)
+
+    def flush(self):
+        """Write pending lines to the widget in one batch; returns how many were written"""
+        pending = self.buffer.take_pending()
+        if not pending:
+            return 0
+
+        follow = self._at_end()
+        chunks = []
+        for _, level, message in pending:
+            chunks.extend((f"{message}\n", (level_tag(level),)))
+        self.text.insert('end', *chunks)
+        self._widget_lines += len(pending)
+        self._trim()
+        if follow:
+            self.text.see('end')
+        self.flushes += 1
+        return len(pending)
+
+    def set_min_level(self, min_level):
+        """Show only lines at min_level or above; hidden lines stay in the widget, elided"""
+        if min_level not in LEVELS:
+            raise ValueError(f"Unknown log level: {min_level}")
+        self.min_level = min_level
+        threshold = LEVELS.index(min_level)
+        for index, level in enumerate(LEVELS):
+            self.text.tag_configure(level_tag(level), elide=index < threshold)
+
+    def set_max_lines(self, max_lines):
+        """Change the line limit, dropping the oldest lines from the widget if needed"""
+        self.buffer.set_max_lines(max_lines)
+        self._trim()
+
+    def clear(self):
+        """Empty the log and the widget"""
+        self.buffer.clear()
+        self.text.delete('1.0', 'end')
+        self._widget_lines = 0
+
+    def lines(self):
+        """Kept lines that the current filter shows"""
+        return self.buffer.lines(self.min_level)
+
+    def _trim(self):
+        excess = self._widget_lines - self.buffer.max_lines
+        if excess > 0:
+            # Line n+1 starts right after the n oldest lines
+            self.text.delete('1.0', f"{excess + 1}.0")
+            self._widget_lines -= excess
+
+    def _at_end(self):
+        try:
+            return self.text.yview()[1] >= 0.999
+        except Exception:
+            # Widget not mapped yet
+            return True
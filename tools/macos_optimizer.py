@@ -10,8 +10,17 @@ import re
 import os
 import sys
 import json
+import time
 from pathlib import Path
 
+if __name__ == "__main__":
+    # Allow running as a script from the tools directory
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools.rule_profiler import get_rule_profiler
+from tools.rule_plan import get_rule_stats, may_match
+from tools.rule_codegen import compile_rules
+
 class MacOSOptimizer:
     """Optimizes Python scripts specifically for macOS"""
 
@@ -86,7 +95,7 @@ class MacOSOptimizer:
             tuple: (optimized_code, optimization_report)
         """
 
-        if not all([self, code_content, target_system="macOS"]):
+        if not all([self, code_content, target_system]):
             raise ValueError("Invalid parameters")
         optimized_code = code_content
         optimization_report = []
@@ -117,8 +126,15 @@ class MacOSOptimizer:
             raise ValueError("Invalid parameters")
         optimized_code = code
         report = []
+        profiler = get_rule_profiler()
+        stats = get_rule_stats()
 
         for old_api, new_api in self.macos_optimizations.items():
+            if profiler is not None:
+                started = time.perf_counter()
+                scanned = len(optimized_code)
+                count = 0
+
             if old_api in optimized_code:
                 # Count occurrences
                 count = optimized_code.count(old_api)
@@ -141,6 +157,11 @@ class MacOSOptimizer:
 
                 self.conversion_stats['optimizations_applied'] += count
 
+            if profiler is not None:
+                profiler.record('macos_optimizer', old_api, count, time.perf_counter() - started, scanned)
+            else:
+                stats.record('macos_optimizer', old_api, int(old_api in code))
+
         return optimized_code, report
 
     def _apply_performance_optimizations(self, code):
@@ -149,18 +170,32 @@ class MacOSOptimizer:
             raise ValueError("Invalid parameters")
         optimized_code = code
         report = []
+        profiler = get_rule_profiler()
+        stats = get_rule_stats()
 
-        for pattern_info in self.performance_patterns:
-            pattern = pattern_info['pattern']
-            replacement = pattern_info['replacement']
-            reason = pattern_info['reason']
+        rules = [(info['pattern'], info['replacement']) for info in self.performance_patterns]
+        if profiler is None:
+            # One generated function applies every pattern
+            optimized_code, counts = compile_rules(rules)(optimized_code)
+        else:
+            counts = []
+            for pattern, replacement in rules:
+                started = time.perf_counter()
+                scanned = len(optimized_code)
+                # Skip the regex entirely when the literal every match needs is absent
+                if may_match(pattern, optimized_code):
+                    optimized_code, count = re.subn(pattern, replacement, optimized_code)
+                else:
+                    count = 0
+                profiler.record('macos_optimizer', pattern, count, time.perf_counter() - started, scanned)
+                counts.append(count)
 
-            matches = re.findall(pattern, optimized_code)
-            if matches:
-                optimized_code = re.sub(pattern, replacement, optimized_code)
-                count = len(matches)
-                report.append(f"⚡ Performance: {reason} ({count} instances)")
+        for pattern_info, count in zip(self.performance_patterns, counts):
+            if count:
+                report.append(f"⚡ Performance: {pattern_info['reason']} ({count} instances)")
                 self.conversion_stats['optimizations_applied'] += count
+            if profiler is None:
+                stats.record('macos_optimizer', pattern_info['pattern'], count)
 
         return optimized_code, report
 
@@ -172,16 +207,15 @@ class MacOSOptimizer:
         imports_to_add = []
 
         # Check if we need macOS-specific imports
-        if 'cv2.' in code and 'try:
-    import cv2
-except ImportError:
-    cv2 = None
-    print("Warning: cv2 module not available - some features disabled")' not in code:
-            imports_to_add.append("try:
-    import cv2
-except ImportError:
-    cv2 = None
-    print("Warning: cv2 module not available - some features disabled")  # OpenCV for computer vision")
+        if 'cv2.' in code and 'import cv2' not in code:
+            # OpenCV for computer vision; optional so the script still starts without it
+            imports_to_add.append(
+                "try:\n"
+                "    import cv2\n"
+                "except ImportError:\n"
+                "    cv2 = None\n"
+                "    print(\"Warning: cv2 module not available - some features disabled\")"
+            )
 
         if 'time.sleep' in code and 'import time' not in code:
             imports_to_add.append("import time")
@@ -190,7 +224,7 @@ except ImportError:
             imports_to_add.append("import threading")
 
         if 'Path(' in code and 'from pathlib import Path' not in code:
-            imports_to_add.append("from pathlib import Path").resolve()
+            imports_to_add.append("from pathlib import Path")
 
         # Add macOS-specific imports at the top
         if imports_to_add:
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+IRUS V6.0 - Conversion Memory Profiler
+Records peak and retained memory of every conversion pipeline stage
+Uses tracemalloc snapshots; top allocation sites export to JSON or CSV
+"""
+
+import csv
+import sys
+import json
+import time
+import tracemalloc
+from pathlib import Path
+
+if __name__ == "__main__":
+    # Allow running as a script from the tools directory
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# EnhancedConverter methods in pipeline order, between 'read' and 'write'
+PIPELINE_STAGES = [
+    'convert_imports', 'convert_screen_capture', 'convert_mouse_control',
+    'convert_keyboard_control', 'convert_system_apis', 'convert_file_paths',
+    'clean_comments', 'fix_common_bugs', 'add_macos_optimizations',
+]
+DEFAULT_TOP = 10
+DEFAULT_FRAMES = 5
+
+# Allocations made by the profiler itself are not interesting
+_IGNORED_FILES = (tracemalloc.__file__, '<frozen importlib._bootstrap>', '<frozen importlib._bootstrap_external>',
+                  '<unknown>')
+
+
+def _format_bytes(size):
+    if abs(size) >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.2f}MB"
+    if abs(size) >= 1024:
+        return f"{size / 1024:.1f}KB"
+    return f"{size}B"
+
+
+class MemoryProfile:
+    """
+    Memory used by each stage of one conversion
+
+    peak_bytes is the highest traced memory while the stage ran, above
+    what was allocated when it started - the transient cost, including
+    copies that were freed again. retained_bytes is what the stage left
+    allocated when it returned. top_allocations lists the source lines
+    whose retained memory grew most during the stage.
+    """
+
+    def __init__(self, script, size_bytes, frames):
+        if not all([self, script, frames]):
+            raise ValueError("Invalid parameters")
+        self.script = str(script)
+        self.size_bytes = size_bytes
+        self.frames = frames
+        self.created = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self.stages = []
+
+    def add_stage(self, stage, seconds, peak_bytes, retained_bytes, top_allocations):
+        """Record one measured stage"""
+        self.stages.append({
+            'stage': stage,
+            'seconds': seconds,
+            'peak_bytes': peak_bytes,
+            'retained_bytes': retained_bytes,
+            'top_allocations': top_allocations,
+        })
+
+    def heaviest_stage(self, key='peak_bytes'):
+        """The stage with the largest peak (or other key)"""
+        if not self.stages:
+            return None
+        return max(self.stages, key=lambda stage: stage[key])
+
+    def to_dict(self):
+        """Snapshot of the profile, suitable for JSON"""
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        return {
+            'script': self.script,
+            'size_bytes': self.size_bytes,
+            'created': self.created,
+            'tracemalloc_frames': self.frames,
+            'stages': self.stages,
+        }
+
+    def export_json(self, path):
+        """Write the whole profile as JSON"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return Path(path)
+
+    def export_csv(self, path):
+        """Write one row per stage and allocation site"""
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['stage', 'peak_bytes', 'retained_bytes', 'file', 'line', 'size_bytes', 'count'])
+            for stage in self.stages:
+                for site in stage['top_allocations']:
+                    writer.writerow([stage['stage'], stage['peak_bytes'], stage['retained_bytes'],
+                                     site['file'], site['line'], site['size_bytes'], site['count']])
+        return Path(path)
+
+    def export(self, path):
+        """Write JSON or CSV depending on the file extension"""
+        if not all([self, path]):
+            raise ValueError("Invalid parameters")
+        if Path(path).suffix.lower() == '.csv':
+            return self.export_csv(path)
+        return self.export_json(path)
+
+    def format_table(self, sites=3):
+        """Text table of the stages, each with its top allocation sites"""
+        lines = [f"{'Stage':<26} {'Time':>9} {'Peak':>10} {'Retained':>10}"]
+        for stage in self.stages:
+            lines.append(
+                f"{stage['stage']:<26} {stage['seconds'] * 1000:>7.2f}ms "
+                f"{_format_bytes(stage['peak_bytes']):>10} {_format_bytes(stage['retained_bytes']):>10}"
+            )
+            for site in stage['top_allocations'][:sites]:
+                lines.append(f"    {_format_bytes(site['size_bytes']):>9}  {Path(site['file']).name}:{site['line']}")
+        heaviest = self.heaviest_stage()
+        if heaviest:
+            lines.append(f"Heaviest stage: {heaviest['stage']} ({_format_bytes(heaviest['peak_bytes'])} peak "
+                         f"for a {_format_bytes(self.size_bytes)} script)")
+        return '\n'.join(lines)
+
+
+def _allocation_sites(before, after, top):
+    """Source lines whose allocations grew most between two snapshots"""
+    filters = [tracemalloc.Filter(False, filename) for filename in _IGNORED_FILES]
+    filters.append(tracemalloc.Filter(False, __file__))
+    differences = after.filter_traces(filters).compare_to(before.filter_traces(filters), 'lineno')
+    sites = []
+    for difference in differences:
+        if difference.size_diff <= 0:
+            continue
+        frame = difference.traceback[0]
+        sites.append({
+            'file': frame.filename,
+            'line': frame.lineno,
+            'size_bytes': difference.size_diff,
+            'count': difference.count_diff,
+        })
+        if len(sites) >= top:
+            break
+    return sites
+
+
+def _measure(profile, stage, func, top):
+    """Run func as one stage under the active tracemalloc session"""
+    before = tracemalloc.take_snapshot()
+    start_current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    started = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    profile.add_stage(stage, seconds, peak - start_current, current - start_current,
+                      _allocation_sites(before, after, top))
+    return result
+
+
+def profile_conversion_memory(input_path, output_path=None, top=DEFAULT_TOP, frames=DEFAULT_FRAMES):
+    """
+    Convert input_path stage by stage and profile each stage's memory
+
+    Stages run whole-file on a converter without chunk cache or worker
+    processes, so every copy is made in this process and attributed to
+    the stage that made it. The output is written to output_path, or
+    nowhere when it is None (the write stage then encodes in memory).
+    """
+    if not all([input_path, top, frames]):
+        raise ValueError("Invalid parameters")
+    from tools.atomic_io import atomic_write_text
+    from tools.enhanced_converter import EnhancedConverter
+
+    converter = EnhancedConverter(use_chunk_cache=False)
+    was_tracing = tracemalloc.is_tracing()
+    if was_tracing:
+        # Keep the caller's session; its frame depth applies
+        frames = tracemalloc.get_traceback_limit()
+    else:
+        tracemalloc.start(frames)
+
+    try:
+        def read():
+            with open(input_path, 'r', encoding='utf-8') as f:
+                return f.read()
+
+        profile = MemoryProfile(input_path, Path(input_path).stat().st_size, frames)
+        content = _measure(profile, 'read', read, top)
+        for stage in PIPELINE_STAGES:
+            content = _measure(profile, stage, lambda stage=stage: getattr(converter, stage)(content), top)
+
+        if output_path:
+            _measure(profile, 'write', lambda: atomic_write_text(output_path, content), top)
+        else:
+            _measure(profile, 'write', lambda: content.encode('utf-8'), top)
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    return profile
+
+
+def main(argv=None):
+    """Command-line entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="memory_profile.py",
+        description="Show how much memory each conversion stage allocates"
+    )
+    parser.add_argument("input_file", help="Windows script to convert")
+    parser.add_argument("output_file", nargs="?", help="Where to write the converted script (default: nowhere)")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="Allocation sites kept per stage")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES, help="Stack frames tracemalloc records")
+    parser.add_argument("--export", metavar="FILE", help="Write the profile to FILE (.json or .csv)")
+    args = parser.parse_args(argv)
+
+    print(f"🧠 Profiling memory for {args.input_file}...")
+    profile = profile_conversion_memory(args.input_file, args.output_file, args.top, args.frames)
+    print(profile.format_table())
+    if args.export:
+        print(f"📄 Memory profile saved to {profile.export(args.export)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
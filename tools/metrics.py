@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+IRUS V6.0 - Metrics Registry
+In-process counters, gauges and histograms for conversions, queues and caches
+Served on localhost in the Prometheus text exposition format
+"""
+
+import re
+import sys
+import math
+import time
+import bisect
+import threading
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+if __name__ == "__main__":
+    # Allow running as a script from the tools directory
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+DEFAULT_METRICS_PORT = 47632
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_LABEL = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+_UNESCAPE = {'\\\\': '\\', '\\"': '"', '\\n': '\n'}
+
+# Seconds; conversion stages run from microseconds to a few seconds
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values)) + (list(extra.items()) if extra else [])
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+class _Metric:
+    """Shared parts of every metric type"""
+
+    kind = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=()):
+        if not all([self, name, documentation]):
+            raise ValueError("Invalid parameters")
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels):
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self):
+        """(suffix, label values, extra labels, value) for every series"""
+        with self._lock:
+            return [('', key, None, value) for key, value in self._values.items()]
+
+    def get(self, **labels):
+        """Current value of one series (0 when it was never touched)"""
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, key, extra, value in self.samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(self.labelnames, key, extra)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        """Add amount (never negative) to the series for labels"""
+        if amount < 0:
+            raise ValueError("Counters only go up")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Value that goes up and down; optionally computed when scraped"""
+
+    kind = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=(), function=None):
+        super().__init__(name, documentation, labelnames)
+        # function() -> {label values tuple: value}, evaluated at scrape time
+        self.function = function
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def samples(self):
+        if self.function is None:
+            return super().samples()
+        return [('', key, None, value) for key, value in self.function().items()]
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative buckets"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        """Record one observation"""
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def get(self, **labels):
+        """(count, sum) of one series"""
+        with self._lock:
+            series = self._values.get(self._key(labels))
+            return (series[2], series[1]) if series else (0, 0.0)
+
+    def samples(self):
+        rows = []
+        with self._lock:
+            series_list = [(key, list(series[0]), series[1], series[2]) for key, series in self._values.items()]
+        for key, counts, total, count in series_list:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                rows.append(('_bucket', key, {'le': _format_value(float(bound))}, cumulative))
+            rows.append(('_sum', key, None, total))
+            rows.append(('_count', key, None, count))
+        return rows
+
+
+class MetricsRegistry:
+    """Named metrics of one process; getters return the existing metric on repeat calls"""
+
+    def __init__(self):
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def _register(self, metric_class, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(name, *args, **kwargs)
+            elif not isinstance(metric, metric_class):
+                raise ValueError(f"{name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=(), function=None):
+        return self._register(Gauge, name, documentation, labelnames, function)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram, name, documentation, labelnames, buckets)
+
+    def render(self):
+        """Every metric in the Prometheus text format"""
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+FILES_CONVERTED = REGISTRY.counter(
+    'irus_files_converted_total', 'Scripts converted successfully', ('component',))
+BYTES_CONVERTED = REGISTRY.counter(
+    'irus_bytes_converted_total', 'Source bytes of successfully converted scripts', ('component',))
+CONVERSION_FAILURES = REGISTRY.counter(
+    'irus_conversion_failures_total', 'Failed conversions by error type', ('component', 'error'))
+QUEUE_DEPTH = REGISTRY.gauge(
+    'irus_queue_depth', 'Files or requests waiting for a worker', ('component',))
+CACHE_LOOKUPS = REGISTRY.counter(
+    'irus_cache_lookups_total', 'Chunk cache and conversion record lookups', ('store', 'result'))
+STAGE_SECONDS = REGISTRY.histogram(
+    'irus_stage_seconds', 'Time spent in each pipeline stage', ('stage',))
+FILE_SECONDS = REGISTRY.histogram(
+    'irus_file_seconds', 'Time to convert one script end to end', ('component',))
+
+
+def _cache_hit_ratios():
+    lookups = {}
+    with CACHE_LOOKUPS._lock:
+        for (store, result), value in CACHE_LOOKUPS._values.items():
+            hits, total = lookups.get(store, (0, 0))
+            lookups[store] = (hits + (value if result == 'hit' else 0), total + value)
+    return {(store,): hits / total for store, (hits, total) in lookups.items() if total}
+
+
+CACHE_HIT_RATIO = REGISTRY.gauge(
+    'irus_cache_hit_ratio', 'Share of cache lookups that hit, per store', ('store',), function=_cache_hit_ratios)
+REGISTRY.gauge('irus_process_start_time_seconds', 'Unix time this process started').set(time.time())
+
+
+class time_stage:
+    """Observe the duration of a with-block in the stage latency histogram"""
+
+    __slots__ = ('stage', 'started')
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        STAGE_SECONDS.observe(time.perf_counter() - self.started, stage=self.stage)
+        return False
+
+
+def record_conversion(component, size_bytes, seconds):
+    """Count one successful conversion"""
+    FILES_CONVERTED.inc(component=component)
+    BYTES_CONVERTED.inc(size_bytes, component=component)
+    FILE_SECONDS.observe(seconds, component=component)
+
+
+def record_failure(component, error):
+    """Count one failed conversion; error is an exception, its type or a short name"""
+    if isinstance(error, BaseException):
+        error = type(error).__name__
+    elif isinstance(error, type):
+        error = error.__name__
+    CONVERSION_FAILURES.inc(component=component, error=error)
+
+
+def record_cache_lookups(store, hits, misses):
+    """Count cache hits and misses for one store"""
+    if hits:
+        CACHE_LOOKUPS.inc(hits, store=store, result='hit')
+    if misses:
+        CACHE_LOOKUPS.inc(misses, store=store, result='miss')
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """GET /metrics returns the registry"""
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = self.server.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would flood the console
+        pass
+
+
+class _MetricsServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+def start_metrics_server(port=DEFAULT_METRICS_PORT, registry=None):
+    """
+    Serve the registry on http://127.0.0.1:port/metrics from a daemon thread
+
+    Only localhost is bound. Returns the server (port=0 picks a free
+    port, see server.server_address); call shutdown() to stop it.
+    """
+    server = _MetricsServer(('127.0.0.1', port), _MetricsHandler)
+    server.registry = registry or REGISTRY
+    threading.Thread(target=server.serve_forever, name="irus-metrics", daemon=True).start()
+    return server
+
+
+def try_start_metrics_server(port=DEFAULT_METRICS_PORT):
+    """start_metrics_server, or None with a warning when the port is taken"""
+    try:
+        server = start_metrics_server(port)
+    except OSError as e:
+        print(f"⚠️ Metrics endpoint unavailable on port {port}: {e}")
+        return None
+    print(f"📏 Metrics on http://127.0.0.1:{server.server_address[1]}/metrics")
+    return server
+
+
+def parse_prometheus_text(text):
+    """{(name, ((label, value), ...)): value} for every sample line"""
+    samples = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        series, _, value = line.rpartition(' ')
+        name, _, label_text = series.partition('{')
+        labels = tuple(
+            (match.group(1), re.sub(r'\\.', lambda escape: _UNESCAPE.get(escape.group(0), escape.group(0)), match.group(2)))
+            for match in _LABEL.finditer(label_text)
+        )
+        samples[(name, labels)] = float(value)
+    return samples
+
+
+def read_metrics(url=None):
+    """Samples from a metrics endpoint, or from this process's registry when url is None"""
+    if url is None:
+        return parse_prometheus_text(REGISTRY.render())
+    from urllib.request import urlopen
+    with urlopen(url, timeout=2.0) as response:
+        return parse_prometheus_text(response.read().decode('utf-8'))
+
+
+def summarize_samples(samples):
+    """Totals a dashboard needs from one scrape"""
+    summary = {'files': 0.0, 'bytes': 0.0, 'failures': {}, 'queue_depth': 0.0, 'cache_hit_ratio': {},
+               'stages': {}}
+    for (name, labels), value in samples.items():
+        labels = dict(labels)
+        if name == 'irus_files_converted_total':
+            summary['files'] += value
+        elif name == 'irus_bytes_converted_total':
+            summary['bytes'] += value
+        elif name == 'irus_conversion_failures_total':
+            summary['failures'][labels['error']] = summary['failures'].get(labels['error'], 0) + value
+        elif name == 'irus_queue_depth':
+            summary['queue_depth'] += value
+        elif name == 'irus_cache_hit_ratio':
+            summary['cache_hit_ratio'][labels['store']] = value
+        elif name in ('irus_stage_seconds_sum', 'irus_stage_seconds_count'):
+            stage = summary['stages'].setdefault(labels['stage'], {'count': 0, 'seconds': 0.0})
+            stage['count' if name.endswith('_count') else 'seconds'] = value
+    return summary
+
+
+def main(argv=None):
+    """Command-line entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="metrics.py",
+        description="Show the metrics of a running IRUS process"
+    )
+    parser.add_argument("--url", default=f"http://127.0.0.1:{DEFAULT_METRICS_PORT}/metrics")
+    args = parser.parse_args(argv)
+
+    try:
+        summary = summarize_samples(read_metrics(args.url))
+    except OSError as e:
+        print(f"❌ Could not read {args.url}: {e}")
+        return 1
+    print(f"📏 {summary['files']:.0f} files, {summary['bytes'] / 1024:.0f}KB converted, "
+          f"queue depth {summary['queue_depth']:.0f}")
+    for store, ratio in sorted(summary['cache_hit_ratio'].items()):
+        print(f"  {store} cache hit ratio: {ratio:.1%}")
+    for error, count in sorted(summary['failures'].items()):
+        print(f"  ❌ {error}: {count:.0f}")
+    for stage, row in sorted(summary['stages'].items(), key=lambda item: -item[1]['seconds']):
+        mean = row['seconds'] / row['count'] if row['count'] else 0.0
+        print(f"  {stage:<26} {row['count']:>7.0f} runs  {mean * 1000:>8.2f}ms mean")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,3 @@
-from functools import lru_cache
 #!/usr/bin/env python3
 """
 IRUS V6.0 - Real-time Performance Profiler
@@ -7,22 +6,26 @@ CPU, Memory, I/O, and Network analysis
 """
 
 import time
-try:
-    import psutil
-except ImportError:
-    psutil = None
-    print("Warning: psutil module not available - some features disabled")
 import threading
 import json
 from pathlib import Path
 import tkinter as tk
 from tkinter import ttk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from collections import deque
 import subprocess
 import sys
 
+if __name__ == "__main__":
+    # Allow running as a script from the tools directory
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools.lazy_import import lazy_import
+from tools.ui_events import UIEventQueue
+from tools.worker_pool import submit
+
+# System counters load when monitoring starts or the profiler window opens
+psutil = lazy_import('psutil')
+
 class PerformanceProfiler:
     """Real-time performance monitoring system"""
 
@@ -39,10 +42,16 @@ class PerformanceProfiler:
         }
         self.process_data = {}
         self.alerts = []
+        self.memory_profiles = deque(maxlen=10)
+
+        # IRUS metrics endpoint to read (None reads this process's registry)
+        self.metrics_url = None
+        self.metrics = None
+        self._last_metrics_read = None
 
     def start_monitoring(self, interval=1.0):
         """Start real-time performance monitoring"""
-        if not all([self, interval=1.0]):
+        if not all([self, interval]):
             raise ValueError("Invalid parameters")
         self.monitoring = True
         self.monitor_thread = threading.Thread(target=self._monitor_loop, args=(interval,), daemon=True)
@@ -86,6 +95,12 @@ class PerformanceProfiler:
                 # Monitor specific processes
                 self._monitor_processes()
 
+                # IRUS's own throughput, queues and caches
+                try:
+                    self.read_metrics()
+                except OSError:
+                    self.metrics = None
+
                 time.sleep(interval)
 
             except Exception as e:
@@ -139,7 +154,6 @@ class PerformanceProfiler:
         except Exception as e:
                     print(f"Error: {e}")
                     # Log error for debugging
-    @lru_cache(maxsize=128)
 
     def get_current_stats(self):
         """Get current performance statistics"""
@@ -163,12 +177,92 @@ class PerformanceProfiler:
             'processes': self.process_data
         }
 
+    def profile_memory(self, script_path, output_path=None, top=10):
+        """Profile the memory of each conversion stage for one script"""
+        if not all([self, script_path]):
+            raise ValueError("Invalid parameters")
+        from tools.memory_profile import profile_conversion_memory
+        profile = profile_conversion_memory(script_path, output_path, top=top)
+        self.memory_profiles.append(profile)
+        return profile
+
+    def capture_cpu_profile(self, func, *args, label=None, sampling=False, **kwargs):
+        """Run func under cProfile (or the stack sampler) and save its flamegraph"""
+        if not all([self, func]):
+            raise ValueError("Invalid parameters")
+        from tools.cpu_profile import profile_call
+        mode = 'sampling' if sampling else 'cprofile'
+        return profile_call(func, *args, label=label, mode=mode, **kwargs)
+
+    def captured_runs(self):
+        """Saved CPU profile runs, newest first"""
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        from tools.cpu_profile import list_runs
+        return list_runs()
+
+    def read_metrics(self, url=None):
+        """
+        Read the IRUS metrics registry or a /metrics endpoint
+
+        Files/s and bytes/s are rates since the previous read; the first
+        read only establishes the baseline.
+        """
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        from tools.metrics import read_metrics, summarize_samples
+        summary = summarize_samples(read_metrics(url or self.metrics_url))
+        now = time.time()
+        summary['files_per_second'] = summary['bytes_per_second'] = 0.0
+        if self._last_metrics_read:
+            last_time, last = self._last_metrics_read
+            elapsed = now - last_time
+            if elapsed > 0:
+                summary['files_per_second'] = max(0.0, summary['files'] - last['files']) / elapsed
+                summary['bytes_per_second'] = max(0.0, summary['bytes'] - last['bytes']) / elapsed
+        self._last_metrics_read = (now, summary)
+        self.metrics = summary
+        return summary
+
+    def metrics_report(self):
+        """Text summary of the last metrics read"""
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        metrics = self.metrics
+        if not metrics:
+            return "No IRUS metrics read"
+        lines = [
+            "📏 IRUS Conversion Metrics:",
+            f"• Files: {metrics['files']:.0f} ({metrics['files_per_second']:.2f}/s)",
+            f"• Bytes: {metrics['bytes'] / 1024:.0f}KB ({metrics['bytes_per_second'] / 1024:.1f}KB/s)",
+            f"• Queue depth: {metrics['queue_depth']:.0f}",
+        ]
+        for store, ratio in sorted(metrics['cache_hit_ratio'].items()):
+            lines.append(f"• {store} cache hit ratio: {ratio:.1%}")
+        for error, count in sorted(metrics['failures'].items()):
+            lines.append(f"• Failures ({error}): {count:.0f}")
+        for stage, row in sorted(metrics['stages'].items(), key=lambda item: -item[1]['seconds'])[:5]:
+            mean = row['seconds'] / row['count'] if row['count'] else 0.0
+            lines.append(f"• {stage}: {mean * 1000:.2f}ms mean over {row['count']:.0f} runs")
+        return '\n'.join(lines) + '\n'
+
+    def memory_report(self):
+        """Stage memory table of the latest memory profile"""
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        if not self.memory_profiles:
+            return "No memory profile captured"
+        profile = self.memory_profiles[-1]
+        return f"🧠 Conversion Memory: {Path(profile.script).name}\n{profile.format_table()}\n"
+
     def generate_report(self):
         """Generate performance analysis report"""
         if not all([self]):
             raise ValueError("Invalid parameters")
         stats = self.get_current_stats()
         if not stats:
+            if self.memory_profiles:
+                return self.memory_report()
             return "No performance data available"
 
         report = f"""
@@ -192,27 +286,44 @@ class PerformanceProfiler:
 
         # Add recommendations based on performance
         if stats['cpu']['average'] > 70:
-            report = f"{report}{"• High CPU usage detected - consider optimizing algorithms\n"}"
+            report += "• High CPU usage detected - consider optimizing algorithms\n"
         if stats['memory']['average'] > 80:
-            report = f"{report}{"• High memory usage - consider using generators or processing in chunks\n"}"
+            report += "• High memory usage - consider using generators or processing in chunks\n"
         if stats['alerts'] > 10:
-            report = f"{report}{"• Multiple performance alerts - review system resources\n"}"
+            report += "• Multiple performance alerts - review system resources\n"
 
         if stats['cpu']['average'] < 30 and stats['memory']['average'] < 50:
-            report = f"{report}{"• System performance is optimal\n"}"
+            report += "• System performance is optimal\n"
+
+        if self.metrics and self.metrics['files']:
+            report += f"\n{self.metrics_report()}"
+
+        if self.memory_profiles:
+            report += f"\n{self.memory_report()}"
 
         return report
 
 class PerformanceProfilerGUI:
-    """GUI for performance profiler"""
+    """
+    GUI for performance profiler
 
-    def __init__(self):
+    Given a parent it is a Toplevel of the main window and shares its UI
+    event queue; on its own it owns a Tk root and a queue of its own.
+    """
+
+    def __init__(self, parent=None, ui_events=None):
         if not all([self]):
             raise ValueError("Invalid parameters")
-        self.root = tk.Tk()
+        self.owns_root = parent is None
+        self.root = tk.Tk() if self.owns_root else tk.Toplevel(parent)
         self.profiler = PerformanceProfiler()
+        # Profiling jobs run on the shared worker pool and report here
+        self._owns_events = ui_events is None
+        self.ui_events = ui_events or UIEventQueue(self.root).start()
+        self._update_after = None
         self.setup_gui()
         self.update_display()
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
 
     def setup_gui(self):
         """Setup profiler GUI"""
@@ -279,6 +390,12 @@ class PerformanceProfilerGUI:
         # Processes tab
         self.create_processes_tab()
 
+        # Conversion memory tab
+        self.create_memory_tab()
+
+        # Captured CPU profiles tab
+        self.create_cpu_profiles_tab()
+
     def create_realtime_tab(self):
         """Create real-time monitoring tab"""
         if not all([self]):
@@ -395,6 +512,191 @@ class PerformanceProfilerGUI:
         self.processes_tree.pack(side='left', fill='both', expand=True)
         processes_scrollbar.pack(side='right', fill='y')
 
+    def create_memory_tab(self):
+        """Create conversion memory profile tab"""
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        memory_frame = ttk.Frame(self.notebook)
+        self.notebook.add(memory_frame, text="🧠 Memory")
+
+        controls = ttk.Frame(memory_frame)
+        controls.pack(fill='x', pady=(0, 10))
+        self.memory_btn = ttk.Button(
+            controls,
+            text="🔬 Profile Script...",
+            command=self.profile_memory
+        )
+        self.memory_btn.pack(side='left', padx=(0, 10))
+        ttk.Button(controls, text="📄 Export...", command=self.export_memory_profile).pack(side='left')
+
+        self.memory_text = tk.Text(memory_frame, font=('Courier', 10))
+        memory_scrollbar = ttk.Scrollbar(memory_frame, orient='vertical', command=self.memory_text.yview)
+        self.memory_text.configure(yscrollcommand=memory_scrollbar.set)
+
+        self.memory_text.pack(side='left', fill='both', expand=True)
+        memory_scrollbar.pack(side='right', fill='y')
+
+    def profile_memory(self):
+        """Profile a script's conversion memory without blocking the GUI"""
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        from tkinter import filedialog
+        script_path = filedialog.askopenfilename(
+            title="Select script to profile",
+            filetypes=[("Python files", "*.py"), ("All files", "*.*")]
+        )
+        if not script_path:
+            return
+
+        result = {}
+
+        def worker():
+            try:
+                result['profile'] = self.profiler.profile_memory(script_path)
+            except Exception as e:
+                result['error'] = e
+
+        future = submit(worker)
+        future.add_done_callback(lambda _: self.ui_events.post(self._show_memory_profile, result))
+        self.memory_btn.config(state='disabled')
+        self.status_label.config(text=f"Profiling memory of {Path(script_path).name}...")
+
+    def _show_memory_profile(self, result):
+        """Show the memory profile once the worker has finished (UI thread only)"""
+        if not self.root.winfo_exists():
+            return
+
+        self.memory_btn.config(state='normal')
+        self.memory_text.delete('1.0', tk.END)
+        if 'error' in result:
+            self.status_label.config(text="Memory profile failed")
+            self.memory_text.insert('1.0', f"❌ Memory profile failed: {result['error']}")
+        else:
+            self.status_label.config(text="Memory profile complete")
+            self.memory_text.insert('1.0', self.profiler.memory_report())
+
+    def export_memory_profile(self):
+        """Export the latest memory profile as JSON or CSV"""
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        from tkinter import filedialog, messagebox
+        if not self.profiler.memory_profiles:
+            messagebox.showinfo("Memory Profile", "Profile a script first")
+            return
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json"), ("CSV files", "*.csv")]
+        )
+        if filename:
+            self.profiler.memory_profiles[-1].export(filename)
+            messagebox.showinfo("Memory Profile", f"Memory profile saved to:\n{filename}")
+
+    def create_cpu_profiles_tab(self):
+        """Create captured CPU profile runs tab"""
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        runs_frame = ttk.Frame(self.notebook)
+        self.notebook.add(runs_frame, text="🔥 CPU Profiles")
+
+        controls = ttk.Frame(runs_frame)
+        controls.pack(fill='x', pady=(0, 10))
+        self.cpu_profile_btn = ttk.Button(
+            controls,
+            text="🔬 Profile Conversion...",
+            command=self.capture_cpu_profile
+        )
+        self.cpu_profile_btn.pack(side='left', padx=(0, 10))
+        self.sampling_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(controls, text="Sampling", variable=self.sampling_var).pack(side='left', padx=(0, 10))
+        ttk.Button(controls, text="🔥 Open Flamegraph", command=self.open_flamegraph).pack(side='left', padx=(0, 10))
+        ttk.Button(controls, text="🔄 Refresh", command=self.update_cpu_profiles).pack(side='left')
+
+        columns = ('Time', 'Run', 'Mode', 'Seconds', 'Stacks')
+        self.runs_tree = ttk.Treeview(runs_frame, columns=columns, show='headings', height=20)
+        for col in columns:
+            self.runs_tree.heading(col, text=col)
+            self.runs_tree.column(col, width=120)
+        self.runs_tree.column('Run', width=320)
+        self.runs_tree.bind('<Double-1>', lambda event: self.open_flamegraph())
+
+        runs_scrollbar = ttk.Scrollbar(runs_frame, orient='vertical', command=self.runs_tree.yview)
+        self.runs_tree.configure(yscrollcommand=runs_scrollbar.set)
+
+        self.runs_tree.pack(side='left', fill='both', expand=True)
+        runs_scrollbar.pack(side='right', fill='y')
+        self.update_cpu_profiles()
+
+    def update_cpu_profiles(self):
+        """List the saved CPU profile runs"""
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        for item in self.runs_tree.get_children():
+            self.runs_tree.delete(item)
+        self.run_svgs = {}
+        for run in self.profiler.captured_runs():
+            item = self.runs_tree.insert('', 'end', values=(
+                run['created'],
+                run['label'],
+                run['mode'],
+                f"{run['seconds']:.2f}",
+                run['stacks']
+            ))
+            self.run_svgs[item] = run['svg']
+
+    def capture_cpu_profile(self):
+        """Profile the conversion of a chosen script in a worker thread"""
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        from tkinter import filedialog
+        script_path = filedialog.askopenfilename(
+            title="Select script to profile",
+            filetypes=[("Python files", "*.py"), ("All files", "*.*")]
+        )
+        if not script_path:
+            return
+
+        from tools.enhanced_converter import EnhancedConverter
+        source = Path(script_path)
+        output_path = source.with_name(f"{source.stem}_macos.py")
+        sampling = self.sampling_var.get()
+        result = {}
+
+        def worker():
+            try:
+                result['run'] = self.profiler.capture_cpu_profile(
+                    EnhancedConverter().convert_script, script_path, output_path,
+                    label=f"convert {source.name}", sampling=sampling
+                )[1]
+            except Exception as e:
+                result['error'] = e
+
+        future = submit(worker)
+        future.add_done_callback(lambda _: self.ui_events.post(self._show_cpu_profile, result))
+        self.cpu_profile_btn.config(state='disabled')
+        self.status_label.config(text=f"Profiling conversion of {source.name}...")
+
+    def _show_cpu_profile(self, result):
+        """Refresh the run list once the profiled conversion has finished (UI thread only)"""
+        if not self.root.winfo_exists():
+            return
+
+        self.cpu_profile_btn.config(state='normal')
+        if 'error' in result:
+            self.status_label.config(text=f"CPU profile failed: {result['error']}")
+        else:
+            self.status_label.config(text=f"CPU profile saved: {result['run'].label}")
+        self.update_cpu_profiles()
+
+    def open_flamegraph(self):
+        """Open the selected run's flamegraph in the browser"""
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        import webbrowser
+        selection = self.runs_tree.selection()
+        svg = self.run_svgs.get(selection[0]) if selection else None
+        if svg and Path(svg).exists():
+            webbrowser.open(Path(svg).resolve().as_uri())
+
     def start_monitoring(self):
         """Start performance monitoring"""
         if not all([self]):
@@ -441,7 +743,7 @@ class PerformanceProfilerGUI:
             self.update_processes()
 
         # Schedule next update
-        self.root.after(1000, self.update_display)
+        self._update_after = self.root.after(1000, self.update_display)
 
     def update_text_graph(self):
         """Update text-based performance graph"""
@@ -453,15 +755,15 @@ class PerformanceProfilerGUI:
         memory_data = list(self.profiler.data_points['memory'])[-20:]
 
         graph_text = "Performance Graph (Last 20 seconds)\n"
-        graph_text = f"{graph_text}{"="}" * 50 + "\n\n"
+        graph_text += "=" * 50 + "\n\n"
 
-        graph_text = f"{graph_text}{"CPU Usage:\n"}"
+        graph_text += "CPU Usage:\n"
         for i, value in enumerate(cpu_data):
             bar_length = int(value / 5)  # Scale to fit
             bar = "█" * bar_length + "░" * (20 - bar_length)
             graph_text += f"{i+1:2d}: {bar} {value:.1f}%\n"
 
-        graph_text = f"{graph_text}{"\nMemory Usage:\n"}"
+        graph_text += "\nMemory Usage:\n"
         for i, value in enumerate(memory_data):
             bar_length = int(value / 5)
             bar = "█" * bar_length + "░" * (20 - bar_length)
@@ -538,11 +840,26 @@ class PerformanceProfilerGUI:
         except Exception as e:
             tk.messagebox.showerror("Export Error", f"Could not export report:\n{e}")
 
+    def close(self):
+        """Stop monitoring and close the window"""
+        if self._update_after is not None:
+            self.root.after_cancel(self._update_after)
+            self._update_after = None
+        if self.profiler.monitoring:
+            self.profiler.stop_monitoring()
+        if self._owns_events:
+            self.ui_events.stop()
+        self.root.destroy()
+
     def run(self):
-        """Run the profiler GUI"""
+        """Run the profiler GUI; a hosted window runs on the main window's mainloop"""
         if not all([self]):
             raise ValueError("Invalid parameters")
-        self.root.mainloop()
+        if self.owns_root:
+            self.root.mainloop()
+        else:
+            self.root.lift()
+            self.root.focus_set()
 
 if __name__ == "__main__":
     try:
@@ -550,6 +867,6 @@ if __name__ == "__main__":
         app.run()
     except ImportError as e:
         print(f"Missing dependency: {e}")
-        print("Install with: pip install psutil matplotlib")
+        print("Install with: pip install psutil")
     except Exception as e:
         print(f"Error starting profiler: {e}")
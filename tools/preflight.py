@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+IRUS V6.0 - Launcher Preflight
+Checks that required and optional modules are installed without importing them
+Results are cached per Python environment and re-probed only when it changes
+"""
+
+import os
+import sys
+import json
+import site
+import hashlib
+import importlib.util
+from pathlib import Path
+
+if __name__ == "__main__":
+    # Allow running as a script from the tools directory
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Next to the install rather than the working directory, so every launcher shares it
+PREFLIGHT_PATH = Path(__file__).resolve().parent.parent / "cache" / "preflight.json"
+
+REQUIRED_MODULES = ('tkinter', '_tkinter', 'threading', 'json')
+OPTIONAL_MODULES = ('requests', 'psutil')
+MINIMUM_PYTHON = (3, 7)
+
+
+def _site_directories():
+    directories = []
+    try:
+        directories.extend(site.getsitepackages())
+    except AttributeError:
+        # Old virtualenv copies of site.py lack getsitepackages
+        pass
+    user_site = site.getusersitepackages() if hasattr(site, 'getusersitepackages') else None
+    if user_site:
+        directories.append(user_site)
+    return sorted(set(directories))
+
+
+def environment_fingerprint():
+    """
+    Hash of the interpreter path, its version and the site-packages mtimes
+
+    Installing or removing a package adds or removes entries in a
+    site-packages directory, which changes its mtime and so the hash.
+    """
+    mtimes = []
+    for directory in _site_directories():
+        try:
+            mtimes.append([directory, os.stat(directory).st_mtime_ns])
+        except OSError:
+            mtimes.append([directory, None])
+    identity = json.dumps([sys.executable, sys.version, sys.platform, mtimes])
+    return hashlib.sha256(identity.encode('utf-8')).hexdigest()[:16]
+
+
+def module_available(name):
+    """True when name can be imported; looks for the module without running it"""
+    if not all([name]):
+        raise ValueError("Invalid parameters")
+    if name in sys.modules:
+        return True
+    try:
+        # A dotted name imports its parent package, so probe the top level only
+        return importlib.util.find_spec(name.partition('.')[0]) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def probe(required=REQUIRED_MODULES, optional=OPTIONAL_MODULES):
+    """Probe every module now; returns the preflight result without caching it"""
+    modules = {name: module_available(name) for name in (*required, *optional)}
+    return {
+        'python_ok': sys.version_info[:2] >= MINIMUM_PYTHON,
+        'python_version': f"{sys.version_info.major}.{sys.version_info.minor}",
+        'modules': modules,
+        'missing_required': [name for name in required if not modules[name]],
+        'missing_optional': [name for name in optional if not modules[name]],
+    }
+
+
+def _load(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save(path, result):
+    from tools.atomic_io import atomic_write_text
+
+    try:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(path, json.dumps(result, indent=2))
+    except OSError as e:
+        print(f"⚠️ Could not cache preflight results: {e}")
+
+
+def run_preflight(required=REQUIRED_MODULES, optional=OPTIONAL_MODULES, path=None, refresh=False):
+    """
+    Preflight result for this environment, probing only when it changed
+
+    The cached result is reused when the fingerprint matches and it covers
+    every requested module; 'cached' in the result tells which happened.
+    """
+    path = Path(path) if path else PREFLIGHT_PATH
+    fingerprint = environment_fingerprint()
+    cached = None if refresh else _load(path)
+    if (cached and cached.get('fingerprint') == fingerprint
+            and all(name in cached.get('modules', {}) for name in (*required, *optional))):
+        modules = cached['modules']
+        return {
+            **cached,
+            'missing_required': [name for name in required if not modules[name]],
+            'missing_optional': [name for name in optional if not modules[name]],
+            'cached': True,
+        }
+
+    result = probe(required, optional)
+    result['fingerprint'] = fingerprint
+    _save(path, result)
+    return {**result, 'cached': False}
+
+
+def clear_preflight(path=None):
+    """Forget cached results so the next launch probes again"""
+    try:
+        os.remove(path or PREFLIGHT_PATH)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def main(argv=None):
+    """Command-line entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="preflight.py",
+        description="Check the modules IRUS needs, using the cached result when the environment is unchanged"
+    )
+    parser.add_argument("--refresh", action="store_true", help="Probe again even if a cached result matches")
+    parser.add_argument("--clear", action="store_true", help="Delete the cached result and exit")
+    args = parser.parse_args(argv)
+
+    if args.clear:
+        print("✅ Preflight cache cleared" if clear_preflight() else "No preflight cache to clear")
+        return 0
+
+    result = run_preflight(refresh=args.refresh)
+    source = "cached" if result['cached'] else "probed"
+    print(f"🔍 Preflight ({source}, environment {result['fingerprint']})")
+    print(f"{'✅' if result['python_ok'] else '❌'} Python {result['python_version']}")
+    for name, available in result['modules'].items():
+        print(f"{'✅' if available else '⚠️'} {name}")
+    return 1 if result['missing_required'] or not result['python_ok'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+IRUS V6.0 - Background Prewarm
+Imports and builds converters, validators and compiled rules while the user looks at the window
+The first conversion then runs at the same speed as every later one
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+
+if __name__ == "__main__":
+    # Allow running as a script from the tools directory
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# A small script from the benchmark corpus drives every rule stage once
+SAMPLE_BYTES = 4 * 1024
+
+# Tool windows opened from the Advanced Tools tab; imported only, their windows are not built
+TOOL_MODULES = ('tools.batch_converter', 'tools.ai_optimizer', 'tools.template_manager',
+                'tools.performance_profiler')
+
+_prewarmer = None
+_prewarmer_lock = threading.Lock()
+
+
+def _sample_script():
+    from tools.benchmark_corpus import MacroScriptGenerator
+    return MacroScriptGenerator().generate(SAMPLE_BYTES)
+
+
+def warm_converter():
+    """Import the converter, build its rule plans and run the sample through it"""
+    from tools.enhanced_converter import EnhancedConverter, stage_plans
+
+    stage_plans()
+    # No chunk cache: the sample must not take up space meant for the user's scripts
+    EnhancedConverter(use_chunk_cache=False).convert_content(_sample_script())
+
+
+def warm_macos_optimizer():
+    """Import MacOSOptimizer and compile its rule sets on the sample"""
+    from tools.macos_optimizer import MacOSOptimizer
+
+    optimizer = MacOSOptimizer()
+    sample = _sample_script()
+    optimized, _ = optimizer.optimize_for_macos(sample, "macOS")
+    optimizer.analyze_conversion_success(sample, optimized)
+
+
+def warm_validators():
+    """Import the validators used after conversion"""
+    from tools.ultra_validator import UltraValidator
+
+    UltraValidator()
+
+
+def warm_tool_modules():
+    """Import the advanced tool modules so their windows open without a pause"""
+    import importlib
+
+    for module in TOOL_MODULES:
+        try:
+            importlib.import_module(module)
+        except ImportError as e:
+            # Optional dependencies of one tool must not stop the rest
+            print(f"⚠️ Prewarm skipped {module}: {e}")
+
+
+PREWARM_TASKS = (
+    ('converter', warm_converter),
+    ('macos_optimizer', warm_macos_optimizer),
+    ('validators', warm_validators),
+    ('tool_modules', warm_tool_modules),
+)
+
+
+class Prewarmer:
+    """
+    Runs the prewarm tasks once, in order, on a daemon thread
+
+    Each task is timed; a failing task is recorded and the rest still
+    run, since anything left cold is simply built on first use as before.
+    """
+
+    def __init__(self, tasks=PREWARM_TASKS):
+        if not all([self, tasks]):
+            raise ValueError("Invalid parameters")
+        self.tasks = tuple(tasks)
+        self.timings = {}
+        self.errors = {}
+        self.done = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the background thread; later calls do nothing"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="irus-prewarm", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        from tools.tracing import span
+
+        try:
+            for name, task in self.tasks:
+                started = time.perf_counter()
+                with span('prewarm', task=name):
+                    try:
+                        task()
+                    except Exception as e:
+                        self.errors[name] = f"{type(e).__name__}: {e}"
+                self.timings[name] = time.perf_counter() - started
+                # Hand the interpreter back to the UI thread between tasks
+                time.sleep(0)
+        finally:
+            self.done.set()
+
+    def wait(self, timeout=None):
+        """Block until every task has run; True unless the timeout passed"""
+        return self.done.wait(timeout)
+
+    def summary(self):
+        """One line per task with its time or error"""
+        lines = []
+        for name, _ in self.tasks:
+            if name in self.errors:
+                lines.append(f"⚠️ {name}: {self.errors[name]}")
+            elif name in self.timings:
+                lines.append(f"✅ {name}: {self.timings[name] * 1000:.1f}ms")
+        return lines
+
+
+def start_prewarm(tasks=PREWARM_TASKS):
+    """Start the process-wide prewarm once and return it"""
+    global _prewarmer
+    with _prewarmer_lock:
+        if _prewarmer is None:
+            _prewarmer = Prewarmer(tasks).start()
+        return _prewarmer
+
+
+def get_prewarmer():
+    """The prewarmer started in this process, or None"""
+    return _prewarmer
+
+
+def main(argv=None):
+    """Command-line entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="prewarm.py",
+        description="Run the GUI's background prewarm in the foreground and time each task"
+    )
+    parser.parse_args(argv)
+
+    prewarmer = start_prewarm()
+    prewarmer.wait()
+    print("🔥 Prewarm finished")
+    for line in prewarmer.summary():
+        print(f"  {line}")
+    return 1 if prewarmer.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
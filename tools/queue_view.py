@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+IRUS V6.0 - Queue View
+Keeps a ttk.Treeview in step with a conversion queue by updating only the rows that changed
+Refreshes are throttled, and very large queues are shown through a window of reused rows
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+
+if __name__ == "__main__":
+    # Allow running as a script from the tools directory
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Status changes reach the tree at most this often
+REFRESH_INTERVAL_SECONDS = 0.1
+
+# Above this many items only the visible rows exist in the tree
+VIRTUAL_THRESHOLD = 2000
+
+
+class QueueView:
+    """
+    Rows of a Treeview for a list of queue items, keyed by each item's 'id'
+
+    Items are expected to be appended to the queue or cleared, as the batch
+    converter does. After invalidate() the next refresh inserts new items and
+    deletes removed ones; otherwise only items passed to mark_changed() are
+    compared, and a row is written only when its values differ from what it
+    shows. In virtual mode the tree holds one row per visible line and
+    scrolling rewrites those rows from the queue.
+    """
+
+    def __init__(self, tree, scrollbar, items, row_values,
+                 virtual_threshold=VIRTUAL_THRESHOLD, interval=REFRESH_INTERVAL_SECONDS):
+        if not all([self, tree, scrollbar, items, row_values, virtual_threshold]):
+            raise ValueError("Invalid parameters")
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.items = items
+        self.row_values = row_values
+        self.virtual_threshold = virtual_threshold
+        self.interval = interval
+
+        # Item id -> values its row shows; in virtual mode, slot id -> values
+        self._rows = {}
+        self._by_id = {}
+        self._slots = []
+        self._dirty = set()
+        self._structure_changed = True
+        self._lock = threading.Lock()
+        self._last_refresh = 0.0
+        self._after_id = None
+
+        self.virtual = False
+        self.offset = 0
+
+        # Counters for tests and the profiler
+        self.refreshes = 0
+        self.row_writes = 0
+
+        self.tree.bind('<MouseWheel>', self._on_wheel, add='+')
+        self.tree.bind('<Button-4>', self._on_wheel, add='+')
+        self.tree.bind('<Button-5>', self._on_wheel, add='+')
+
+    def mark_changed(self, item_id):
+        """Note that an item's row may need redrawing; safe to call from worker threads"""
+        if item_id is not None:
+            with self._lock:
+                self._dirty.add(item_id)
+
+    def invalidate(self):
+        """Items were added or removed; the next refresh compares the whole queue"""
+        with self._lock:
+            self._structure_changed = True
+
+    def request_refresh(self):
+        """Refresh now, or once the interval since the last refresh has passed"""
+        if self._after_id is not None:
+            return
+        wait = self.interval - (time.perf_counter() - self._last_refresh)
+        if wait <= 0:
+            self.refresh()
+        else:
+            self._after_id = self.tree.after(int(wait * 1000) + 1, self._deferred_refresh)
+
+    def refresh(self):
+        """Bring the tree up to date with the queue (UI thread only)"""
+        self.stop()
+
+        items = self.items()
+        virtual = len(items) > self.virtual_threshold
+        if virtual != self.virtual:
+            self._switch_mode(virtual)
+
+        if self.virtual:
+            with self._lock:
+                self._dirty.clear()
+                self._structure_changed = False
+            self._render_window(items)
+        else:
+            self._sync_rows(items)
+
+        self._last_refresh = time.perf_counter()
+        self.refreshes += 1
+
+    def stop(self):
+        """Cancel a deferred refresh, for when the tree is about to be destroyed"""
+        if self._after_id is not None:
+            self.tree.after_cancel(self._after_id)
+            self._after_id = None
+
+    def row_count(self):
+        """Rows that exist in the tree"""
+        return len(self._slots) if self.virtual else len(self._rows)
+
+    def _deferred_refresh(self):
+        self._after_id = None
+        self.refresh()
+
+    def _sync_rows(self, items):
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            structure_changed, self._structure_changed = self._structure_changed, False
+
+        if structure_changed:
+            self._by_id = {item['id']: item for item in items}
+            stale = [item_id for item_id in self._rows if item_id not in self._by_id]
+            if stale:
+                self.tree.delete(*stale)
+                for item_id in stale:
+                    del self._rows[item_id]
+            for item in items:
+                if item['id'] not in self._rows:
+                    values = self.row_values(item)
+                    self.tree.insert('', 'end', iid=item['id'], values=values)
+                    self._rows[item['id']] = values
+                    self.row_writes += 1
+            candidates = items
+        else:
+            candidates = [self._by_id[item_id] for item_id in dirty if item_id in self._by_id]
+
+        for item in candidates:
+            values = self.row_values(item)
+            if self._rows.get(item['id']) != values:
+                self.tree.item(item['id'], values=values)
+                self._rows[item['id']] = values
+                self.row_writes += 1
+
+    def _switch_mode(self, virtual):
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
+        self._rows.clear()
+        self._slots = []
+        self.virtual = virtual
+        self.offset = 0
+
+        if virtual:
+            # The scrollbar now moves the window over the queue, not the tree
+            self.scrollbar.configure(command=self._on_scroll)
+            self.tree.configure(yscrollcommand='')
+            for index in range(int(self.tree.cget('height'))):
+                slot = f"slot{index}"
+                self.tree.insert('', 'end', iid=slot, values=())
+                self._slots.append(slot)
+                self._rows[slot] = ()
+        else:
+            self.scrollbar.configure(command=self.tree.yview)
+            self.tree.configure(yscrollcommand=self.scrollbar.set)
+            with self._lock:
+                self._structure_changed = True
+
+    def _render_window(self, items):
+        total = len(items)
+        visible = len(self._slots)
+        self.offset = max(0, min(self.offset, total - visible))
+
+        for index, slot in enumerate(self._slots):
+            position = self.offset + index
+            values = self.row_values(items[position]) if position < total else ()
+            if self._rows[slot] != values:
+                self.tree.item(slot, values=values)
+                self._rows[slot] = values
+                self.row_writes += 1
+
+        if total:
+            self.scrollbar.set(self.offset / total, min(self.offset + visible, total) / total)
+
+    def _scroll_to(self, offset):
+        self.offset = int(offset)
+        self._render_window(self.items())
+
+    def _on_scroll(self, action, amount, unit=None):
+        """Scrollbar command in virtual mode"""
+        if action == 'moveto':
+            self._scroll_to(float(amount) * len(self.items()))
+        elif action == 'scroll':
+            step = len(self._slots) if unit == 'pages' else 1
+            self._scroll_to(self.offset + int(amount) * step)
+
+    def _on_wheel(self, event):
+        if not self.virtual:
+            # The tree scrolls itself
+            return None
+        if getattr(event, 'num', None) == 4:
+            lines = -3
+        elif getattr(event, 'num', None) == 5:
+            lines = 3
+        else:
+            lines = -3 if event.delta > 0 else 3
+        self._scroll_to(self.offset + lines)
+        return 'break'
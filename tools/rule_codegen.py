@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+IRUS V6.0 - Rule Code Generator
+Turns a rule set into one specialised Python function
+Patterns are precompiled and bound once; literal prefilters are inlined
+"""
+
+import re
+import os
+import sys
+import threading
+from pathlib import Path
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+if __name__ == "__main__":
+    # Allow running as a script from the tools directory
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools.rule_plan import required_literal
+
+# Consecutive rules whose literals share a prefix this long get one combined check
+MIN_GROUP_PREFIX = 6
+
+# Distinct rule sets kept compiled; templates can be edited at run time
+MAX_COMPILED_RULESETS = 256
+
+# Set IRUS_NO_CODEGEN=1 to run every rule set through the interpreter instead
+CODEGEN_ENABLED = not os.environ.get('IRUS_NO_CODEGEN')
+
+_compiled = {}
+_compiled_lock = threading.Lock()
+
+
+def normalize_rule(rule):
+    """(pattern, replacement[, kind]) as a (pattern, replacement, kind) triple"""
+    pattern, replacement = rule[0], rule[1]
+    kind = rule[2] if len(rule) > 2 else 'regex'
+    if kind not in ('regex', 'literal'):
+        raise ValueError(f"Unknown rule kind: {kind}")
+    return pattern, replacement, kind
+
+
+class InterpretedRuleSet:
+    """
+    The same interface as CompiledRuleSet, applying rules one at a time
+
+    This is the reference the generated functions are checked against,
+    and what runs when IRUS_NO_CODEGEN is set. Prefilters never change
+    output, so gated and stage_gate are accepted and ignored.
+    """
+
+    def __init__(self, rules, gated=None, stage_gate=None, track_absent=False):
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        self.rules = [normalize_rule(rule) for rule in rules]
+        self.track_absent = track_absent
+        for pattern, _, kind in self.rules:
+            if kind == 'regex':
+                re.compile(pattern)
+
+    def __call__(self, content):
+        counts = []
+        absent = []
+        for pattern, replacement, kind in self.rules:
+            if kind == 'literal':
+                count = content.count(pattern)
+                if count:
+                    content = content.replace(pattern, replacement)
+            else:
+                content, count = re.subn(pattern, replacement, content)
+            counts.append(count)
+            absent.append(pattern not in content)
+        if self.track_absent:
+            return content, tuple(counts), tuple(absent)
+        return content, tuple(counts)
+
+
+class CompiledRuleSet:
+    """
+    A rule set compiled to a single function
+
+    Rules are (pattern, replacement) or (pattern, replacement, kind) with
+    kind 'regex' (the default) or 'literal' for plain str.replace rules.
+    Calling the compiled set returns (content, counts), where counts[i]
+    is how many replacements rule i made - the same number re.subn or
+    str.count would give - and the content is exactly what applying the
+    rules one by one produces. With track_absent=True a third tuple says,
+    for every rule, whether its pattern text was absent right after it ran.
+
+    gated chooses which rules check their required literal before running
+    (default: all); stage_gate is an optional tuple of literals of which
+    at least one must occur for any rule to run.
+    """
+
+    def __init__(self, rules, gated=None, stage_gate=None, track_absent=False):
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        if stage_gate and track_absent:
+            raise ValueError("stage_gate and track_absent cannot be combined")
+        self.rules = [normalize_rule(rule) for rule in rules]
+        self.gated = list(gated) if gated is not None else [True] * len(self.rules)
+        self.stage_gate = tuple(stage_gate) if stage_gate else None
+        self.track_absent = track_absent
+        self.namespace = {}
+        self.source = self._generate()
+        exec(compile(self.source, f"<irus rules {id(self):x}>", 'exec'), self.namespace)
+        self.run = self.namespace['run']
+
+    def __call__(self, content):
+        return self.run(content)
+
+    def _rule_literal(self, index):
+        """Literal every match of rule index must contain, or None"""
+        pattern, _, kind = self.rules[index]
+        if kind == 'literal':
+            return pattern or None
+        return required_literal(pattern)
+
+    def _groups(self):
+        """Split rule indexes into runs that can share one literal check"""
+        groups = []
+        current, prefix = [], None
+        for index in range(len(self.rules)):
+            literal = self._rule_literal(index)
+            if current and literal and prefix:
+                shared = os.path.commonprefix([prefix, literal])
+                if len(shared) >= MIN_GROUP_PREFIX:
+                    current.append(index)
+                    prefix = shared
+                    continue
+            if current:
+                groups.append((current, prefix if len(current) > 1 else None))
+            current, prefix = [index], literal
+        if current:
+            groups.append((current, prefix if len(current) > 1 else None))
+        return groups
+
+    def _rule_lines(self, index):
+        """Statements applying one rule and setting n<index>"""
+        pattern, replacement, kind = self.rules[index]
+        if kind == 'literal':
+            # An escaped pattern and replacement make subn behave exactly like str.replace
+            self.namespace[f"_p{index}"] = re.compile(re.escape(pattern))
+            self.namespace[f"_r{index}"] = replacement.replace('\\', '\\\\')
+        else:
+            self.namespace[f"_p{index}"] = re.compile(pattern)
+            self.namespace[f"_r{index}"] = replacement
+
+        lines = [f"content, n{index} = _p{index}.subn(_r{index}, content)"]
+        gate = self._rule_literal(index) if self.gated[index] else None
+        if gate is not None:
+            lines = [f"if {gate!r} in content:"] + ["    " + line for line in lines]
+        if self.track_absent:
+            lines.append(f"a{index} = {pattern!r} not in content")
+        return lines
+
+    def _generate(self):
+        count = len(self.rules)
+        body = []
+        if count:
+            body.append(" = ".join(f"n{index}" for index in range(count)) + " = 0")
+        if self.track_absent and count:
+            body.append(" = ".join(f"a{index}" for index in range(count)) + " = False")
+
+        counts = _tuple_source(f"n{index}" for index in range(count))
+        if self.track_absent:
+            absent = _tuple_source(f"a{index}" for index in range(count))
+            result = f"content, {counts}, {absent}"
+        else:
+            result = f"content, {counts}"
+
+        if self.stage_gate:
+            checks = " or ".join(f"{literal!r} in content" for literal in self.stage_gate)
+            body += [f"if not ({checks}):", f"    return {result}"]
+
+        for indexes, prefix in self._groups():
+            lines = [line for index in indexes for line in self._rule_lines(index)]
+            if prefix is not None and not self.track_absent:
+                # If the shared prefix is absent no rule in the run can match or change content
+                lines = [f"if {prefix!r} in content:"] + ["    " + line for line in lines]
+            body += lines
+
+        body.append(f"return {result}")
+        return "def run(content):\n" + "".join(f"    {line}\n" for line in body)
+
+
+def _tuple_source(names):
+    names = list(names)
+    return "(" + ", ".join(names) + ("," if len(names) == 1 else "") + ")"
+
+
+def ruleset_key(rules, gated=None, stage_gate=None, track_absent=False):
+    """Hashable identity of a rule set and the options it is compiled with"""
+    return (
+        tuple((rule[0], rule[1], rule[2] if len(rule) > 2 else 'regex') for rule in rules),
+        tuple(gated) if gated is not None else None,
+        tuple(stage_gate) if stage_gate else None,
+        track_absent,
+    )
+
+
+def compile_rules(rules, gated=None, stage_gate=None, track_absent=False):
+    """
+    Executor for a rule set, generated once per distinct rule set
+
+    Raises re.error for an invalid pattern. With IRUS_NO_CODEGEN set the
+    executor is an InterpretedRuleSet.
+    """
+    if not CODEGEN_ENABLED:
+        return InterpretedRuleSet(rules, gated, stage_gate, track_absent)
+
+    key = ruleset_key(rules, gated, stage_gate, track_absent)
+    compiled = _compiled.get(key)
+    if compiled is None:
+        compiled = CompiledRuleSet(rules, gated, stage_gate, track_absent)
+        with _compiled_lock:
+            if len(_compiled) >= MAX_COMPILED_RULESETS:
+                _compiled.clear()
+            compiled = _compiled.setdefault(key, compiled)
+    return compiled
+
+
+def compare_with_interpreter(rules, contents, **options):
+    """
+    Differential check of the generated and interpreted executors
+
+    Returns (index, expected, actual) for every input on which the two
+    disagree about the content, the per-rule counts or, with
+    track_absent, the absent flags; an empty list means identical.
+    """
+    compiled = CompiledRuleSet(rules, **options)
+    interpreted = InterpretedRuleSet(rules, **options)
+    mismatches = []
+    for index, content in enumerate(contents):
+        expected = interpreted(content)
+        actual = compiled(content)
+        if actual != expected:
+            mismatches.append((index, expected, actual))
+    return mismatches
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="rule_codegen.py",
+        description="Show the function generated for each conversion stage"
+    )
+    parser.add_argument("--stage", type=int, help="Only this stage index")
+    args = parser.parse_args()
+
+    from tools.enhanced_converter import CONVERSION_STAGES
+    for stage_index, (rules, label, _) in enumerate(CONVERSION_STAGES):
+        if args.stage is None or args.stage == stage_index:
+            print(f"# {label}")
+            print(compile_rules(rules).source)
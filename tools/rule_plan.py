@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+IRUS V6.0 - Rule Execution Plans
+Uses recorded rule-hit statistics to decide how each rule set runs
+Rarely-hit rules sit behind a literal prefilter; a report flags dead rules
+"""
+
+import re
+import sys
+import json
+import time
+import weakref
+import threading
+from pathlib import Path
+from functools import lru_cache
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+if __name__ == "__main__":
+    # Allow running as a script from the tools directory
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools.atomic_io import atomic_write_text
+
+RULE_STATS_PATH = Path("cache") / "rule_stats.json"
+
+# A rule counts as dead after this many runs without a single hit
+DEAD_RULE_MIN_RUNS = 50
+
+# Rules that hit at least this often skip the prefilter: it would almost
+# always pass, so checking it would only add a scan
+DIRECT_HIT_RATE = 0.5
+
+# Zero-width nodes do not break a run of literal characters
+_ZERO_WIDTH = {sre_parse.AT, sre_parse.ASSERT, sre_parse.ASSERT_NOT}
+
+
+@lru_cache(maxsize=1024)
+def required_literal(pattern, flags=0):
+    """
+    Longest literal that every match of pattern must contain
+
+    Only consecutive top-level literal characters count, so the result is
+    a sound prefilter: if it is not in the text, the pattern cannot match.
+    Returns None when no such literal exists (character classes at the
+    top, alternation, case-insensitive matching, unparsable patterns).
+    """
+    if isinstance(pattern, re.Pattern):
+        pattern, flags = pattern.pattern, pattern.flags
+    if not isinstance(pattern, str):
+        return None
+
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except re.error:
+        return None
+    if (parsed.state.flags | flags) & (re.IGNORECASE | re.VERBOSE):
+        return None
+
+    best = ''
+    current = []
+    for op, value in parsed:
+        if op is sre_parse.LITERAL:
+            current.append(chr(value))
+            continue
+        if op in _ZERO_WIDTH:
+            continue
+        if len(current) > len(best):
+            best = ''.join(current)
+        current = []
+    if len(current) > len(best):
+        best = ''.join(current)
+
+    return best or None
+
+
+def may_match(pattern, content, flags=0):
+    """False only when pattern certainly cannot match content"""
+    literal = required_literal(pattern, flags)
+    return literal is None or literal in content
+
+
+class RuleStatsStore:
+    """
+    Persistent per-rule hit counts
+
+    For every (component, rule) it keeps how many times the rule was run
+    and how many of those runs matched at least once, plus time spent
+    when a RuleProfiler supplied it. Counts are in memory until save().
+    """
+
+    def __init__(self, path=None):
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        self.path = Path(path) if path else RULE_STATS_PATH
+        self._lock = threading.Lock()
+        self._sources = weakref.WeakSet()
+        self.stats = {}
+        self.load()
+
+    def load(self):
+        """Read saved counts, if any"""
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        with self._lock:
+            self.stats = data.get('components', {})
+
+    def save(self):
+        """Write the counts atomically"""
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        self._flush()
+        with self._lock:
+            data = json.dumps({'updated': time.strftime('%Y-%m-%dT%H:%M:%S'), 'components': self.stats}, indent=1)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(self.path, data)
+        except OSError as e:
+            print(f"⚠️ Could not save rule statistics: {e}")
+
+    def _entry(self, component, rule):
+        return self.stats.setdefault(component, {}).setdefault(
+            rule, {'runs': 0, 'hits': 0, 'matches': 0, 'seconds': 0.0}
+        )
+
+    def record(self, component, rule, matches, seconds=0.0):
+        """Count one run of a rule"""
+        with self._lock:
+            entry = self._entry(component, str(rule))
+            entry['runs'] += 1
+            entry['matches'] += matches
+            entry['seconds'] += seconds
+            if matches:
+                entry['hits'] += 1
+
+    def add_runs(self, component, rules, runs, hits, matches):
+        """Add runs of a whole rule set; hits and matches are per rule"""
+        with self._lock:
+            for rule, rule_hits, rule_matches in zip(rules, hits, matches):
+                entry = self._entry(component, str(rule))
+                entry['runs'] += runs
+                entry['hits'] += rule_hits
+                entry['matches'] += rule_matches
+
+    def add_source(self, source):
+        """Pull pending counts from source (anything with drain()) before reading or saving"""
+        self._sources.add(source)
+
+    def _flush(self):
+        for source in list(self._sources):
+            pending = source.drain()
+            if pending:
+                self.add_runs(*pending)
+
+    def merge_profiler(self, profiler):
+        """Fold a RuleProfiler's statistics into the store"""
+        if not all([self, profiler]):
+            raise ValueError("Invalid parameters")
+        for row in profiler.top_rules(limit=0):
+            with self._lock:
+                entry = self._entry(row['component'], row['rule'])
+                entry['runs'] += row['calls']
+                entry['matches'] += row['matches']
+                entry['seconds'] += row['seconds']
+                # The profiler counts matches, not matching runs, so this is an upper bound
+                if row['matches']:
+                    entry['hits'] += min(row['calls'], row['matches'])
+
+    def get(self, component, rule):
+        """Counts for one rule, or None if it was never seen"""
+        self._flush()
+        with self._lock:
+            entry = self.stats.get(component, {}).get(str(rule))
+            return dict(entry) if entry else None
+
+    def hit_rate(self, component, rule):
+        """Share of runs in which the rule matched, or None without data"""
+        entry = self.get(component, rule)
+        if not entry or not entry['runs']:
+            return None
+        return entry['hits'] / entry['runs']
+
+    def is_dead(self, component, rule, min_runs=DEAD_RULE_MIN_RUNS):
+        """True when a rule has run at least min_runs times and never hit"""
+        entry = self.get(component, rule)
+        return bool(entry) and entry['runs'] >= min_runs and entry['hits'] == 0
+
+    def dead_rules(self, min_runs=DEAD_RULE_MIN_RUNS):
+        """All rules with zero hits over at least min_runs runs"""
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        self._flush()
+        with self._lock:
+            return sorted(
+                (component, rule, entry['runs'])
+                for component, rules in self.stats.items()
+                for rule, entry in rules.items()
+                if entry['runs'] >= min_runs and entry['hits'] == 0
+            )
+
+
+class RulePlan:
+    """
+    Execution plan for an ordered list of (pattern, replacement) rules
+
+    Rewrite rules always run in their declared order, because later rules
+    see the output of earlier ones. What the plan changes is how much
+    work each rule costs:
+
+    * rules that usually hit run directly;
+    * rarely-hit and dead rules first check their required literal and
+      are skipped when it is absent;
+    * when every rule has a literal, the whole set is skipped unless one
+      of them occurs, checking the most likely literal first.
+
+    The plan runs as a generated function (see rule_codegen). The
+    prefilter is exact, so output is identical to running every rule.
+    """
+
+    def __init__(self, component, rules, stats=None, min_runs=DEAD_RULE_MIN_RUNS, record_hits=True):
+        if not all([self, component]):
+            raise ValueError("Invalid parameters")
+        self.component = component
+        self.stats = stats
+        self.record_hits = record_hits and stats is not None
+        self.steps = []
+
+        for pattern, replacement in rules:
+            literal = required_literal(pattern)
+            hit_rate = stats.hit_rate(component, pattern) if stats else None
+            gated = literal is not None and (hit_rate is None or hit_rate < DIRECT_HIT_RATE)
+            self.steps.append({
+                'pattern': pattern,
+                'replacement': replacement,
+                'literal': literal,
+                'gated': gated,
+                'dead': bool(stats) and stats.is_dead(component, pattern, min_runs),
+                'hit_rate': hit_rate,
+            })
+
+        # Whole-set gate, most likely literal first so any() stops early
+        if self.steps and all(step['literal'] for step in self.steps):
+            ordered = sorted(self.steps, key=lambda step: -(step['hit_rate'] or 0.0))
+            self.gate_literals = tuple(dict.fromkeys(step['literal'] for step in ordered))
+        else:
+            self.gate_literals = None
+
+        # Hit counts stay on the plan until the store drains them
+        self.runs, self.hits, self.matches = 0, [0] * len(self.steps), [0] * len(self.steps)
+        if self.record_hits:
+            stats.add_source(self)
+
+        from tools.rule_codegen import compile_rules
+        self.patterns = [step['pattern'] for step in self.steps]
+        self.executor = compile_rules(
+            [(step['pattern'], step['replacement']) for step in self.steps],
+            gated=[step['gated'] for step in self.steps],
+            stage_gate=self.gate_literals,
+        )
+
+    def apply(self, content):
+        """Apply the rules; returns (content, patterns that fired)"""
+        content, counts = self.executor(content)
+        if not any(counts):
+            if self.record_hits:
+                self.runs += 1
+            return content, []
+
+        fired = []
+        for index, count in enumerate(counts):
+            if count:
+                fired.append(self.patterns[index])
+                if self.record_hits:
+                    self.hits[index] += 1
+                    self.matches[index] += count
+        if self.record_hits:
+            self.runs += 1
+        return content, fired
+
+    def drain(self):
+        """Hand counts gathered since the last drain to the statistics store"""
+        if not self.runs:
+            return None
+        pending = (self.component, self.patterns, self.runs, self.hits, self.matches)
+        self.runs, self.hits, self.matches = 0, [0] * len(self.steps), [0] * len(self.steps)
+        return pending
+
+    def describe(self):
+        """One line per rule: how the plan runs it"""
+        lines = []
+        for step in self.steps:
+            if step['dead']:
+                mode = 'dead → prefilter'
+            elif step['gated']:
+                mode = 'prefilter'
+            else:
+                mode = 'direct'
+            rate = '-' if step['hit_rate'] is None else f"{step['hit_rate']:.0%}"
+            lines.append(f"{mode:<17} {rate:>5}  {step['pattern']}")
+        return lines
+
+
+_shared_stats = None
+_shared_stats_lock = threading.Lock()
+
+
+def get_rule_stats():
+    """Process-wide rule statistics store"""
+    global _shared_stats
+    with _shared_stats_lock:
+        if _shared_stats is None:
+            _shared_stats = RuleStatsStore()
+        return _shared_stats
+
+
+def print_dead_rule_report(stats=None, min_runs=DEAD_RULE_MIN_RUNS):
+    """Print every rule with zero hits over at least min_runs runs"""
+    stats = stats or get_rule_stats()
+    dead = stats.dead_rules(min_runs)
+    if not dead:
+        print(f"✅ No rule has gone {min_runs} runs without a hit")
+        return dead
+
+    print(f"🪦 {len(dead)} rule(s) with zero hits over at least {min_runs} runs:")
+    for component, rule, runs in dead:
+        print(f"  • {component}: {rule}  ({runs} runs)")
+    return dead
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="rule_plan.py",
+        description="Inspect rule-hit statistics and execution plans"
+    )
+    parser.add_argument("command", choices=["dead", "plan"], help="dead: list dead rules; plan: show the converter's plan")
+    parser.add_argument("--min-runs", type=int, default=DEAD_RULE_MIN_RUNS, help="Runs without a hit before a rule is dead")
+    parser.add_argument("--stats", default=None, help=f"Statistics file (default: {RULE_STATS_PATH})")
+    args = parser.parse_args()
+
+    stats = RuleStatsStore(args.stats)
+    if args.command == "dead":
+        print_dead_rule_report(stats, args.min_runs)
+    else:
+        from tools.enhanced_converter import CONVERSION_STAGES
+        for rules, label, _ in CONVERSION_STAGES:
+            plan = RulePlan('enhanced_converter', rules, stats, args.min_runs, record_hits=False)
+            gate = "gated on " + ", ".join(repr(literal) for literal in plan.gate_literals) if plan.gate_literals else "always runs"
+            print(f"\n{label} ({gate})")
+            for line in plan.describe():
+                print(f"  {line}")
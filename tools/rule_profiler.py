@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+IRUS V6.0 - Rule Profiler
+Opt-in per-rule instrumentation for the conversion engines
+Records matches, time spent and bytes scanned for every rule and file
+"""
+
+import re
+import csv
+import json
+import time
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+
+SORT_KEYS = ('seconds', 'matches', 'bytes_scanned', 'calls')
+
+_active_profiler = None
+
+
+def _empty_stats():
+    return {'calls': 0, 'matches': 0, 'seconds': 0.0, 'bytes_scanned': 0}
+
+
+class RuleProfiler:
+    """
+    Thread-safe accumulator of per-rule statistics
+
+    Rules are keyed by (component, rule), where rule is the pattern or a
+    readable rule name. Every record also lands in a per-file bucket for
+    the file the current thread is working on (see file_scope), so one
+    profiler can aggregate a whole batch and still break it down by file.
+    """
+
+    def __init__(self):
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.rules = {}
+        self.files = {}
+        self.started = time.time()
+
+    @contextmanager
+    def file_scope(self, file_key):
+        """Attribute rule records on this thread to file_key"""
+        previous = getattr(self._local, 'file_key', None)
+        self._local.file_key = str(file_key) if file_key else None
+        try:
+            yield self
+        finally:
+            self._local.file_key = previous
+
+    def record(self, component, rule, matches, seconds, bytes_scanned):
+        """Add one rule application"""
+        key = (component, str(rule))
+        file_key = getattr(self._local, 'file_key', None) or '<memory>'
+        with self._lock:
+            for stats in (self.rules.setdefault(key, _empty_stats()),
+                          self.files.setdefault(key, {}).setdefault(file_key, _empty_stats())):
+                stats['calls'] += 1
+                stats['matches'] += matches
+                stats['seconds'] += seconds
+                stats['bytes_scanned'] += bytes_scanned
+
+    def reset(self):
+        """Drop everything recorded so far"""
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        with self._lock:
+            self.rules = {}
+            self.files = {}
+            self.started = time.time()
+
+    def top_rules(self, limit=10, sort_by='seconds'):
+        """Most expensive rules as dicts, highest first"""
+        if sort_by not in SORT_KEYS:
+            raise ValueError(f"sort_by must be one of {', '.join(SORT_KEYS)}")
+        with self._lock:
+            rows = [
+                dict(stats, component=component, rule=rule)
+                for (component, rule), stats in self.rules.items()
+            ]
+        rows.sort(key=lambda row: row[sort_by], reverse=True)
+        return rows[:limit] if limit else rows
+
+    def to_dict(self):
+        """Snapshot of all statistics, suitable for JSON"""
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        with self._lock:
+            rules = [
+                dict(stats, component=component, rule=rule, files={
+                    file_key: dict(file_stats)
+                    for file_key, file_stats in self.files.get((component, rule), {}).items()
+                })
+                for (component, rule), stats in self.rules.items()
+            ]
+        rules.sort(key=lambda row: row['seconds'], reverse=True)
+        return {
+            'started': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started)),
+            'total_seconds': sum(row['seconds'] for row in rules),
+            'rules': rules,
+        }
+
+    def export_json(self, path):
+        """Write the statistics as JSON"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return Path(path)
+
+    def export_csv(self, path):
+        """Write one CSV row per rule and file"""
+        rows = []
+        with self._lock:
+            for (component, rule), per_file in self.files.items():
+                for file_key, stats in per_file.items():
+                    rows.append([component, rule, file_key, stats['calls'], stats['matches'],
+                                 f"{stats['seconds']:.9f}", stats['bytes_scanned']])
+        rows.sort(key=lambda row: float(row[5]), reverse=True)
+
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['component', 'rule', 'file', 'calls', 'matches', 'seconds', 'bytes_scanned'])
+            writer.writerows(rows)
+        return Path(path)
+
+    def export(self, path):
+        """Write JSON or CSV depending on the file extension"""
+        if not all([self, path]):
+            raise ValueError("Invalid parameters")
+        if Path(path).suffix.lower() == '.csv':
+            return self.export_csv(path)
+        return self.export_json(path)
+
+    def format_top(self, limit=10, sort_by='seconds'):
+        """Text table of the most expensive rules"""
+        rows = self.top_rules(limit, sort_by)
+        if not rows:
+            return "No rule activity recorded"
+        total = sum(stats['seconds'] for stats in self.rules.values()) or 1.0
+        lines = [f"{'#':>2}  {'Time':>9} {'Share':>6} {'Matches':>8} {'Scanned':>10}  Component / Rule"]
+        for index, row in enumerate(rows, 1):
+            rule = row['rule'] if len(row['rule']) <= 60 else row['rule'][:57] + '...'
+            lines.append(
+                f"{index:>2}  {row['seconds'] * 1000:>7.2f}ms {row['seconds'] / total:>6.1%} "
+                f"{row['matches']:>8} {row['bytes_scanned'] / 1024:>8.0f}KB  {row['component']}: {rule}"
+            )
+        return '\n'.join(lines)
+
+
+def get_rule_profiler():
+    """The active profiler, or None when instrumentation is off"""
+    return _active_profiler
+
+
+def enable_rule_profiling(profiler=None):
+    """Turn instrumentation on and return the profiler collecting data"""
+    global _active_profiler
+    _active_profiler = profiler or _active_profiler or RuleProfiler()
+    return _active_profiler
+
+
+def disable_rule_profiling():
+    """Turn instrumentation off and return the profiler that was active"""
+    global _active_profiler
+    profiler, _active_profiler = _active_profiler, None
+    return profiler
+
+
+@contextmanager
+def profile_rules(profiler=None):
+    """Collect rule statistics inside a with-block"""
+    global _active_profiler
+    previous = _active_profiler
+    _active_profiler = profiler or RuleProfiler()
+    try:
+        yield _active_profiler
+    finally:
+        _active_profiler = previous
+
+
+def profiled_subn(profiler, component, pattern, replacement, content, flags=0, rule=None):
+    """re.subn that records its cost on profiler"""
+    started = time.perf_counter()
+    content_after, count = re.subn(pattern, replacement, content, flags=flags)
+    profiler.record(component, rule or pattern, count, time.perf_counter() - started, len(content))
+    return content_after, count
+
+
+def profiled_replace(profiler, component, old, new, content, rule=None):
+    """str.replace that records its cost on profiler; returns (content, count)"""
+    started = time.perf_counter()
+    count = content.count(old)
+    content_after = content.replace(old, new) if count else content
+    profiler.record(component, rule or old, count, time.perf_counter() - started, len(content))
+    return content_after, count
+
+
+def profiled_finditer(profiler, component, pattern, content, flags=0, rule=None):
+    """re.finditer that records its cost on profiler; returns a list of matches"""
+    started = time.perf_counter()
+    matches = list(re.finditer(pattern, content, flags))
+    profiler.record(component, rule or pattern, len(matches), time.perf_counter() - started, len(content))
+    return matches
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+IRUS V6.0 - Settings Store
+Keeps the GUI settings in memory, validated against a schema with defaults
+Changes are written in debounced batches, atomically, on a background thread
+"""
+
+import sys
+import json
+import math
+import time
+import threading
+from pathlib import Path
+
+if __name__ == "__main__":
+    # Allow running as a script from the tools directory
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools.log_console import DEFAULT_MAX_LINES, MIN_MAX_LINES
+from tools.execution_profile import DEFAULT_MEMORY, DEFAULT_SPEED, MEMORY_PROFILES, SPEED_PROFILES
+
+# Next to the install, where the launcher looks for it on first run
+SETTINGS_PATH = Path(__file__).resolve().parent.parent / "settings.json"
+
+# Quiet time before a write, and the longest a change waits while changes keep coming
+DEBOUNCE_SECONDS = 0.5
+MAX_DELAY_SECONDS = 2.0
+
+THEMES = ("Professional", "Dark", "Light", "High Contrast")
+
+# type and default of every setting, with allowed choices or an inclusive range where they apply
+SETTINGS_SCHEMA = {
+    'auto_open': {'type': bool, 'default': True},
+    'backup': {'type': bool, 'default': True},
+    'verbose': {'type': bool, 'default': False},
+    'log_lines': {'type': int, 'default': DEFAULT_MAX_LINES, 'min': MIN_MAX_LINES, 'max': 100000},
+    'theme': {'type': str, 'default': "Professional", 'choices': THEMES},
+    'font_size': {'type': int, 'default': 10, 'min': 8, 'max': 16},
+    'speed': {'type': str, 'default': DEFAULT_SPEED, 'choices': tuple(SPEED_PROFILES)},
+    'memory': {'type': str, 'default': DEFAULT_MEMORY, 'choices': tuple(MEMORY_PROFILES)},
+    'discord_enabled': {'type': bool, 'default': True},
+    'mobile_companion': {'type': bool, 'default': False},
+    'debug': {'type': bool, 'default': False},
+    'auto_update': {'type': bool, 'default': True},
+    'experimental': {'type': bool, 'default': False},
+    'discord_webhook_url': {'type': str, 'default': ""},
+    # Experimental features
+    'batch_conversion': {'type': bool, 'default': False},
+    'ai_optimization': {'type': bool, 'default': False},
+    'profiling': {'type': bool, 'default': False},
+    'custom_templates': {'type': bool, 'default': False},
+    'advanced_debug': {'type': bool, 'default': False},
+    'cloud_sync': {'type': bool, 'default': False},
+}
+
+
+def default_settings(schema=SETTINGS_SCHEMA):
+    """Every setting at its default"""
+    return {name: field['default'] for name, field in schema.items()}
+
+
+def coerce_setting(name, value, schema=SETTINGS_SCHEMA):
+    """
+    value converted to the type of setting name
+
+    Raises ValueError for an unknown name or a value that cannot be used;
+    numbers outside the range are clamped rather than rejected.
+    """
+    field = schema.get(name)
+    if field is None:
+        raise ValueError(f"Unknown setting: {name}")
+
+    kind = field['type']
+    if kind is bool:
+        if isinstance(value, bool):
+            return value
+        # Tk BooleanVar values arrive as 0/1 on some platforms
+        if isinstance(value, int) and value in (0, 1):
+            return bool(value)
+    elif kind is int:
+        # json.load accepts Infinity and NaN, which int() cannot convert
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+            return min(max(int(value), field.get('min', int(value))), field.get('max', int(value)))
+    elif kind is str:
+        if isinstance(value, str) and ('choices' not in field or value in field['choices']):
+            return value
+    raise ValueError(f"Invalid value for {name}: {value!r}")
+
+
+def validate_settings(raw, schema=SETTINGS_SCHEMA):
+    """
+    Settings from raw with every schema key present and valid
+
+    Returns (settings, problems): missing keys take their default, invalid
+    values are replaced by the default and listed in problems, and keys
+    the schema does not know are dropped.
+    """
+    settings = default_settings(schema)
+    problems = []
+    if not isinstance(raw, dict):
+        return settings, [f"Expected a JSON object, found {type(raw).__name__}"]
+
+    for name, value in raw.items():
+        if name not in schema:
+            problems.append(f"Unknown setting dropped: {name}")
+            continue
+        try:
+            settings[name] = coerce_setting(name, value, schema)
+        except ValueError as e:
+            problems.append(f"{e}; using {schema[name]['default']!r}")
+    return settings, problems
+
+
+def load_settings(path=None, schema=SETTINGS_SCHEMA):
+    """Validated settings from path; a missing or unreadable file gives the defaults"""
+    try:
+        with open(path or SETTINGS_PATH, 'r', encoding='utf-8') as f:
+            raw = json.load(f)
+    except FileNotFoundError:
+        return default_settings(schema), []
+    except (OSError, ValueError) as e:
+        return default_settings(schema), [f"Could not read settings ({e}); using defaults"]
+    return validate_settings(raw, schema)
+
+
+class SettingsStore:
+    """
+    In-memory settings with debounced, atomic persistence
+
+    update() changes the values at once and asks the writer thread to save
+    them once no change has come for the debounce time, or at the latest
+    after max_delay while changes keep coming. The file is written through
+    a temp file and rename, so it is never left half-written.
+    """
+
+    def __init__(self, path=None, schema=SETTINGS_SCHEMA, debounce=DEBOUNCE_SECONDS, max_delay=MAX_DELAY_SECONDS):
+        if not all([self, schema]):
+            raise ValueError("Invalid parameters")
+        self.path = Path(path) if path else SETTINGS_PATH
+        self.schema = schema
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.problems = []
+
+        self._values = default_settings(schema)
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._version = 0
+        self._written_version = 0
+        self._first_change = None
+        self._due = None
+        self._closed = False
+        self._thread = None
+
+        # Counters for tests
+        self.updates = 0
+        self.writes = 0
+
+    def load(self):
+        """Read the file once; returns a copy of the validated settings"""
+        values, self.problems = load_settings(self.path, self.schema)
+        with self._condition:
+            self._values = values
+            return dict(values)
+
+    def get(self, name):
+        """Current value of one setting"""
+        with self._condition:
+            return self._values[name]
+
+    def all(self):
+        """Copy of every current setting"""
+        with self._condition:
+            return dict(self._values)
+
+    def defaults(self):
+        """Every setting at its default"""
+        return default_settings(self.schema)
+
+    def update(self, values, delay=None):
+        """
+        Change settings and schedule a save; returns the names that changed
+
+        Invalid values are skipped with a warning and keep their current
+        value. delay=0 saves as soon as the writer thread wakes.
+        """
+        changed = []
+        with self._condition:
+            for name, value in values.items():
+                try:
+                    value = coerce_setting(name, value, self.schema)
+                except ValueError as e:
+                    print(f"⚠️ {e}")
+                    continue
+                if self._values.get(name) != value:
+                    self._values[name] = value
+                    changed.append(name)
+            self.updates += 1
+            if changed or delay == 0:
+                self._schedule(self.debounce if delay is None else delay)
+        return changed
+
+    def flush(self):
+        """Write pending changes now, on the calling thread"""
+        with self._condition:
+            if self._due is None:
+                return False
+            snapshot, version = self._take_pending()
+        self._write(snapshot, version)
+        return True
+
+    def close(self):
+        """Write pending changes and stop the writer thread"""
+        self.flush()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _schedule(self, delay):
+        # Caller holds self._condition
+        now = time.monotonic()
+        self._version += 1
+        if self._first_change is None:
+            self._first_change = now
+        self._due = min(now + delay, self._first_change + max(self.max_delay, delay))
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._writer, name="irus-settings", daemon=True)
+            self._thread.start()
+        self._condition.notify_all()
+
+    def _take_pending(self):
+        # Caller holds self._condition
+        self._due = None
+        self._first_change = None
+        return dict(self._values), self._version
+
+    def _writer(self):
+        while True:
+            with self._condition:
+                while self._due is None and not self._closed:
+                    self._condition.wait()
+                if self._due is None:
+                    return
+                remaining = self._due - time.monotonic()
+                if remaining > 0 and not self._closed:
+                    self._condition.wait(remaining)
+                    continue
+                snapshot, version = self._take_pending()
+            self._write(snapshot, version)
+
+    def _write(self, snapshot, version):
+        from tools.atomic_io import atomic_write_text
+
+        with self._write_lock:
+            # A flush may already have written newer values
+            if version <= self._written_version:
+                return
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                atomic_write_text(self.path, json.dumps(snapshot, indent=2))
+                self._written_version = version
+                self.writes += 1
+            except OSError as e:
+                print(f"⚠️ Could not save settings to {self.path}: {e}")
+
+
+def main(argv=None):
+    """Command-line entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="settings_store.py",
+        description="Check the saved GUI settings against the schema"
+    )
+    parser.add_argument("path", nargs="?", help=f"Settings file (default: {SETTINGS_PATH})")
+    args = parser.parse_args(argv)
+
+    settings, problems = load_settings(args.path)
+    for name, value in settings.items():
+        print(f"  {name}: {value!r}")
+    for problem in problems:
+        print(f"⚠️ {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,12 +6,22 @@ Create, edit, and share conversion templates
 Advanced template system with community sharing
 """
 
+import re
+import sys
 import json
 import time
 import os
 from pathlib import Path
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
+if __name__ == "__main__":
+    # Allow running as a script from the tools directory
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools.rule_profiler import get_rule_profiler
+from tools.rule_plan import get_rule_stats, may_match
+from tools.rule_codegen import compile_rules
+
 try:
     import requests
 except ImportError:
@@ -154,17 +164,51 @@ class TemplateManager:
         template = self.templates[template_name]
         modified_code = code
         applied_rules = []
+        profiler = get_rule_profiler()
+        stats = get_rule_stats()
+
+        executor = self._template_executor(template) if profiler is None else None
+        if executor is not None:
+            try:
+                modified_code, counts, absent = executor(code)
+            except Exception:
+                # Fall through to the rule-by-rule loop, which reports the failing rule
+                modified_code = code
+            else:
+                for rule, count, gone in zip(template['rules'], counts, absent):
+                    stats.record('template_manager', f"[{template_name}] {rule['pattern']}", count)
+                    if gone and rule['pattern'] in code:
+                        applied_rules.append(rule)
+                return modified_code, applied_rules
 
         for rule in template['rules']:
             try:
-                import re
                 pattern = rule['pattern']
                 replacement = rule['replacement']
 
+                if profiler is not None:
+                    started = time.perf_counter()
+                    scanned = len(modified_code)
+
                 if rule['type'] == 'regex':
-                    modified_code = re.sub(pattern, replacement, modified_code)
-                else:
+                    # Skip the regex when the literal every match needs is absent
+                    if may_match(pattern, modified_code):
+                        modified_code, count = re.subn(pattern, replacement, modified_code)
+                    else:
+                        count = 0
+                elif profiler is not None:
+                    count = modified_code.count(pattern)
                     modified_code = modified_code.replace(pattern, replacement)
+                else:
+                    count = int(pattern in modified_code)
+                    if count:
+                        modified_code = modified_code.replace(pattern, replacement)
+
+                if profiler is not None:
+                    profiler.record('template_manager', f"[{template_name}] {pattern}", count,
+                                    time.perf_counter() - started, scanned)
+                else:
+                    stats.record('template_manager', f"[{template_name}] {pattern}", count)
 
                 # Check if rule was applied
                 if pattern in code and pattern not in modified_code:
@@ -174,6 +218,17 @@ class TemplateManager:
                 print(f"Error applying rule {rule}: {e}")
 
         return modified_code, applied_rules
+
+    def _template_executor(self, template):
+        """Generated function for a template's rules, or None if a rule is malformed"""
+        try:
+            rules = [
+                (rule['pattern'], rule['replacement'], 'regex' if rule['type'] == 'regex' else 'literal')
+                for rule in template['rules']
+            ]
+            return compile_rules(rules, track_absent=True)
+        except (KeyError, TypeError, AttributeError, ValueError, re.error):
+            return None
     @lru_cache(maxsize=128)
 
     def get_template_list(self):
@@ -241,12 +296,13 @@ class TemplateManager:
         return template_data
 
 class TemplateManagerGUI:
-    """GUI for template management"""
+    """GUI for template management; a Toplevel of parent when given, otherwise its own Tk root"""
 
-    def __init__(self):
+    def __init__(self, parent=None):
         if not all([self]):
             raise ValueError("Invalid parameters")
-        self.root = tk.Tk()
+        self.owns_root = parent is None
+        self.root = tk.Tk() if self.owns_root else tk.Toplevel(parent)
         self.manager = TemplateManager()
         self.setup_gui()
 
@@ -484,7 +540,7 @@ class TemplateManagerGUI:
             details += f"Version: {template.get('version', '1.0')}\n"
             details += f"Created: {template.get('created', 'Unknown')}\n\n"
             details += f"Rules ({len(template['rules'])}):\n"
-            details = f"{details}{"-"}" * 40 + "\n"
+            details += "-" * 40 + "\n"
 
             for i, rule in enumerate(template['rules'], 1):
                 details += f"{i}. {rule.get('description', 'No description')}\n"
@@ -514,7 +570,7 @@ class TemplateManagerGUI:
 
     def rule_dialog(self, title, item_id=None):
         """Show rule creation/editing dialog"""
-        if not all([self, title, item_id=None]):
+        if not all([self, title]):
             raise ValueError("Invalid parameters")
         dialog = tk.Toplevel(self.root)
         dialog.title(title)
@@ -716,10 +772,14 @@ class TemplateManagerGUI:
                 messagebox.showerror("Delete Error", f"Could not delete template:\n{e}")
 
     def run(self):
-        """Run the template manager GUI"""
+        """Run the template manager GUI; a hosted window runs on the main window's mainloop"""
         if not all([self]):
             raise ValueError("Invalid parameters")
-        self.root.mainloop()
+        if self.owns_root:
+            self.root.mainloop()
+        else:
+            self.root.lift()
+            self.root.focus_set()
 
 if __name__ == "__main__":
     app = TemplateManagerGUI()
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+IRUS V6.0 - Pipeline Tracing
+Nested spans for reads, stages, validation, writes, cache lookups and queue waits
+Written as Chrome trace events, one JSON object per line
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+
+if __name__ == "__main__":
+    # Allow running as a script from the tools directory
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+TRACE_PATH = Path("cache") / "trace.jsonl"
+
+# Set IRUS_TRACE=1 (or to a file path) to trace every IRUS process from the start
+TRACE_ENV = 'IRUS_TRACE'
+
+# Buffered events are written once this many pile up, or when an outermost span ends
+FLUSH_EVENTS = 512
+
+_tracer = None
+
+
+def now_us():
+    """Trace clock in microseconds; monotonic and shared by processes on one machine"""
+    return time.perf_counter_ns() // 1000
+
+
+class _NullSpan:
+    """What span() returns while tracing is off"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """One timed region; attributes can be added while it is open"""
+
+    __slots__ = ('tracer', 'name', 'cat', 'attrs', 'start')
+
+    def __init__(self, tracer, name, cat, attrs):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.attrs = attrs
+        self.start = 0
+
+    def __enter__(self):
+        self.tracer._enter()
+        self.start = now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = now_us()
+        if exc_type is not None:
+            self.attrs['error'] = exc_type.__name__
+        self.tracer.complete(self.name, self.start, end, self.cat, self.attrs)
+        self.tracer._leave()
+        return False
+
+    def set(self, **attrs):
+        """Add attributes to the span"""
+        self.attrs.update(attrs)
+
+
+class Tracer:
+    """
+    Buffers trace events and appends them to a JSON Lines file
+
+    Every span becomes a Chrome "complete" event (ph "X") with pid, tid,
+    start and duration in microseconds; spans nest by time on a thread.
+    Several processes may append to the same file: each flush is a single
+    write of whole lines to a file opened for appending.
+    """
+
+    def __init__(self, path=None):
+        if not all([self]):
+            raise ValueError("Invalid parameters")
+        self.path = Path(path) if path else TRACE_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._events = []
+        self._named_threads = set()
+        self.pid = os.getpid()
+
+    def _after_fork(self):
+        """Start clean in a forked worker; the parent's buffer and nesting are not ours"""
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._events = []
+        self._named_threads = set()
+        self.pid = os.getpid()
+
+    def _enter(self):
+        self._local.depth = getattr(self._local, 'depth', 0) + 1
+
+    def _leave(self):
+        self._local.depth -= 1
+        if not self._local.depth:
+            self.flush()
+
+    def complete(self, name, start, end, cat='irus', attrs=None):
+        """Record a finished span from start to end (now_us() values)"""
+        tid = threading.get_native_id()
+        event = {'name': name, 'cat': cat, 'ph': 'X', 'ts': start, 'dur': end - start,
+                 'pid': self.pid, 'tid': tid}
+        if attrs:
+            event['args'] = attrs
+        with self._lock:
+            if tid not in self._named_threads:
+                self._named_threads.add(tid)
+                self._events.append({'name': 'thread_name', 'ph': 'M', 'pid': self.pid, 'tid': tid,
+                                     'args': {'name': threading.current_thread().name}})
+            self._events.append(event)
+            if len(self._events) < FLUSH_EVENTS:
+                return
+        self.flush()
+
+    def flush(self):
+        """Append buffered events to the trace file"""
+        with self._lock:
+            events, self._events = self._events, []
+            if not events:
+                return
+            data = ''.join(json.dumps(event, separators=(',', ':')) + '\n' for event in events)
+            try:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(data)
+            except OSError as e:
+                print(f"⚠️ Could not write trace events: {e}")
+
+
+def span(name, cat='irus', **attrs):
+    """
+    Time a with-block as a trace span
+
+    Returns a shared no-op object while tracing is off, so instrumented
+    code pays one global lookup and a call.
+    """
+    tracer = _tracer
+    if tracer is None:
+        return NULL_SPAN
+    return Span(tracer, name, cat, attrs)
+
+
+def record_span(name, start, end=None, cat='irus', **attrs):
+    """Record a span measured by hand, e.g. time spent waiting in a queue"""
+    tracer = _tracer
+    if tracer is not None:
+        tracer.complete(name, start, now_us() if end is None else end, cat, attrs)
+
+
+def tracing_enabled():
+    """True while spans are being recorded"""
+    return _tracer is not None
+
+
+def enable_tracing(path=None):
+    """
+    Start recording spans to path (default cache/trace.jsonl); returns the tracer
+
+    IRUS_TRACE is set as well, so worker processes started afterwards
+    append their spans to the same file.
+    """
+    global _tracer
+    if _tracer is not None and (path is None or Path(path) == _tracer.path):
+        return _tracer
+    disable_tracing()
+    _tracer = Tracer(path)
+    os.environ[TRACE_ENV] = str(_tracer.path.resolve())
+    return _tracer
+
+
+def disable_tracing():
+    """Stop recording and flush what was recorded; returns the tracer that was active"""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is not None:
+        tracer.flush()
+        os.environ.pop(TRACE_ENV, None)
+    return tracer
+
+
+@contextmanager
+def trace_to(path=None):
+    """Record spans to path inside a with-block, then restore the previous tracer"""
+    global _tracer
+    previous = _tracer
+    _tracer = tracer = Tracer(path)
+    try:
+        yield tracer
+    finally:
+        _tracer = previous
+        tracer.flush()
+
+
+def load_events(path=None):
+    """Every event in a trace file; malformed lines (a crashed writer) are skipped"""
+    events = []
+    with open(path or TRACE_PATH, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue
+    return events
+
+
+def export_chrome_trace(path, output_path):
+    """Wrap a JSON Lines trace in the {"traceEvents": [...]} file trace viewers open"""
+    if not all([path, output_path]):
+        raise ValueError("Invalid parameters")
+    from tools.atomic_io import atomic_write_text
+    atomic_write_text(output_path, json.dumps({'traceEvents': load_events(path), 'displayTimeUnit': 'ms'}))
+    return Path(output_path)
+
+
+def summarize(events):
+    """Per span name: count, total, mean and the slowest instance"""
+    summary = {}
+    for event in events:
+        if event.get('ph') != 'X':
+            continue
+        row = summary.setdefault(event['name'], {'count': 0, 'total_us': 0, 'max_us': 0, 'slowest': None})
+        row['count'] += 1
+        row['total_us'] += event['dur']
+        if event['dur'] >= row['max_us']:
+            row['max_us'] = event['dur']
+            row['slowest'] = event.get('args')
+    for row in summary.values():
+        row['mean_us'] = row['total_us'] / row['count']
+    return summary
+
+
+def _close_at_exit():
+    if _tracer is not None:
+        _tracer.flush()
+
+
+def _after_fork_in_child():
+    if _tracer is not None:
+        _tracer._after_fork()
+
+
+atexit.register(_close_at_exit)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+if os.environ.get(TRACE_ENV):
+    enable_tracing(None if os.environ[TRACE_ENV] == '1' else os.environ[TRACE_ENV])
+
+
+def main(argv=None):
+    """Command-line entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="tracing.py",
+        description="Inspect IRUS pipeline traces"
+    )
+    parser.add_argument("command", choices=["summary", "export"],
+                        help="summary: slowest spans per name; export: write a Chrome trace JSON file")
+    parser.add_argument("trace", nargs="?", default=str(TRACE_PATH), help=f"Trace file (default: {TRACE_PATH})")
+    parser.add_argument("--output", default="trace.json", help="File written by export")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        print(f"📄 Chrome trace saved to {export_chrome_trace(args.trace, args.output)}")
+        return 0
+
+    summary = summarize(load_events(args.trace))
+    if not summary:
+        print("No spans recorded")
+        return 0
+    print(f"{'Span':<28} {'Count':>6} {'Total':>10} {'Mean':>10} {'Max':>10}  Slowest")
+    for name, row in sorted(summary.items(), key=lambda item: item[1]['total_us'], reverse=True):
+        slowest = ', '.join(f"{key}={value}" for key, value in (row['slowest'] or {}).items())
+        print(f"{name:<28} {row['count']:>6} {row['total_us'] / 1000:>8.1f}ms {row['mean_us'] / 1000:>8.2f}ms "
+              f"{row['max_us'] / 1000:>8.1f}ms  {slowest[:60]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
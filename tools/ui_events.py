@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+IRUS V6.0 - UI Event Queue
+Worker threads post UI updates here instead of touching Tk widgets
+The Tk mainloop drains the queue on a fixed-rate after() tick
+"""
+
+import sys
+import time
+import queue
+import threading
+from pathlib import Path
+
+if __name__ == "__main__":
+    # Allow running as a script from the tools directory
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# About 60 Hz
+TICK_MS = 16
+
+# Share of a tick spent running events; the rest is left for Tk to redraw and handle input
+TICK_BUDGET_SECONDS = 0.008
+
+
+def on_ui_thread():
+    """True on the thread running the Tk mainloop (Tk is only used from the main thread)"""
+    return threading.current_thread() is threading.main_thread()
+
+
+class UIEventQueue:
+    """
+    One queue of UI callbacks between worker threads and the Tk mainloop
+
+    post() queues a callback; every call runs, in order. post_latest()
+    keeps only the newest callback per key, so a worker can report
+    progress thousands of times a second while the UI applies at most
+    one update per key per tick. Neither ever blocks the worker.
+    """
+
+    def __init__(self, root, tick_ms=TICK_MS, budget_seconds=TICK_BUDGET_SECONDS):
+        if not all([self, root, tick_ms, budget_seconds]):
+            raise ValueError("Invalid parameters")
+        self.root = root
+        self.tick_ms = tick_ms
+        self.budget_seconds = budget_seconds
+        self._events = queue.Queue()
+        self._latest = {}
+        self._lock = threading.Lock()
+        self._after_id = None
+
+        # Counters for tests and the profiler
+        self.posted = 0
+        self.coalesced = 0
+        self.handled = 0
+        self.ticks = 0
+
+    def post(self, callback, *args, **kwargs):
+        """Queue callback(*args, **kwargs) to run on the UI thread"""
+        self._events.put_nowait((callback, args, kwargs))
+        with self._lock:
+            self.posted += 1
+
+    def post_latest(self, key, callback, *args, **kwargs):
+        """Queue callback for key, replacing one for the same key that has not run yet"""
+        with self._lock:
+            if key in self._latest:
+                self.coalesced += 1
+            self._latest[key] = (callback, args, kwargs)
+            self.posted += 1
+
+    def call(self, callback, *args, **kwargs):
+        """Run callback now when on the UI thread, otherwise queue it"""
+        if on_ui_thread():
+            return callback(*args, **kwargs)
+        self.post(callback, *args, **kwargs)
+        return None
+
+    def pending(self):
+        """Events waiting for the next tick"""
+        with self._lock:
+            return self._events.qsize() + len(self._latest)
+
+    def start(self):
+        """Start draining on the Tk mainloop; returns self"""
+        if self._after_id is None:
+            self._after_id = self.root.after(self.tick_ms, self._tick)
+        return self
+
+    def stop(self):
+        """Stop the tick; events still queued stay queued"""
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception as e:
+                # The root may already be destroyed
+                print(f"⚠️ Could not cancel UI tick: {e}")
+            self._after_id = None
+
+    def drain(self, budget_seconds=None):
+        """Run queued events until the queue is empty or the budget is spent; returns how many ran"""
+        deadline = time.perf_counter() + (self.budget_seconds if budget_seconds is None else budget_seconds)
+        handled = 0
+
+        with self._lock:
+            latest, self._latest = self._latest, {}
+
+        while True:
+            try:
+                callback, args, kwargs = self._events.get_nowait()
+            except queue.Empty:
+                break
+            self._run(callback, args, kwargs)
+            handled += 1
+            if time.perf_counter() >= deadline:
+                break
+
+        # Coalesced updates come last so they show the state after this tick's events
+        for callback, args, kwargs in latest.values():
+            self._run(callback, args, kwargs)
+            handled += 1
+
+        self.handled += handled
+        return handled
+
+    def _run(self, callback, args, kwargs):
+        try:
+            callback(*args, **kwargs)
+        except Exception as e:
+            # One bad update must not stop the tick
+            print(f"⚠️ UI event {getattr(callback, '__qualname__', callback)} failed: {e}")
+
+    def _tick(self):
+        self._after_id = None
+        self.ticks += 1
+        try:
+            self.drain()
+        finally:
+            try:
+                self._after_id = self.root.after(self.tick_ms, self._tick)
+            except Exception:
+                # Root destroyed while draining; nothing left to tick
+                self._after_id = None
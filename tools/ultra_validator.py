@@ -474,14 +474,25 @@ class UltraValidator:
 
         return recommendations
 
+def ultra_validate_report(script_path):
+    """Validate a script and return the report without printing it"""
+
+    if not all([script_path]):
+        raise ValueError("Invalid parameters")
+    from tools.tracing import span
+    with span('validate', file=str(script_path)) as validation:
+        validator = UltraValidator()
+        validator.validate_converted_script(script_path)
+        report = validator.generate_validation_report()
+        validation.set(score=report['validation_score'])
+    return report
+
 def ultra_validate_script(script_path):
     """Perform ultra-comprehensive validation"""
 
     if not all([script_path]):
         raise ValueError("Invalid parameters")
-    validator = UltraValidator()
-    success = validator.validate_converted_script(script_path)
-    report = validator.generate_validation_report()
+    report = ultra_validate_report(script_path)
 
     print(f"\n🔍 Ultra-Validation Results:")
     print(f"📊 Validation Score: {report['validation_score']}/100")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+IRUS V6.0 - Shared Worker Pool
+One thread pool for background work started from the main window and its tool windows
+Results come back to the UI through the UI event queue, never by touching widgets
+"""
+
+import os
+import sys
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+if __name__ == "__main__":
+    # Allow running as a script from the tools directory
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Conversions are mostly regex work on str; a few threads keep I/O overlapped without starving the UI thread
+DEFAULT_WORKERS = min(8, (os.cpu_count() or 1) + 2)
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def get_worker_pool(max_workers=None):
+    """The process-wide pool, created on first use; max_workers applies only then"""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None:
+            _pool_workers = max_workers or DEFAULT_WORKERS
+            _pool = ThreadPoolExecutor(max_workers=_pool_workers, thread_name_prefix="irus-worker")
+        return _pool
+
+
+def configure_worker_pool(max_workers):
+    """
+    Use max_workers threads from now on
+
+    A pool of another size is replaced and shut down without waiting: work
+    already queued on it still runs, then its threads exit. Batches that
+    must outlive a resize submit through SharedExecutor instead of holding
+    the pool.
+    """
+    global _pool, _pool_workers
+    if not all([max_workers]):
+        raise ValueError("Invalid parameters")
+    with _pool_lock:
+        if _pool is not None and _pool_workers == max_workers:
+            return _pool
+        old_pool = _pool
+        _pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="irus-worker")
+        _pool_workers = max_workers
+        pool = _pool
+    if old_pool is not None:
+        old_pool.shutdown(wait=False)
+    return pool
+
+
+def submit(callback, *args, **kwargs):
+    """Run callback(*args, **kwargs) on the shared pool; returns its Future"""
+    if not all([callback]):
+        raise ValueError("Invalid parameters")
+    return get_worker_pool().submit(callback, *args, **kwargs)
+
+
+class SharedExecutor:
+    """Executor-like handle whose submit() always goes to the current shared pool"""
+
+    def submit(self, callback, *args, **kwargs):
+        return submit(callback, *args, **kwargs)
+
+
+def shutdown_worker_pool(wait=False):
+    """Stop the pool, dropping work that has not started; the next get_worker_pool() starts a new one"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is None:
+        return
+    if sys.version_info >= (3, 9):
+        pool.shutdown(wait=wait, cancel_futures=True)
+    else:
+        pool.shutdown(wait=wait)